@@ -269,11 +269,18 @@ async def get_ingestion_overview():
 
 
 @app.get("/api/ingestion/{environment}/jobs")
-async def list_ingestion_jobs(environment: str, limit: int = Query(50, ge=1, le=100)):
-    """List ingestion jobs for environment"""
+async def list_ingestion_jobs(
+    environment: str,
+    limit: int = Query(50, ge=1, le=100),
+    status: Optional[str] = Query(None),
+    before_created_at: Optional[float] = Query(None),
+    before_job_id: Optional[str] = Query(None),
+):
+    """List ingestion jobs for environment, newest first; page with the last job's created_at and job_id"""
     validate_environment(environment)
     
-    return await ingestion_service.list_jobs(environment, limit)
+    before = (before_created_at, before_job_id or "") if before_created_at is not None else None
+    return await ingestion_service.list_jobs(environment, limit, status=status, before=before)
 
 
 @app.get("/api/ingestion/{environment}/jobs/{job_id}")
@@ -421,23 +428,43 @@ async def run_test(environment: str, test_id: str):
 
 
 @app.post("/api/testing/{environment}/test-suites/run")
-async def run_test_suite(environment: str, test_type: Optional[str] = Query(None)):
-    """Run test suite"""
+async def run_test_suite(
+    environment: str,
+    test_type: Optional[str] = Query(None),
+    max_concurrency: Optional[int] = Query(None, ge=1),
+    fail_fast: bool = Query(False),
+    suite_id: Optional[str] = Query(None),
+):
+    """Run test suite; output streams on progress key test_suite:<suite_id>"""
     validate_environment(environment)
     
-    return await testing_service.run_test_suite(environment, test_type)
+    return await testing_service.run_test_suite(
+        environment, test_type, max_concurrency=max_concurrency, fail_fast=fail_fast, suite_id=suite_id
+    )
+
+
+@app.post("/api/testing/test-suites/{suite_id}/cancel")
+async def cancel_test_suite(suite_id: str):
+    """Cancel a running test suite"""
+    if not await testing_service.cancel_test_suite(suite_id):
+        raise HTTPException(status_code=404, detail=f"Test suite {suite_id} is not running")
+    return {"suite_id": suite_id, "cancelled": True}
 
 
 @app.get("/api/testing/{environment}/bugs")
 async def list_bugs(
     environment: str,
     status: Optional[str] = Query(None),
-    severity: Optional[str] = Query(None)
+    severity: Optional[str] = Query(None),
+    component: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = Query(None, description="bug_cursor of the last bug on the previous page")
 ):
     """List bug bundles"""
     validate_environment(environment)
     
-    return await testing_service.list_bugs(environment, status, severity)
+    return await testing_service.list_bugs(environment, status, severity, component=component,
+                                           limit=limit, cursor=cursor)
 
 
 @app.post("/api/testing/{environment}/bugs")
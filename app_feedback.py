@@ -11,7 +11,9 @@ Provides:
 """
 
 import asyncio
+import hashlib
 import json
+import threading
 import time
 import uuid
 import os
@@ -29,7 +31,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
 # Import logging and other common utilities
-from src_common.ttrpg_logging import get_logger
+from src_common.ttrpg_logging import get_logger, indexed_log_files, trace_log_lines
+from src_common.feedback_queue import FeedbackJob, FeedbackQueue
 from src_common.cors_security import (
     setup_secure_cors,
     validate_cors_startup,
@@ -100,6 +103,7 @@ class FeedbackResponse(BaseModel):
     action_taken: str
     message: str
     artifact_path: Optional[str] = None
+    status_url: Optional[str] = None
 
 
 class RegressionTestCase(BaseModel):
@@ -112,6 +116,7 @@ class RegressionTestCase(BaseModel):
     created_at: float
     environment: str
     metadata: Dict[str, Any]
+    query_fingerprint: str = ""
 
 
 class BugBundle(BaseModel):
@@ -136,16 +141,28 @@ class TestGateStatus(BaseModel):
     environment: str
 
 
+def query_fingerprint(query: str) -> str:
+    """Fingerprint for deduplicating regression tests; ignores case and whitespace"""
+    normalized = " ".join(query.casefold().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
 # Data Classes for Internal Use
 @dataclass
 class FeedbackProcessor:
     """Process feedback and generate appropriate artifacts"""
     
-    def __init__(self):
+    def __init__(self, log_files: Optional[List[Path]] = None):
         self.artifacts_dir = Path("artifacts")
         self.bugs_dir = self.artifacts_dir / "bugs"
         self.regression_dir = self.artifacts_dir / "regression"
         self.gates_dir = self.artifacts_dir / "gates"
+        # Logs searched for a trace's lines; defaults to the trace-indexed log handlers
+        self.log_files = log_files
+        
+        # Query fingerprint -> regression test file, per regression directory
+        self._fingerprint_index: Dict[str, Dict[str, Path]] = {}
+        self._fingerprint_lock = threading.Lock()
         
         # Ensure directories exist
         self.artifacts_dir.mkdir(exist_ok=True)
@@ -153,25 +170,50 @@ class FeedbackProcessor:
         self.regression_dir.mkdir(exist_ok=True)
         self.gates_dir.mkdir(exist_ok=True)
     
-    async def process_thumbs_up(self, feedback: FeedbackRequest) -> Dict[str, Any]:
-        """Process 👍 feedback by creating regression test (US-601)"""
+    def regression_test_path(self, test_id: str) -> Path:
+        return self.regression_dir / f"test_{test_id}.json"
+    
+    def bug_bundle_path(self, bundle_name: str) -> Path:
+        return self.bugs_dir / bundle_name / "bundle.json"
+    
+    @staticmethod
+    def new_bundle_name(bug_id: str) -> str:
+        """Bug directory name; the id suffix keeps bundles from the same second apart"""
+        return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{bug_id[:8]}"
+    
+    async def process_thumbs_up(self, feedback: FeedbackRequest, test_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process 👍 feedback by creating regression test (US-601)
+        
+        Feedback for a query that already has a regression test (same query
+        fingerprint) is recorded on that test instead of creating another one.
+        """
         try:
-            test_case = RegressionTestCase(
-                test_id=str(uuid.uuid4()),
-                trace_id=feedback.trace_id,
-                query=feedback.query,
-                expected_answer=feedback.answer,
-                expected_chunks=feedback.retrieved_chunks or [],
-                model=safe_metadata_get(feedback.metadata, "model", "unknown"),
-                created_at=time.time(),
-                environment=os.getenv("ENVIRONMENT", "dev"),
-                metadata=self._sanitize_metadata(feedback.metadata)
-            )
-            
-            # Save regression test case
-            test_file = self.regression_dir / f"test_{test_case.test_id}.json"
-            with open(test_file, 'w') as f:
-                json.dump(asdict(test_case), f, indent=2)
+            fingerprint = query_fingerprint(feedback.query)
+            with self._fingerprint_lock:
+                existing = self._record_duplicate(fingerprint, feedback)
+                if existing is not None:
+                    logger.info(f"Recorded trace {feedback.trace_id} on existing regression test {existing['test_id']}")
+                    return existing
+                
+                test_case = RegressionTestCase(
+                    test_id=test_id or str(uuid.uuid4()),
+                    trace_id=feedback.trace_id,
+                    query=feedback.query,
+                    expected_answer=feedback.answer,
+                    expected_chunks=feedback.retrieved_chunks or [],
+                    model=safe_metadata_get(feedback.metadata, "model", "unknown"),
+                    created_at=time.time(),
+                    environment=os.getenv("ENVIRONMENT", "dev"),
+                    metadata=self._sanitize_metadata(feedback.metadata),
+                    query_fingerprint=fingerprint
+                )
+                
+                # Save regression test case
+                test_file = self.regression_test_path(test_case.test_id)
+                with open(test_file, 'w') as f:
+                    json.dump(test_case.dict(), f, indent=2)
+                self._regression_index()[fingerprint] = test_file
             
             # Generate pytest test file
             await self._generate_pytest_test(test_case)
@@ -189,12 +231,18 @@ class FeedbackProcessor:
             logger.error(f"Failed to process thumbs up feedback: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to create regression test: {e}")
     
-    async def process_thumbs_down(self, feedback: FeedbackRequest) -> Dict[str, Any]:
+    async def process_thumbs_down(
+        self,
+        feedback: FeedbackRequest,
+        bug_id: Optional[str] = None,
+        bundle_name: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Process 👎 feedback by creating bug bundle (US-602)"""
         try:
-            job_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+            bug_id = bug_id or str(uuid.uuid4())
+            bundle_name = bundle_name or self.new_bundle_name(bug_id)
             bug_bundle = BugBundle(
-                bug_id=str(uuid.uuid4()),
+                bug_id=bug_id,
                 trace_id=feedback.trace_id,
                 query=feedback.query,
                 actual_answer=feedback.answer,
@@ -207,13 +255,13 @@ class FeedbackProcessor:
             )
             
             # Create bug directory
-            bug_dir = self.bugs_dir / job_id
+            bundle_file = self.bug_bundle_path(bundle_name)
+            bug_dir = bundle_file.parent
             bug_dir.mkdir(exist_ok=True)
             
             # Save bug bundle
-            bundle_file = bug_dir / "bundle.json"
             with open(bundle_file, 'w') as f:
-                json.dump(asdict(bug_bundle), f, indent=2)
+                json.dump(bug_bundle.dict(), f, indent=2)
             
             # Save additional debug info
             await self._save_debug_artifacts(bug_dir, feedback)
@@ -224,7 +272,7 @@ class FeedbackProcessor:
                 "bug_id": bug_bundle.bug_id,
                 "artifact_path": str(bundle_file),
                 "action": "bug_bundle_created",
-                "message": f"Bug bundle created: {job_id}"
+                "message": f"Bug bundle created: {bundle_name}"
             }
             
         except Exception as e:
@@ -299,15 +347,56 @@ if __name__ == "__main__":
         logger.info(f"Generated pytest file: {test_file}")
     
     async def _collect_relevant_logs(self, trace_id: str) -> List[str]:
-        """Collect logs relevant to the trace ID"""
-        # This would collect actual logs from your logging system
-        # For now, return placeholder logs
-        return [
-            f"INFO: Processing query for trace {trace_id}",
-            f"DEBUG: Retrieved chunks for trace {trace_id}",
-            f"INFO: Generated response for trace {trace_id}",
-            f"WARNING: Response quality may be below threshold for trace {trace_id}"
-        ]
+        """Collect logs relevant to the trace ID from the trace offset index"""
+        log_files = self.log_files if self.log_files is not None else indexed_log_files()
+        lines = trace_log_lines(trace_id, log_files) if trace_id else []
+        if not lines:
+            return [f"INFO: No indexed log lines found for trace {trace_id}"]
+        return lines
+    
+    def _regression_index(self) -> Dict[str, Path]:
+        """Fingerprint index for the current regression directory, built on first use"""
+        key = str(self.regression_dir)
+        index = self._fingerprint_index.get(key)
+        if index is None:
+            index = {}
+            for test_file in sorted(self.regression_dir.glob("test_*.json")):
+                try:
+                    data = json.loads(test_file.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    continue
+                fingerprint = data.get("query_fingerprint") or query_fingerprint(data.get("query", ""))
+                index.setdefault(fingerprint, test_file)
+            self._fingerprint_index[key] = index
+        return index
+    
+    def _record_duplicate(self, fingerprint: str, feedback: FeedbackRequest) -> Optional[Dict[str, Any]]:
+        """Append the trace to the regression test for ``fingerprint``, if there is one"""
+        index = self._regression_index()
+        test_file = index.get(fingerprint)
+        if test_file is None:
+            return None
+        try:
+            data = json.loads(test_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            # Removed or unreadable; let the new feedback replace it
+            del index[fingerprint]
+            return None
+        
+        data.setdefault("metadata", {}).setdefault("duplicate_traces", []).append({
+            "trace_id": feedback.trace_id,
+            "created_at": time.time()
+        })
+        tmp_file = test_file.with_name(test_file.name + ".tmp")
+        tmp_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp_file, test_file)
+        
+        return {
+            "test_id": data["test_id"],
+            "artifact_path": str(test_file),
+            "action": "regression_test_deduplicated",
+            "message": f"Query already covered by regression test: {data['test_id']}"
+        }
     
     async def _save_debug_artifacts(self, bug_dir: Path, feedback: FeedbackRequest):
         """Save additional debug artifacts for bug investigation"""
@@ -435,9 +524,117 @@ class TestGateManager:
         return gates
 
 
+# Feedback Worker Pool
+class FeedbackWorkerPool:
+    """
+    Background workers that turn queued feedback into artifacts (US-601, US-602)
+    
+    Each worker thread claims a batch from the durable queue and processes it
+    on its own event loop, so a burst of submissions never holds up the
+    feedback endpoint. Failed jobs are retried up to the queue's attempt limit.
+    """
+    
+    def __init__(
+        self,
+        queue: FeedbackQueue,
+        processor: FeedbackProcessor,
+        workers: int = 2,
+        batch_size: int = 16,
+        poll_interval_s: float = 2.0
+    ):
+        self.queue = queue
+        self.processor = processor
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.poll_interval_s = poll_interval_s
+        self._threads: List[threading.Thread] = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+    
+    def start(self) -> None:
+        with self._lock:
+            if any(thread.is_alive() for thread in self._threads):
+                return
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f"feedback-worker-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+        logger.info(f"Started {self.workers} feedback workers")
+    
+    def notify(self) -> None:
+        """Wake the workers for newly enqueued feedback, starting them if needed"""
+        self.start()
+        self._wake.set()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(timeout)
+    
+    def run_once(self) -> int:
+        """Claim and process one batch in the calling thread; returns the batch size"""
+        jobs = self.queue.claim(self.batch_size)
+        if jobs:
+            asyncio.run(self._process_batch(jobs))
+        return len(jobs)
+    
+    def drain(self) -> int:
+        """Process batches until the queue has no claimable work"""
+        total = 0
+        while True:
+            processed = self.run_once()
+            if not processed:
+                return total
+            total += processed
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                logger.error(f"Feedback worker batch failed: {e}")
+                processed = 0
+            if not processed:
+                self._wake.wait(self.poll_interval_s)
+    
+    async def _process_batch(self, jobs: List[FeedbackJob]) -> None:
+        await asyncio.gather(*(self._process(job) for job in jobs))
+    
+    async def _process(self, job: FeedbackJob) -> None:
+        try:
+            feedback = FeedbackRequest(**job.payload["feedback"])
+            if job.rating == "thumbs_up":
+                result = await self.processor.process_thumbs_up(feedback, test_id=job.job_id)
+            else:
+                result = await self.processor.process_thumbs_down(
+                    feedback, bug_id=job.job_id, bundle_name=job.payload.get("bundle_name")
+                )
+        except Exception as e:
+            error = getattr(e, "detail", None) or str(e)
+            if self.queue.fail(job, str(error)):
+                logger.warning(f"Feedback job {job.job_id} attempt {job.attempts} failed, will retry: {error}")
+            return
+        self.queue.complete(job.job_id, result)
+
+
 # Initialize managers
 feedback_processor = FeedbackProcessor()
 gate_manager = TestGateManager()
+feedback_queue = FeedbackQueue(feedback_processor.artifacts_dir / "feedback_queue.sqlite3")
+feedback_workers = FeedbackWorkerPool(
+    feedback_queue,
+    feedback_processor,
+    workers=int(os.getenv("FEEDBACK_WORKERS", "2")),
+    batch_size=int(os.getenv("FEEDBACK_BATCH_SIZE", "16"))
+)
 
 
 # Rate limiting for feedback (US-604 security requirement)
@@ -499,31 +696,39 @@ async def submit_feedback(
                 detail="Too many feedback submissions. Please wait before submitting again."
             )
         
+        # The feedback id doubles as the bug id, so a bug bundle's path is known
+        # before a worker writes it. A regression test may be deduplicated onto
+        # an existing test, so its path is only known from the job status.
         feedback_id = str(uuid.uuid4())
+        payload: Dict[str, Any] = {"feedback": feedback.dict()}
         
-        # Process based on rating
         if feedback.rating == "thumbs_up":
-            result = await feedback_processor.process_thumbs_up(feedback)
+            artifact_path = None
             action_taken = "regression_test_created"
-            message = f"Thank you! Your positive feedback created regression test: {result['test_id']}"
+            message = "Thank you! Your positive feedback was queued for a regression test; check the status URL for the test file"
             
         elif feedback.rating == "thumbs_down":
-            result = await feedback_processor.process_thumbs_down(feedback)
+            payload["bundle_name"] = feedback_processor.new_bundle_name(feedback_id)
+            artifact_path = feedback_processor.bug_bundle_path(payload["bundle_name"])
             action_taken = "bug_bundle_created"
-            message = f"Thank you! Your feedback created bug report: {result['bug_id']}"
+            message = f"Thank you! Your feedback was queued as bug report: {feedback_id}"
             
         else:
             raise HTTPException(status_code=400, detail="Invalid rating. Must be 'thumbs_up' or 'thumbs_down'")
         
+        feedback_queue.enqueue(feedback_id, feedback.rating, payload)
+        feedback_workers.notify()
+        
         response = FeedbackResponse(
             success=True,
             feedback_id=feedback_id,
             action_taken=action_taken,
             message=message,
-            artifact_path=result.get("artifact_path")
+            artifact_path=str(artifact_path) if artifact_path else None,
+            status_url=f"/api/feedback/jobs/{feedback_id}"
         )
         
-        logger.info(f"Processed feedback {feedback_id}: {action_taken}")
+        logger.info(f"Queued feedback {feedback_id}: {action_taken}")
         return response
         
     except HTTPException:
@@ -545,10 +750,16 @@ async def get_feedback_stats():
         bug_dirs = [d for d in Path("artifacts/bugs").iterdir() if d.is_dir()]
         bug_count = len(bug_dirs)
         
+        # Accepted feedback still waiting for a worker counts as well
+        queued = feedback_queue.open_counts()
+        regression_count += queued.get("thumbs_up", 0)
+        bug_count += queued.get("thumbs_down", 0)
+        
         return {
             "regression_tests": regression_count,
             "bug_bundles": bug_count,
             "total_feedback": regression_count + bug_count,
+            "queue": feedback_queue.status_counts(),
             "last_updated": time.time()
         }
         
@@ -557,6 +768,29 @@ async def get_feedback_stats():
         raise HTTPException(status_code=500, detail="Failed to get feedback statistics")
 
 
+@app.get("/api/feedback/jobs/{feedback_id}")
+async def get_feedback_status(feedback_id: str):
+    """Processing status of queued feedback and, once done, its artifact"""
+    job = feedback_queue.get(feedback_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Feedback {feedback_id} not found")
+    return job
+
+
+async def start_feedback_workers():
+    """Resume feedback left in the queue by a previous run"""
+    if feedback_queue.has_work():
+        feedback_workers.start()
+
+
+async def stop_feedback_workers():
+    feedback_workers.stop()
+
+
+app.router.add_event_handler("startup", start_feedback_workers)
+app.router.add_event_handler("shutdown", stop_feedback_workers)
+
+
 @app.post("/api/gates", response_model=TestGateStatus)
 async def create_test_gate(environment: str = "dev"):
     """Create a new test gate (US-603)"""
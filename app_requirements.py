@@ -527,17 +527,21 @@ async def get_feature_audit_trail(
 
 
 @app.get("/api/audit/integrity")
-async def validate_audit_integrity(current_user = Depends(require_admin)):
+async def validate_audit_integrity(
+    full: bool = Query(False, description="Re-verify the whole hash chain instead of entries since the last checkpoint"),
+    current_user = Depends(require_admin)
+):
     """Validate audit log integrity (Admin only)"""
     try:
         _ensure_managers_isolated()
-        compromised_entries = feature_manager.validate_audit_integrity()
+        compromised_entries = feature_manager.validate_audit_integrity(full=full)
         
         return {
             "integrity_valid": len(compromised_entries) == 0,
             "compromised_entries": compromised_entries,
             "total_compromised": len(compromised_entries),
-            "validation_timestamp": datetime.now().isoformat()
+            "validation_timestamp": datetime.now().isoformat(),
+            "last_full_verification": feature_manager.last_full_verification
         }
     except Exception as e:
         logger.error(f"Error validating audit integrity: {e}")
@@ -47,6 +47,7 @@ from src_common.ttrpg_secrets import _load_env_file
 from src_common.ssl_bypass import configure_ssl_bypass_for_development
 from src_common.preflight_checks import run_preflight_checks, PreflightError
 from src_common.pipeline_guardrails import get_guardrail_policy
+from src_common.job_catalog import get_job_catalog
 
 # Import new 6-pass system
 from src_common.pass_a_toc_parser import process_pass_a
@@ -177,9 +178,11 @@ class Pass6Pipeline:
                 )
             
             try:
-                return self._process_source_sequential(pdf_path, env, resume=resume, force_dict_init=force_dict_init)
+                result = self._process_source_sequential(pdf_path, env, resume=resume, force_dict_init=force_dict_init)
             finally:
                 source_lock.release()
+            self._catalog_job(env, result)
+            return result
                 
         except Exception as e:
             logger.error(f"Lock management error for {pdf_path.name}: {e}")
@@ -447,6 +450,16 @@ class Pass6Pipeline:
             aborted_after_pass=pass_name
         )
     
+    def _catalog_job(self, env: str, result: Source6PassResult) -> None:
+        """Record the finished job in the admin job catalog"""
+        try:
+            get_job_catalog(env).record_job_dir(
+                Path(f"artifacts/ingest/{env}/{result.job_id}"),
+                status="completed" if result.success else "failed",
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update job catalog for {result.job_id}: {e}")
+
     def _job_id_for(self, pdf_path: Path) -> str:
         """Generate consistent job ID for a PDF including file attributes"""
         import hashlib
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Offline recall@k comparison of lexical, vector and hybrid retrieval.
+
+Runs every persona question (Personas/*.md) or a JSONL question set through
+the vector store in each retrieval mode and reports recall@k. Vector and
+hybrid modes need a query embedding provider (OpenAI key); without one,
+vector mode is skipped rather than reported as zero recall.
+
+Usage:
+  python scripts/eval_retrieval_recall.py --env dev
+  python scripts/eval_retrieval_recall.py --env dev --questions questions.jsonl --k 1 5 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Ensure repo root on path
+sys.path.insert(0, str(REPO_ROOT))
+
+from src_common.orchestrator.retrieval_eval import (  # noqa: E402
+    evaluate_recall, load_persona_questions, load_question_file
+)
+from src_common.orchestrator.query_embeddings import get_query_embedder  # noqa: E402
+from src_common.orchestrator.retriever import _retrieve_from_store  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure retrieval recall@k per retrieval mode")
+    parser.add_argument("--env", default=os.getenv("APP_ENV", "dev"))
+    parser.add_argument("--personas-dir", default=str(REPO_ROOT / "Personas"))
+    parser.add_argument("--questions", help="JSONL question set (overrides --personas-dir)")
+    parser.add_argument("--modes", nargs="+", default=["lexical", "vector", "hybrid"])
+    parser.add_argument("--k", nargs="+", type=int, default=[1, 3, 5, 10])
+    parser.add_argument("--threshold", type=float, default=0.3,
+                        help="Expected-answer overlap for a chunk to count as relevant")
+    parser.add_argument("--output", help="Report path (default artifacts/reports/retrieval_recall_<env>.json)")
+    args = parser.parse_args()
+
+    if args.questions:
+        questions = load_question_file(Path(args.questions))
+    else:
+        questions = load_persona_questions(Path(args.personas_dir))
+    if not questions:
+        print(f"No questions found (looked in {args.questions or args.personas_dir})")
+        return 1
+
+    modes = list(args.modes)
+    if not get_query_embedder().available and any(mode in ("vector", "hybrid") for mode in modes):
+        print("WARNING: no query embedding provider is configured (set an OpenAI key and "
+              "QUERY_EMBEDDINGS_ENABLED=true); skipping vector mode, hybrid equals lexical")
+        modes = [mode for mode in modes if mode != "vector"]
+        if not modes:
+            return 1
+
+    report = evaluate_recall(
+        questions,
+        lambda query, mode, top_k: _retrieve_from_store(query, args.env, top_k, mode=mode),
+        modes=modes,
+        ks=args.k,
+        relevance_threshold=args.threshold,
+    )
+
+    print(f"{report['judged']}/{report['questions']} questions had at least one relevant chunk")
+    header = "mode".ljust(10) + "".join(f"recall@{k}".rjust(12) for k in args.k)
+    print(header)
+    for mode, scores in report["modes"].items():
+        cells = "".join(
+            (f"{scores[f'recall@{k}']:.3f}" if scores[f"recall@{k}"] is not None else "-").rjust(12)
+            for k in args.k
+        )
+        print(mode.ljust(10) + cells)
+
+    output = Path(args.output or f"artifacts/reports/retrieval_recall_{args.env}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Report written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Job Catalog Utility
+
+Rebuilds the admin ingestion job catalog from the job manifests on disk and
+lists catalogued jobs. Use ``rebuild`` for recovery after the catalog
+database is lost or drifts from the artifact directories.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src_common.job_catalog import get_job_catalog
+
+
+def rebuild_catalog(env: str) -> None:
+    """Replace the catalog with the manifests found under the artifact directories"""
+    count = get_job_catalog(env).rebuild()
+    print(f"Job catalog rebuilt: {count} jobs indexed for {env}")
+
+
+def list_catalog(env: str, status: str, limit: int) -> None:
+    """Show the newest catalogued jobs"""
+    catalog = get_job_catalog(env)
+    jobs = catalog.list_jobs(status=status, limit=limit)
+    print(f"Job catalog for {env}: {catalog.count()} jobs")
+    print()
+    
+    for i, job in enumerate(jobs, 1):
+        print(f"  {i}. {job['job_id']} - {job['status']} ({job['job_type']}, source: {job['source_file']})")
+    if not jobs:
+        print("No jobs found")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Manage the ingestion job catalog")
+    parser.add_argument("--env", default="dev", choices=["dev", "test", "prod"], help="Environment")
+    
+    subparsers = parser.add_subparsers(dest="command", help="Job catalog commands")
+    
+    # Rebuild command
+    subparsers.add_parser("rebuild", help="Rebuild the catalog from job manifests on disk")
+    
+    # List command
+    list_parser = subparsers.add_parser("list", help="List catalogued jobs, newest first")
+    list_parser.add_argument("--status", help="Only jobs with this status")
+    list_parser.add_argument("--limit", type=int, default=20, help="Maximum jobs to show")
+    
+    args = parser.parse_args(argv)
+    
+    if not args.command:
+        parser.print_help()
+        return 1
+    
+    try:
+        if args.command == "rebuild":
+            rebuild_catalog(args.env)
+        elif args.command == "list":
+            list_catalog(args.env, args.status, args.limit)
+        
+        return 0
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
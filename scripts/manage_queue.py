@@ -39,7 +39,8 @@ def status_queue(env: str) -> None:
     status = queue.get_status()
     items = queue.peek_queue()
     
-    print(f"Queue Status: {status['total_documents']} items (capacity: {status['capacity']})")
+    print(f"Queue Status: {status['total_documents']} items (capacity: {status['capacity']}, "
+          f"claimed: {status['claimed']}, dead letters: {status['dead_letters']})")
     print()
     
     if items:
@@ -63,6 +64,28 @@ def remove_failed(env: str, failed_paths: List[str]) -> None:
     print(f"Queue now contains {result['remaining_count']} items")
 
 
+def dead_letters(env: str, requeue: bool) -> None:
+    """Show documents that exhausted their retry attempts, optionally requeueing them"""
+    project_root = Path(__file__).resolve().parents[1]
+    queue_state_file = project_root / "artifacts" / "ingest" / env / ".." / "queue_state" / "processing_queue.json"
+    
+    queue = ProcessingQueue(state_file=queue_state_file)
+    if requeue:
+        result = queue.requeue_dead_letters()
+        print(f"Requeued {result['requeued_count']} dead-lettered documents")
+        return
+    
+    items = queue.list_dead_letters()
+    if not items:
+        print("No dead-lettered documents")
+        return
+    
+    print("Dead-lettered Documents:")
+    for i, item in enumerate(items, 1):
+        path_name = Path(item['path']).name
+        print(f"  {i}. {item['job_id']} - {path_name} (attempts: {item['attempts']}, error: {item['last_error']})")
+
+
 def main(argv: List[str]) -> int:
     parser = argparse.ArgumentParser(description="Manage processing queue")
     parser.add_argument("--env", default="dev", choices=["dev", "test", "prod"], help="Environment")
@@ -79,6 +102,10 @@ def main(argv: List[str]) -> int:
     remove_parser = subparsers.add_parser("remove-failed", help="Remove failed documents from queue")
     remove_parser.add_argument("paths", nargs="+", help="Paths to remove from queue")
     
+    # Dead letter command
+    dead_parser = subparsers.add_parser("dead-letters", help="Show documents that exhausted their retries")
+    dead_parser.add_argument("--requeue", action="store_true", help="Move dead-lettered documents back to the queue")
+    
     args = parser.parse_args(argv)
     
     if not args.command:
@@ -92,6 +119,8 @@ def main(argv: List[str]) -> int:
             status_queue(args.env)
         elif args.command == "remove-failed":
             remove_failed(args.env, args.paths)
+        elif args.command == "dead-letters":
+            dead_letters(args.env, args.requeue)
         
         return 0
     except Exception as e:
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Testing Store Utility
+
+Imports the per-file admin testing layout (``regression_tests.json``,
+``bug_bundles.json``, ``test_executions.json``) into the indexed testing
+store and shows the overview counters. The admin console imports changed
+files on its own; use ``import`` to migrate ahead of time or after restoring
+the JSON files from a backup, and ``recount`` if the counters drift.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src_common.admin.testing_store import get_testing_store
+
+
+def import_layout(env: str) -> None:
+    """Import every per-file record the store does not already have"""
+    imported = get_testing_store(env).import_legacy()
+    print(f"Imported into the {env} testing store: "
+          + ", ".join(f"{count} {kind}" for kind, count in imported.items()))
+
+
+def show_counts(env: str) -> None:
+    """Print the overview counters"""
+    counts = get_testing_store(env).counts()
+    print(f"Testing store counters for {env}")
+    for kind, fields in counts.items():
+        for field, values in fields.items():
+            summary = ", ".join(f"{value}={count}" for value, count in sorted(values.items())) or "none"
+            print(f"  {kind} by {field}: {summary}")
+
+
+def recount(env: str) -> None:
+    """Recompute the counters from the stored records"""
+    get_testing_store(env).rebuild_counters()
+    print(f"Recounted the {env} testing store")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Manage the admin testing store")
+    parser.add_argument("--env", default="dev", choices=["dev", "test", "prod"], help="Environment")
+
+    subparsers = parser.add_subparsers(dest="command", help="Testing store commands")
+    subparsers.add_parser("import", help="Import the per-file JSON layout")
+    subparsers.add_parser("counts", help="Show the overview counters")
+    subparsers.add_parser("recount", help="Recompute the overview counters")
+
+    args = parser.parse_args(argv)
+
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    try:
+        if args.command == "import":
+            import_layout(args.env)
+        elif args.command == "counts":
+            show_counts(args.env)
+        elif args.command == "recount":
+            recount(args.env)
+
+        return 0
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
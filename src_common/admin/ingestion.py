@@ -10,12 +10,14 @@ import asyncio
 import os
 import hashlib
 from pathlib import Path
-from typing import Dict, List, Any, Optional, AsyncGenerator, Callable
+from typing import Dict, List, Any, Optional, AsyncGenerator, Callable, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
 from ..ttrpg_logging import get_logger
 from .logs import AdminLogService
+from ..progress_bus import FINAL_EVENT, TERMINAL_STATUSES, get_progress_bus
+from ..job_catalog import get_job_catalog, job_record, job_roots
 
 
 logger = get_logger(__name__)
@@ -127,6 +129,8 @@ class AdminIngestionService:
         self._metrics_callbacks: List[Callable[[IngestionMetrics], None]] = []  # FR-034: Metrics broadcasting
         self._job_progress: Dict[str, Dict[str, PhaseProgress]] = {}  # Track phase progress per job
         self.log_service = AdminLogService()
+        self.progress_bus = get_progress_bus()  # Push updates to job progress streams
+        self._log_jobs: Dict[str, str] = {}  # log file path -> job id, for log events
         logger.info("Admin Ingestion Service initialized")
     
     async def get_ingestion_overview(self) -> Dict[str, Any]:
@@ -145,14 +149,11 @@ class AdminIngestionService:
             for env in self.environments:
                 env_jobs = await self.list_jobs(env)
                 
-                # Calculate statistics
-                status_counts = {}
-                for job in env_jobs:
-                    status = job['status']
-                    status_counts[status] = status_counts.get(status, 0) + 1
+                # Statistics come from the catalog's status index
+                status_counts = await asyncio.to_thread(get_job_catalog(env).status_counts)
                 
                 overview["environments"][env] = {
-                    "total_jobs": len(env_jobs),
+                    "total_jobs": sum(status_counts.values()),
                     "status_breakdown": status_counts,
                     "recent_jobs": env_jobs[:5],  # Last 5 jobs
                     "artifacts_path": f"artifacts/{env}"
@@ -164,44 +165,28 @@ class AdminIngestionService:
             logger.error(f"Error getting ingestion overview: {e}")
             raise
     
-    async def list_jobs(self, environment: str, limit: int = 50) -> List[Dict[str, Any]]:
+    async def list_jobs(
+        self,
+        environment: str,
+        limit: int = 50,
+        status: Optional[str] = None,
+        before: Optional[Tuple[float, str]] = None,
+    ) -> List[Dict[str, Any]]:
         """
         List ingestion jobs for a specific environment
         
         Args:
             environment: Environment name (dev/test/prod)
             limit: Maximum number of jobs to return
+            status: Only return jobs with this status
+            before: ``(created_at, job_id)`` of the last job on the previous page
             
         Returns:
             List of job dictionaries sorted by creation time (newest first)
         """
         try:
-            artifacts_path = Path(f"artifacts/{environment}")
-            
-            if not artifacts_path.exists():
-                return []
-            
-            jobs = []
-            
-            # Scan for job directories
-            for job_dir in artifacts_path.iterdir():
-                if job_dir.is_dir() and job_dir.name != "ingest":
-                    job_info = await self._load_job_info(environment, job_dir.name)
-                    if job_info:
-                        jobs.append(asdict(job_info))
-            
-            # Also check ingest subdirectory
-            ingest_path = artifacts_path / "ingest" / environment
-            if ingest_path.exists():
-                for job_dir in ingest_path.iterdir():
-                    if job_dir.is_dir():
-                        job_info = await self._load_job_info(environment, job_dir.name, ingest_path)
-                        if job_info:
-                            jobs.append(asdict(job_info))
-            
-            # Sort by creation time (newest first) and apply limit
-            jobs.sort(key=lambda x: x['created_at'], reverse=True)
-            return jobs[:limit]
+            catalog = await asyncio.to_thread(get_job_catalog, environment)
+            return await asyncio.to_thread(catalog.list_jobs, status, limit, before)
             
         except Exception as e:
             logger.error(f"Error listing jobs for {environment}: {e}")
@@ -362,9 +347,11 @@ class AdminIngestionService:
             manifest_file = job_path / "manifest.json"
             with open(manifest_file, 'w', encoding='utf-8') as f:
                 json.dump(job_manifest, f, indent=2)
+            self._catalog_manifest(manifest_file, job_manifest)
 
             # Create log file path for the job
             log_file_path = logs_dir / log_filename
+            self._log_jobs[str(log_file_path)] = job_id
             log_lines = [
                 f"[{timestamp.isoformat()}] Ingestion job created",
                 f"job_id={job_id} environment={environment} type={job_type}",
@@ -393,6 +380,7 @@ class AdminIngestionService:
                 job_manifest["completed_at"] = datetime.now().timestamp()
                 with open(manifest_file, 'w', encoding='utf-8') as f:
                     json.dump(job_manifest, f, indent=2)
+                self._catalog_manifest(manifest_file, job_manifest)
 
                 raise ValueError(f"Source file validation failed: {validation_results['summary']}")
 
@@ -474,6 +462,7 @@ class AdminIngestionService:
                 manifest["error_message"] = f"Failed to start pipeline: {str(e)}"
                 with open(manifest_file, 'w', encoding='utf-8') as f:
                     json.dump(manifest, f, indent=2)
+                self._catalog_manifest(manifest_file, manifest)
             except Exception as manifest_error:
                 logger.error(f"Failed to update manifest after pipeline start failure: {manifest_error}")
 
@@ -528,9 +517,28 @@ class AdminIngestionService:
             manifest_file.parent.mkdir(parents=True, exist_ok=True)
             with open(manifest_file, 'w', encoding='utf-8') as handle:
                 json.dump(manifest, handle, indent=2)
+            self._catalog_manifest(manifest_file, manifest)
 
         await asyncio.to_thread(_write)
 
+        job_id = manifest.get("job_id") or manifest_file.parent.name
+        status = manifest.get("status")
+        self.progress_bus.publish(job_id, {
+            "type": FINAL_EVENT if status in TERMINAL_STATUSES else "status",
+            "status": status,
+            "current_phase": manifest.get("current_phase"),
+            "completed_phases": manifest.get("completed_phases", 0),
+            "error_message": manifest.get("error_message"),
+        })
+
+    def _catalog_manifest(self, manifest_file: Path, manifest: Dict[str, Any]) -> None:
+        """Keep the job catalog in step with a manifest that was just written"""
+        environment = manifest.get("environment") or manifest_file.parent.parent.name
+        try:
+            get_job_catalog(environment).record_manifest(manifest_file.parent, manifest)
+        except Exception as e:
+            logger.warning(f"Failed to update job catalog for {manifest_file}: {e}")
+
     async def _append_log(self, log_file_path: Path, message: str) -> None:
         def _write() -> None:
             log_file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -539,6 +547,14 @@ class AdminIngestionService:
 
         await asyncio.to_thread(_write)
 
+        job_id = self._log_jobs.get(str(log_file_path), log_file_path.stem)
+        now = time.time()
+        self.progress_bus.publish(job_id, {
+            "type": "logs",
+            "logs": [{"timestamp": now, "level": "INFO", "message": message, "job_id": job_id}],
+            "timestamp": now,
+        })
+
     async def execute_lane_a_pipeline(
         self,
         job_id: str,
@@ -1301,8 +1317,9 @@ class AdminIngestionService:
             logger.debug(f"Unregistered metrics callback: {callback.__name__}")
 
     async def _emit_metrics(self, metrics: IngestionMetrics) -> None:
-        """Emit metrics to all registered callbacks"""
+        """Emit metrics to the progress bus and all registered callbacks"""
         try:
+            self.progress_bus.publish(metrics.job_id, {"type": "metrics", **asdict(metrics)})
             for callback in self._metrics_callbacks:
                 try:
                     # Handle both sync and async callbacks
@@ -1703,6 +1720,7 @@ class AdminIngestionService:
                 if job_path.exists():
                     import shutil
                     shutil.rmtree(job_path)
+            await asyncio.to_thread(get_job_catalog(environment).remove, job_info.job_id)
             
             logger.info(f"Deleted job {job_id} from {environment}")
             return True
@@ -1715,6 +1733,11 @@ class AdminIngestionService:
         """
         Stream real-time progress updates for a job
         
+        Updates are pushed from the progress bus as the job logs, emits
+        metrics or writes its manifest; recent events are replayed first.
+        The manifest is only re-read after ``INGESTION_STREAM_IDLE_S`` without
+        events, to notice jobs finishing in a process that has no bus relay.
+        
         Args:
             environment: Environment name
             job_id: Job identifier
@@ -1722,41 +1745,42 @@ class AdminIngestionService:
         Yields:
             Progress update dictionaries
         """
+        idle_seconds = float(os.getenv("INGESTION_STREAM_IDLE_S", "30"))
+        # Subscribe before reading the manifest so no event falls in between
+        subscription = self.progress_bus.subscribe(job_id)
         try:
-            last_update = 0
+            job_info = await self._find_job(environment, job_id)
+            if not job_info and not self.progress_bus.recent(job_id):
+                return
+            if job_info and job_info.status in TERMINAL_STATUSES:
+                yield {
+                    "type": FINAL_EVENT,
+                    "job_id": job_id,
+                    "status": job_info.status,
+                    "timestamp": time.time()
+                }
+                return
             
             while True:
-                job_info = await self._find_job(environment, job_id)
-                if not job_info:
-                    break
+                event = await subscription.get(timeout=idle_seconds)
+                if event is None:
+                    job_info = await self._find_job(environment, job_id)
+                    if not job_info:
+                        break
+                    if job_info.status in TERMINAL_STATUSES:
+                        yield {
+                            "type": FINAL_EVENT,
+                            "job_id": job_id,
+                            "status": job_info.status,
+                            "timestamp": time.time()
+                        }
+                        break
+                    continue
                 
-                # Check if job completed
-                if job_info.status in ['completed', 'failed']:
-                    yield {
-                        "type": "final_status",
-                        "job_id": job_id,
-                        "status": job_info.status,
-                        "timestamp": time.time()
-                    }
+                yield event
+                if event.get("type") == FINAL_EVENT:
                     break
                 
-                # Get recent logs
-                recent_logs = await self.get_job_logs(environment, job_id, limit=5)
-                new_logs = [log for log in recent_logs if log.get('timestamp', 0) > last_update]
-                
-                if new_logs:
-                    last_update = max(log.get('timestamp', 0) for log in new_logs)
-                    
-                    yield {
-                        "type": "logs",
-                        "job_id": job_id,
-                        "logs": new_logs,
-                        "timestamp": time.time()
-                    }
-                
-                # Wait before next check
-                await asyncio.sleep(2)
-                
         except Exception as e:
             logger.error(f"Error streaming job progress: {e}")
             yield {
@@ -1765,6 +1789,8 @@ class AdminIngestionService:
                 "error": str(e),
                 "timestamp": time.time()
             }
+        finally:
+            subscription.close()
     
     async def _load_job_info(self, environment: str, job_id: str, base_path: Optional[Path] = None) -> Optional[IngestionJob]:
         """Load job information from manifest file"""
@@ -1780,42 +1806,27 @@ class AdminIngestionService:
             
             manifest = json.loads(manifest_file.read_text())
             
-            return IngestionJob(
-                job_id=manifest.get("job_id", job_id),
-                environment=environment,
-                status=manifest.get("status", "unknown"),
-                created_at=manifest.get("created_at", 0),
-                started_at=manifest.get("started_at"),
-                completed_at=manifest.get("completed_at"),
-                source_file=manifest.get("source_file", "unknown"),
-                job_type=manifest.get("job_type", manifest.get("name", "unknown")),
-                lane=manifest.get("lane", "A"),
-                total_phases=len(manifest.get("phases", [])),
-                completed_phases=manifest.get("completed_phases", 0),
-                current_phase=manifest.get("current_phase"),
-                error_message=manifest.get("error_message"),
-                artifacts_path=str(job_path),
-                process_id=manifest.get("process_id")
-            )
+            return IngestionJob(**job_record(environment, job_path, manifest))
             
         except Exception as e:
             logger.warning(f"Could not load job info for {job_id}: {e}")
             return None
     
     async def _find_job(self, environment: str, job_id: str) -> Optional[IngestionJob]:
-        """Find job across different possible locations"""
-        # Try different paths where jobs might be stored
-        paths = [
-            Path(f"artifacts/{environment}"),
-            Path(f"artifacts/ingest/{environment}")
-        ]
+        """Find job by id in the job catalog, falling back to the artifact directories"""
+        catalog = await asyncio.to_thread(get_job_catalog, environment)
+        record = await asyncio.to_thread(catalog.find, job_id)
+        if record:
+            return IngestionJob(**record)
         
-        for base_path in paths:
+        # Jobs written by tools that do not update the catalog
+        for base_path in job_roots(environment):
             if base_path.exists():
                 for job_dir in base_path.iterdir():
                     if job_dir.is_dir() and (job_dir.name == job_id or job_id in job_dir.name):
-                        job_info = await self._load_job_info(environment, job_dir.name, base_path.parent if 'ingest' in str(base_path) else None)
+                        job_info = await self._load_job_info(environment, job_dir.name, base_path)
                         if job_info:
+                            await asyncio.to_thread(catalog.upsert, asdict(job_info))
                             return job_info
         
         return None
@@ -2087,6 +2098,14 @@ class AdminIngestionService:
                     source['health'] = 'yellow'  # Downgrade since missing from vector store
 
         return combined
+    def _remove_from_graph_index(self, environment: str, job_dir: Path) -> None:
+        """Drop a removed job from the merged graph index (best effort)"""
+        try:
+            from ..orchestrator.graph_index import remove_from_merged_graph_index
+            remove_from_merged_graph_index(environment, job_dir)
+        except Exception as e:
+            logger.warning(f"Could not update merged graph index after removing {job_dir}: {e}")
+
     async def remove_source(self, environment: str, source_id: str) -> bool:
         """
         Remove an ingested source and all its artifacts
@@ -2131,6 +2150,7 @@ class AdminIngestionService:
                                     shutil.rmtree(item)
                                     removed = True
                                     logger.info(f"Removed source artifacts: {item}")
+                                    self._remove_from_graph_index(environment, item)
                                     break
                             except Exception as e:
                                 logger.warning(f"Could not parse manifest in {item}: {e}")
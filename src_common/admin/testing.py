@@ -4,22 +4,31 @@ Testing & Bug Management Service - ADM-004
 Environment-scoped regression tests and bug bundle management
 """
 
-import json
+import asyncio
 import time
 import uuid
-import subprocess
 import os
+import signal
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 from datetime import datetime
 
 from ..ttrpg_logging import get_logger
+from ..progress_bus import FINAL_EVENT, get_progress_bus
+from .testing_store import AdminTestingStore, get_testing_store
 
 
 logger = get_logger(__name__)
 
+# Weight of the latest run in a test's average duration (shortest-job-first order)
+DURATION_SMOOTHING = 0.3
+# Largest single output line read from a test process
+OUTPUT_LINE_LIMIT = 1024 * 1024
+
+OutputCallback = Callable[["TestExecution", str, str], Union[None, Awaitable[None]]]
+
 
 class TestStatus(Enum):
     """Test execution status"""
@@ -93,6 +102,7 @@ class RegressionTest:
     run_count: int = 0
     failure_count: int = 0
     tags: List[str] = None
+    avg_duration_seconds: Optional[float] = None
 
     def __post_init__(self):
         if self.tags is None:
@@ -193,6 +203,9 @@ class AdminTestingService:
 
     def __init__(self):
         self.environments = ['dev', 'test', 'prod']
+        self.progress_bus = get_progress_bus()  # Live test output for the UI
+        self._processes: Dict[str, Tuple[str, asyncio.subprocess.Process]] = {}  # execution_id -> (env, process)
+        self._suite_tasks: Dict[str, Tuple[str, List[asyncio.Task]]] = {}  # suite_id -> (env, test tasks)
         logger.info("Admin Testing Service initialized")
 
     def _serialize_test(self, test: RegressionTest) -> Dict[str, Any]:
@@ -221,6 +234,49 @@ class AdminTestingService:
         exec_dict['status'] = execution.status.value  # Convert enum to string
         return exec_dict
 
+    def _deserialize_test(self, test_data: Dict[str, Any]) -> RegressionTest:
+        test_data['status'] = TestStatus(test_data['status'])
+        return RegressionTest(**test_data)
+
+    def _deserialize_bug(self, bug_data: Dict[str, Any]) -> BugBundle:
+        """Convert stored bug dict to dataclass, filling fields added since it was written"""
+        # Handle enum conversions
+        bug_data['severity'] = BugSeverity(bug_data['severity'])
+        bug_data['priority'] = BugPriority(bug_data.get('priority', 'medium'))
+        bug_data['status'] = BugStatus(bug_data.get('status', 'open'))
+        bug_data['component'] = BugComponent(bug_data.get('component', 'other'))
+
+        # Handle activity log conversion
+        if 'activity_log' in bug_data and bug_data['activity_log']:
+            activities = []
+            for activity_data in bug_data['activity_log']:
+                activity = BugActivity(**activity_data)
+                activities.append(activity)
+            bug_data['activity_log'] = activities
+
+        # Ensure default values for new fields
+        defaults = {
+            'related_bugs': [],
+            'labels': [],
+            'last_updated': bug_data.get('created_at', time.time()),
+            'last_updated_by': bug_data.get('created_by', 'unknown')
+        }
+        for key, default_value in defaults.items():
+            if key not in bug_data:
+                bug_data[key] = default_value
+
+        return BugBundle(**bug_data)
+
+    def _store(self, environment: str) -> AdminTestingStore:
+        """Indexed store for an environment, picking up changes to the per-file layout"""
+        store = get_testing_store(environment)
+        store.sync_legacy()
+        return store
+
+    async def _in_store(self, environment: str, operation: Callable[[AdminTestingStore], Any]) -> Any:
+        """Run a store operation, and the legacy sync before it, off the event loop"""
+        return await asyncio.to_thread(lambda: operation(self._store(environment)))
+
     async def get_testing_overview(self) -> Dict[str, Any]:
         """
         Get overview of testing status across all environments
@@ -235,38 +291,22 @@ class AdminTestingService:
             }
 
             for env in self.environments:
-                tests = await self.list_tests(env)
-                bugs = await self.list_bugs(env)
+                counts = await self._in_store(env, lambda store: store.counts())
                 recent_executions = await self.get_recent_executions(env, limit=5)
 
-                # Calculate test statistics
+                # Test and bug statistics from the store's incremental counters
                 test_stats = {
-                    "total": len(tests),
-                    "by_status": {},
-                    "by_type": {}
+                    "total": sum(counts["test"]["status"].values()),
+                    "by_status": counts["test"]["status"],
+                    "by_type": counts["test"]["test_type"]
                 }
 
-                for test in tests:
-                    status = test['status']
-                    test_type = test['test_type']
-
-                    test_stats["by_status"][status] = test_stats["by_status"].get(status, 0) + 1
-                    test_stats["by_type"][test_type] = test_stats["by_type"].get(test_type, 0) + 1
-
-                # Calculate bug statistics
                 bug_stats = {
-                    "total": len(bugs),
-                    "by_severity": {},
-                    "by_status": {}
+                    "total": sum(counts["bug"]["status"].values()),
+                    "by_severity": counts["bug"]["severity"],
+                    "by_status": counts["bug"]["status"]
                 }
 
-                for bug in bugs:
-                    severity = bug['severity']
-                    status = bug['status']
-
-                    bug_stats["by_severity"][severity] = bug_stats["by_severity"].get(severity, 0) + 1
-                    bug_stats["by_status"][status] = bug_stats["by_status"].get(status, 0) + 1
-
                 overview["environments"][env] = {
                     "test_stats": test_stats,
                     "bug_stats": bug_stats,
@@ -291,7 +331,7 @@ class AdminTestingService:
             List of test dictionaries
         """
         try:
-            tests = await self._load_environment_tests(environment)
+            tests = await self._load_environment_tests(environment, test_type=test_type)
 
             if test_type:
                 tests = [test for test in tests if test.test_type == test_type]
@@ -305,13 +345,8 @@ class AdminTestingService:
     async def get_test(self, environment: str, test_id: str) -> Optional[Dict[str, Any]]:
         """Get details for a specific test"""
         try:
-            tests = await self._load_environment_tests(environment)
-
-            for test in tests:
-                if test.test_id == test_id:
-                    return self._serialize_test(test)
-
-            return None
+            test = await self._load_test(environment, test_id)
+            return self._serialize_test(test) if test else None
 
         except Exception as e:
             logger.error(f"Error getting test {test_id} from {environment}: {e}")
@@ -351,13 +386,22 @@ class AdminTestingService:
             logger.error(f"Error creating test in {environment}: {e}")
             raise
 
-    async def run_test(self, environment: str, test_id: str) -> TestExecution:
+    async def run_test(self, environment: str, test_id: str, on_output: Optional[OutputCallback] = None,
+                       progress_key: Optional[str] = None, timeout: Optional[float] = None) -> TestExecution:
         """
-        Execute a regression test
+        Execute a regression test without blocking the event loop
+
+        Output lines are published to the progress bus as they are read, under
+        ``progress_key`` (default ``test:<environment>:<test_id>``), and passed
+        to ``on_output(execution, stream, line)`` when given. Cancelling the
+        call kills the test process and records the execution as an error.
 
         Args:
             environment: Environment name
             test_id: Test identifier
+            on_output: Optional callback for each stdout/stderr line
+            progress_key: Progress bus key for output events
+            timeout: Seconds before the test is killed (default ADMIN_TEST_TIMEOUT_S or 300)
 
         Returns:
             TestExecution object with results
@@ -375,39 +419,64 @@ class AdminTestingService:
                 environment=environment,
                 started_at=time.time()
             )
+            key = progress_key or f"test:{environment}:{test_id}"
+            if timeout is None:
+                timeout = float(os.getenv("ADMIN_TEST_TIMEOUT_S", "300"))
 
             # Execute test command
             try:
                 # Set environment-specific working directory
                 cwd = Path(f"env/{environment}")
 
-                result = subprocess.run(
+                process = await asyncio.create_subprocess_shell(
                     test['command'],
-                    shell=True,
-                    cwd=cwd if cwd.exists() else None,
-                    capture_output=True,
-                    text=True,
-                    timeout=300  # 5 minute timeout
+                    cwd=str(cwd) if cwd.exists() else None,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    limit=OUTPUT_LINE_LIMIT,
+                    start_new_session=os.name == "posix"  # Own process group, so the shell's children die too
                 )
-
-                execution.exit_code = result.returncode
-                execution.stdout = result.stdout
-                execution.stderr = result.stderr
+                self._processes[execution.execution_id] = (environment, process)
+                try:
+                    stdout, stderr, _ = await asyncio.wait_for(asyncio.gather(
+                        self._read_output(execution, key, "stdout", process.stdout, on_output),
+                        self._read_output(execution, key, "stderr", process.stderr, on_output),
+                        process.wait()
+                    ), timeout)
+                finally:
+                    if process.returncode is None:
+                        self._kill_process(process)
+                        await process.wait()
+                    self._processes.pop(execution.execution_id, None)
+
+                execution.exit_code = process.returncode
+                execution.stdout = stdout
+                execution.stderr = stderr
                 execution.completed_at = time.time()
                 execution.duration_seconds = execution.completed_at - execution.started_at
 
                 # Determine test result based on expected behavior
-                if result.returncode == 0:
+                if process.returncode == 0:
                     execution.status = TestStatus.PASSED
                 else:
                     execution.status = TestStatus.FAILED
 
-            except subprocess.TimeoutExpired:
+            except asyncio.TimeoutError:
                 execution.status = TestStatus.ERROR
                 execution.stderr = "Test execution timed out"
                 execution.completed_at = time.time()
                 execution.duration_seconds = execution.completed_at - execution.started_at
 
+            except asyncio.CancelledError:
+                execution.status = TestStatus.ERROR
+                execution.stderr = "Test execution cancelled"
+                execution.completed_at = time.time()
+                execution.duration_seconds = execution.completed_at - execution.started_at
+                await self._save_execution(execution)
+                await self._update_test_stats(environment, test_id, execution.status)
+                self._publish_completion(key, execution, final=progress_key is None)
+                raise
+
             except Exception as e:
                 execution.status = TestStatus.ERROR
                 execution.stderr = str(e)
@@ -417,46 +486,146 @@ class AdminTestingService:
             # Save execution record
             await self._save_execution(execution)
 
-            # Update test statistics
-            await self._update_test_stats(environment, test_id, execution.status)
+            # Update test statistics (timed-out runs say nothing about the usual duration)
+            duration = execution.duration_seconds if execution.exit_code is not None else None
+            await self._update_test_stats(environment, test_id, execution.status, duration)
+            self._publish_completion(key, execution, final=progress_key is None)
 
             logger.info(f"Executed test {test_id} in {environment}: {execution.status.value}")
             return execution
 
+        except asyncio.CancelledError:
+            logger.info(f"Cancelled test {test_id} in {environment}")
+            raise
         except Exception as e:
             logger.error(f"Error running test {test_id} in {environment}: {e}")
             raise
 
-    async def run_test_suite(self, environment: str, test_type: Optional[str] = None) -> Dict[str, Any]:
+    @staticmethod
+    def _kill_process(process: asyncio.subprocess.Process) -> None:
+        """Kill a test process and everything its shell started"""
+        try:
+            if os.name == "posix":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
+    async def _read_output(self, execution: TestExecution, key: str, stream_name: str,
+                           stream: asyncio.StreamReader, on_output: Optional[OutputCallback]) -> str:
+        """Collect a process stream line by line, forwarding each line as it arrives"""
+        lines = []
+        while True:
+            raw = await stream.readline()
+            if not raw:
+                return "".join(lines)
+            line = raw.decode("utf-8", errors="replace")
+            lines.append(line)
+            self.progress_bus.publish(key, {
+                "type": "output",
+                "execution_id": execution.execution_id,
+                "test_id": execution.test_id,
+                "stream": stream_name,
+                "line": line.rstrip("\n")
+            })
+            if on_output is not None:
+                try:
+                    result = on_output(execution, stream_name, line)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    logger.warning(f"Test output callback failed for {execution.test_id}: {e}")
+
+    def _publish_completion(self, key: str, execution: TestExecution, final: bool) -> None:
+        self.progress_bus.publish(key, {
+            "type": FINAL_EVENT if final else "test_complete",
+            "execution_id": execution.execution_id,
+            "test_id": execution.test_id,
+            "status": execution.status.value,
+            "exit_code": execution.exit_code,
+            "duration_seconds": execution.duration_seconds
+        })
+
+    async def run_test_suite(self, environment: str, test_type: Optional[str] = None,
+                             max_concurrency: Optional[int] = None, fail_fast: bool = False,
+                             suite_id: Optional[str] = None,
+                             on_output: Optional[OutputCallback] = None) -> Dict[str, Any]:
         """
-        Run a suite of tests
+        Run a suite of tests concurrently, shortest expected duration first
+
+        Tests start in order of their average historical duration (tests with
+        no history are placed at the mean), at most ``max_concurrency`` at a
+        time. Output streams to the progress bus under ``test_suite:<suite_id>``.
 
         Args:
             environment: Environment name
             test_type: Optional test type filter
+            max_concurrency: Parallel test processes (default ADMIN_TEST_CONCURRENCY or CPU count)
+            fail_fast: Cancel the remaining tests after the first failure
+            suite_id: Identifier to use, so callers can subscribe or cancel before the suite ends
+            on_output: Optional callback for each output line
 
         Returns:
             Test suite results summary
         """
+        suite_id = suite_id or str(uuid.uuid4())
+        progress_key = f"test_suite:{suite_id}"
         try:
-            tests = await self.list_tests(environment, test_type)
+            tests = self._shortest_first(await self.list_tests(environment, test_type))
+            if max_concurrency is None:
+                max_concurrency = int(os.getenv("ADMIN_TEST_CONCURRENCY", "0")) or os.cpu_count() or 1
 
             results = {
-                "suite_id": str(uuid.uuid4()),
+                "suite_id": suite_id,
                 "environment": environment,
                 "test_type": test_type,
                 "started_at": time.time(),
                 "total_tests": len(tests),
-                "executions": []
+                "max_concurrency": max_concurrency,
+                "fail_fast": fail_fast,
+                "executions": [],
+                "cancelled": [],
+                "skipped": []
             }
 
-            # Run each test
-            for test in tests:
+            # The semaphore wakes waiters in FIFO order, so tasks start in schedule order
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+            stopped = asyncio.Event()
+            tasks: List[asyncio.Task] = []
+
+            async def run_one(test: Dict[str, Any]) -> None:
+                test_id = test['test_id']
+                started = False
                 try:
-                    execution = await self.run_test(environment, test['test_id'])
-                    results["executions"].append(self._serialize_execution(execution))
+                    async with semaphore:
+                        if stopped.is_set():
+                            results["skipped"].append(test_id)
+                            return
+                        started = True
+                        execution = await self.run_test(environment, test_id, on_output=on_output,
+                                                        progress_key=progress_key)
+                except asyncio.CancelledError:
+                    results["cancelled" if started else "skipped"].append(test_id)
+                    raise
                 except Exception as e:
-                    logger.error(f"Failed to run test {test['test_id']}: {e}")
+                    logger.error(f"Failed to run test {test_id}: {e}")
+                    return
+                results["executions"].append(self._serialize_execution(execution))
+                if fail_fast and execution.status in (TestStatus.FAILED, TestStatus.ERROR) and not stopped.is_set():
+                    stopped.set()
+                    logger.info(f"Fail-fast: stopping suite {suite_id} after {test_id} {execution.status.value}")
+                    for task in tasks:
+                        if task is not asyncio.current_task():
+                            task.cancel()
+
+            for test in tests:
+                tasks.append(asyncio.create_task(run_one(test)))
+            self._suite_tasks[suite_id] = (environment, tasks)
+            try:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            finally:
+                self._suite_tasks.pop(suite_id, None)
 
             results["completed_at"] = time.time()
             results["duration_seconds"] = results["completed_at"] - results["started_at"]
@@ -469,6 +638,13 @@ class AdminTestingService:
 
             results["summary"] = status_counts
 
+            self.progress_bus.publish(progress_key, {
+                "type": FINAL_EVENT,
+                "status": "completed",
+                "summary": status_counts,
+                "cancelled": len(results["cancelled"]),
+                "skipped": len(results["skipped"])
+            })
             logger.info(f"Completed test suite in {environment}: {status_counts}")
             return results
 
@@ -476,12 +652,30 @@ class AdminTestingService:
             logger.error(f"Error running test suite in {environment}: {e}")
             raise
 
+    def _shortest_first(self, tests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Order tests by average historical duration; unmeasured tests are placed at the mean"""
+        known = [test['avg_duration_seconds'] for test in tests if test.get('avg_duration_seconds') is not None]
+        default = sum(known) / len(known) if known else 0.0
+        return sorted(tests, key=lambda test: (
+            test['avg_duration_seconds'] if test.get('avg_duration_seconds') is not None else default
+        ))
+
+    async def cancel_test_suite(self, suite_id: str) -> bool:
+        """Cancel a running suite; running tests are killed, queued tests are skipped"""
+        entry = self._suite_tasks.get(suite_id)
+        if entry is None:
+            return False
+        for task in entry[1]:
+            task.cancel()
+        logger.info(f"Cancelled test suite {suite_id}")
+        return True
+
     async def list_bugs(self, environment: str, status: Optional[str] = None,
                        severity: Optional[str] = None, priority: Optional[str] = None,
                        component: Optional[str] = None, assigned_to: Optional[str] = None,
                        created_by: Optional[str] = None, tags: Optional[List[str]] = None,
                        search: Optional[str] = None, limit: Optional[int] = None,
-                       offset: Optional[int] = None) -> List[Dict[str, Any]]:
+                       offset: Optional[int] = None, cursor: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List bug bundles for an environment with advanced filtering
 
@@ -497,12 +691,22 @@ class AdminTestingService:
             search: Optional full-text search in title/description
             limit: Optional limit for pagination
             offset: Optional offset for pagination
+            cursor: Optional ``bug_cursor`` of the last bug on the previous page
 
         Returns:
             List of bug dictionaries
         """
         try:
-            bugs = await self._load_environment_bugs(environment)
+            # Indexed filters and paging run in the store; tag and text filters
+            # are applied below, so paging waits for them when they are set
+            paged_in_store = not (tags or search)
+            bugs = await self._load_environment_bugs(
+                environment, status=status, severity=severity, priority=priority,
+                component=component, assigned_to=assigned_to, created_by=created_by,
+                cursor=cursor,
+                limit=limit if paged_in_store else None,
+                offset=offset if paged_in_store else None
+            )
 
             # Apply filters
             if status:
@@ -538,10 +742,11 @@ class AdminTestingService:
             bugs.sort(key=lambda x: (priority_order.get(x.priority.value, 4), -x.created_at))
 
             # Apply pagination
-            if offset:
-                bugs = bugs[offset:]
-            if limit:
-                bugs = bugs[:limit]
+            if not paged_in_store:
+                if offset:
+                    bugs = bugs[offset:]
+                if limit:
+                    bugs = bugs[:limit]
 
             return [self._serialize_bug(bug) for bug in bugs]
 
@@ -617,98 +822,97 @@ class AdminTestingService:
                          updated_by: str = 'admin') -> Optional[BugBundle]:
         """Update an existing bug bundle with activity tracking"""
         try:
-            bugs = await self._load_environment_bugs(environment)
-
-            for bug in bugs:
-                if bug.bug_id == bug_id:
-                    current_time = time.time()
-                    changes = []
-                    activity_details = {}
-
-                    # Track all changes
-                    if 'status' in updates and updates['status'] != bug.status.value:
-                        old_status = bug.status.value
-                        new_status = updates['status']
-                        bug.status = BugStatus(new_status)
-                        changes.append(f"Status: {old_status} → {new_status}")
-                        activity_details['status_change'] = {'from': old_status, 'to': new_status}
-
-                        # Handle status-specific updates
-                        if new_status == 'resolved':
+            bug = await self._load_bug(environment, bug_id)
+
+            if bug is not None:
+                current_time = time.time()
+                changes = []
+                activity_details = {}
+
+                # Track all changes
+                if 'status' in updates and updates['status'] != bug.status.value:
+                    old_status = bug.status.value
+                    new_status = updates['status']
+                    bug.status = BugStatus(new_status)
+                    changes.append(f"Status: {old_status} → {new_status}")
+                    activity_details['status_change'] = {'from': old_status, 'to': new_status}
+
+                    # Handle status-specific updates
+                    if new_status == 'resolved':
+                        bug.resolved_at = current_time
+                        bug.resolution = updates.get('resolution', 'No resolution provided')
+                    elif new_status == 'closed':
+                        bug.closed_at = current_time
+                        if not bug.resolved_at:
                             bug.resolved_at = current_time
-                            bug.resolution = updates.get('resolution', 'No resolution provided')
-                        elif new_status == 'closed':
-                            bug.closed_at = current_time
-                            if not bug.resolved_at:
-                                bug.resolved_at = current_time
-
-                    if 'assigned_to' in updates and updates['assigned_to'] != bug.assigned_to:
-                        old_assignee = bug.assigned_to or 'Unassigned'
-                        new_assignee = updates['assigned_to'] or 'Unassigned'
-                        bug.assigned_to = updates['assigned_to']
-                        changes.append(f"Assignee: {old_assignee} → {new_assignee}")
-                        activity_details['assignee_change'] = {'from': old_assignee, 'to': new_assignee}
-
-                    if 'priority' in updates and updates['priority'] != bug.priority.value:
-                        old_priority = bug.priority.value
-                        new_priority = updates['priority']
-                        bug.priority = BugPriority(new_priority)
-                        changes.append(f"Priority: {old_priority} → {new_priority}")
-                        activity_details['priority_change'] = {'from': old_priority, 'to': new_priority}
-
-                    if 'severity' in updates and updates['severity'] != bug.severity.value:
-                        old_severity = bug.severity.value
-                        new_severity = updates['severity']
-                        bug.severity = BugSeverity(new_severity)
-                        changes.append(f"Severity: {old_severity} → {new_severity}")
-                        activity_details['severity_change'] = {'from': old_severity, 'to': new_severity}
-
-                    if 'component' in updates and updates['component'] != bug.component.value:
-                        old_component = bug.component.value
-                        new_component = updates['component']
-                        bug.component = BugComponent(new_component)
-                        changes.append(f"Component: {old_component} → {new_component}")
-                        activity_details['component_change'] = {'from': old_component, 'to': new_component}
-
-                    # Update other fields
-                    simple_fields = ['title', 'description', 'expected_behavior', 'actual_behavior',
-                                   'resolution', 'estimation_hours', 'actual_hours', 'milestone',
-                                   'version_found', 'version_fixed']
-                    for field in simple_fields:
-                        if field in updates:
-                            old_value = getattr(bug, field, None)
-                            new_value = updates[field]
-                            if old_value != new_value:
-                                setattr(bug, field, new_value)
-                                changes.append(f"{field.replace('_', ' ').title()}: updated")
-                                activity_details[f'{field}_updated'] = True
-
-                    # Update list fields
-                    list_fields = ['tags', 'labels', 'related_bugs', 'steps_to_reproduce']
-                    for field in list_fields:
-                        if field in updates:
-                            setattr(bug, field, updates[field])
+
+                if 'assigned_to' in updates and updates['assigned_to'] != bug.assigned_to:
+                    old_assignee = bug.assigned_to or 'Unassigned'
+                    new_assignee = updates['assigned_to'] or 'Unassigned'
+                    bug.assigned_to = updates['assigned_to']
+                    changes.append(f"Assignee: {old_assignee} → {new_assignee}")
+                    activity_details['assignee_change'] = {'from': old_assignee, 'to': new_assignee}
+
+                if 'priority' in updates and updates['priority'] != bug.priority.value:
+                    old_priority = bug.priority.value
+                    new_priority = updates['priority']
+                    bug.priority = BugPriority(new_priority)
+                    changes.append(f"Priority: {old_priority} → {new_priority}")
+                    activity_details['priority_change'] = {'from': old_priority, 'to': new_priority}
+
+                if 'severity' in updates and updates['severity'] != bug.severity.value:
+                    old_severity = bug.severity.value
+                    new_severity = updates['severity']
+                    bug.severity = BugSeverity(new_severity)
+                    changes.append(f"Severity: {old_severity} → {new_severity}")
+                    activity_details['severity_change'] = {'from': old_severity, 'to': new_severity}
+
+                if 'component' in updates and updates['component'] != bug.component.value:
+                    old_component = bug.component.value
+                    new_component = updates['component']
+                    bug.component = BugComponent(new_component)
+                    changes.append(f"Component: {old_component} → {new_component}")
+                    activity_details['component_change'] = {'from': old_component, 'to': new_component}
+
+                # Update other fields
+                simple_fields = ['title', 'description', 'expected_behavior', 'actual_behavior',
+                               'resolution', 'estimation_hours', 'actual_hours', 'milestone',
+                               'version_found', 'version_fixed']
+                for field in simple_fields:
+                    if field in updates:
+                        old_value = getattr(bug, field, None)
+                        new_value = updates[field]
+                        if old_value != new_value:
+                            setattr(bug, field, new_value)
                             changes.append(f"{field.replace('_', ' ').title()}: updated")
                             activity_details[f'{field}_updated'] = True
 
-                    # Create activity record if there were changes
-                    if changes:
-                        activity = BugActivity(
-                            activity_id=str(uuid.uuid4()),
-                            bug_id=bug_id,
-                            activity_type='updated',
-                            user=updated_by,
-                            timestamp=current_time,
-                            description=f"Updated: {', '.join(changes)}",
-                            details=activity_details
-                        )
-                        bug.activity_log.append(activity)
-                        bug.last_updated = current_time
-                        bug.last_updated_by = updated_by
-
-                    await self._save_bug(bug)
-                    logger.info(f"Updated bug {bug_id} in {environment}: {', '.join(changes)}")
-                    return bug
+                # Update list fields
+                list_fields = ['tags', 'labels', 'related_bugs', 'steps_to_reproduce']
+                for field in list_fields:
+                    if field in updates:
+                        setattr(bug, field, updates[field])
+                        changes.append(f"{field.replace('_', ' ').title()}: updated")
+                        activity_details[f'{field}_updated'] = True
+
+                # Create activity record if there were changes
+                if changes:
+                    activity = BugActivity(
+                        activity_id=str(uuid.uuid4()),
+                        bug_id=bug_id,
+                        activity_type='updated',
+                        user=updated_by,
+                        timestamp=current_time,
+                        description=f"Updated: {', '.join(changes)}",
+                        details=activity_details
+                    )
+                    bug.activity_log.append(activity)
+                    bug.last_updated = current_time
+                    bug.last_updated_by = updated_by
+
+                await self._save_bug(bug)
+                logger.info(f"Updated bug {bug_id} in {environment}: {', '.join(changes)}")
+                return bug
 
             return None
 
@@ -719,132 +923,59 @@ class AdminTestingService:
     async def get_recent_executions(self, environment: str, limit: int = 10) -> List[TestExecution]:
         """Get recent test executions for an environment"""
         try:
-            executions_file = Path(f"env/{environment}/data/test_executions.json")
-
-            if not executions_file.exists():
-                return []
-
-            with open(executions_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
             executions = []
-            for exec_data in data.get('executions', []):
+            for exec_data in await self._in_store(environment, lambda store: store.recent_executions(limit)):
                 # Convert status string to enum
                 exec_data['status'] = TestStatus(exec_data['status'])
                 execution = TestExecution(**exec_data)
                 executions.append(execution)
 
-            # Sort by start time (newest first) and apply limit
-            executions.sort(key=lambda x: x.started_at, reverse=True)
-            return executions[:limit]
+            return executions
 
         except Exception as e:
             logger.warning(f"Could not load executions for {environment}: {e}")
             return []
 
-    async def _load_environment_tests(self, environment: str) -> List[RegressionTest]:
-        """Load tests from environment storage"""
+    async def _load_environment_tests(self, environment: str, test_type: Optional[str] = None,
+                                      status: Optional[str] = None) -> List[RegressionTest]:
+        """Load tests from environment storage, optionally narrowed by the type and status indexes"""
         try:
-            tests_file = Path(f"env/{environment}/data/regression_tests.json")
-
-            if not tests_file.exists():
-                return []
-
-            with open(tests_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            tests = []
-            for test_data in data.get('tests', []):
-                test_data['status'] = TestStatus(test_data['status'])
-                test = RegressionTest(**test_data)
-                tests.append(test)
-
-            return tests
+            tests = await self._in_store(
+                environment, lambda store: store.list_tests(test_type=test_type, status=status))
+            return [self._deserialize_test(test_data) for test_data in tests]
 
         except Exception as e:
             logger.warning(f"Could not load tests for {environment}: {e}")
             return []
 
-    async def _load_environment_bugs(self, environment: str) -> List[BugBundle]:
-        """Load bugs from environment storage with enhanced data handling"""
-        try:
-            bugs_file = Path(f"env/{environment}/data/bug_bundles.json")
-
-            if not bugs_file.exists():
-                return []
-
-            with open(bugs_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            bugs = []
-            for bug_data in data.get('bugs', []):
-                # Handle enum conversions
-                bug_data['severity'] = BugSeverity(bug_data['severity'])
-                bug_data['priority'] = BugPriority(bug_data.get('priority', 'medium'))
-                bug_data['status'] = BugStatus(bug_data.get('status', 'open'))
-                bug_data['component'] = BugComponent(bug_data.get('component', 'other'))
-
-                # Handle activity log conversion
-                if 'activity_log' in bug_data and bug_data['activity_log']:
-                    activities = []
-                    for activity_data in bug_data['activity_log']:
-                        activity = BugActivity(**activity_data)
-                        activities.append(activity)
-                    bug_data['activity_log'] = activities
-
-                # Ensure default values for new fields
-                defaults = {
-                    'related_bugs': [],
-                    'labels': [],
-                    'last_updated': bug_data.get('created_at', time.time()),
-                    'last_updated_by': bug_data.get('created_by', 'unknown')
-                }
-                for key, default_value in defaults.items():
-                    if key not in bug_data:
-                        bug_data[key] = default_value
+    async def _load_test(self, environment: str, test_id: str) -> Optional[RegressionTest]:
+        test_data = await self._in_store(environment, lambda store: store.get_test(test_id))
+        return self._deserialize_test(test_data) if test_data else None
 
-                bug = BugBundle(**bug_data)
-                bugs.append(bug)
+    async def _load_environment_bugs(self, environment: str, **query: Any) -> List[BugBundle]:
+        """
+        Load bugs from environment storage with enhanced data handling
 
-            return bugs
+        ``query`` takes ``AdminTestingStore.query_bugs`` filters and paging;
+        without it every bug is loaded.
+        """
+        try:
+            bugs = await self._in_store(environment, lambda store: store.query_bugs(**query))
+            return [self._deserialize_bug(bug_data) for bug_data in bugs]
 
         except Exception as e:
             logger.warning(f"Could not load bugs for {environment}: {e}")
             return []
 
+    async def _load_bug(self, environment: str, bug_id: str) -> Optional[BugBundle]:
+        bug_data = await self._in_store(environment, lambda store: store.get_bug(bug_id))
+        return self._deserialize_bug(bug_data) if bug_data else None
+
     async def _save_test(self, test: RegressionTest):
         """Save test to environment storage"""
         try:
-            tests = await self._load_environment_tests(test.environment)
-
-            # Update or add test
-            updated = False
-            for i, existing_test in enumerate(tests):
-                if existing_test.test_id == test.test_id:
-                    tests[i] = test
-                    updated = True
-                    break
-
-            if not updated:
-                tests.append(test)
-
-            # Save to file
-            tests_file = Path(f"env/{test.environment}/data/regression_tests.json")
-            tests_file.parent.mkdir(parents=True, exist_ok=True)
-
-            data = {
-                "environment": test.environment,
-                "updated_at": time.time(),
-                "tests": []
-            }
-
-            for t in tests:
-                test_dict = asdict(t)
-                test_dict['status'] = t.status.value
-                data["tests"].append(test_dict)
-
-            with open(tests_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            data = self._serialize_test(test)
+            await self._in_store(test.environment, lambda store: store.upsert_test(data))
 
         except Exception as e:
             logger.error(f"Error saving test {test.test_id}: {e}")
@@ -853,46 +984,8 @@ class AdminTestingService:
     async def _save_bug(self, bug: BugBundle):
         """Save bug to environment storage with enhanced data handling"""
         try:
-            bugs = await self._load_environment_bugs(bug.environment)
-
-            # Update or add bug
-            updated = False
-            for i, existing_bug in enumerate(bugs):
-                if existing_bug.bug_id == bug.bug_id:
-                    bugs[i] = bug
-                    updated = True
-                    break
-
-            if not updated:
-                bugs.append(bug)
-
-            # Save to file
-            bugs_file = Path(f"env/{bug.environment}/data/bug_bundles.json")
-            bugs_file.parent.mkdir(parents=True, exist_ok=True)
-
-            data = {
-                "environment": bug.environment,
-                "updated_at": time.time(),
-                "schema_version": "2.0",  # Track schema version for future migrations
-                "bugs": []
-            }
-
-            for b in bugs:
-                bug_dict = asdict(b)
-                # Convert enums to strings
-                bug_dict['severity'] = b.severity.value
-                bug_dict['priority'] = b.priority.value
-                bug_dict['status'] = b.status.value
-                bug_dict['component'] = b.component.value
-
-                # Convert activity log to dicts
-                if bug_dict.get('activity_log'):
-                    bug_dict['activity_log'] = [asdict(activity) for activity in b.activity_log]
-
-                data["bugs"].append(bug_dict)
-
-            with open(bugs_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            data = self._serialize_bug(bug)
+            await self._in_store(bug.environment, lambda store: store.upsert_bug(data))
 
         except Exception as e:
             logger.error(f"Error saving bug {bug.bug_id}: {e}")
@@ -901,54 +994,35 @@ class AdminTestingService:
     async def _save_execution(self, execution: TestExecution):
         """Save test execution record"""
         try:
-            executions_file = Path(f"env/{execution.environment}/data/test_executions.json")
-            executions_file.parent.mkdir(parents=True, exist_ok=True)
-
-            # Load existing executions
-            executions = []
-            if executions_file.exists():
-                with open(executions_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    executions = data.get('executions', [])
-
-            # Add new execution
-            exec_dict = asdict(execution)
-            exec_dict['status'] = execution.status.value
-            executions.append(exec_dict)
-
-            # Keep only recent executions (limit to 1000)
-            executions = executions[-1000:]
-
-            # Save back
-            data = {
-                "environment": execution.environment,
-                "updated_at": time.time(),
-                "executions": executions
-            }
-
-            with open(executions_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            data = self._serialize_execution(execution)
+            await self._in_store(execution.environment, lambda store: store.add_execution(data))
 
         except Exception as e:
             logger.error(f"Error saving execution {execution.execution_id}: {e}")
 
-    async def _update_test_stats(self, environment: str, test_id: str, result_status: TestStatus):
-        """Update test run statistics"""
+    async def _update_test_stats(self, environment: str, test_id: str, result_status: TestStatus,
+                                 duration_seconds: Optional[float] = None):
+        """Update test run statistics, including the smoothed run duration"""
         try:
-            tests = await self._load_environment_tests(environment)
+            test = await self._load_test(environment, test_id)
 
-            for test in tests:
-                if test.test_id == test_id:
-                    test.run_count += 1
-                    test.last_run = time.time()
-                    test.last_result = result_status.value
-                    test.status = result_status
+            if test is not None:
+                test.run_count += 1
+                test.last_run = time.time()
+                test.last_result = result_status.value
+                test.status = result_status
 
-                    if result_status == TestStatus.FAILED:
-                        test.failure_count += 1
+                if duration_seconds is not None:
+                    if test.avg_duration_seconds is None:
+                        test.avg_duration_seconds = duration_seconds
+                    else:
+                        test.avg_duration_seconds += DURATION_SMOOTHING * (
+                            duration_seconds - test.avg_duration_seconds)
 
-                    await self._save_test(test)
-                    break
+                if result_status == TestStatus.FAILED:
+                    test.failure_count += 1
+
+                await self._save_test(test)
 
         except Exception as e:
             logger.error(f"Error updating test stats for {test_id}: {e}")
@@ -956,13 +1030,8 @@ class AdminTestingService:
     async def get_bug(self, environment: str, bug_id: str) -> Optional[Dict[str, Any]]:
         """Get details for a specific bug"""
         try:
-            bugs = await self._load_environment_bugs(environment)
-
-            for bug in bugs:
-                if bug.bug_id == bug_id:
-                    return self._serialize_bug(bug)
-
-            return None
+            bug = await self._load_bug(environment, bug_id)
+            return self._serialize_bug(bug) if bug else None
 
         except Exception as e:
             logger.error(f"Error getting bug {bug_id} from {environment}: {e}")
@@ -1242,7 +1311,7 @@ class AdminTestingService:
             Analytics data dictionary
         """
         try:
-            bugs = await self._load_environment_bugs(environment)
+            bugs = await self._load_environment_bugs(environment, created_from=date_from, created_to=date_to)
 
             # Apply date filters
             if date_from or date_to:
@@ -1366,9 +1435,14 @@ class AdminTestingService:
     async def stop_all_tests(self, environment: str) -> bool:
         """Stop all running tests in an environment"""
         try:
-            # In a real implementation, this would kill running test processes
-            # For now, we'll just mark running tests as stopped
-            tests = await self._load_environment_tests(environment)
+            for suite_id, (suite_environment, _) in list(self._suite_tasks.items()):
+                if suite_environment == environment:
+                    await self.cancel_test_suite(suite_id)
+            for execution_id, (process_environment, process) in list(self._processes.items()):
+                if process_environment == environment and process.returncode is None:
+                    self._kill_process(process)
+
+            tests = await self._load_environment_tests(environment, status=TestStatus.RUNNING.value)
 
             stopped_count = 0
             for test in tests:
@@ -0,0 +1,460 @@
+# src_common/admin/testing_store.py
+"""
+Testing Store - ADM-004
+
+Indexed storage for regression tests, bug bundles and test executions.
+
+Each environment keeps one SQLite database under ``env/<env>/data``. Bugs are
+indexed on status, severity, component and created_at (each together with
+the console's priority/newest-first order, so filtered pages are index
+scans), executions on started_at, and per-field counters are updated in the
+same transaction as every write, so the testing overview never loads the
+records themselves.
+
+The previous per-file layout (``regression_tests.json``, ``bug_bundles.json``
+and ``test_executions.json``) is imported on first use and again whenever one
+of those files changes, which keeps bugs written there by the log review
+service visible.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..ttrpg_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Console order for bugs: lower rank first, then newest first
+PRIORITY_RANK = {"urgent": 0, "high": 1, "medium": 2, "low": 3}
+UNRANKED_PRIORITY = 4
+# Executions kept per environment
+EXECUTION_RETENTION = 1000
+
+LEGACY_FILES = {
+    "tests": "regression_tests.json",
+    "bugs": "bug_bundles.json",
+    "executions": "test_executions.json",
+}
+
+# Fields with incremental counters, by record kind
+COUNTED_FIELDS = {
+    "test": ("status", "test_type"),
+    "bug": ("status", "severity"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tests (
+    test_id TEXT PRIMARY KEY,
+    test_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tests_type ON tests (test_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_tests_status ON tests (status);
+CREATE TABLE IF NOT EXISTS bugs (
+    bug_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    priority_rank INTEGER NOT NULL,
+    component TEXT NOT NULL,
+    assigned_to TEXT,
+    created_by TEXT,
+    created_at REAL NOT NULL DEFAULT 0,
+    last_updated REAL NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bugs_order ON bugs (priority_rank, created_at DESC, bug_id);
+CREATE INDEX IF NOT EXISTS idx_bugs_status ON bugs (status, priority_rank, created_at DESC, bug_id);
+CREATE INDEX IF NOT EXISTS idx_bugs_severity ON bugs (severity, priority_rank, created_at DESC, bug_id);
+CREATE INDEX IF NOT EXISTS idx_bugs_component ON bugs (component, priority_rank, created_at DESC, bug_id);
+CREATE INDEX IF NOT EXISTS idx_bugs_created ON bugs (created_at);
+CREATE TABLE IF NOT EXISTS executions (
+    execution_id TEXT PRIMARY KEY,
+    test_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_executions_started ON executions (started_at);
+CREATE TABLE IF NOT EXISTS counters (
+    kind TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, field, value)
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def bug_cursor(bug: Dict[str, Any]) -> str:
+    """Opaque cursor for the page after ``bug`` (a serialized bug)"""
+    rank = PRIORITY_RANK.get(bug.get("priority"), UNRANKED_PRIORITY)
+    return f"{rank}:{float(bug.get('created_at') or 0)!r}:{bug['bug_id']}"
+
+
+def _parse_cursor(cursor: str) -> Tuple[int, float, str]:
+    try:
+        rank, created_at, bug_id = cursor.split(":", 2)
+        return int(rank), float(created_at), bug_id
+    except ValueError:
+        raise ValueError(f"Invalid bug cursor: {cursor!r}")
+
+
+class AdminTestingStore:
+    """SQLite store for one environment's tests, bugs and executions"""
+
+    def __init__(self, environment: str, db_path: Optional[Path] = None, data_dir: Optional[Path] = None) -> None:
+        self.environment = environment
+        self.data_dir = Path(data_dir) if data_dir else Path(f"env/{environment}/data")
+        self.db_path = Path(db_path) if db_path else self.data_dir / "testing.sqlite3"
+        self._init_db()
+
+    # ------------------------------------------------------------------
+    # Regression tests
+    # ------------------------------------------------------------------
+    def upsert_test(self, test: Dict[str, Any]) -> None:
+        """Insert or replace a serialized test"""
+        with self._transaction() as conn:
+            self._upsert(conn, "test", self._test_row(test))
+
+    def get_test(self, test_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM tests WHERE test_id = ?", (test_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_tests(self, test_type: Optional[str] = None, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Serialized tests in creation order"""
+        clauses, params = [], []
+        if test_type:
+            clauses.append("test_type = ?")
+            params.append(test_type)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT data FROM tests {where} ORDER BY created_at, rowid", params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Bugs
+    # ------------------------------------------------------------------
+    def upsert_bug(self, bug: Dict[str, Any]) -> None:
+        """Insert or replace a serialized bug"""
+        with self._transaction() as conn:
+            self._upsert(conn, "bug", self._bug_row(bug))
+
+    def get_bug(self, bug_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM bugs WHERE bug_id = ?", (bug_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query_bugs(
+        self,
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        priority: Optional[str] = None,
+        component: Optional[str] = None,
+        assigned_to: Optional[str] = None,
+        created_by: Optional[str] = None,
+        created_from: Optional[float] = None,
+        created_to: Optional[float] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Serialized bugs, highest priority then newest first
+
+        Args:
+            cursor: ``bug_cursor`` of the last bug on the previous page
+            limit: Page size (all matches when omitted)
+            offset: Rows to skip, for callers still paging by offset
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (("status", status), ("severity", severity), ("priority", priority),
+                              ("component", component), ("assigned_to", assigned_to),
+                              ("created_by", created_by)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if created_from:
+            clauses.append("created_at >= ?")
+            params.append(created_from)
+        if created_to:
+            clauses.append("created_at <= ?")
+            params.append(created_to)
+        if cursor:
+            rank, created_at, bug_id = _parse_cursor(cursor)
+            clauses.append(
+                "(priority_rank > ? OR (priority_rank = ? AND "
+                "(created_at < ? OR (created_at = ? AND bug_id > ?))))"
+            )
+            params.extend([rank, rank, created_at, created_at, bug_id])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        page = ""
+        if limit or offset:
+            page = "LIMIT ? OFFSET ?"
+            params.extend([limit if limit else -1, offset or 0])
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT data FROM bugs {where} ORDER BY priority_rank, created_at DESC, bug_id {page}", params
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Executions
+    # ------------------------------------------------------------------
+    def add_execution(self, execution: Dict[str, Any]) -> None:
+        """Record a serialized execution, keeping the newest ``EXECUTION_RETENTION``"""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO executions (execution_id, test_id, status, started_at, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                self._execution_values(execution),
+            )
+            conn.execute(
+                "DELETE FROM executions WHERE execution_id IN ("
+                "SELECT execution_id FROM executions ORDER BY started_at DESC LIMIT -1 OFFSET ?)",
+                (EXECUTION_RETENTION,),
+            )
+
+    def recent_executions(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Serialized executions, newest first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT data FROM executions ORDER BY started_at DESC LIMIT ?", (max(0, int(limit)),)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Overview counters
+    # ------------------------------------------------------------------
+    def counts(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """``{kind: {field: {value: count}}}`` from the incremental counters"""
+        result: Dict[str, Dict[str, Dict[str, int]]] = {
+            kind: {field: {} for field in fields} for kind, fields in COUNTED_FIELDS.items()
+        }
+        with self._connect() as conn:
+            rows = conn.execute("SELECT kind, field, value, count FROM counters WHERE count > 0").fetchall()
+        for kind, field, value, count in rows:
+            result.setdefault(kind, {}).setdefault(field, {})[value] = count
+        return result
+
+    def rebuild_counters(self) -> None:
+        """Recompute every counter from the stored records"""
+        with self._transaction() as conn:
+            self._rebuild_counters(conn)
+
+    # ------------------------------------------------------------------
+    # Per-file layout import
+    # ------------------------------------------------------------------
+    def sync_legacy(self) -> bool:
+        """Import the per-file layout if any of its files changed since the last import"""
+        signatures = self._legacy_signatures()
+        changed = {
+            kind: signature for kind, signature in signatures.items()
+            if signature != self._get_meta(f"legacy:{kind}")
+        }
+        if not changed:
+            return False
+        self.import_legacy(kinds=list(changed))
+        return True
+
+    def import_legacy(self, kinds: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Import records from the per-file JSON layout
+
+        Tests and executions already in the store are kept; a bug replaces the
+        stored one only when its ``last_updated`` is newer. Returns the number
+        of records imported per kind.
+        """
+        kinds = kinds or list(LEGACY_FILES)
+        signatures = self._legacy_signatures()
+        imported = {kind: 0 for kind in kinds}
+        loaded = {kind: self._read_legacy(kind) for kind in kinds}
+
+        with self._transaction() as conn:
+            for test in loaded.get("tests", []):
+                row = self._test_row(test)
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO tests (test_id, test_type, status, created_at, data) VALUES (?, ?, ?, ?, ?)",
+                    (row["test_id"], row["test_type"], row["status"], row["created_at"], row["data"]),
+                )
+                imported["tests"] += cursor.rowcount
+            for bug in loaded.get("bugs", []):
+                row = self._bug_row(bug)
+                stored = conn.execute(
+                    "SELECT last_updated FROM bugs WHERE bug_id = ?", (row["bug_id"],)
+                ).fetchone()
+                if stored is None or row["last_updated"] > stored[0]:
+                    conn.execute(self._insert_sql("bugs", row), tuple(row.values()))
+                    imported["bugs"] += 1
+            for execution in loaded.get("executions", []):
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO executions (execution_id, test_id, status, started_at, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    self._execution_values(execution),
+                )
+                imported["executions"] += cursor.rowcount
+            self._rebuild_counters(conn)
+            for kind in kinds:
+                if kind in signatures:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+                        (f"legacy:{kind}", signatures[kind]),
+                    )
+
+        if any(imported.values()):
+            logger.info(f"Imported {imported} from the {self.environment} per-file testing layout")
+        return imported
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _test_row(test: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "test_id": test["test_id"],
+            "test_type": test.get("test_type") or "unknown",
+            "status": test.get("status") or "pending",
+            "created_at": test.get("created_at") or 0,
+            "data": json.dumps(test),
+        }
+
+    @staticmethod
+    def _bug_row(bug: Dict[str, Any]) -> Dict[str, Any]:
+        priority = bug.get("priority") or "medium"
+        created_at = bug.get("created_at") or 0
+        return {
+            "bug_id": bug["bug_id"],
+            "status": bug.get("status") or "open",
+            "severity": bug.get("severity") or "medium",
+            "priority": priority,
+            "priority_rank": PRIORITY_RANK.get(priority, UNRANKED_PRIORITY),
+            "component": bug.get("component") or "other",
+            "assigned_to": bug.get("assigned_to"),
+            "created_by": bug.get("created_by"),
+            "created_at": created_at,
+            "last_updated": bug.get("last_updated") or created_at,
+            "data": json.dumps(bug),
+        }
+
+    @staticmethod
+    def _execution_values(execution: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (execution["execution_id"], execution.get("test_id") or "", execution.get("status") or "running",
+                execution.get("started_at") or 0, json.dumps(execution))
+
+    @staticmethod
+    def _insert_sql(table: str, row: Dict[str, Any]) -> str:
+        return f"INSERT OR REPLACE INTO {table} ({', '.join(row)}) VALUES ({', '.join('?' for _ in row)})"
+
+    def _upsert(self, conn: sqlite3.Connection, kind: str, row: Dict[str, Any]) -> None:
+        """Replace a test or bug row and move its counters from the old values to the new"""
+        table, key = ("tests", "test_id") if kind == "test" else ("bugs", "bug_id")
+        fields = COUNTED_FIELDS[kind]
+        old = conn.execute(f"SELECT {', '.join(fields)} FROM {table} WHERE {key} = ?", (row[key],)).fetchone()
+        for field in fields:
+            if old is not None:
+                self._bump(conn, kind, field, old[field], -1)
+            self._bump(conn, kind, field, row[field], 1)
+        conn.execute(self._insert_sql(table, row), tuple(row.values()))
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, kind: str, field: str, value: str, delta: int) -> None:
+        conn.execute(
+            "INSERT INTO counters (kind, field, value, count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (kind, field, value) DO UPDATE SET count = count + excluded.count",
+            (kind, field, value, delta),
+        )
+
+    @staticmethod
+    def _rebuild_counters(conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM counters")
+        for kind, fields in COUNTED_FIELDS.items():
+            table = "tests" if kind == "test" else "bugs"
+            for field in fields:
+                conn.execute(
+                    f"INSERT INTO counters (kind, field, value, count) "
+                    f"SELECT ?, ?, {field}, COUNT(*) FROM {table} GROUP BY {field}",
+                    (kind, field),
+                )
+
+    def _legacy_signatures(self) -> Dict[str, str]:
+        signatures = {}
+        for kind, filename in LEGACY_FILES.items():
+            path = self.data_dir / filename
+            if path.exists():
+                stat = path.stat()
+                signatures[kind] = f"{stat.st_mtime_ns}:{stat.st_size}"
+        return signatures
+
+    def _read_legacy(self, kind: str) -> List[Dict[str, Any]]:
+        path = self.data_dir / LEGACY_FILES[kind]
+        if not path.exists():
+            return []
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable {path}: {e}")
+            return []
+        return [record for record in data.get(kind, []) if isinstance(record, dict)]
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+
+_stores: Dict[str, AdminTestingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_testing_store(environment: str) -> AdminTestingStore:
+    """Store for ``environment``, one per resolved database path"""
+    key = str(Path(f"env/{environment}/data/testing.sqlite3").resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = AdminTestingStore(environment)
+        return store
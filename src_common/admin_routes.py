@@ -38,6 +38,7 @@ from .personas.metrics import PersonaMetricsTracker
 from .admin.wireframe_editor import WireframeEditorService
 from .admin.template_generator import TemplateGenerator
 from .admin.testing import BugSeverity, BugPriority, BugStatus, BugComponent
+from .admin.testing_store import bug_cursor
 from .container_scheduler_service import get_scheduler_service
 from .vector_store.factory import make_vector_store
 
@@ -1248,6 +1249,9 @@ async def admin_wireframe_editor(request: Request, project: Optional[str] = Quer
 class TestRunRequest(BaseModel):
     environment: str
     test_type: Optional[str] = None
+    max_concurrency: Optional[int] = None
+    fail_fast: bool = False
+    suite_id: Optional[str] = None
 
 class TestCreateRequest(BaseModel):
     name: str
@@ -1399,12 +1403,39 @@ async def run_single_test(test_id: str, request: TestRunRequest):
 async def run_test_suite(request: TestRunRequest):
     """Run a test suite"""
     try:
-        result = await testing_service.run_test_suite(request.environment, request.test_type)
+        result = await testing_service.run_test_suite(
+            request.environment, request.test_type, max_concurrency=request.max_concurrency,
+            fail_fast=request.fail_fast, suite_id=request.suite_id
+        )
         return JSONResponse(content=result)
     except Exception as e:
         logger.error(f"Error running test suite: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@admin_router.post("/api/admin/testing/suites/{suite_id}/cancel")
+async def cancel_test_suite(suite_id: str):
+    """Cancel a running test suite"""
+    if not await testing_service.cancel_test_suite(suite_id):
+        raise HTTPException(status_code=404, detail=f"Test suite {suite_id} is not running")
+    return JSONResponse(content={"suite_id": suite_id, "cancelled": True})
+
+@admin_router.websocket("/ws/admin/testing/suites/{suite_id}")
+async def test_suite_output_websocket(websocket: WebSocket, suite_id: str):
+    """Stream a test suite's output lines and results as they are produced"""
+    await websocket.accept()
+    subscription = testing_service.progress_bus.subscribe(f"test_suite:{suite_id}")
+    try:
+        async for event in subscription:
+            await websocket.send_json(event)
+            if event.get("type") == "final_status":
+                break
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Test suite output stream error for {suite_id}: {e}")
+    finally:
+        subscription.close()
+
 @admin_router.post("/api/admin/testing/run-all")
 async def run_all_tests(request: TestRunRequest):
     """Run all test suites"""
@@ -1453,10 +1484,12 @@ async def list_bugs(
     created_by: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     limit: Optional[int] = Query(100),
-    offset: Optional[int] = Query(0)
+    offset: Optional[int] = Query(0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (single environment)")
 ):
     """List bugs with comprehensive filtering support"""
     try:
+        next_cursor = None
         if environment and environment != 'all':
             bugs = await testing_service.list_bugs(
                 environment=environment,
@@ -1468,8 +1501,11 @@ async def list_bugs(
                 created_by=created_by,
                 search=search,
                 limit=limit,
-                offset=offset
+                offset=offset,
+                cursor=cursor
             )
+            if limit and len(bugs) == limit:
+                next_cursor = bug_cursor(bugs[-1])
         else:
             # Aggregate bugs from all environments
             all_bugs = []
@@ -1494,7 +1530,8 @@ async def list_bugs(
             "bugs": bugs,
             "total": len(bugs),
             "offset": offset,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         })
     except Exception as e:
         logger.error(f"Error listing bugs: {e}")
@@ -2125,26 +2162,33 @@ metrics_ws_manager = JobMetricsWebSocketManager()
 
 @admin_router.websocket("/api/admin/ingestion/{job_id}/metrics")
 async def websocket_job_metrics(websocket: WebSocket, job_id: str):
-    """WebSocket endpoint for real-time job metrics"""
+    """WebSocket endpoint for real-time job metrics, pushed from the progress bus"""
     import uuid
     websocket_id = str(uuid.uuid4())
+    subscription = None
+    forwarder = None
 
     try:
         await metrics_ws_manager.connect(websocket, job_id, websocket_id)
 
-        # Register metrics callback for this job
-        async def metrics_callback(metrics):
-            if metrics.job_id == job_id:
-                await metrics_ws_manager.broadcast_metrics(job_id, asdict(metrics))
+        progress_bus = ingestion_service.progress_bus
+        replay = [event for event in progress_bus.recent(job_id) if event.get("type") == "metrics"]
+        subscription = progress_bus.subscribe(job_id)
 
-        ingestion_service.register_metrics_callback(metrics_callback)
+        # Recent metrics are replayed; otherwise send the current job status
+        if not replay:
+            try:
+                initial_metrics = await ingestion_service.get_job_metrics(job_id)
+                await websocket.send_json(initial_metrics)
+            except Exception as e:
+                logger.warning(f"Failed to send initial metrics for job {job_id}: {e}")
 
-        # Send initial job status if available
-        try:
-            initial_metrics = await ingestion_service.get_job_metrics(job_id)
-            await websocket.send_json(initial_metrics)
-        except Exception as e:
-            logger.warning(f"Failed to send initial metrics for job {job_id}: {e}")
+        async def forward_metrics():
+            async for event in subscription:
+                if event.get("type") == "metrics":
+                    await websocket.send_json({key: value for key, value in event.items() if key != "type"})
+
+        forwarder = asyncio.create_task(forward_metrics())
 
         # Keep connection alive and listen for client messages
         while True:
@@ -2169,10 +2213,12 @@ async def websocket_job_metrics(websocket: WebSocket, job_id: str):
     finally:
         # Clean up
         metrics_ws_manager.disconnect(job_id, websocket_id)
-        try:
-            ingestion_service.unregister_metrics_callback(metrics_callback)
-        except:
-            pass
+        if subscription is not None:
+            subscription.close()
+        if forwarder is not None:
+            forwarder.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await forwarder
 
 @admin_router.get("/api/admin/ingestion/{job_id}/metrics")
 async def get_job_metrics_endpoint(job_id: str):
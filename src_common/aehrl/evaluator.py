@@ -16,6 +16,7 @@ from .models import (
     HallucinationSeverity, SupportLevel, AEHRLMetrics
 )
 from .fact_extractor import FactExtractor
+from ..spans import span
 from ..ttrpg_logging import get_logger
 
 logger = get_logger(__name__)
@@ -52,6 +53,7 @@ class AEHRLEvaluator:
 
         logger.info(f"AEHRL Evaluator initialized for {environment} environment")
 
+    @span("aehrl.evaluate")
     def evaluate_query_response(
         self,
         query_id: str,
@@ -80,10 +82,11 @@ class AEHRLEvaluator:
             logger.info(f"Starting query-time evaluation for query {query_id}")
 
             # Extract factual claims from response
-            claims = self.fact_extractor.extract_facts(
-                text=model_response,
-                context=f"Query response for {query_id}"
-            )
+            with span("aehrl.extract_facts"):
+                claims = self.fact_extractor.extract_facts(
+                    text=model_response,
+                    context=f"Query response for {query_id}"
+                )
 
             logger.debug(f"Extracted {len(claims)} fact claims from response")
 
@@ -92,12 +95,13 @@ class AEHRLEvaluator:
             total_support_score = 0.0
 
             for claim in claims:
-                evidence = self._gather_evidence(
-                    claim=claim,
-                    retrieved_chunks=retrieved_chunks,
-                    graph_context=graph_context,
-                    dictionary_entries=dictionary_entries
-                )
+                with span("aehrl.gather_evidence"):
+                    evidence = self._gather_evidence(
+                        claim=claim,
+                        retrieved_chunks=retrieved_chunks,
+                        graph_context=graph_context,
+                        dictionary_entries=dictionary_entries
+                    )
 
                 # Evaluate claim support
                 support_score = self._calculate_support_score(evidence)
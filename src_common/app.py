@@ -21,9 +21,9 @@ try:
 except ImportError:  # pragma: no cover - allows import when src_common is on sys.path
     from ttrpg_logging import setup_logging, get_logger, LogContext
 try:
-    from .orchestrator.service import rag_router
+    from .orchestrator.service import rag_router, warm_rag_services
 except ImportError:  # pragma: no cover
-    from orchestrator.service import rag_router
+    from orchestrator.service import rag_router, warm_rag_services
 try:
     from .mock_ingest import run_mock_job
 except ImportError:  # pragma: no cover
@@ -93,11 +93,20 @@ class TTRPGApp:
                 
             return response
 
+    def _warm_rag_services(self):
+        """Build shared RAG components once so the first request does not pay for them."""
+        try:
+            warm_rag_services()
+        except Exception as e:
+            logger.warning(f"RAG service warm-up failed: {e}")
+
     def setup_routes(self):
         """Configure application routes."""
 
         # Phase 2: RAG endpoints
         self.app.include_router(rag_router, prefix="/rag")
+        if os.getenv("RAG_WARM_SERVICES", "true").lower() == "true":
+            self.app.router.add_event_handler("startup", self._warm_rag_services)
 
         # Phase 3: Workflow endpoints
         try:
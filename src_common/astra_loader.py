@@ -191,18 +191,20 @@ class AstraLoader:
                     }
                 )
 
+        started = time.perf_counter()
         try:
             inserted = self.store.upsert_documents(documents)
             failed = len(documents) - inserted
+            loading_time_ms = int((time.perf_counter() - started) * 1000)
             if failed:
                 logger.warning("Partial upsert detected: %s/%s failed", failed, len(documents))
             else:
-                logger.info("Upserted %s documents into %s", inserted, self.collection_name)
+                logger.info("Upserted %s documents into %s in %s ms", inserted, self.collection_name, loading_time_ms)
             return LoadResult(
                 collection_name=self.collection_name,
                 chunks_loaded=inserted,
                 chunks_failed=max(0, failed),
-                loading_time_ms=0,
+                loading_time_ms=loading_time_ms,
                 success=failed == 0,
                 error_message=None if failed == 0 else "partial upsert",
             )
@@ -0,0 +1,195 @@
+"""
+Feedback Work Queue
+
+Durable queue of submitted 👍/👎 feedback waiting to be turned into regression
+tests and bug bundles.
+
+``/api/feedback`` only inserts a row here and acknowledges; the feedback
+worker pool claims pending rows in batches and writes the artifacts. Rows are
+kept in SQLite (``artifacts/feedback_queue.sqlite3``) so a restart resumes
+whatever was still pending, and a claim is a lease: a row whose worker died
+mid-batch is handed out again once ``lease_s`` has passed.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .ttrpg_logging import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback_jobs (
+    job_id TEXT PRIMARY KEY,
+    rating TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    claimed_at REAL,
+    completed_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_jobs_status ON feedback_jobs (status, enqueued_at);
+"""
+
+# Statuses of a job that has been accepted but has no artifacts yet
+OPEN_STATUSES = ("pending", "processing")
+
+
+@dataclass
+class FeedbackJob:
+    """One claimed queue row"""
+    job_id: str
+    rating: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class FeedbackQueue:
+    """SQLite-backed feedback work queue"""
+
+    def __init__(self, db_path: Optional[Path] = None, lease_s: float = 300.0, max_attempts: int = 3) -> None:
+        self.db_path = Path(db_path) if db_path else Path("artifacts/feedback_queue.sqlite3")
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        self._init_db()
+
+    def enqueue(self, job_id: str, rating: str, payload: Dict[str, Any]) -> None:
+        """Accept a feedback submission for background processing"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO feedback_jobs (job_id, rating, payload, enqueued_at) VALUES (?, ?, ?, ?)",
+                (job_id, rating, json.dumps(payload), time.time()),
+            )
+
+    def claim(self, limit: int) -> List[FeedbackJob]:
+        """
+        Lease up to ``limit`` jobs, oldest first
+
+        Pending jobs and jobs whose lease expired are eligible; each claim
+        counts as an attempt.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT job_id, rating, payload, attempts FROM feedback_jobs "
+                "WHERE status = 'pending' OR (status = 'processing' AND claimed_at < ?) "
+                "ORDER BY enqueued_at, job_id LIMIT ?",
+                (now - self.lease_s, max(0, int(limit))),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE feedback_jobs SET status = 'processing', claimed_at = ?, attempts = attempts + 1 "
+                "WHERE job_id = ?",
+                [(now, row["job_id"]) for row in rows],
+            )
+        return [
+            FeedbackJob(row["job_id"], row["rating"], json.loads(row["payload"]), row["attempts"] + 1)
+            for row in rows
+        ]
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE feedback_jobs SET status = 'done', completed_at = ?, result = ?, error = NULL "
+                "WHERE job_id = ?",
+                (time.time(), json.dumps(result), job_id),
+            )
+
+    def fail(self, job: FeedbackJob, error: str) -> bool:
+        """Record a failed attempt; returns True if the job will be retried"""
+        retry = job.attempts < self.max_attempts
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE feedback_jobs SET status = ?, claimed_at = NULL, completed_at = ?, error = ? "
+                "WHERE job_id = ?",
+                ("pending" if retry else "failed", None if retry else time.time(), error, job.job_id),
+            )
+        if not retry:
+            logger.error(f"Feedback job {job.job_id} failed after {job.attempts} attempts: {error}")
+        return retry
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT job_id, rating, status, attempts, enqueued_at, completed_at, result, error "
+                "FROM feedback_jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def has_work(self) -> bool:
+        """True if a job is pending or holds an expired lease"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM feedback_jobs "
+                "WHERE status = 'pending' OR (status = 'processing' AND claimed_at < ?) LIMIT 1",
+                (time.time() - self.lease_s,),
+            ).fetchone()
+        return row is not None
+
+    def open_counts(self) -> Dict[str, int]:
+        """Accepted jobs without artifacts yet, by rating"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT rating, COUNT(*) FROM feedback_jobs WHERE status IN "
+                f"({', '.join('?' for _ in OPEN_STATUSES)}) GROUP BY rating",
+                OPEN_STATUSES,
+            ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def status_counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM feedback_jobs GROUP BY status").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def purge_done(self, older_than_s: float) -> int:
+        """Delete completed jobs finished more than ``older_than_s`` ago"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM feedback_jobs WHERE status = 'done' AND completed_at < ?",
+                (time.time() - older_than_s,),
+            )
+        return cursor.rowcount
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
@@ -0,0 +1,292 @@
+# src_common/graph_artifact.py
+"""
+Compact columnar graph artifact for Pass E
+
+Pass E's ``graph_snapshot.json`` is a full, pretty-printed object graph that
+has to be parsed completely before any lookup. This module stores the same
+graph column-wise so readers can load it cheaply:
+
+- ``graph_snapshot.bin``: string tables (node/edge IDs, titles, cross-reference
+  columns, aliases) plus packed integer arrays for node types, parents,
+  children (CSR offsets/indices) and edges as node-index pairs.
+- ``graph_content.bin``: node content and metadata, concatenated UTF-8. It is
+  only read the first time a node's content or metadata is requested.
+
+The JSON snapshot remains the debugging/export format. String tables are
+encoded with MessagePack when available, otherwise compact JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from array import array
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional
+
+try:  # Optional dependency: faster, smaller string tables
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover - exercised when msgpack is not installed
+    msgpack = None
+
+from .ttrpg_logging import get_logger
+
+logger = get_logger(__name__)
+
+GRAPH_ARTIFACT_FILENAME = "graph_snapshot.bin"
+GRAPH_CONTENT_FILENAME = "graph_content.bin"
+
+_MAGIC = b"TTGRAPH1"
+ARTIFACT_VERSION = 2  # v2: edge weights stored as float64
+_CODEC_JSON = b"J"
+_CODEC_MSGPACK = b"M"
+
+# Packed columns, in file order: (name, array typecode)
+_COLUMNS = (
+    ("node_type", "i"),
+    ("parent", "i"),
+    ("children_offsets", "i"),
+    ("children_index", "i"),
+    ("edge_source", "i"),
+    ("edge_target", "i"),
+    ("edge_type", "i"),
+    ("edge_weight", "d"),
+    ("content_offsets", "q"),
+    ("content_present", "b"),
+    ("metadata_offsets", "q"),
+)
+
+
+def _encode_table(data: Dict[str, Any]) -> bytes:
+    if msgpack is not None:
+        return _CODEC_MSGPACK + msgpack.packb(data, use_bin_type=True)
+    return _CODEC_JSON + json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _decode_table(raw: bytes) -> Dict[str, Any]:
+    codec, payload = raw[:1], raw[1:]
+    if codec == _CODEC_MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("graph artifact was written with msgpack, which is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload.decode("utf-8"))
+
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    temp_path = path.with_suffix(path.suffix + f".tmp.{os.getpid()}")
+    try:
+        temp_path.write_bytes(payload)
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+def write_graph_artifact(output_dir: Path, job_id: str, created_at: float,
+                         nodes: Iterable[Any], edges: Iterable[Any],
+                         cross_references: Iterable[Any],
+                         aliases: Dict[str, Iterable[str]]) -> List[Path]:
+    """
+    Write the columnar graph artifact and its content store.
+
+    ``nodes``, ``edges`` and ``cross_references`` are objects exposing the Pass E
+    dataclass attributes (node_id/node_type/title/content/parent_id/children/
+    metadata, etc.).
+
+    Returns:
+        Paths of the written files
+    """
+    nodes = list(nodes)
+    edges = list(edges)
+    cross_references = list(cross_references)
+
+    node_ids = [node.node_id for node in nodes]
+    index: Dict[str, int] = {node_id: i for i, node_id in enumerate(node_ids)}
+
+    # Edge and child endpoints that have no node row still need an ID slot
+    def slot(node_id: str) -> int:
+        position = index.get(node_id)
+        if position is None:
+            position = index[node_id] = len(node_ids)
+            node_ids.append(node_id)
+        return position
+
+    type_table: List[str] = []
+    type_codes: Dict[str, int] = {}
+
+    def code(table: List[str], codes: Dict[str, int], value: str) -> int:
+        if value not in codes:
+            codes[value] = len(table)
+            table.append(value)
+        return codes[value]
+
+    columns = {name: array(typecode) for name, typecode in _COLUMNS}
+    content = bytearray()
+    titles: List[str] = []
+
+    columns["children_offsets"].append(0)
+    for node in nodes:
+        titles.append(node.title or "")
+        columns["node_type"].append(code(type_table, type_codes, node.node_type or "unknown"))
+        columns["parent"].append(slot(node.parent_id) if node.parent_id else -1)
+        for child_id in node.children or []:
+            columns["children_index"].append(slot(child_id))
+        columns["children_offsets"].append(len(columns["children_index"]))
+
+        columns["content_offsets"].append(len(content))
+        columns["content_present"].append(0 if node.content is None else 1)
+        if node.content is not None:
+            content.extend(node.content.encode("utf-8"))
+    columns["content_offsets"].append(len(content))
+
+    # Metadata follows content in the same store
+    for node in nodes:
+        columns["metadata_offsets"].append(len(content))
+        if node.metadata:
+            content.extend(json.dumps(node.metadata, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+    columns["metadata_offsets"].append(len(content))
+
+    edge_type_table: List[str] = []
+    edge_type_codes: Dict[str, int] = {}
+    for edge in edges:
+        columns["edge_source"].append(slot(edge.source_id))
+        columns["edge_target"].append(slot(edge.target_id))
+        columns["edge_type"].append(code(edge_type_table, edge_type_codes, edge.edge_type or "unknown"))
+        columns["edge_weight"].append(float(edge.weight if edge.weight is not None else 1.0))
+
+    table = {
+        "version": ARTIFACT_VERSION,
+        "job_id": job_id,
+        "created_at": created_at,
+        "node_count": len(nodes),
+        "node_ids": node_ids,
+        "titles": titles,
+        "node_types": type_table,
+        "edge_ids": [edge.edge_id for edge in edges],
+        "edge_types": edge_type_table,
+        "edge_metadata": {str(i): edge.metadata for i, edge in enumerate(edges) if edge.metadata},
+        "cross_references": {
+            "ref_id": [ref.ref_id for ref in cross_references],
+            "source_element": [ref.source_element for ref in cross_references],
+            "target_element": [ref.target_element for ref in cross_references],
+            "ref_type": [ref.ref_type for ref in cross_references],
+            "confidence": [ref.confidence for ref in cross_references],
+            "context": [ref.context for ref in cross_references],
+        },
+        "aliases": {term: sorted(alias_set) for term, alias_set in aliases.items()},
+        "column_lengths": [len(columns[name]) for name, _ in _COLUMNS],
+    }
+
+    encoded_table = _encode_table(table)
+    payload = bytearray(_MAGIC)
+    payload.extend(struct.pack("<I", len(encoded_table)))
+    payload.extend(encoded_table)
+    for name, _ in _COLUMNS:
+        payload.extend(columns[name].tobytes())
+
+    output_dir = Path(output_dir)
+    artifact_path = output_dir / GRAPH_ARTIFACT_FILENAME
+    content_path = output_dir / GRAPH_CONTENT_FILENAME
+    _atomic_write(content_path, bytes(content))
+    _atomic_write(artifact_path, bytes(payload))
+
+    logger.info(f"Wrote columnar graph artifact to {artifact_path} "
+                f"({len(payload)} bytes, content store {len(content)} bytes)")
+    return [artifact_path, content_path]
+
+
+class GraphContentStore:
+    """Lazily loaded node content/metadata store backed by ``graph_content.bin``"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._blob: Optional[bytes] = None
+        self._lock = Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._blob is not None
+
+    def read(self, start: int, end: int) -> bytes:
+        blob = self._blob
+        if blob is None:
+            with self._lock:
+                if self._blob is None:
+                    self._blob = self.path.read_bytes()
+                blob = self._blob
+        return blob[start:end]
+
+
+class GraphArtifact:
+    """Decoded columnar graph artifact (string tables plus packed columns)"""
+
+    def __init__(self, table: Dict[str, Any], columns: Dict[str, array], content: GraphContentStore):
+        self.table = table
+        self.columns = columns
+        self.content = content
+
+        self.job_id: str = table.get("job_id", "unknown")
+        self.created_at: float = table.get("created_at", 0.0)
+        self.node_count: int = table["node_count"]
+        self.node_ids: List[str] = table["node_ids"]
+        self.titles: List[str] = table["titles"]
+        self.node_types: List[str] = table["node_types"]
+        self.edge_ids: List[str] = table["edge_ids"]
+        self.edge_types: List[str] = table["edge_types"]
+        self.edge_metadata: Dict[str, Any] = table.get("edge_metadata", {})
+        self.cross_references: Dict[str, List[Any]] = table["cross_references"]
+        self.aliases: Dict[str, List[str]] = table["aliases"]
+
+    def node_content(self, position: int) -> Optional[str]:
+        if not self.columns["content_present"][position]:
+            return None
+        offsets = self.columns["content_offsets"]
+        return self.content.read(offsets[position], offsets[position + 1]).decode("utf-8")
+
+    def node_metadata(self, position: int) -> Dict[str, Any]:
+        offsets = self.columns["metadata_offsets"]
+        raw = self.content.read(offsets[position], offsets[position + 1])
+        return json.loads(raw) if raw else {}
+
+
+def has_graph_artifact(artifact_dir: Path) -> bool:
+    """True when the columnar artifact exists and is not older than the JSON export"""
+    artifact_path = Path(artifact_dir) / GRAPH_ARTIFACT_FILENAME
+    json_path = Path(artifact_dir) / "graph_snapshot.json"
+    try:
+        artifact_mtime = artifact_path.stat().st_mtime
+    except OSError:
+        return False
+    try:
+        return artifact_mtime >= json_path.stat().st_mtime
+    except OSError:
+        return True
+
+
+def read_graph_artifact(artifact_dir: Path) -> GraphArtifact:
+    """Read ``graph_snapshot.bin``; node content stays on disk until requested"""
+    artifact_dir = Path(artifact_dir)
+    raw = (artifact_dir / GRAPH_ARTIFACT_FILENAME).read_bytes()
+    if raw[:len(_MAGIC)] != _MAGIC:
+        raise ValueError(f"Not a graph artifact: {artifact_dir / GRAPH_ARTIFACT_FILENAME}")
+
+    offset = len(_MAGIC)
+    (table_length,) = struct.unpack_from("<I", raw, offset)
+    offset += 4
+    table = _decode_table(raw[offset:offset + table_length])
+    offset += table_length
+    if table.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported graph artifact version {table.get('version')}: "
+                         f"{artifact_dir / GRAPH_ARTIFACT_FILENAME}")
+
+    columns: Dict[str, array] = {}
+    for (name, typecode), length in zip(_COLUMNS, table["column_lengths"]):
+        column = array(typecode)
+        size = length * column.itemsize
+        column.frombytes(raw[offset:offset + size])
+        offset += size
+        columns[name] = column
+
+    return GraphArtifact(table, columns, GraphContentStore(artifact_dir / GRAPH_CONTENT_FILENAME))
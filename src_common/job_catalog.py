@@ -0,0 +1,279 @@
+"""
+Ingestion Job Catalog
+
+Persistent index of ingestion job manifests for the admin console.
+
+Each environment keeps a SQLite catalog under ``env/<env>/data`` with one row
+per job directory, keyed by job id and indexed on (created_at) and
+(status, created_at). ``AdminIngestionService`` and the bulk ingester upsert a
+row whenever they write a job manifest, so listing and looking up jobs no
+longer scans the artifact directories or parses every ``manifest.json``.
+
+A catalog that has never been populated is rebuilt from disk on first use;
+``scripts/job_catalog.py rebuild`` does the same on demand for recovery.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .ttrpg_logging import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    environment TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL DEFAULT 0,
+    started_at REAL,
+    completed_at REAL,
+    source_file TEXT NOT NULL DEFAULT 'unknown',
+    job_type TEXT NOT NULL DEFAULT 'unknown',
+    lane TEXT NOT NULL DEFAULT 'A',
+    total_phases INTEGER NOT NULL DEFAULT 0,
+    completed_phases INTEGER NOT NULL DEFAULT 0,
+    current_phase TEXT,
+    error_message TEXT,
+    artifacts_path TEXT,
+    process_id INTEGER,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at, job_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at, job_id);
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+JOB_FIELDS = (
+    "job_id", "environment", "status", "created_at", "started_at", "completed_at",
+    "source_file", "job_type", "lane", "total_phases", "completed_phases",
+    "current_phase", "error_message", "artifacts_path", "process_id",
+)
+
+_UPSERT = (
+    f"INSERT OR REPLACE INTO jobs ({', '.join(JOB_FIELDS)}, updated_at) "
+    f"VALUES ({', '.join('?' for _ in JOB_FIELDS)}, ?)"
+)
+
+
+def _values(record: Dict[str, Any], updated_at: float) -> Tuple[Any, ...]:
+    row = {name: record.get(name) for name in JOB_FIELDS}
+    row["status"] = row["status"] or "unknown"
+    row["created_at"] = row["created_at"] or 0
+    return tuple(row.values()) + (updated_at,)
+
+
+def job_roots(environment: str) -> List[Path]:
+    """Directories whose subdirectories are ingestion jobs for ``environment``"""
+    return [Path(f"artifacts/{environment}"), Path(f"artifacts/ingest/{environment}")]
+
+
+def job_record(environment: str, job_path: Path, manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """Catalog row (``IngestionJob`` fields) for a job directory's manifest"""
+    completed_phases = manifest.get("completed_phases", manifest.get("completed_passes", 0))
+    if not isinstance(completed_phases, int):
+        # Bulk ingester manifests list the completed passes
+        completed_phases = len(completed_phases or [])
+    return {
+        "job_id": manifest.get("job_id", job_path.name),
+        "environment": environment,
+        "status": manifest.get("status", "unknown"),
+        "created_at": manifest.get("created_at", 0),
+        "started_at": manifest.get("started_at"),
+        "completed_at": manifest.get("completed_at"),
+        "source_file": manifest.get("source_file", "unknown"),
+        "job_type": manifest.get("job_type", manifest.get("name", "unknown")),
+        "lane": manifest.get("lane", "A"),
+        "total_phases": len(manifest.get("phases", [])),
+        "completed_phases": completed_phases,
+        "current_phase": manifest.get("current_phase"),
+        "error_message": manifest.get("error_message"),
+        "artifacts_path": str(job_path),
+        "process_id": manifest.get("process_id"),
+    }
+
+
+class JobCatalog:
+    """SQLite catalog of one environment's ingestion jobs"""
+
+    def __init__(self, environment: str, db_path: Optional[Path] = None, auto_rebuild: bool = True) -> None:
+        self.environment = environment
+        self.db_path = Path(db_path) if db_path else Path(f"env/{environment}/data/job_catalog.sqlite3")
+        self._init_db()
+        if auto_rebuild and self._get_meta("rebuilt_at") is None:
+            self.rebuild()
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """Insert or replace a job row"""
+        with self._connect() as conn:
+            conn.execute(_UPSERT, _values(record, time.time()))
+
+    def record_manifest(self, job_path: Path, manifest: Dict[str, Any]) -> None:
+        """Upsert from a manifest that was just written to ``job_path``"""
+        self.upsert(job_record(self.environment, Path(job_path), manifest))
+
+    def record_job_dir(self, job_path: Path, status: Optional[str] = None) -> bool:
+        """Upsert from ``job_path/manifest.json`` on disk; ``status`` fills a manifest without one"""
+        manifest_file = Path(job_path) / "manifest.json"
+        try:
+            manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+            manifest.setdefault("created_at", manifest_file.stat().st_mtime)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not catalog job {job_path}: {e}")
+            return False
+        if status and "status" not in manifest:
+            manifest["status"] = status
+        self.record_manifest(job_path, manifest)
+        return True
+
+    def remove(self, job_id: str) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+        return cursor.rowcount > 0
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job by exact id (primary key lookup)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row(row) if row else None
+
+    def find(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job by exact id, else the newest job whose id contains ``job_id``"""
+        job = self.get(job_id)
+        if job is not None:
+            return job
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE instr(job_id, ?) > 0 ORDER BY created_at DESC, job_id DESC LIMIT 1",
+                (job_id,),
+            ).fetchone()
+        return self._row(row) if row else None
+
+    def list_jobs(
+        self,
+        status: Optional[str] = None,
+        limit: int = 50,
+        before: Optional[Tuple[float, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Jobs newest first
+
+        Args:
+            status: Only jobs with this status
+            limit: Page size
+            before: ``(created_at, job_id)`` of the last job on the previous page
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if before is not None:
+            clauses.append("(created_at < ? OR (created_at = ? AND job_id < ?))")
+            params.extend([before[0], before[0], before[1]])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(max(0, int(limit)))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM jobs {where} ORDER BY created_at DESC, job_id DESC LIMIT ?", params
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def status_counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def rebuild(self) -> int:
+        """Replace the catalog with the job manifests found on disk"""
+        records = []
+        for root in job_roots(self.environment):
+            if not root.exists():
+                continue
+            for job_dir in root.iterdir():
+                manifest_file = job_dir / "manifest.json"
+                if not job_dir.is_dir() or not manifest_file.exists():
+                    continue
+                try:
+                    manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping unreadable manifest {manifest_file}: {e}")
+                    continue
+                records.append(job_record(self.environment, job_dir, manifest))
+
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM jobs")
+            conn.executemany(_UPSERT, [_values(record, now) for record in records])
+            conn.execute(
+                "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES ('rebuilt_at', ?)", (str(now),)
+            )
+        logger.info(f"Rebuilt {self.environment} job catalog with {len(records)} jobs")
+        return len(records)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _row(row: sqlite3.Row) -> Dict[str, Any]:
+        return {name: row[name] for name in JOB_FIELDS}
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM catalog_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+
+_catalogs: Dict[str, JobCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_job_catalog(environment: str) -> JobCatalog:
+    """Catalog for ``environment``, one per resolved database path"""
+    key = str(Path(f"env/{environment}/data/job_catalog.sqlite3").resolve())
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = _catalogs[key] = JobCatalog(environment)
+        return catalog
@@ -205,11 +205,12 @@ def create_job_status_api(app: FastAPI):
     @app.get("/api/jobs/history", response_model=List[JobStatusResponse])
     async def get_job_history(
         limit: int = Query(50, ge=1, le=200),
-        environment: Optional[str] = Query(None)
+        environment: Optional[str] = Query(None),
+        offset: int = Query(0, ge=0)
     ):
         """Get recent job execution history"""
         store = await get_job_store()
-        history = store.get_job_history(limit=limit, environment=environment)
+        history = store.get_job_history(limit=limit, environment=environment, offset=offset)
         
         return [
             JobStatusResponse(
@@ -8,6 +8,7 @@ with support for real-time updates and historical queries.
 from __future__ import annotations
 
 import json
+import sqlite3
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -21,6 +22,29 @@ from .ttrpg_logging import get_logger
 from .progress_callback import JobProgress, PassProgress, PassStatus
 
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    environment TEXT,
+    state TEXT NOT NULL,
+    status TEXT,
+    queued_time REAL,
+    start_time REAL,
+    end_time REAL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state_end ON jobs (state, end_time);
+CREATE INDEX IF NOT EXISTS idx_jobs_env_end ON jobs (environment, state, end_time);
+CREATE INDEX IF NOT EXISTS idx_jobs_env_start ON jobs (environment, start_time);
+CREATE TABLE IF NOT EXISTS job_stats (
+    environment TEXT PRIMARY KEY,
+    total_completed INTEGER NOT NULL DEFAULT 0,
+    successful INTEGER NOT NULL DEFAULT 0,
+    processing_time_sum REAL NOT NULL DEFAULT 0,
+    processing_time_count INTEGER NOT NULL DEFAULT 0
+);
+"""
+
 @dataclass
 class JobStatusRecord:
     """Complete job status record for API responses"""
@@ -94,67 +118,178 @@ class JobStatusRecord:
 
 
 class JobStatusStore:
-    """Thread-safe in-memory job status storage with disk persistence"""
+    """Thread-safe job status storage backed by SQLite
+    
+    Active jobs are kept in memory for fast progress updates and mirrored to
+    disk one row at a time. Completed jobs live only on disk, indexed by
+    environment and time, so history is paged from SQLite rather than held in
+    RAM. Per-environment statistics are maintained incrementally as jobs
+    complete and are compacted: they always describe the retained history.
+    
+    Storage defaults to ``$JOB_STATUS_DIR`` or the runtime data directory
+    ``env/<APP_ENV>/data/job_status`` (not tracked in git).
+    """
+    
+    DB_FILENAME = "job_status.sqlite3"
     
-    def __init__(self, storage_dir: Path = None):
+    def __init__(self, storage_dir: Path = None, max_completed_history: int = 10000,
+                 compaction_interval: int = 100):
         self.logger = get_logger(__name__)
         # Anchor storage under repo root to avoid CWD issues (e.g., Task Scheduler)
-        if storage_dir is None:
+        if storage_dir is None and os.getenv("JOB_STATUS_DIR"):
+            self.storage_dir = Path(os.environ["JOB_STATUS_DIR"])
+        elif storage_dir is None:
             project_root = Path(__file__).resolve().parents[1]
             env_name = os.getenv("APP_ENV", "dev")
             self.storage_dir = project_root / "env" / env_name / "data" / "job_status"
         else:
             self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.storage_dir / self.DB_FILENAME
+        self.max_completed_history = max_completed_history
+        self.compaction_interval = max(1, compaction_interval)
         
-        # In-memory storage for fast access
+        # In-memory storage for fast access to running jobs
         self._active_jobs: Dict[str, JobStatusRecord] = {}
-        self._completed_jobs: Dict[str, JobStatusRecord] = {}
         self._lock = Lock()
+        self._completions_since_compaction = 0
+        
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
         
         # Load existing data
         self._load_from_disk()
         
     def _load_from_disk(self):
-        """Load job status from disk storage"""
+        """Load active jobs from disk, importing legacy JSON files once"""
         try:
-            active_file = self.storage_dir / "active_jobs.json"
-            completed_file = self.storage_dir / "completed_jobs.json"
+            self._migrate_legacy_json()
+            rows = self._conn.execute(
+                "SELECT record FROM jobs WHERE state = 'active'"
+            ).fetchall()
+            for (record_json,) in rows:
+                record = JobStatusRecord(**json.loads(record_json))
+                self._active_jobs[record.job_id] = record
             
-            if active_file.exists():
-                with open(active_file, 'r') as f:
-                    data = json.load(f)
-                    for job_id, job_data in data.items():
-                        self._active_jobs[job_id] = JobStatusRecord(**job_data)
-                        
-            if completed_file.exists():
-                with open(completed_file, 'r') as f:
-                    data = json.load(f)
-                    for job_id, job_data in data.items():
-                        self._completed_jobs[job_id] = JobStatusRecord(**job_data)
-                        
-            self.logger.info(f"Loaded {len(self._active_jobs)} active and {len(self._completed_jobs)} completed jobs")
+            completed = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state = 'completed'"
+            ).fetchone()[0]
+            self.logger.info(f"Loaded {len(self._active_jobs)} active jobs ({completed} completed jobs on disk)")
             
         except Exception as e:
             self.logger.error(f"Failed to load job status from disk: {e}")
     
-    def _save_to_disk(self):
-        """Persist job status to disk"""
+    def _migrate_legacy_json(self):
+        """Import active_jobs.json / completed_jobs.json written by older versions"""
+        for filename, state in (("active_jobs.json", "active"), ("completed_jobs.json", "completed")):
+            legacy_file = self.storage_dir / filename
+            if not legacy_file.exists():
+                continue
+            try:
+                data = json.loads(legacy_file.read_text())
+                records = [JobStatusRecord(**job_data) for job_data in data.values()]
+            except Exception as e:
+                self.logger.error(f"Skipping unreadable legacy job status file {legacy_file}: {e}")
+                records = []
+            with self._conn:
+                for record in records:
+                    if state == "completed":
+                        self._record_completion(record)
+                    else:
+                        self._write_record(record, state)
+            legacy_file.replace(legacy_file.with_suffix(legacy_file.suffix + ".migrated"))
+    
+    def _write_record(self, record: JobStatusRecord, state: str):
+        """Upsert a single job row (caller holds the lock and transaction)"""
+        self._retract_completion(record.job_id)
+        self._conn.execute(
+            "INSERT INTO jobs (job_id, environment, state, status, queued_time, start_time, end_time, record) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(job_id) DO UPDATE SET environment = excluded.environment, state = excluded.state, "
+            "status = excluded.status, queued_time = excluded.queued_time, start_time = excluded.start_time, "
+            "end_time = excluded.end_time, record = excluded.record",
+            (
+                record.job_id,
+                record.environment,
+                state,
+                record.status,
+                record.queued_time,
+                record.start_time,
+                record.end_time,
+                json.dumps(asdict(record)),
+            ),
+        )
+    
+    def _save_record(self, record: JobStatusRecord, state: str):
+        """Persist one job record; cost is independent of job history size"""
         try:
-            active_file = self.storage_dir / "active_jobs.json"
-            completed_file = self.storage_dir / "completed_jobs.json"
-            
-            with open(active_file, 'w') as f:
-                active_data = {job_id: asdict(record) for job_id, record in self._active_jobs.items()}
-                json.dump(active_data, f, indent=2)
-                
-            with open(completed_file, 'w') as f:
-                completed_data = {job_id: asdict(record) for job_id, record in self._completed_jobs.items()}
-                json.dump(completed_data, f, indent=2)
-                
+            with self._conn:
+                self._write_record(record, state)
         except Exception as e:
             self.logger.error(f"Failed to save job status to disk: {e}")
     
+    def _adjust_stats(self, environment: str, completed: int, successful: int,
+                      time_sum: float, time_count: int):
+        """Add a signed delta to one environment's statistics row"""
+        self._conn.execute(
+            "INSERT INTO job_stats (environment, total_completed, successful, processing_time_sum, processing_time_count) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(environment) DO UPDATE SET total_completed = total_completed + excluded.total_completed, "
+            "successful = successful + excluded.successful, "
+            "processing_time_sum = processing_time_sum + excluded.processing_time_sum, "
+            "processing_time_count = processing_time_count + excluded.processing_time_count",
+            (environment or "", completed, successful, time_sum, time_count),
+        )
+    
+    def _retract_completion(self, job_id: str):
+        """Remove an already-completed row's contribution before it is overwritten"""
+        previous = self._conn.execute(
+            "SELECT environment, status, json_extract(record, '$.processing_time') "
+            "FROM jobs WHERE job_id = ? AND state = 'completed'",
+            (job_id,),
+        ).fetchone()
+        if previous:
+            environment, status, processing_time = previous
+            successful = 1 if status == "completed" else 0
+            timed = 1 if (processing_time and successful) else 0
+            self._adjust_stats(environment, -1, -successful, -(processing_time if timed else 0.0), -timed)
+    
+    def _record_completion(self, record: JobStatusRecord):
+        """Write a completed job and fold it into the incremental statistics
+        
+        Statistics describe the completed history currently on disk, so a job
+        that is completed again replaces its earlier contribution rather than
+        being counted twice.
+        """
+        self._write_record(record, "completed")
+        successful = 1 if record.status == "completed" else 0
+        timed = 1 if (record.processing_time and successful) else 0
+        self._adjust_stats(record.environment, 1, successful, record.processing_time if timed else 0.0, timed)
+    
+    def _compact(self):
+        """Drop the oldest completed jobs beyond max_completed_history
+        
+        The dropped jobs' contribution is subtracted from the statistics so
+        they keep matching the retained history.
+        """
+        expired = (
+            "FROM jobs WHERE state = 'completed' AND job_id NOT IN ("
+            "SELECT job_id FROM jobs WHERE state = 'completed' ORDER BY end_time DESC, rowid DESC LIMIT ?)"
+        )
+        timed = "(status = 'completed' AND json_extract(record, '$.processing_time') > 0)"
+        rows = self._conn.execute(
+            f"SELECT environment, COUNT(*), SUM(status = 'completed'), "
+            f"SUM(CASE WHEN {timed} THEN json_extract(record, '$.processing_time') ELSE 0 END), "
+            f"SUM({timed}) {expired} GROUP BY environment",
+            (self.max_completed_history,),
+        ).fetchall()
+        for environment, completed, successful, time_sum, time_count in rows:
+            self._adjust_stats(environment, -completed, -int(successful or 0),
+                               -float(time_sum or 0.0), -int(time_count or 0))
+        self._conn.execute(f"DELETE {expired}", (self.max_completed_history,))
+    
     def create_job(self, job_id: str, source_path: str, environment: str) -> JobStatusRecord:
         """Create a new job status record"""
         with self._lock:
@@ -167,7 +302,7 @@ class JobStatusStore:
             )
             
             self._active_jobs[job_id] = record
-            self._save_to_disk()
+            self._save_record(record, "active")
             
             self.logger.info(f"Created job status record for {job_id}")
             return record
@@ -177,7 +312,7 @@ class JobStatusStore:
         with self._lock:
             if job_progress.job_id not in self._active_jobs:
                 # Create record if it doesn't exist
-                self._active_jobs[job_progress.job_id] = JobStatusRecord.from_job_progress(job_progress)
+                updated = JobStatusRecord.from_job_progress(job_progress)
             else:
                 # Update existing record
                 record = self._active_jobs[job_progress.job_id]
@@ -185,12 +320,12 @@ class JobStatusStore:
                 
                 # Preserve original queued time
                 updated.queued_time = record.queued_time
-                self._active_jobs[job_progress.job_id] = updated
             
-            self._save_to_disk()
+            self._active_jobs[job_progress.job_id] = updated
+            self._save_record(updated, "active")
     
     def complete_job(self, job_id: str, result: Dict[str, Any]):
-        """Mark job as completed and move to completed jobs"""
+        """Mark job as completed and move it to on-disk history"""
         with self._lock:
             if job_id not in self._active_jobs:
                 self.logger.warning(f"Attempting to complete unknown job: {job_id}")
@@ -207,19 +342,19 @@ class JobStatusStore:
             record.artifacts_path = result.get("artifacts_path")
             record.thread_name = result.get("thread_name")
             
-            # Move to completed jobs
-            self._completed_jobs[job_id] = record
-            del self._active_jobs[job_id]
-            
-            # Clean up old completed jobs (keep last 100)
-            if len(self._completed_jobs) > 100:
-                sorted_jobs = sorted(self._completed_jobs.items(), 
-                                   key=lambda x: x[1].end_time or 0)
-                to_remove = sorted_jobs[:-100]
-                for job_id_to_remove, _ in to_remove:
-                    del self._completed_jobs[job_id_to_remove]
+            try:
+                with self._conn:
+                    self._record_completion(record)
+                    
+                    # Periodic compaction keeps history bounded without per-update scans
+                    self._completions_since_compaction += 1
+                    if self._completions_since_compaction >= self.compaction_interval:
+                        self._compact()
+                        self._completions_since_compaction = 0
+            except Exception as e:
+                self.logger.error(f"Failed to save job status to disk: {e}")
             
-            self._save_to_disk()
+            del self._active_jobs[job_id]
             self.logger.info(f"Completed job {job_id} with status: {record.status}")
     
     def get_job_status(self, job_id: str) -> Optional[JobStatusRecord]:
@@ -227,57 +362,64 @@ class JobStatusStore:
         with self._lock:
             if job_id in self._active_jobs:
                 return self._active_jobs[job_id]
-            if job_id in self._completed_jobs:
-                return self._completed_jobs[job_id]
-            return None
+            row = self._conn.execute(
+                "SELECT record FROM jobs WHERE job_id = ? AND state = 'completed'", (job_id,)
+            ).fetchone()
+            return JobStatusRecord(**json.loads(row[0])) if row else None
     
     def get_active_jobs(self) -> List[JobStatusRecord]:
         """Get all active jobs"""
         with self._lock:
             return list(self._active_jobs.values())
     
-    def get_job_history(self, limit: int = 50, environment: str = None) -> List[JobStatusRecord]:
-        """Get recent job history"""
+    def get_job_history(self, limit: int = 50, environment: str = None, offset: int = 0) -> List[JobStatusRecord]:
+        """Get recent job history, most recently completed first"""
+        query = "SELECT record FROM jobs WHERE state = 'completed'"
+        params: List[Any] = []
+        if environment:
+            query += " AND environment = ?"
+            params.append(environment)
+        query += " ORDER BY end_time DESC, rowid DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        
         with self._lock:
-            completed = list(self._completed_jobs.values())
-            
-            # Filter by environment if specified
-            if environment:
-                completed = [job for job in completed if job.environment == environment]
-            
-            # Sort by completion time and limit
-            completed.sort(key=lambda x: x.end_time or 0, reverse=True)
-            return completed[:limit]
+            rows = self._conn.execute(query, params).fetchall()
+        return [JobStatusRecord(**json.loads(record_json)) for (record_json,) in rows]
     
     def get_job_statistics(self, environment: str = None) -> Dict[str, Any]:
         """Get job execution statistics"""
         with self._lock:
-            active_jobs = list(self._active_jobs.values())
-            completed_jobs = list(self._completed_jobs.values())
-            
             if environment:
-                active_jobs = [j for j in active_jobs if j.environment == environment]
-                completed_jobs = [j for j in completed_jobs if j.environment == environment]
-            
-            # Calculate statistics
-            total_completed = len(completed_jobs)
-            successful = len([j for j in completed_jobs if j.status == "completed"])
-            failed = total_completed - successful
-            
-            # Average processing time for successful jobs
-            processing_times = [j.processing_time for j in completed_jobs 
-                              if j.processing_time and j.status == "completed"]
-            avg_processing_time = sum(processing_times) / len(processing_times) if processing_times else 0
-            
-            return {
-                "active_jobs": len(active_jobs),
-                "total_completed": total_completed,
-                "successful": successful,
-                "failed": failed,
-                "success_rate": (successful / total_completed * 100) if total_completed > 0 else 0,
-                "average_processing_time": avg_processing_time,
-                "environment": environment
-            }
+                active_count = sum(1 for j in self._active_jobs.values() if j.environment == environment)
+                row = self._conn.execute(
+                    "SELECT total_completed, successful, processing_time_sum, processing_time_count "
+                    "FROM job_stats WHERE environment = ?",
+                    (environment,),
+                ).fetchone()
+            else:
+                active_count = len(self._active_jobs)
+                row = self._conn.execute(
+                    "SELECT SUM(total_completed), SUM(successful), SUM(processing_time_sum), SUM(processing_time_count) "
+                    "FROM job_stats"
+                ).fetchone()
+        
+        row = row or (0, 0, 0.0, 0)
+        total_completed = int(row[0] or 0)
+        successful = int(row[1] or 0)
+        time_sum = float(row[2] or 0.0)
+        time_count = int(row[3] or 0)
+        failed = total_completed - successful
+        avg_processing_time = time_sum / time_count if time_count else 0
+        
+        return {
+            "active_jobs": active_count,
+            "total_completed": total_completed,
+            "successful": successful,
+            "failed": failed,
+            "success_rate": (successful / total_completed * 100) if total_completed > 0 else 0,
+            "average_processing_time": avg_processing_time,
+            "environment": environment
+        }
 
 
 # Global job status store instance
@@ -0,0 +1,62 @@
+"""
+Result fusion for hybrid (lexical + vector) retrieval.
+
+Both fusers take ranked lists per retrieval source (best first) of DocChunk-like
+dataclasses with ``id``, ``score`` and ``metadata`` and return one fused list.
+Each fused chunk records where it came from in
+``metadata["retrieval_sources"]`` (rank and raw score per source) and its fused
+score in ``metadata["fused_score"]``.
+"""
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+DEFAULT_RRF_K = 60
+
+
+def _fuse(ranked: Mapping[str, Sequence[Any]], score_for) -> List[Any]:
+    fused: Dict[str, float] = {}
+    first_seen: Dict[str, Any] = {}
+    breakdown: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    for source, chunks in ranked.items():
+        for rank, chunk in enumerate(chunks, start=1):
+            key = str(chunk.id)
+            fused[key] = fused.get(key, 0.0) + score_for(source, rank, chunk)
+            first_seen.setdefault(key, chunk)
+            breakdown.setdefault(key, {})[source] = {"rank": rank, "score": float(chunk.score or 0.0)}
+
+    results = []
+    for key, score in sorted(fused.items(), key=lambda item: item[1], reverse=True):
+        chunk = first_seen[key]
+        metadata = dict(chunk.metadata or {})
+        metadata["retrieval_sources"] = breakdown[key]
+        metadata["fused_score"] = round(score, 6)
+        results.append(replace(chunk, score=score, metadata=metadata))
+    return results
+
+
+def reciprocal_rank_fusion(ranked: Mapping[str, Sequence[Any]], k: int = DEFAULT_RRF_K,
+                           weights: Optional[Mapping[str, float]] = None) -> List[Any]:
+    """Fuse by sum of weight / (k + rank); insensitive to each source's score scale."""
+    weights = weights or {}
+    return _fuse(ranked, lambda source, rank, chunk: weights.get(source, 1.0) / (k + rank))
+
+
+def weighted_score_fusion(ranked: Mapping[str, Sequence[Any]],
+                          weights: Optional[Mapping[str, float]] = None) -> List[Any]:
+    """Fuse by weighted sum of per-source min-max normalised scores."""
+    weights = weights or {}
+    bounds: Dict[str, tuple] = {}
+    for source, chunks in ranked.items():
+        scores = [float(chunk.score or 0.0) for chunk in chunks]
+        if scores:
+            bounds[source] = (min(scores), max(scores))
+
+    def normalized(source, rank, chunk):
+        low, high = bounds[source]
+        value = 1.0 if high == low else (float(chunk.score or 0.0) - low) / (high - low)
+        return weights.get(source, 1.0) * value
+
+    return _fuse(ranked, normalized)
@@ -0,0 +1,595 @@
+"""
+Merged Knowledge-Graph Index
+
+Combines the graph snapshots of every finalized Pass E job in an environment
+into a single GraphSnapshot, so query expansion and graph reranking see all
+ingested books instead of only the most recently written one.
+
+The index keeps one segment per job directory and is updated incrementally:
+only new or changed snapshots are parsed, and removed jobs simply drop their
+segment. Segments hold graph structure only (node IDs, types, titles,
+parent/child links, edges, cross-references and aliases) and are persisted as
+compact positional JSON under ``artifacts/ingest/_graph_index/<env>/merged_graph.json``
+(outside the environment's job root, so job scanners never see it), so other worker processes can load the merged view read-only without
+re-reading every job directory. Segments are built from the columnar
+``graph_snapshot.bin`` artifact when it is current, falling back to
+``graph_snapshot.json``. Node content and metadata are not copied into the
+index; a node's position in its segment locates them in the job's own
+artifacts (``graph_content.bin`` or the JSON snapshot), which are read the
+first time that job's content is requested.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..graph_artifact import GRAPH_ARTIFACT_FILENAME, GraphArtifact, has_graph_artifact, read_graph_artifact
+from ..ttrpg_logging import get_logger
+from .graph_loader import CrossReference, GraphEdge, GraphNode, GraphSnapshot, notify_snapshot_written
+
+try:  # Optional fast JSON codec
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    orjson = None
+
+logger = get_logger(__name__)
+
+INDEX_DIRNAME = "_graph_index"
+INDEX_FILENAME = "merged_graph.json"
+INDEX_VERSION = 2
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def merged_index_path(base_path: Path) -> Path:
+    """Location of the persisted index for the jobs under ``base_path``
+
+    The index lives beside the job root rather than inside it, so directory
+    scans of ``artifacts/ingest/<env>`` only ever see job directories.
+    """
+    base_path = Path(base_path)
+    return base_path.parent / INDEX_DIRNAME / base_path.name / INDEX_FILENAME
+
+
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+_UNSET = object()
+
+
+class SegmentContentSource:
+    """Node content and metadata of one job, read from its artifacts on first use"""
+
+    def __init__(self, job_dir: Path, columnar: bool = False):
+        self.job_dir = Path(job_dir)
+        self.columnar = columnar
+        self._artifact: Optional[GraphArtifact] = None
+        self._rows: Optional[List[Tuple[Optional[str], Dict[str, Any]]]] = None
+        self._lock = Lock()
+
+    @property
+    def loaded(self) -> bool:
+        if self._artifact is not None:
+            return self._artifact.content.loaded
+        return self._rows is not None
+
+    def _load(self) -> None:
+        with self._lock:
+            if self._artifact is not None or self._rows is not None:
+                return
+            if self.columnar:
+                try:
+                    # Only the string tables and offsets; graph_content.bin is read on first access
+                    self._artifact = read_graph_artifact(self.job_dir)
+                    return
+                except Exception as e:
+                    logger.warning(f"Falling back to JSON graph content for {self.job_dir.name}: {e}")
+            try:
+                graph_data = json.loads((self.job_dir / "graph_snapshot.json").read_text(encoding="utf-8"))
+                self._rows = [(node.get("content"), node.get("metadata") or {})
+                              for node in graph_data.get("nodes", {}).values()]
+            except Exception as e:
+                logger.warning(f"Graph content unavailable for {self.job_dir.name}: {e}")
+                self._rows = []
+
+    def content(self, position: int) -> Optional[str]:
+        if self._artifact is None and self._rows is None:
+            self._load()
+        if self._artifact is not None:
+            return self._artifact.node_content(position) if position < self._artifact.node_count else None
+        return self._rows[position][0] if position < len(self._rows) else None
+
+    def metadata(self, position: int) -> Dict[str, Any]:
+        if self._artifact is None and self._rows is None:
+            self._load()
+        if self._artifact is not None:
+            return self._artifact.node_metadata(position) if position < self._artifact.node_count else {}
+        return dict(self._rows[position][1]) if position < len(self._rows) else {}
+
+
+class SegmentGraphNode(GraphNode):
+    """Merged-view node whose content and metadata resolve from its source job on first access"""
+
+    def __init__(self, node_id: str, node_type: str, title: str, parent_id: Optional[str],
+                 children: List[str], source: SegmentContentSource, position: int, job_id: str):
+        self.node_id = node_id
+        self.node_type = node_type
+        self.title = title
+        self.parent_id = parent_id
+        self.children = children
+        self._source = source
+        self._position = position
+        self._job_id = job_id
+        self._content = _UNSET
+        self._metadata = _UNSET
+
+    @property
+    def content(self) -> Optional[str]:
+        if self._content is _UNSET:
+            self._content = self._source.content(self._position)
+        return self._content
+
+    @content.setter
+    def content(self, value: Optional[str]) -> None:
+        self._content = value
+
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        if self._metadata is _UNSET:
+            self._metadata = {**self._source.metadata(self._position), "job_id": self._job_id}
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Optional[Dict[str, Any]]) -> None:
+        self._metadata = value
+
+
+class MergedGraphIndex:
+    """
+    Environment-wide graph merged from all finalized Pass E snapshots.
+
+    Read-only instances never scan job directories or write the index; they
+    reload the persisted file whenever another process rewrites it.
+
+    A job directory is included when it contains ``graph_snapshot.json`` and
+    its ``manifest.json`` (if present) lists Pass F as completed. Every node ID
+    is namespaced as ``<job_id>::<node_id>``, so edges and parent/child links
+    stay within their own book and adding or removing a book never changes the
+    IDs of another book's nodes.
+    """
+
+    def __init__(self, environment: str, base_path: Optional[Path] = None, read_only: Optional[bool] = None):
+        self.environment = environment
+        self.base_path = Path(base_path) if base_path else Path(f"artifacts/ingest/{environment}")
+        self.index_path = merged_index_path(self.base_path)
+        # Query workers can set GRAPH_INDEX_READ_ONLY=1 to only consume the persisted index
+        if read_only is None:
+            read_only = os.getenv("GRAPH_INDEX_READ_ONLY", "").lower() in ("1", "true", "yes")
+        self.read_only = read_only
+
+        self._segments: Dict[str, Dict[str, Any]] = {}
+        self._content_sources: Dict[str, Tuple[tuple, SegmentContentSource]] = {}
+        self._loaded_mtime: Optional[float] = None
+        self._snapshot: Optional[GraphSnapshot] = None
+        self._lock = Lock()
+
+        self.stats: Dict[str, Any] = {
+            "segments_parsed": 0,
+            "segments_removed": 0,
+            "index_loads": 0,
+            "last_load_ms": 0.0,
+            "last_refresh_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def index_mtime(self) -> Optional[float]:
+        """Modification time of the persisted index, or None if absent"""
+        return _mtime(self.index_path)
+
+    def refresh(self) -> bool:
+        """
+        Bring the index in line with the job directories on disk.
+
+        Read-only instances only reload the persisted index when another
+        process has rewritten it.
+
+        Returns:
+            True if the merged view changed
+        """
+        with self._lock:
+            started = time.perf_counter()
+            changed = self._reload_if_stale()
+            if not self.read_only:
+                changed = self._sync_with_job_directories() or changed
+            self.stats["last_refresh_ms"] = (time.perf_counter() - started) * 1000
+            return changed
+
+    def add_job(self, job_dir: Path) -> bool:
+        """Add or replace one job's segment (e.g. right after Pass F)"""
+        job_dir = Path(job_dir)
+        with self._lock:
+            self._reload_if_stale()
+            if self._loaded_mtime is None:
+                # No persisted index yet: build it from every job, not just this one
+                self._sync_with_job_directories()
+                return job_dir.name in self._segments
+            segment = self._build_segment(job_dir)
+            if segment is None:
+                return False
+            self._segments[job_dir.name] = segment
+            self._persist()
+            return True
+
+    def remove_job(self, job_dir_name: str) -> bool:
+        """Drop a job's segment (e.g. after its source was deleted)"""
+        with self._lock:
+            self._reload_if_stale()
+            if self._segments.pop(job_dir_name, None) is None:
+                return False
+            self.stats["segments_removed"] += 1
+            self._persist()
+            return True
+
+    def get_snapshot(self) -> Optional[GraphSnapshot]:
+        """Merged GraphSnapshot over all segments, or None when empty"""
+        with self._lock:
+            if self._snapshot is None and self._segments:
+                self._snapshot = self._merge_segments()
+            return self._snapshot
+
+    def get_sources(self) -> List[Dict[str, Any]]:
+        """Per-job summary of what the merged view contains"""
+        with self._lock:
+            return [
+                {
+                    "job_dir": name,
+                    "job_id": segment["job_id"],
+                    "nodes": len(segment["nodes"]),
+                    "edges": len(segment["edges"]),
+                    "cross_references": len(segment["cross_references"]),
+                    "snapshot_mtime": segment["fingerprint"][0],
+                }
+                for name, segment in sorted(self._segments.items())
+            ]
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+
+    def _reload_if_stale(self) -> bool:
+        index_mtime = _mtime(self.index_path)
+        if index_mtime is None or index_mtime == self._loaded_mtime:
+            return False
+
+        started = time.perf_counter()
+        try:
+            data = _loads(self.index_path.read_bytes())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable merged graph index {self.index_path}: {e}")
+            return False
+        if data.get("version") != INDEX_VERSION:
+            logger.info(f"Merged graph index version mismatch, rebuilding: {self.index_path}")
+            return False
+
+        self._segments = data.get("segments", {})
+        self._loaded_mtime = index_mtime
+        self._snapshot = None
+        self.stats["index_loads"] += 1
+        self.stats["last_load_ms"] = (time.perf_counter() - started) * 1000
+        return True
+
+    def _persist(self) -> None:
+        self._snapshot = None
+        if self.read_only:
+            return
+
+        data = {
+            "version": INDEX_VERSION,
+            "environment": self.environment,
+            "updated_at": time.time(),
+            "segments": self._segments,
+        }
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.index_path.with_suffix(f".tmp.{os.getpid()}.{int(time.time() * 1000000)}")
+        try:
+            temp_path.write_bytes(_dumps(data))
+            os.replace(temp_path, self.index_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        # Indexes written before the move lived inside the job root
+        legacy_dir = self.base_path / INDEX_DIRNAME
+        if legacy_dir.is_dir():
+            shutil.rmtree(legacy_dir, ignore_errors=True)
+        self._loaded_mtime = _mtime(self.index_path)
+        logger.info(f"Merged graph index updated for {self.environment}: {len(self._segments)} sources")
+
+    # ------------------------------------------------------------------ #
+    # Incremental sync
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _fingerprint(job_dir: Path) -> Optional[Tuple[float, Optional[float], Optional[float]]]:
+        snapshot_mtime = _mtime(job_dir / "graph_snapshot.json")
+        if snapshot_mtime is None:
+            return None
+        return (snapshot_mtime, _mtime(job_dir / "manifest.json"), _mtime(job_dir / GRAPH_ARTIFACT_FILENAME))
+
+    def _sync_with_job_directories(self) -> bool:
+        if not self.base_path.exists():
+            return False
+
+        changed = False
+        present = set()
+        for job_dir in self.base_path.iterdir():
+            if not job_dir.is_dir() or job_dir.name == INDEX_DIRNAME:
+                continue
+            fingerprint = self._fingerprint(job_dir)
+            if fingerprint is None:
+                continue
+            present.add(job_dir.name)
+
+            existing = self._segments.get(job_dir.name)
+            if existing is not None and tuple(existing["fingerprint"]) == fingerprint:
+                continue
+            segment = self._build_segment(job_dir)
+            if segment is not None:
+                self._segments[job_dir.name] = segment
+                changed = True
+            elif existing is not None:
+                # Snapshot changed but is no longer finalized/readable
+                del self._segments[job_dir.name]
+                changed = True
+
+        for name in [name for name in self._segments if name not in present]:
+            del self._segments[name]
+            self.stats["segments_removed"] += 1
+            changed = True
+
+        if changed:
+            self._persist()
+        return changed
+
+    def _build_segment(self, job_dir: Path) -> Optional[Dict[str, Any]]:
+        """Parse one job's Pass E artifacts into a compact positional segment"""
+        fingerprint = self._fingerprint(job_dir)
+        if fingerprint is None:
+            return None
+
+        manifest_file = job_dir / "manifest.json"
+        if manifest_file.exists():
+            try:
+                manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning(f"Skipping {job_dir.name} for merged graph, unreadable manifest: {e}")
+                return None
+            if "F" not in manifest.get("completed_passes", []):
+                return None
+
+        segment = None
+        if has_graph_artifact(job_dir):
+            try:
+                segment = self._columnar_segment(job_dir)
+            except Exception as e:
+                logger.warning(f"Falling back to JSON graph snapshot for {job_dir.name}: {e}")
+        if segment is None:
+            try:
+                segment = self._json_segment(job_dir)
+            except Exception as e:
+                logger.warning(f"Skipping {job_dir.name} for merged graph: {e}")
+                return None
+
+        segment["fingerprint"] = list(fingerprint)
+        segment.setdefault("created_at", fingerprint[0])
+        self.stats["segments_parsed"] += 1
+        return segment
+
+    @staticmethod
+    def _columnar_segment(job_dir: Path) -> Dict[str, Any]:
+        """Segment from graph_snapshot.bin; graph_content.bin is not touched"""
+        artifact = read_graph_artifact(job_dir)
+        node_ids, columns = artifact.node_ids, artifact.columns
+        children_offsets, children_index = columns["children_offsets"], columns["children_index"]
+        refs = artifact.cross_references
+
+        nodes = []
+        for position in range(artifact.node_count):
+            parent = columns["parent"][position]
+            nodes.append([
+                node_ids[position],
+                artifact.node_types[columns["node_type"][position]],
+                artifact.titles[position],
+                node_ids[parent] if parent >= 0 else None,
+                [node_ids[child] for child in
+                 children_index[children_offsets[position]:children_offsets[position + 1]]],
+            ])
+
+        return {
+            "job_id": artifact.job_id,
+            "created_at": artifact.created_at,
+            "columnar": True,
+            "nodes": nodes,
+            "edges": [
+                [edge_id, node_ids[source], node_ids[target], artifact.edge_types[edge_type], weight,
+                 artifact.edge_metadata.get(str(position)) or None]
+                for position, (edge_id, source, target, edge_type, weight) in enumerate(zip(
+                    artifact.edge_ids, columns["edge_source"], columns["edge_target"],
+                    columns["edge_type"], columns["edge_weight"]))
+            ],
+            "cross_references": [list(row) for row in zip(
+                refs["ref_id"], refs["source_element"], refs["target_element"],
+                refs["ref_type"], refs["confidence"], refs["context"])],
+            "aliases": {term: list(alias_list) for term, alias_list in artifact.aliases.items()},
+        }
+
+    @staticmethod
+    def _json_segment(job_dir: Path) -> Dict[str, Any]:
+        """Segment parsed from graph_snapshot.json and alias_map.json"""
+        graph_data = json.loads((job_dir / "graph_snapshot.json").read_text(encoding="utf-8"))
+        aliases: Dict[str, Any] = {}
+        alias_file = job_dir / "alias_map.json"
+        if alias_file.exists():
+            aliases = json.loads(alias_file.read_text(encoding="utf-8")).get("aliases", {})
+
+        segment = {
+            "job_id": graph_data.get("job_id", job_dir.name),
+            # [node_id, node_type, title, parent_id, children]; content and metadata
+            # stay in the job's artifacts at the same position
+            "nodes": [
+                [node_id, node.get("node_type", "unknown"), node.get("title", ""),
+                 node.get("parent_id"), node.get("children") or []]
+                for node_id, node in graph_data.get("nodes", {}).items()
+            ],
+            # [edge_id, source_id, target_id, edge_type, weight, metadata]
+            "edges": [
+                [edge.get("edge_id", ""), edge.get("source_id", ""), edge.get("target_id", ""),
+                 edge.get("edge_type", "unknown"), edge.get("weight", 1.0), edge.get("metadata") or None]
+                for edge in graph_data.get("edges", [])
+            ],
+            # [ref_id, source_element, target_element, ref_type, confidence, context]
+            "cross_references": [
+                [ref.get("ref_id", ""), ref.get("source_element", ""), ref.get("target_element", ""),
+                 ref.get("ref_type", "unknown"), ref.get("confidence", 0.0), ref.get("context", "")]
+                for ref in graph_data.get("cross_references", [])
+            ],
+            "aliases": {
+                term: alias_list if isinstance(alias_list, list) else [str(alias_list)]
+                for term, alias_list in aliases.items()
+            },
+        }
+        if "created_at" in graph_data:
+            segment["created_at"] = graph_data["created_at"]
+        return segment
+
+    # ------------------------------------------------------------------ #
+    # Merge
+    # ------------------------------------------------------------------ #
+
+    def _content_source(self, name: str) -> SegmentContentSource:
+        """Content source for a segment, reused while its fingerprint is unchanged"""
+        fingerprint = tuple(self._segments[name]["fingerprint"])
+        cached = self._content_sources.get(name)
+        if cached is None or cached[0] != fingerprint:
+            source = SegmentContentSource(self.base_path / name, self._segments[name].get("columnar", False))
+            cached = self._content_sources[name] = (fingerprint, source)
+        return cached[1]
+
+    def _merge_segments(self) -> GraphSnapshot:
+        nodes: Dict[str, GraphNode] = {}
+        edges: List[GraphEdge] = []
+        cross_references: List[CrossReference] = []
+        aliases: Dict[str, set] = {}
+        created_at = 0.0
+        for name in [name for name in self._content_sources if name not in self._segments]:
+            del self._content_sources[name]
+
+        for name in sorted(self._segments):
+            segment = self._segments[name]
+            job_id = segment["job_id"]
+            created_at = max(created_at, segment.get("created_at") or 0.0)
+
+            source = self._content_source(name)
+
+            def scoped(node_id: Optional[str]) -> Optional[str]:
+                return f"{job_id}::{node_id}" if node_id else node_id
+
+            for position, (node_id, node_type, title, parent_id, children) in enumerate(segment["nodes"]):
+                node_id = scoped(node_id)
+                nodes[node_id] = SegmentGraphNode(
+                    node_id=node_id,
+                    node_type=node_type,
+                    title=title,
+                    parent_id=scoped(parent_id),
+                    children=[scoped(child) for child in children],
+                    source=source,
+                    position=position,
+                    job_id=job_id,
+                )
+
+            for edge_id, source_id, target_id, edge_type, weight, metadata in segment["edges"]:
+                edges.append(GraphEdge(
+                    edge_id=edge_id,
+                    source_id=scoped(source_id),
+                    target_id=scoped(target_id),
+                    edge_type=edge_type,
+                    weight=weight,
+                    metadata=metadata or {},
+                ))
+
+            for ref_id, source_element, target_element, ref_type, confidence, context in segment["cross_references"]:
+                cross_references.append(CrossReference(
+                    ref_id=ref_id,
+                    source_element=source_element,
+                    target_element=target_element,
+                    ref_type=ref_type,
+                    confidence=confidence,
+                    context=context,
+                ))
+
+            for term, alias_list in segment["aliases"].items():
+                aliases.setdefault(term.lower(), set()).update(alias.lower() for alias in alias_list)
+
+        return GraphSnapshot(
+            job_id=f"merged:{self.environment}",
+            created_at=created_at or time.time(),
+            nodes=nodes,
+            edges=edges,
+            cross_references=cross_references,
+            aliases=aliases,
+        )
+
+
+# Per-process index instances, keyed by artifacts base path
+_index_instances: Dict[str, MergedGraphIndex] = {}
+_index_lock = Lock()
+
+
+def get_merged_graph_index(environment: str, base_path: Optional[Path] = None) -> MergedGraphIndex:
+    """Get or create the merged graph index for an environment's artifacts directory"""
+    index = MergedGraphIndex(environment, base_path)
+    key = str(index.base_path.resolve())
+    with _index_lock:
+        return _index_instances.setdefault(key, index)
+
+
+def update_merged_graph_index(environment: str, job_dir: Path) -> bool:
+    """Add a just-finalized job to its environment's merged graph index"""
+    job_dir = Path(job_dir)
+    added = get_merged_graph_index(environment, job_dir.parent).add_job(job_dir)
+    if added:
+        notify_snapshot_written(environment, job_dir)
+    return added
+
+
+def remove_from_merged_graph_index(environment: str, job_dir: Path) -> bool:
+    """Remove a deleted job from its environment's merged graph index"""
+    job_dir = Path(job_dir)
+    index = get_merged_graph_index(environment, job_dir.parent)
+    if index.index_mtime() is None:
+        return False
+    removed = index.remove_job(job_dir.name)
+    if removed:
+        notify_snapshot_written(environment, job_dir)
+    return removed
@@ -8,13 +8,22 @@ from __future__ import annotations
 
 import json
 import time
+from collections import deque
+from collections.abc import Mapping, Sequence
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set
-from dataclasses import dataclass
-from threading import Lock
+from typing import Callable, Dict, Any, Iterator, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from threading import Event, Lock, Thread
 import os
 
 from ..ttrpg_logging import get_logger
+from ..graph_artifact import (
+    GRAPH_ARTIFACT_FILENAME,
+    GRAPH_CONTENT_FILENAME,
+    GraphArtifact,
+    has_graph_artifact,
+    read_graph_artifact,
+)
 
 logger = get_logger(__name__)
 
@@ -57,16 +66,174 @@ class CrossReference:
     context: str
 
 
+_UNSET = object()
+
+
+class LazyGraphNode(GraphNode):
+    """GraphNode view over a columnar artifact; content and metadata load on first access"""
+
+    def __init__(self, artifact: GraphArtifact, position: int):
+        columns = artifact.columns
+        self._artifact = artifact
+        self._position = position
+        self._content = _UNSET
+        self._metadata = _UNSET
+
+        self.node_id = artifact.node_ids[position]
+        self.node_type = artifact.node_types[columns["node_type"][position]]
+        self.title = artifact.titles[position]
+        parent = columns["parent"][position]
+        self.parent_id = artifact.node_ids[parent] if parent >= 0 else None
+        start, end = columns["children_offsets"][position], columns["children_offsets"][position + 1]
+        self.children = [artifact.node_ids[child] for child in columns["children_index"][start:end]]
+
+    @property
+    def content(self) -> Optional[str]:
+        if self._content is _UNSET:
+            self._content = self._artifact.node_content(self._position)
+        return self._content
+
+    @content.setter
+    def content(self, value: Optional[str]) -> None:
+        self._content = value
+
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        if self._metadata is _UNSET:
+            self._metadata = self._artifact.node_metadata(self._position)
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Optional[Dict[str, Any]]) -> None:
+        self._metadata = value
+
+
+class ColumnarNodeMap(Mapping):
+    """Read-only node_id -> GraphNode mapping that materialises nodes on access"""
+
+    def __init__(self, artifact: GraphArtifact):
+        self._artifact = artifact
+        self._positions = {node_id: i for i, node_id in enumerate(artifact.node_ids[:artifact.node_count])}
+        # Materialised nodes are kept so their loaded content is reused across lookups
+        self._materialised: Dict[str, LazyGraphNode] = {}
+
+    def __getitem__(self, node_id: str) -> GraphNode:
+        node = self._materialised.get(node_id)
+        if node is None:
+            node = self._materialised.setdefault(node_id, LazyGraphNode(self._artifact, self._positions[node_id]))
+        return node
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+
+class ColumnarEdgeList(Sequence):
+    """Read-only edge sequence over a columnar artifact's index-pair arrays"""
+
+    def __init__(self, artifact: GraphArtifact):
+        self._artifact = artifact
+
+    def __len__(self) -> int:
+        return len(self._artifact.edge_ids)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        artifact, columns = self._artifact, self._artifact.columns
+        if position < 0:
+            position += len(self)
+        return GraphEdge(
+            edge_id=artifact.edge_ids[position],
+            source_id=artifact.node_ids[columns["edge_source"][position]],
+            target_id=artifact.node_ids[columns["edge_target"][position]],
+            edge_type=artifact.edge_types[columns["edge_type"][position]],
+            weight=columns["edge_weight"][position],
+            metadata=artifact.edge_metadata.get(str(position), {}),
+        )
+
+    def endpoint_pairs(self) -> Iterator[Tuple[str, str]]:
+        """(source_id, target_id) for every edge without building GraphEdge objects"""
+        node_ids, columns = self._artifact.node_ids, self._artifact.columns
+        for source, target in zip(columns["edge_source"], columns["edge_target"]):
+            yield node_ids[source], node_ids[target]
+
+
+# Substring lookups over cross-reference elements use a trigram index; shorter
+# queries fall back to a scan of the distinct element vocabulary.
+_NGRAM = 3
+
+
+def _ngrams(text: str) -> Set[str]:
+    return {text[i:i + _NGRAM] for i in range(len(text) - _NGRAM + 1)}
+
+
 @dataclass
 class GraphSnapshot:
-    """Complete graph structure loaded from Pass E artifacts"""
+    """Complete graph structure loaded from Pass E artifacts
+
+    Lookup indexes (adjacency lists, reverse alias map, cross-reference element
+    index) are compiled once at construction. Call ``reindex()`` after mutating
+    ``edges``, ``cross_references`` or ``aliases`` in place.
+    """
     job_id: str
     created_at: float
-    nodes: Dict[str, GraphNode]
-    edges: List[GraphEdge]
+    nodes: Dict[str, GraphNode]  # read-only ColumnarNodeMap when loaded from graph_snapshot.bin
+    edges: List[GraphEdge]  # read-only ColumnarEdgeList when loaded from graph_snapshot.bin
     cross_references: List[CrossReference]
     aliases: Dict[str, Set[str]]  # term -> set of aliases
 
+    _adjacency: Dict[str, List[str]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _alias_lower: Dict[str, Set[str]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _reverse_aliases: Dict[str, Set[str]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _element_refs: Dict[str, List[int]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _element_vocab: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _element_ngrams: Dict[str, Set[str]] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.reindex()
+
+    def reindex(self) -> None:
+        """Rebuild adjacency, alias and cross-reference lookup indexes"""
+        # Undirected adjacency in edge order, so traversal order matches a scan of self.edges
+        adjacency: Dict[str, List[str]] = {}
+        if isinstance(self.edges, ColumnarEdgeList):
+            pairs = self.edges.endpoint_pairs()
+        else:
+            pairs = ((edge.source_id, edge.target_id) for edge in self.edges)
+        for source_id, target_id in pairs:
+            adjacency.setdefault(source_id, []).append(target_id)
+            adjacency.setdefault(target_id, []).append(source_id)
+        self._adjacency = adjacency
+
+        # Forward and reverse alias maps, both keyed by lowercase term
+        alias_lower: Dict[str, Set[str]] = {}
+        reverse_aliases: Dict[str, Set[str]] = {}
+        for key, alias_set in self.aliases.items():
+            alias_lower.setdefault(key.lower(), set()).update(alias_set)
+            for alias in alias_set:
+                reverse_aliases.setdefault(alias.lower(), set()).add(key)
+        self._alias_lower = alias_lower
+        self._reverse_aliases = reverse_aliases
+
+        # Distinct lowercase elements -> cross-reference positions, plus trigram postings
+        element_refs: Dict[str, List[int]] = {}
+        for position, ref in enumerate(self.cross_references):
+            for element in {ref.source_element.lower(), ref.target_element.lower()}:
+                element_refs.setdefault(element, []).append(position)
+        element_ngrams: Dict[str, Set[str]] = {}
+        for element in element_refs:
+            for gram in _ngrams(element):
+                element_ngrams.setdefault(gram, set()).add(element)
+        self._element_refs = element_refs
+        self._element_vocab = sorted(element_refs)
+        self._element_ngrams = element_ngrams
+
     def get_node(self, node_id: str) -> Optional[GraphNode]:
         """Get node by ID"""
         return self.nodes.get(node_id)
@@ -78,17 +245,21 @@ class GraphSnapshot:
             return []
         return [self.nodes[child_id] for child_id in node.children if child_id in self.nodes]
 
+    def get_neighbors(self, node_id: str) -> List[str]:
+        """Get IDs of nodes sharing an edge with the given node (either direction)"""
+        return list(self._adjacency.get(node_id, ()))
+
     def get_related_nodes(self, node_id: str, max_depth: int = 2) -> List[GraphNode]:
         """Get related nodes via graph traversal (BFS)"""
         if node_id not in self.nodes:
             return []
 
         visited = set()
-        queue = [(node_id, 0)]
+        queue = deque([(node_id, 0)])
         related = []
 
         while queue and len(related) < 50:  # Limit results
-            current_id, depth = queue.pop(0)
+            current_id, depth = queue.popleft()
 
             if current_id in visited or depth > max_depth:
                 continue
@@ -99,20 +270,43 @@ class GraphSnapshot:
             if current_node and depth > 0:  # Don't include self
                 related.append(current_node)
 
+            if depth == max_depth:
+                continue
+
             # Add connected nodes to queue
-            for edge in self.edges:
-                if edge.source_id == current_id and edge.target_id not in visited:
-                    queue.append((edge.target_id, depth + 1))
-                elif edge.target_id == current_id and edge.source_id not in visited:
-                    queue.append((edge.source_id, depth + 1))
+            for neighbor_id in self._adjacency.get(current_id, ()):
+                if neighbor_id not in visited:
+                    queue.append((neighbor_id, depth + 1))
 
         return related
 
+    def _matching_elements(self, needle: str) -> List[str]:
+        """Distinct lowercase cross-reference elements containing ``needle``"""
+        if len(needle) < _NGRAM:
+            return [element for element in self._element_vocab if needle in element]
+
+        # Intersect trigram postings, rarest first, then verify the substring
+        candidates: Optional[Set[str]] = None
+        for gram in sorted(_ngrams(needle), key=lambda g: len(self._element_ngrams.get(g, ()))):
+            postings = self._element_ngrams.get(gram)
+            if not postings:
+                return []
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                return []
+        return [element for element in candidates if needle in element]
+
     def find_cross_references(self, element: str) -> List[CrossReference]:
         """Find cross-references for a given element"""
-        return [ref for ref in self.cross_references
-                if element.lower() in ref.source_element.lower() or
-                   element.lower() in ref.target_element.lower()]
+        return self.find_cross_references_any([element])
+
+    def find_cross_references_any(self, elements: List[str]) -> List[CrossReference]:
+        """Find cross-references matching any of the given elements, in snapshot order"""
+        positions: Set[int] = set()
+        for element in elements:
+            for match in self._matching_elements(element.lower()):
+                positions.update(self._element_refs[match])
+        return [self.cross_references[position] for position in sorted(positions)]
 
     def expand_aliases(self, term: str) -> Set[str]:
         """Get aliases for a term"""
@@ -120,18 +314,346 @@ class GraphSnapshot:
         aliases = set([term])  # Include original term
 
         # Direct aliases
-        if term_lower in self.aliases:
-            aliases.update(self.aliases[term_lower])
+        if term_lower in self._alias_lower:
+            aliases.update(self._alias_lower[term_lower])
 
         # Reverse lookup - find terms that have this as an alias
-        for key, alias_set in self.aliases.items():
-            if term_lower in {alias.lower() for alias in alias_set}:
-                aliases.add(key)
-                aliases.update(alias_set)
+        for key in self._reverse_aliases.get(term_lower, ()):
+            aliases.add(key)
+            aliases.update(self.aliases[key])
 
         return aliases
 
 
+# Files whose (mtime, size) identify one version of a job's graph snapshot
+SNAPSHOT_FILES = (GRAPH_ARTIFACT_FILENAME, GRAPH_CONTENT_FILENAME, "graph_snapshot.json", "alias_map.json")
+
+SnapshotSignature = Tuple[Tuple[int, int], ...]
+
+
+def _file_signature(path: Path) -> Tuple[int, int]:
+    try:
+        stat = path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return (0, 0)
+
+
+def snapshot_signature(artifact_dir: Path) -> SnapshotSignature:
+    """Version of the snapshot files in ``artifact_dir``; missing files count as (0, 0)"""
+    return tuple(_file_signature(Path(artifact_dir) / name) for name in SNAPSHOT_FILES)
+
+
+@dataclass
+class _RegistryEntry:
+    environment: str
+    artifact_dir: Path
+    signature: SnapshotSignature
+    snapshot: GraphSnapshot
+    loaded_at: float
+    load_ms: float
+    load: Callable[[Path], Optional[GraphSnapshot]]
+    signature_of: Callable[[Path], SnapshotSignature] = snapshot_signature
+    # Brings the files behind the signature up to date before they are versioned
+    sync: Optional[Callable[[], Any]] = None
+
+
+class GraphSnapshotRegistry:
+    """
+    Process-wide cache of parsed per-job graph snapshots.
+
+    Entries are keyed by (environment, job directory) and carry the snapshot
+    files' signature (mtime and size), so every GraphLoader shares one parsed
+    copy of a job's graph and a rewritten snapshot is never served stale.
+    Concurrent requests for the same job parse it once. The merged view over
+    all finalized jobs (``get_merged``) is one more entry, versioned by the
+    persisted index file.
+
+    A daemon thread re-stats the cached jobs every ``refresh_interval_s`` and
+    reparses the ones Pass E rewrote, so requests do not pay for the reload;
+    it also bumps the environment's generation when a job directory gains or
+    changes its snapshot, which tells loaders to re-resolve "latest".
+    """
+
+    def __init__(self, refresh_interval_s: Optional[float] = None):
+        if refresh_interval_s is None:
+            refresh_interval_s = float(os.getenv("GRAPH_SNAPSHOT_REFRESH_S", "30"))
+        self.refresh_interval_s = refresh_interval_s
+        self._entries: Dict[Tuple[str, str], _RegistryEntry] = {}
+        self._key_locks: Dict[Tuple[str, str], Lock] = {}
+        self._generations: Dict[str, int] = {}
+        self._scans: Dict[str, Dict[str, SnapshotSignature]] = {}
+        self._lock = Lock()
+        self._wake = Event()
+        self._refresher: Optional[Thread] = None
+        self._metrics: Dict[str, float] = {
+            "loads": 0, "hits": 0, "stale_reloads": 0, "background_reloads": 0, "load_failures": 0,
+            "load_seconds_total": 0.0, "last_load_ms": 0.0, "max_load_ms": 0.0,
+        }
+
+    def get(
+        self,
+        environment: str,
+        artifact_dir: Path,
+        load: Callable[[Path], Optional[GraphSnapshot]],
+        force_reload: bool = False,
+    ) -> Optional[GraphSnapshot]:
+        """Snapshot for ``artifact_dir``, parsed with ``load`` unless a current copy is cached"""
+        return self._get(environment, Path(artifact_dir).resolve(), load, snapshot_signature, None, force_reload)
+
+    def get_merged(self, environment: str, index: Any, force_reload: bool = False) -> Optional[GraphSnapshot]:
+        """
+        Merged snapshot of a ``MergedGraphIndex``, unless a current copy is cached.
+
+        Requests only stat the persisted index file. Job directories are
+        synced into the index by the background refresher and by
+        ``notify_written``; a request only does it when nothing is cached yet
+        or another process rewrote the index.
+        """
+        def load(_: Path) -> Optional[GraphSnapshot]:
+            return index.get_snapshot()
+
+        def signature_of(_: Path) -> SnapshotSignature:
+            return (_file_signature(index.index_path),)
+
+        return self._get(environment, index.base_path.resolve(), load, signature_of, index.refresh, force_reload)
+
+    def _get(
+        self,
+        environment: str,
+        artifact_dir: Path,
+        load: Callable[[Path], Optional[GraphSnapshot]],
+        signature_of: Callable[[Path], SnapshotSignature],
+        sync: Optional[Callable[[], Any]],
+        force_reload: bool,
+    ) -> Optional[GraphSnapshot]:
+        key = (environment, str(artifact_dir))
+        signature = signature_of(artifact_dir)
+
+        entry = self._entries.get(key)
+        if not force_reload and entry is not None and entry.signature == signature:
+            self._count("hits")
+            return entry.snapshot
+
+        with self._key_lock(key):
+            # Another thread may have loaded this version while we waited
+            entry = self._entries.get(key)
+            if not force_reload and entry is not None and entry.signature == signature:
+                self._count("hits")
+                return entry.snapshot
+            if entry is not None and entry.signature != signature:
+                self._count("stale_reloads")
+            return self._load(key, environment, artifact_dir, signature, load, signature_of, sync)
+
+    def is_current(self, environment: str, snapshot: GraphSnapshot, generation: int) -> bool:
+        """True if ``snapshot`` is still the registered copy and the environment has not changed since ``generation``"""
+        if self.generation(environment) != generation:
+            return False
+        return any(entry.snapshot is snapshot for entry in list(self._entries.values()))
+
+    def generation(self, environment: str) -> int:
+        return self._generations.get(environment, 0)
+
+    def notify_written(self, environment: str, artifact_dir: Optional[Path] = None) -> None:
+        """Pass E wrote a snapshot in this process: re-resolve loaders and refresh now"""
+        with self._lock:
+            self._generations[environment] = self.generation(environment) + 1
+        if artifact_dir is not None:
+            key = (environment, str(Path(artifact_dir).resolve()))
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._reload_if_changed(key, entry)
+        # Merged views of the environment pick up the job before the next request
+        for key, entry in list(self._entries.items()):
+            if entry.environment == environment and entry.sync is not None:
+                self._reload_if_changed(key, entry)
+        self._wake.set()
+
+    def refresh(self) -> int:
+        """Reparse cached snapshots whose files changed; returns the number reloaded"""
+        reloaded = 0
+        for key, entry in list(self._entries.items()):
+            if not entry.artifact_dir.exists():
+                with self._lock:
+                    if self._entries.get(key) is entry:
+                        del self._entries[key]
+                        self._generations[entry.environment] = self.generation(entry.environment) + 1
+                continue
+            if self._reload_if_changed(key, entry):
+                reloaded += 1
+
+        for environment in {entry.environment for entry in list(self._entries.values())}:
+            scan = self._scan_environment(environment)
+            with self._lock:
+                previous = self._scans.get(environment)
+                self._scans[environment] = scan
+                if previous is not None and previous != scan:
+                    self._generations[environment] = self.generation(environment) + 1
+        return reloaded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._scans.clear()
+            for environment in self._generations:
+                self._generations[environment] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Load counts and latency for the shared snapshots"""
+        with self._lock:
+            metrics: Dict[str, Any] = dict(self._metrics)
+            entries = list(self._entries.values())
+        loads = metrics["loads"]
+        metrics["avg_load_ms"] = (metrics["load_seconds_total"] * 1000 / loads) if loads else 0.0
+        metrics["entries"] = len(entries)
+        metrics["snapshots"] = {
+            str(entry.artifact_dir): {
+                "environment": entry.environment,
+                "job_id": entry.snapshot.job_id,
+                "load_ms": entry.load_ms,
+                "age_seconds": time.time() - entry.loaded_at,
+            }
+            for entry in entries
+        }
+        return metrics
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._refresher = self._refresher, None
+        if thread is not None:
+            self.refresh_interval_s = 0
+            self._wake.set()
+            thread.join(5.0)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _load(
+        self,
+        key: Tuple[str, str],
+        environment: str,
+        artifact_dir: Path,
+        signature: SnapshotSignature,
+        load: Callable[[Path], Optional[GraphSnapshot]],
+        signature_of: Callable[[Path], SnapshotSignature] = snapshot_signature,
+        sync: Optional[Callable[[], Any]] = None,
+    ) -> Optional[GraphSnapshot]:
+        started = time.perf_counter()
+        try:
+            if sync is not None:
+                # Version the snapshot by what the sync left on disk
+                sync()
+                signature = signature_of(artifact_dir)
+            snapshot = load(artifact_dir)
+        except Exception:
+            self._count("load_failures")
+            raise
+        elapsed = time.perf_counter() - started
+        scan = self._scan_environment(environment) if environment not in self._scans else None
+
+        with self._lock:
+            self._metrics["loads"] += 1
+            self._metrics["load_seconds_total"] += elapsed
+            self._metrics["last_load_ms"] = elapsed * 1000
+            self._metrics["max_load_ms"] = max(self._metrics["max_load_ms"], elapsed * 1000)
+            if snapshot is None:
+                self._entries.pop(key, None)
+                return None
+            self._entries[key] = _RegistryEntry(
+                environment=environment, artifact_dir=artifact_dir, signature=signature,
+                snapshot=snapshot, loaded_at=time.time(), load_ms=elapsed * 1000, load=load,
+                signature_of=signature_of, sync=sync,
+            )
+            if scan is not None:
+                self._scans.setdefault(environment, scan)
+        self._ensure_refresher()
+        return snapshot
+
+    def _reload_if_changed(self, key: Tuple[str, str], entry: _RegistryEntry) -> bool:
+        if entry.sync is not None:
+            try:
+                entry.sync()
+            except Exception as e:
+                logger.warning(f"Background sync of graph snapshot {entry.artifact_dir} failed: {e}")
+                return False
+        signature = entry.signature_of(entry.artifact_dir)
+        if signature == entry.signature:
+            return False
+        with self._key_lock(key):
+            current = self._entries.get(key)
+            if current is None or current.signature == signature:
+                return False
+            try:
+                self._load(key, entry.environment, entry.artifact_dir, signature, entry.load,
+                           entry.signature_of, entry.sync)
+            except Exception as e:
+                logger.warning(f"Background reload of graph snapshot {entry.artifact_dir} failed: {e}")
+                return False
+        self._count("background_reloads")
+        logger.info(f"Reloaded changed graph snapshot from {entry.artifact_dir}")
+        return True
+
+    @staticmethod
+    def _scan_environment(environment: str) -> Dict[str, SnapshotSignature]:
+        base_path = Path(f"artifacts/ingest/{environment}")
+        if not base_path.exists():
+            return {}
+        return {
+            str(job_dir): snapshot_signature(job_dir)
+            for job_dir in base_path.iterdir()
+            if job_dir.is_dir() and ((job_dir / "graph_snapshot.json").exists() or has_graph_artifact(job_dir))
+        }
+
+    def _key_lock(self, key: Tuple[str, str]) -> Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = Lock()
+            return lock
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._metrics[name] += 1
+
+    def _ensure_refresher(self) -> None:
+        if self.refresh_interval_s <= 0:
+            return
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = Thread(target=self._refresh_loop, name="graph-snapshot-refresh", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while self.refresh_interval_s > 0:
+            self._wake.wait(self.refresh_interval_s)
+            self._wake.clear()
+            if self.refresh_interval_s <= 0:
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Graph snapshot refresh failed: {e}")
+
+
+_snapshot_registry: Optional[GraphSnapshotRegistry] = None
+_snapshot_registry_lock = Lock()
+
+
+def get_snapshot_registry() -> GraphSnapshotRegistry:
+    """The process-wide graph snapshot registry"""
+    global _snapshot_registry
+    with _snapshot_registry_lock:
+        if _snapshot_registry is None:
+            _snapshot_registry = GraphSnapshotRegistry()
+        return _snapshot_registry
+
+
+def notify_snapshot_written(environment: str, artifact_dir: Optional[Path] = None) -> None:
+    """Tell loaders in this process that Pass E wrote a new graph snapshot"""
+    get_snapshot_registry().notify_written(environment, artifact_dir)
+
+
 class GraphLoader:
     """
     Loads and caches graph artifacts from Pass E ingestion jobs.
@@ -139,13 +661,21 @@ class GraphLoader:
     Provides environment-specific loading and caching for optimal performance.
     """
 
-    def __init__(self, environment: str = None):
+    def __init__(self, environment: str = None, merge_sources: Optional[bool] = None):
         self.environment = environment or os.getenv("APP_ENV", "dev")
         self.cache_ttl = 3600  # 1 hour cache TTL
         self._cache: Dict[str, GraphSnapshot] = {}
         self._cache_timestamps: Dict[str, float] = {}
+        # Registry generation each cached entry was resolved at
+        self._cache_generations: Dict[str, int] = {}
         self._lock = Lock()
 
+        # Without a job_id, serve the merged view over all finalized jobs
+        if merge_sources is None:
+            merge_sources = os.getenv("GRAPH_MERGE_SOURCES", "true").lower() not in ("0", "false", "no")
+        self.merge_sources = merge_sources
+        self._merged_index = None
+
         logger.info(f"GraphLoader initialized for environment: {self.environment}")
 
     def get_artifact_directory(self, job_id: str = None) -> Optional[Path]:
@@ -209,45 +739,104 @@ class GraphLoader:
         Load graph snapshot from artifacts.
 
         Args:
-            job_id: Specific job ID, or None for latest
+            job_id: Specific job ID, or None for the merged view over all
+                finalized jobs (the latest job when merge_sources is False)
             force_reload: Force reload from disk, ignoring cache
 
         Returns:
             GraphSnapshot or None if not available
         """
+        if job_id is None and self.merge_sources:
+            return self._load_merged_snapshot(force_reload)
+
         cache_key = job_id or "latest"
+        registry = get_snapshot_registry()
 
         with self._lock:
-            # Check cache first
+            # Check cache first; the registry says whether the snapshot is still current
             if not force_reload and cache_key in self._cache:
                 cached_time = self._cache_timestamps.get(cache_key, 0)
-                if (time.time() - cached_time) < self.cache_ttl:
+                if ((time.time() - cached_time) < self.cache_ttl and registry.is_current(
+                        self.environment, self._cache[cache_key], self._cache_generations.get(cache_key, -1))):
                     logger.debug(f"Returning cached graph for {cache_key}")
                     return self._cache[cache_key]
 
-            # Load from disk
+            # Resolve the job directory, then share its parsed snapshot with other loaders
+            generation = registry.generation(self.environment)
             artifact_dir = self.get_artifact_directory(job_id)
             if not artifact_dir:
                 return None
 
             try:
-                snapshot = self._load_snapshot_from_directory(artifact_dir)
+                previous = self._cache.get(cache_key)
+                snapshot = registry.get(self.environment, artifact_dir, self._load_snapshot_from_directory,
+                                        force_reload=force_reload)
                 if snapshot:
                     # Cache the result
                     self._cache[cache_key] = snapshot
                     self._cache_timestamps[cache_key] = time.time()
-                    logger.info(f"Loaded graph snapshot: {snapshot.job_id} "
-                              f"({len(snapshot.nodes)} nodes, {len(snapshot.edges)} edges, "
-                              f"{len(snapshot.cross_references)} cross-refs)")
+                    self._cache_generations[cache_key] = generation
+                    if snapshot is not previous:
+                        logger.info(f"Loaded graph snapshot: {snapshot.job_id} "
+                                  f"({len(snapshot.nodes)} nodes, {len(snapshot.edges)} edges, "
+                                  f"{len(snapshot.cross_references)} cross-refs)")
                     return snapshot
 
             except Exception as e:
                 logger.error(f"Failed to load graph snapshot from {artifact_dir}: {e}")
                 return None
 
+    def _load_merged_snapshot(self, force_reload: bool = False) -> Optional[GraphSnapshot]:
+        """Load the merged graph over every finalized job in the environment"""
+        from .graph_index import get_merged_graph_index
+
+        cache_key = "merged"
+        registry = get_snapshot_registry()
+
+        with self._lock:
+            if self._merged_index is None:
+                self._merged_index = get_merged_graph_index(self.environment)
+            index = self._merged_index
+
+            # The registry syncs the index with the job directories and says whether this copy is current
+            if not force_reload and cache_key in self._cache:
+                cached_time = self._cache_timestamps.get(cache_key, 0)
+                if ((time.time() - cached_time) < self.cache_ttl and registry.is_current(
+                        self.environment, self._cache[cache_key], self._cache_generations.get(cache_key, -1))):
+                    logger.debug("Returning cached merged graph")
+                    return self._cache[cache_key]
+
+            generation = registry.generation(self.environment)
+            try:
+                snapshot = registry.get_merged(self.environment, index, force_reload=force_reload)
+            except Exception as e:
+                logger.error(f"Failed to load merged graph for {self.environment}: {e}")
+                return None
+
+            if snapshot is None:
+                self._cache.pop(cache_key, None)
+                logger.warning(f"No finalized graph snapshots found for {self.environment}")
+                return None
+
+            if self._cache.get(cache_key) is not snapshot:
+                logger.info(f"Loaded merged graph for {self.environment}: "
+                            f"{len(index.get_sources())} sources, {len(snapshot.nodes)} nodes, "
+                            f"{len(snapshot.edges)} edges, {len(snapshot.cross_references)} cross-refs")
+            self._cache[cache_key] = snapshot
+            self._cache_timestamps[cache_key] = time.time()
+            self._cache_generations[cache_key] = generation
+            return snapshot
+
     def _load_snapshot_from_directory(self, artifact_dir: Path) -> Optional[GraphSnapshot]:
         """Load graph snapshot from artifact directory"""
 
+        # Prefer the columnar artifact; the JSON snapshot is the fallback/export format
+        if has_graph_artifact(artifact_dir):
+            try:
+                return self._load_columnar_snapshot(artifact_dir)
+            except Exception as e:
+                logger.warning(f"Falling back to JSON graph snapshot in {artifact_dir}: {e}")
+
         # Load graph snapshot
         graph_file = artifact_dir / "graph_snapshot.json"
         if not graph_file.exists():
@@ -317,13 +906,44 @@ class GraphLoader:
             aliases=alias_dict
         )
 
+    def _load_columnar_snapshot(self, artifact_dir: Path) -> GraphSnapshot:
+        """Load a snapshot backed by graph_snapshot.bin (node content stays on disk)"""
+        artifact = read_graph_artifact(artifact_dir)
+        refs = artifact.cross_references
+
+        cross_references = [
+            CrossReference(ref_id=ref_id, source_element=source, target_element=target,
+                           ref_type=ref_type, confidence=confidence, context=context)
+            for ref_id, source, target, ref_type, confidence, context in zip(
+                refs["ref_id"], refs["source_element"], refs["target_element"],
+                refs["ref_type"], refs["confidence"], refs["context"])
+        ]
+        aliases = {
+            term.lower(): {alias.lower() for alias in alias_list}
+            for term, alias_list in artifact.aliases.items()
+        }
+
+        return GraphSnapshot(
+            job_id=artifact.job_id,
+            created_at=artifact.created_at,
+            nodes=ColumnarNodeMap(artifact),
+            edges=ColumnarEdgeList(artifact),
+            cross_references=cross_references,
+            aliases=aliases
+        )
+
     def clear_cache(self) -> None:
         """Clear the graph cache"""
         with self._lock:
             self._cache.clear()
             self._cache_timestamps.clear()
+            self._cache_generations.clear()
             logger.info("Graph cache cleared")
 
+    def get_snapshot_metrics(self) -> Dict[str, Any]:
+        """Load counts and latency of the process-wide snapshot registry"""
+        return get_snapshot_registry().metrics()
+
     def get_cache_info(self) -> Dict[str, Any]:
         """Get cache information for debugging"""
         with self._lock:
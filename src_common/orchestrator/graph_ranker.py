@@ -178,7 +178,9 @@ class GraphQueryProcessor:
         """Find cross-references between two specific entities"""
         relevant_refs = []
 
-        for ref in graph.cross_references:
+        # Every match needs one entity inside source_element, so the indexed
+        # per-entity lookups are a complete candidate set
+        for ref in graph.find_cross_references_any([entity1, entity2]):
             e1_lower, e2_lower = entity1.lower(), entity2.lower()
             source_lower, target_lower = ref.source_element.lower(), ref.target_element.lower()
 
@@ -11,16 +11,30 @@ Integrates with QueryPlanner (FR-024) and Graph Augmented Retrieval (FR-025).
 """
 from __future__ import annotations
 
+import os
 import time
-from dataclasses import dataclass
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from threading import Lock
 from typing import Dict, List, Any, Optional, Union, Tuple
 from enum import Enum
 
+from ..spans import span
 from ..ttrpg_logging import get_logger
 from .classifier import Classification
 
 logger = get_logger(__name__)
 
+# Upper bound on cached per-(query, result) signals; the reranker is shared per environment
+MAX_SIGNAL_CACHE_ENTRIES = 5000
+
+# Signal groups in the order they are computed: cheapest first, so the
+# signals that finish before a deadline are the ones that cost least
+SIGNAL_GROUPS = ("vector", "content", "graph", "domain")
+
+# Results scored concurrently per signal group; shared by every reranker
+RERANK_WORKERS = int(os.getenv("RERANK_WORKERS", "4"))
+
 
 class RerankingStrategy(Enum):
     """Available reranking strategies based on query characteristics."""
@@ -78,6 +92,10 @@ class RerankedResult:
     reranking_time_ms: float
     strategy_used: RerankingStrategy
 
+    # Signal groups included in final_score; fewer than configured when the
+    # deadline stopped reranking early
+    signals_completed: List[str] = field(default_factory=list)
+
 
 @dataclass
 class RerankingConfig:
@@ -137,13 +155,15 @@ class HybridReranker:
             self.content_extractor = None
             self.domain_extractor = None
 
+    @span("rerank")
     def rerank_results(
         self,
         query: str,
         results: List[Dict[str, Any]],
         config: Optional[RerankingConfig] = None,
         query_plan: Optional[Dict[str, Any]] = None,
-        classification: Optional[Classification] = None
+        classification: Optional[Classification] = None,
+        deadline: Optional[float] = None
     ) -> List[RerankedResult]:
         """
         Rerank search results using multi-signal hybrid approach.
@@ -154,6 +174,10 @@ class HybridReranker:
             config: Reranking configuration (optional)
             query_plan: Query plan from QueryPlanner (optional)
             classification: Query classification (optional)
+            deadline: ``time.perf_counter()`` value after which no further
+                signal groups are computed; every result is scored with the
+                groups that completed (see ``signals_completed``), and none
+                are returned if no group completed
 
         Returns:
             List of reranked results with detailed scoring
@@ -163,6 +187,10 @@ class HybridReranker:
         if not results:
             return []
 
+        if deadline is not None and start_time >= deadline:
+            logger.info("Reranking deadline passed before any signal was computed")
+            return []
+
         config = config or self._get_default_config(classification)
 
         # Limit results to rerank for performance
@@ -170,34 +198,76 @@ class HybridReranker:
 
         logger.info(f"Reranking {len(results_to_rerank)} results with strategy: {config.strategy}")
 
-        # Extract signals for all results
-        reranked_results = []
-
-        for i, result in enumerate(results_to_rerank):
-            result_start_time = time.perf_counter()
+        # Signals are computed group by group (cheapest first) across all
+        # results, so every result always has the same signals when the
+        # deadline hits and partial scores stay comparable
+        groups = self.active_signal_groups(config)
+        cache_keys = [self._signal_cache_key(query, result, config) for result in results_to_rerank]
+        signals: List[RerankingSignals] = []
+        pending: List[int] = []
+        for i, cache_key in enumerate(cache_keys):
+            cached = self.signal_cache.get(cache_key) if config.enable_signal_caching else None
+            signals.append(cached if cached is not None else RerankingSignals())
+            if cached is None:
+                pending.append(i)
+        result_times = [0.0] * len(results_to_rerank)
+
+        completed: List[str] = []
+        for group in groups:
+            if not pending:
+                completed.append(group)
+                continue
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            with span(f"rerank.{group}"):
+                values = self._extract_group_for_results(
+                    group, query, results_to_rerank, pending, query_plan, classification, deadline, result_times
+                )
+            if values is None:
+                # The round missed the deadline; its signals are left out for every result
+                break
+            for i, group_values in values.items():
+                for name, value in group_values.items():
+                    setattr(signals[i], name, value)
+            completed.append(group)
+
+        if groups and not completed:
+            logger.info(f"Reranking deadline reached before any of {len(groups)} signal groups completed")
+            return []
 
-            # Extract all signals
-            signals = self._extract_signals(
-                query, result, config, query_plan, classification
+        if len(completed) < len(groups):
+            logger.info(
+                f"Reranking deadline reached after {len(completed)}/{len(groups)} signal groups "
+                f"({', '.join(completed)})"
             )
-
-            # Compute final score
-            final_score = self._compute_final_score(signals, config)
-
-            result_time_ms = (time.perf_counter() - result_start_time) * 1000
-
-            reranked_result = RerankedResult(
+        else:
+            for i in pending:
+                signals[i].recency_boost = self._compute_recency_boost(results_to_rerank[i])
+                signals[i].popularity_score = self._compute_popularity_score(results_to_rerank[i])
+                if config.enable_signal_caching:
+                    self._cache_signals(cache_keys[i], signals[i])
+
+        skipped = [group for group in groups if group not in completed]
+        reranked_results = []
+        for i, result in enumerate(results_to_rerank):
+            score_start_time = time.perf_counter()
+            if skipped:
+                signals[i].recency_boost = self._compute_recency_boost(result)
+                signals[i].popularity_score = self._compute_popularity_score(result)
+            final_score = self._compute_final_score(signals[i], config, skipped)
+            result_times[i] += time.perf_counter() - score_start_time
+
+            reranked_results.append(RerankedResult(
                 original_result=result,
                 original_rank=i,
                 original_score=result.get('score', 0.0),
                 final_score=final_score,
                 final_rank=0,  # Will be set after sorting
-                signals=signals,
-                reranking_time_ms=result_time_ms,
-                strategy_used=config.strategy
-            )
-
-            reranked_results.append(reranked_result)
+                signals=signals[i],
+                reranking_time_ms=result_times[i] * 1000,
+                strategy_used=config.strategy,
+                signals_completed=list(completed)
+            ))
 
         # Sort by final score
         reranked_results.sort(key=lambda x: x.final_score, reverse=True)
@@ -210,86 +280,142 @@ class HybridReranker:
 
         logger.info(
             f"Reranking completed in {total_time_ms:.2f}ms. "
-            f"Average per result: {total_time_ms/len(results_to_rerank):.2f}ms"
+            f"Average per result: {total_time_ms/max(1, len(reranked_results)):.2f}ms"
         )
 
         return reranked_results
 
-    def _extract_signals(
+    def active_signal_groups(self, config: RerankingConfig) -> List[str]:
+        """Signal groups this config computes, in cost order"""
+        extractors = {
+            "vector": (self.vector_extractor, config.vector_weight),
+            "content": (self.content_extractor, config.content_weight),
+            "graph": (self.graph_extractor, config.graph_weight),
+            "domain": (self.domain_extractor, config.domain_weight),
+        }
+        return [group for group in SIGNAL_GROUPS if extractors[group][0] and extractors[group][1] > 0]
+
+    @staticmethod
+    def _signal_cache_key(query: str, result: Dict[str, Any], config: RerankingConfig) -> str:
+        result_id = result.get('id', str(hash(str(result))))
+        return f"{query}:{result_id}:{config.strategy}"
+
+    def _cache_signals(self, cache_key: str, signals: RerankingSignals) -> None:
+        self.signal_cache[cache_key] = signals
+        if len(self.signal_cache) > MAX_SIGNAL_CACHE_ENTRIES:
+            # Evict the oldest entry (dicts keep insertion order)
+            try:
+                self.signal_cache.pop(next(iter(self.signal_cache)), None)
+            except (StopIteration, RuntimeError):
+                pass
+
+    def _extract_group_for_results(
+        self,
+        group: str,
+        query: str,
+        results: List[Dict[str, Any]],
+        indices: List[int],
+        query_plan: Optional[Dict[str, Any]],
+        classification: Optional[Classification],
+        deadline: Optional[float],
+        result_times: List[float]
+    ) -> Optional[Dict[int, Dict[str, float]]]:
+        """
+        One signal group for the given results, spread over the rerank pool.
+
+        Returns None if the group could not finish for every result before
+        ``deadline``; tasks still running then finish in the background and
+        their values are dropped.
+        """
+        def task(i: int) -> Tuple[int, Dict[str, float], float]:
+            task_start = time.perf_counter()
+            values = self._extract_group(group, query, results[i], query_plan, classification)
+            return i, values, time.perf_counter() - task_start
+
+        if len(indices) == 1 or RERANK_WORKERS <= 1:
+            outcomes = []
+            for i in indices:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return None
+                outcomes.append(task(i))
+        else:
+            futures = [_get_rerank_pool().submit(task, i) for i in indices]
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            done, not_done = wait(futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+            if not_done:
+                for future in not_done:
+                    future.cancel()
+                return None
+            outcomes = [future.result() for future in futures]
+
+        values: Dict[int, Dict[str, float]] = {}
+        for i, group_values, elapsed in outcomes:
+            values[i] = group_values
+            result_times[i] += elapsed
+        return values
+
+    def _extract_group(
         self,
+        group: str,
         query: str,
         result: Dict[str, Any],
-        config: RerankingConfig,
         query_plan: Optional[Dict[str, Any]],
         classification: Optional[Classification]
-    ) -> RerankingSignals:
-        """Extract all reranking signals for a single result."""
-
-        signals = RerankingSignals()
-
-        # Check cache first
-        result_id = result.get('id', str(hash(str(result))))
-        cache_key = f"{query}:{result_id}:{config.strategy}"
-
-        if config.enable_signal_caching and cache_key in self.signal_cache:
-            return self.signal_cache[cache_key]
-
+    ) -> Dict[str, float]:
+        """Signals of one group for a single result, as RerankingSignals field values."""
         try:
             # Vector similarity signals
-            if self.vector_extractor and config.vector_weight > 0:
-                vector_signals = self.vector_extractor.extract_signals(
-                    query, result, classification
-                )
-                signals.vector_similarity = vector_signals.get('similarity', 0.0)
-                signals.semantic_similarity = vector_signals.get('semantic', 0.0)
-
-            # Graph relationship signals
-            if self.graph_extractor and config.graph_weight > 0:
-                graph_signals = self.graph_extractor.extract_signals(
-                    query, result, query_plan
-                )
-                signals.graph_relevance = graph_signals.get('relevance', 0.0)
-                signals.relationship_score = graph_signals.get('relationships', 0.0)
-                signals.cross_reference_boost = graph_signals.get('cross_refs', 0.0)
+            if group == "vector":
+                vector_signals = self.vector_extractor.extract_signals(query, result, classification)
+                return {
+                    "vector_similarity": vector_signals.get('similarity', 0.0),
+                    "semantic_similarity": vector_signals.get('semantic', 0.0),
+                }
 
             # Content feature signals
-            if self.content_extractor and config.content_weight > 0:
-                content_signals = self.content_extractor.extract_signals(
-                    query, result, classification
-                )
-                signals.content_quality = content_signals.get('quality', 0.0)
-                signals.readability_score = content_signals.get('readability', 0.0)
-                signals.length_penalty = content_signals.get('length_penalty', 0.0)
-                signals.structure_score = content_signals.get('structure', 0.0)
+            if group == "content":
+                content_signals = self.content_extractor.extract_signals(query, result, classification)
+                return {
+                    "content_quality": content_signals.get('quality', 0.0),
+                    "readability_score": content_signals.get('readability', 0.0),
+                    "length_penalty": content_signals.get('length_penalty', 0.0),
+                    "structure_score": content_signals.get('structure', 0.0),
+                }
 
-            # Domain-specific TTRPG signals
-            if self.domain_extractor and config.domain_weight > 0:
-                domain_signals = self.domain_extractor.extract_signals(
-                    query, result, classification
-                )
-                signals.entity_match_score = domain_signals.get('entity_match', 0.0)
-                signals.mechanics_relevance = domain_signals.get('mechanics', 0.0)
-                signals.rulebook_authority = domain_signals.get('authority', 0.0)
+            # Graph relationship signals
+            if group == "graph":
+                graph_signals = self.graph_extractor.extract_signals(query, result, query_plan)
+                return {
+                    "graph_relevance": graph_signals.get('relevance', 0.0),
+                    "relationship_score": graph_signals.get('relationships', 0.0),
+                    "cross_reference_boost": graph_signals.get('cross_refs', 0.0),
+                }
 
-            # Simple metadata signals (computed directly)
-            signals.recency_boost = self._compute_recency_boost(result)
-            signals.popularity_score = self._compute_popularity_score(result)
+            # Domain-specific TTRPG signals
+            domain_signals = self.domain_extractor.extract_signals(query, result, classification)
+            return {
+                "entity_match_score": domain_signals.get('entity_match', 0.0),
+                "mechanics_relevance": domain_signals.get('mechanics', 0.0),
+                "rulebook_authority": domain_signals.get('authority', 0.0),
+            }
 
         except Exception as e:
-            logger.warning(f"Error extracting signals: {e}")
-
-        # Cache the signals
-        if config.enable_signal_caching:
-            self.signal_cache[cache_key] = signals
-
-        return signals
+            logger.warning(f"Error extracting {group} signals: {e}")
+            return {}
 
     def _compute_final_score(
         self,
         signals: RerankingSignals,
-        config: RerankingConfig
+        config: RerankingConfig,
+        skipped_groups: Optional[List[str]] = None
     ) -> float:
-        """Compute final reranking score from all signals."""
+        """
+        Compute final reranking score from all signals.
+
+        Signal groups in ``skipped_groups`` (cut off by the deadline) are left
+        out and the remaining weights scaled up, keeping partial scores on the
+        same scale as full ones.
+        """
 
         # Vector component
         vector_score = (
@@ -326,13 +452,21 @@ class HybridReranker:
         )
 
         # Weighted final score
-        final_score = (
-            vector_score * config.vector_weight +
-            graph_score * config.graph_weight +
-            content_score * config.content_weight +
-            domain_score * config.domain_weight +
-            metadata_score * config.metadata_weight
-        )
+        weighted = {
+            "vector": (vector_score, config.vector_weight),
+            "graph": (graph_score, config.graph_weight),
+            "content": (content_score, config.content_weight),
+            "domain": (domain_score, config.domain_weight),
+            "metadata": (metadata_score, config.metadata_weight),
+        }
+        final_score = sum(score * weight for score, weight in weighted.values())
+
+        if skipped_groups:
+            total_weight = sum(weight for _, weight in weighted.values())
+            kept_weight = sum(weight for group, (_, weight) in weighted.items() if group not in skipped_groups)
+            kept_score = sum(score * weight for group, (score, weight) in weighted.items()
+                             if group not in skipped_groups)
+            final_score = kept_score * total_weight / kept_weight if kept_weight > 0 else 0.0
 
         return max(0.0, min(1.0, final_score))
 
@@ -383,6 +517,7 @@ class HybridReranker:
 
     def get_reranking_metrics(self) -> Dict[str, Any]:
         """Get reranking performance metrics."""
+        graph_loader = getattr(self.graph_extractor, "graph_loader", None)
         return {
             "cache_size": len(self.signal_cache),
             "environment": self.environment,
@@ -391,7 +526,8 @@ class HybridReranker:
                 "graph": self.graph_extractor is not None,
                 "content": self.content_extractor is not None,
                 "domain": self.domain_extractor is not None
-            }
+            },
+            "graph_snapshots": graph_loader.get_snapshot_metrics() if graph_loader is not None else {}
         }
 
     def clear_cache(self) -> int:
@@ -399,4 +535,48 @@ class HybridReranker:
         cache_size = len(self.signal_cache)
         self.signal_cache.clear()
         logger.info(f"Cleared {cache_size} cached signal entries")
-        return cache_size
\ No newline at end of file
+        return cache_size
+
+
+# Global reranker instance per environment
+_reranker_instances: Dict[str, HybridReranker] = {}
+_reranker_lock = Lock()
+
+_rerank_pool: Optional[ThreadPoolExecutor] = None
+_rerank_pool_lock = Lock()
+
+
+def _get_rerank_pool() -> ThreadPoolExecutor:
+    """Thread pool that scores independent results of one signal group concurrently"""
+    global _rerank_pool
+    with _rerank_pool_lock:
+        if _rerank_pool is None:
+            _rerank_pool = ThreadPoolExecutor(max_workers=RERANK_WORKERS, thread_name_prefix="rerank")
+        return _rerank_pool
+
+
+def get_reranker(environment: str = None, refresh: bool = False) -> HybridReranker:
+    """
+    Get or create the shared hybrid reranker for an environment.
+
+    Building a reranker constructs all signal extractors (including a
+    GraphLoader), so callers should reuse this instance rather than
+    creating one per request.
+
+    Args:
+        environment: Environment name (dev/test/prod)
+        refresh: Build a new reranker (re-reading domain patterns) and make
+            it the shared instance
+
+    Returns:
+        HybridReranker instance for the environment
+    """
+    env = environment or os.getenv("APP_ENV", "dev")
+
+    reranker = None if refresh else _reranker_instances.get(env)
+    if reranker is None:
+        with _reranker_lock:
+            reranker = None if refresh else _reranker_instances.get(env)
+            if reranker is None:
+                reranker = _reranker_instances[env] = HybridReranker(environment=env)
+    return reranker
@@ -4,6 +4,7 @@ import os
 from dataclasses import dataclass
 from typing import Any, Dict, Mapping, Optional
 
+from ..spans import span
 from ..ttrpg_logging import get_logger
 from ..providers import any_provider_configured, get_provider
 from ..providers.base import LLMProviderError
@@ -117,12 +118,13 @@ def generate_rag_answers(
         temperature = float(model_cfg["temperature"])
 
     try:
-        result = provider.generate(
-            prompt=prompt,
-            model=model_name,
-            temperature=temperature,
-            metadata=dict(model_cfg) if isinstance(model_cfg, Mapping) else None,
-        )
+        with span(f"llm.{provider.name}"):
+            result = provider.generate(
+                prompt=prompt,
+                model=model_name,
+                temperature=temperature,
+                metadata=dict(model_cfg) if isinstance(model_cfg, Mapping) else None,
+            )
     except LLMProviderError as err:
         reason = err.public_message
         logger.warning("LLM provider error (%s): %s", provider.name, reason)
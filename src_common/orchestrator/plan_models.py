@@ -164,6 +164,11 @@ class PlanGenerationContext:
     max_results_to_rerank: int = 20
     reranking_timeout_ms: int = 100
 
+    # Staged retrieval budgets (rerank stage uses reranking_timeout_ms)
+    candidate_stage_budget_ms: int = 250
+    graph_stage_budget_ms: int = 50
+    candidate_pool_size: int = 50
+
     # Provenance tracking settings
     enable_provenance_tracking: bool = True
     track_query_processing: bool = True
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import copy
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 import yaml
 
@@ -52,14 +53,18 @@ def _safe_load_yaml(path: Path) -> Dict[str, Any]:
         return {}
 
 
-def load_policies() -> Dict[str, Any]:
-    """Load retrieval policies from env-specific path or fallback defaults."""
-    env = os.getenv("APP_ENV", "dev")
-    candidates = [
+def policy_candidates(environment: Optional[str] = None) -> List[Path]:
+    """Policy files checked by ``load_policies``, in priority order."""
+    env = environment or os.getenv("APP_ENV", "dev")
+    return [
         Path(f"env/{env}/config/retrieval_policies.yaml"),
         Path("config/retrieval_policies.yaml"),
     ]
-    for p in candidates:
+
+
+def load_policies(environment: Optional[str] = None) -> Dict[str, Any]:
+    """Load retrieval policies from env-specific path or fallback defaults."""
+    for p in policy_candidates(environment):
         if p.exists():
             data = _safe_load_yaml(p)
             if data:
@@ -77,6 +82,8 @@ def choose_plan(policies: Dict[str, Any], classification: Dict[str, Any]) -> Dic
         or policies.get("unknown", {}).get(i, {}).get(c)
         or {"vector_top_k": 8, "rerank": "mmr"}
     )
+    # Policies may be shared across requests; never mutate them in place
+    plan = copy.deepcopy(plan)
     # Cost guards
     if plan.get("graph_depth", 0) and int(plan["graph_depth"]) > 3:
         plan["graph_depth"] = 3
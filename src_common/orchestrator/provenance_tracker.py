@@ -15,6 +15,7 @@ import hashlib
 from typing import Dict, List, Any, Optional, Union
 from contextlib import contextmanager
 
+from ..spans import record_span
 from ..ttrpg_logging import get_logger
 from .provenance_models import (
     ProvenanceBundle,
@@ -456,6 +457,7 @@ class ProvenanceTracker:
             yield
         finally:
             duration = (time.perf_counter() - start_time) * 1000
+            record_span(f"provenance.{stage_name}", duration)
             logger.debug(f"Completed stage {stage_name} in {duration:.2f}ms")
 
     def _extract_source_type(self, source_path: str) -> str:
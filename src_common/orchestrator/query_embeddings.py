@@ -0,0 +1,283 @@
+"""
+Query embedding for vector retrieval.
+
+Queries are embedded with the same model and dimensionality reduction Pass D
+uses for chunks, so query vectors are comparable with stored embeddings.
+Results are cached in-process (and optionally in Redis) by normalised query
+text and model, concurrent identical queries share one provider call, and
+distinct concurrent queries are batched. When no embedding provider is
+configured, ``embed`` returns None and retrieval falls back to lexical search.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from threading import Event, Lock
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..ttrpg_logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+OPENAI_EMBEDDINGS_URL = "https://api.openai.com/v1/embeddings"
+
+EmbeddingProvider = Callable[[Sequence[str], str], List[List[float]]]
+
+
+def normalize_query_text(text: str) -> str:
+    """Cache key form of a query: lowercased, whitespace collapsed."""
+    return " ".join((text or "").lower().split())
+
+
+def openai_embedding_provider(texts: Sequence[str], model: str) -> List[List[float]]:
+    """Embed texts with the OpenAI embeddings API, reduced to Pass D's MODEL_DIM."""
+    import httpx
+
+    from ..pass_d_vector_enrichment import EMBED_DIM_REDUCTION, MODEL_DIM, reduce_embedding_dimensions
+    from ..ssl_bypass import get_httpx_verify_setting
+    from ..ttrpg_secrets import get_openai_client_config
+
+    config = get_openai_client_config()
+    headers = {"Authorization": f"Bearer {config['api_key']}", "Content-Type": "application/json"}
+    payload = {"input": [text[:8000] for text in texts], "model": model}
+
+    with httpx.Client(timeout=config.get("timeout", 30), verify=get_httpx_verify_setting()) as client:
+        response = client.post(OPENAI_EMBEDDINGS_URL, json=payload, headers=headers)
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item.get("index", 0))
+
+    vectors = []
+    for item in data:
+        embedding = item["embedding"]
+        if len(embedding) > MODEL_DIM:
+            embedding = reduce_embedding_dimensions(embedding, MODEL_DIM, EMBED_DIM_REDUCTION)
+        vectors.append(embedding)
+    return vectors
+
+
+def _default_provider() -> Optional[EmbeddingProvider]:
+    if os.getenv("QUERY_EMBEDDINGS_ENABLED", "true").lower() != "true":
+        return None
+    try:
+        from ..ttrpg_secrets import get_openai_client_config
+
+        if not get_openai_client_config().get("api_key"):
+            return None
+    except Exception:
+        return None
+    return openai_embedding_provider
+
+
+def _default_remote() -> Optional[Any]:
+    """Shared Redis tier, used only when enabled and the Redis service can serve values."""
+    if os.getenv("QUERY_EMBEDDING_REDIS_ENABLED", "false").lower() != "true":
+        return None
+    try:
+        from ..redis_service import get_redis_service
+
+        service = get_redis_service()
+    except Exception as e:
+        logger.warning(f"Redis unavailable for query embeddings: {e}")
+        return None
+    if service.client is None:
+        return None
+    if not service.features_enabled:
+        logger.info("Redis features are disabled; query embedding Redis tier inactive")
+        return None
+    return service
+
+
+class _PendingEmbedding:
+    """One in-flight query embedding that concurrent callers wait on."""
+
+    __slots__ = ("text", "key", "done", "vector")
+
+    def __init__(self, text: str, key: tuple):
+        self.text = text
+        self.key = key
+        self.done = Event()
+        self.vector: Optional[List[float]] = None
+
+
+class QueryEmbedder:
+    """
+    Embeds query text once per (normalised text, model).
+
+    Lookups go through an in-process LRU, then an optional shared tier (an
+    object with ``get_value``/``set_value``, normally ``RedisService``), then
+    the provider. Concurrent callers for the same text share one in-flight
+    request, and distinct texts arriving within ``batch_window_ms`` of each
+    other are sent to the provider as one multi-input request.
+    """
+
+    def __init__(self, provider: Optional[EmbeddingProvider] = None, model: Optional[str] = None,
+                 max_entries: Optional[int] = None, remote: Optional[Any] = None,
+                 batch_window_ms: Optional[float] = None, max_batch_size: Optional[int] = None):
+        self.provider = provider
+        self.model = model or os.getenv("QUERY_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+        self.max_entries = max_entries or int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+        self.remote = remote
+        self.remote_ttl = int(os.getenv("QUERY_EMBEDDING_REDIS_TTL", "86400"))
+        self.batch_window_ms = float(os.getenv("QUERY_EMBEDDING_BATCH_WINDOW_MS", "2")
+                                     if batch_window_ms is None else batch_window_ms)
+        self.max_batch_size = max(1, max_batch_size or int(os.getenv("QUERY_EMBEDDING_MAX_BATCH", "64")))
+        self.wait_timeout_s = float(os.getenv("QUERY_EMBEDDING_WAIT_TIMEOUT_S", "35"))
+        self._cache: "OrderedDict[tuple, List[float]]" = OrderedDict()
+        self._lock = Lock()
+        self._inflight: Dict[tuple, _PendingEmbedding] = {}
+        self._queue: List[_PendingEmbedding] = []
+        self._flushing = False
+        self._stats = {"hits": 0, "misses": 0, "errors": 0, "provider_calls": 0,
+                       "coalesced": 0, "remote_hits": 0, "batched_inputs": 0}
+
+    @property
+    def available(self) -> bool:
+        return self.provider is not None
+
+    def _key(self, normalized: str) -> tuple:
+        return (normalized, self.model)
+
+    def _remote_key(self, normalized: str) -> str:
+        digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+        return f"ttrpg:query_embedding:{self.model}:{digest}"
+
+    def cached(self, text: str) -> Optional[List[float]]:
+        """Return the query vector only if it is already in the in-process cache."""
+        key = self._key(normalize_query_text(text))
+        with self._lock:
+            return self._cache.get(key)
+
+    def embed(self, text: str) -> Optional[List[float]]:
+        """Return the query vector, or None when embeddings are unavailable or fail."""
+        normalized = normalize_query_text(text)
+        if not normalized or self.provider is None:
+            return None
+
+        key = self._key(normalized)
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                self._stats["hits"] += 1
+                return vector
+            self._stats["misses"] += 1
+
+            pending = self._inflight.get(key)
+            if pending is not None:
+                self._stats["coalesced"] += 1
+            else:
+                pending = _PendingEmbedding(normalized, key)
+                self._inflight[key] = pending
+                self._queue.append(pending)
+            lead = not self._flushing
+            if lead:
+                self._flushing = True
+
+        if lead:
+            self._drain()
+        elif not pending.done.wait(self.wait_timeout_s):
+            logger.warning("Timed out waiting for a shared query embedding; using lexical retrieval only")
+        return pending.vector
+
+    def _drain(self) -> None:
+        """Send queued texts to the provider in batches until the queue is empty."""
+        if self.batch_window_ms > 0:
+            time.sleep(self.batch_window_ms / 1000.0)
+        while True:
+            with self._lock:
+                batch = self._queue[: self.max_batch_size]
+                del self._queue[: len(batch)]
+                if not batch:
+                    self._flushing = False
+                    return
+            try:
+                self._embed_batch(batch)
+            except Exception as e:
+                with self._lock:
+                    self._stats["errors"] += 1
+                logger.warning(f"Query embedding batch failed: {e}")
+            finally:
+                with self._lock:
+                    for pending in batch:
+                        self._inflight.pop(pending.key, None)
+                        if pending.vector is not None:
+                            self._cache[pending.key] = pending.vector
+                            self._cache.move_to_end(pending.key)
+                    while len(self._cache) > self.max_entries:
+                        self._cache.popitem(last=False)
+                for pending in batch:
+                    pending.done.set()
+
+    def _embed_batch(self, batch: List[_PendingEmbedding]) -> None:
+        missing = batch
+        if self.remote is not None:
+            missing = []
+            for pending in batch:
+                vector = self._remote_get(pending.text)
+                if vector is None:
+                    missing.append(pending)
+                else:
+                    pending.vector = vector
+            if len(missing) < len(batch):
+                with self._lock:
+                    self._stats["remote_hits"] += len(batch) - len(missing)
+        if not missing:
+            return
+
+        with self._lock:
+            self._stats["provider_calls"] += 1
+            self._stats["batched_inputs"] += len(missing)
+        try:
+            vectors = self.provider([pending.text for pending in missing], self.model)
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            logger.warning(f"Query embedding failed, using lexical retrieval only: {e}")
+            return
+
+        for pending, vector in zip(missing, vectors):
+            pending.vector = vector
+            if self.remote is not None:
+                self._remote_set(pending.text, vector)
+
+    def _remote_get(self, normalized: str) -> Optional[List[float]]:
+        try:
+            value = self.remote.get_value(self._remote_key(normalized))
+        except Exception as e:
+            logger.debug(f"Query embedding remote lookup failed: {e}")
+            return None
+        return value if isinstance(value, list) else None
+
+    def _remote_set(self, normalized: str, vector: List[float]) -> None:
+        try:
+            self.remote.set_value(self._remote_key(normalized), vector, ttl=self.remote_ttl)
+        except Exception as e:
+            logger.debug(f"Query embedding remote store failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "size": len(self._cache), "model": self.model, "available": self.available,
+                    "remote": self.remote is not None}
+
+    def clear(self) -> int:
+        with self._lock:
+            size = len(self._cache)
+            self._cache.clear()
+            return size
+
+
+_query_embedder: Optional[QueryEmbedder] = None
+_query_embedder_lock = Lock()
+
+
+def get_query_embedder() -> QueryEmbedder:
+    """Process-wide query embedder (provider resolved from configuration on first use)."""
+    global _query_embedder
+    if _query_embedder is None:
+        with _query_embedder_lock:
+            if _query_embedder is None:
+                _query_embedder = QueryEmbedder(provider=_default_provider(), remote=_default_remote())
+    return _query_embedder
@@ -15,7 +15,7 @@ from .plan_cache import get_cache
 from .policies import load_policies, choose_plan
 from .router import pick_model
 from .graph_expander import GraphQueryExpander
-from .hybrid_reranker import HybridReranker, RerankingConfig, RerankingStrategy
+from .hybrid_reranker import RerankingConfig, RerankingStrategy, get_reranker
 from .provenance_tracker import ProvenanceTracker
 from .provenance_models import ProvenanceConfig
 
@@ -41,7 +41,7 @@ class QueryPlanner:
         self.cache = get_cache(self.environment)
         self.context = PlanGenerationContext(environment=self.environment)
         self.graph_expander = GraphQueryExpander(environment=self.environment)
-        self.reranker = HybridReranker(environment=self.environment)
+        self.reranker = get_reranker(self.environment)
         self.provenance_tracker = ProvenanceTracker(environment=self.environment)
 
         logger.info(f"QueryPlanner initialized for environment: {self.environment}")
@@ -267,6 +267,22 @@ class QueryPlanner:
         if intent == "procedural_howto":
             hints["prefetch_related"] = True
 
+        # Per-stage retrieval latency budgets; a stage that overruns keeps the
+        # previous stage's ranking (see retriever.retrieve)
+        budgets = {
+            "candidates": self.context.candidate_stage_budget_ms,
+            "graph": self.context.graph_stage_budget_ms,
+            "rerank": self.context.reranking_timeout_ms,
+        }
+        candidate_pool = self.context.candidate_pool_size
+        if hints["enable_early_termination"]:
+            budgets["rerank"] = budgets["rerank"] // 2
+            candidate_pool = max(10, candidate_pool // 2)
+        elif complexity == "high":
+            budgets["rerank"] = budgets["rerank"] * 2
+        hints["retrieval_budgets_ms"] = budgets
+        hints["candidate_pool"] = candidate_pool
+
         # Query-specific hints
         if self._is_time_sensitive_query(query):
             hints["priority"] = "high"
@@ -721,18 +737,19 @@ class QueryPlanner:
 _planner_instances: Dict[str, QueryPlanner] = {}
 
 
-def get_planner(environment: str = None) -> QueryPlanner:
+def get_planner(environment: str = None, refresh: bool = False) -> QueryPlanner:
     """
     Get or create a query planner instance for the specified environment.
 
     Args:
         environment: Environment name (dev/test/prod)
+        refresh: Build a new planner and make it the shared instance
 
     Returns:
         QueryPlanner instance for the environment
     """
     env = environment or os.getenv("APP_ENV", "dev")
 
-    if env not in _planner_instances:
+    if refresh or env not in _planner_instances:
         _planner_instances[env] = QueryPlanner(env)
-    return _planner_instances[env]
\ No newline at end of file
+    return _planner_instances[env]
@@ -0,0 +1,153 @@
+"""
+Offline recall@k evaluation for lexical, vector and hybrid retrieval.
+
+Questions come from the persona files (``Personas/*.md`` English Q&A blocks)
+or a JSONL file of ``{"question", "expected", "relevant_ids"}``. When a question has no labelled ``relevant_ids``, relevance is judged by
+pooling: the top results of every mode are pooled and a chunk counts as
+relevant when it covers enough of the expected answer's content words.
+"""
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from ..ttrpg_logging import get_logger
+
+logger = get_logger(__name__)
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from", "how",
+    "in", "is", "it", "of", "on", "or", "that", "the", "this", "to", "what", "when", "with", "you",
+    "your",
+}
+
+
+@dataclass
+class EvalQuestion:
+    """One evaluation question with its expected answer and/or labelled chunk IDs"""
+    question: str
+    expected: str = ""
+    relevant_ids: List[str] = field(default_factory=list)
+    persona: str = ""
+
+
+def _content_tokens(text: str) -> set:
+    return {t for t in re.findall(r"[a-z0-9]+", (text or "").lower()) if t not in _STOPWORDS and len(t) > 2}
+
+
+def answer_overlap(expected: str, text: str) -> float:
+    """Fraction of the expected answer's content words present in ``text``."""
+    wanted = _content_tokens(expected)
+    if not wanted:
+        return 0.0
+    return len(wanted & _content_tokens(text)) / len(wanted)
+
+
+def load_persona_questions(personas_dir: Path) -> List[EvalQuestion]:
+    """Parse English questions and expected answers from persona markdown files."""
+    questions: List[EvalQuestion] = []
+    personas_dir = Path(personas_dir)
+    if not personas_dir.is_dir():
+        logger.warning(f"Personas directory not found: {personas_dir}")
+        return questions
+    for path in sorted(personas_dir.glob("*.md")):
+        if path.stem.endswith("_response"):
+            continue
+        text = path.read_text(encoding="utf-8")
+        persona = path.stem[len("Persona_"):] if path.stem.startswith("Persona_") else path.stem
+
+        section = re.search(r"##\s*Q&A\s*\(English\)(.*?)(?:\n---|\Z)", text, re.S)
+        if section:
+            for block in re.split(r"\n###\s*Question\s*\d+\s*\(English\)\s*\n", section.group(1))[1:]:
+                q_match = re.search(r"^-\s*Question:\s*(.+)$", block, re.M)
+                a_match = re.search(r"^-\s*(?:Expected\s+)?Answer\s*\(English\):\s*(.+)$", block, re.M)
+                if q_match:
+                    questions.append(EvalQuestion(q_match.group(1).strip(),
+                                                  a_match.group(1).strip() if a_match else "", persona=persona))
+
+        # Older "- **English Q:** / - **English A:**" layout
+        current: Optional[str] = None
+        for line in text.splitlines():
+            line = line.strip()
+            if line.startswith("- **English Q:**"):
+                current = line.split("**English Q:**", 1)[1].strip().lstrip(":").strip()
+            elif line.startswith("- **English A:**") and current:
+                answer = line.split("**English A:**", 1)[1].strip().lstrip(":").strip()
+                questions.append(EvalQuestion(current, answer, persona=persona))
+                current = None
+    return questions
+
+
+def load_question_file(path: Path) -> List[EvalQuestion]:
+    """Load questions from a JSONL file."""
+    questions = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        questions.append(EvalQuestion(
+            question=row["question"],
+            expected=row.get("expected", ""),
+            relevant_ids=[str(i) for i in row.get("relevant_ids", [])],
+            persona=row.get("persona", ""),
+        ))
+    return questions
+
+
+def evaluate_recall(
+    questions: Iterable[EvalQuestion],
+    retrieve_fn: Callable[[str, str, int], Sequence[Any]],
+    modes: Sequence[str] = ("lexical", "vector", "hybrid"),
+    ks: Sequence[int] = (1, 3, 5, 10),
+    relevance_threshold: float = 0.3,
+) -> Dict[str, Any]:
+    """
+    Measure recall@k per retrieval mode.
+
+    Args:
+        questions: Evaluation questions
+        retrieve_fn: ``(query, mode, top_k) -> ranked chunks`` (objects with ``id`` and ``text``)
+        modes: Retrieval modes to compare
+        ks: Cut-offs to report
+        relevance_threshold: Minimum expected-answer overlap for pooled relevance
+
+    Returns:
+        Report with mean recall@k per mode and per-question detail
+    """
+    depth = max(ks)
+    totals = {mode: {k: 0.0 for k in ks} for mode in modes}
+    per_question: List[Dict[str, Any]] = []
+    judged = 0
+
+    for question in questions:
+        ranked = {mode: list(retrieve_fn(question.question, mode, depth))[:depth] for mode in modes}
+
+        if question.relevant_ids:
+            relevant = set(question.relevant_ids)
+        else:
+            pooled = {str(chunk.id): chunk for chunks in ranked.values() for chunk in chunks}
+            relevant = {chunk_id for chunk_id, chunk in pooled.items()
+                        if answer_overlap(question.expected, chunk.text) >= relevance_threshold}
+
+        detail: Dict[str, Any] = {"question": question.question, "persona": question.persona,
+                                  "relevant": len(relevant), "recall": {}}
+        if relevant:
+            judged += 1
+            for mode, chunks in ranked.items():
+                ids = [str(chunk.id) for chunk in chunks]
+                detail["recall"][mode] = {}
+                for k in ks:
+                    recall = len(relevant & set(ids[:k])) / len(relevant)
+                    totals[mode][k] += recall
+                    detail["recall"][mode][f"recall@{k}"] = round(recall, 4)
+        per_question.append(detail)
+
+    summary = {
+        mode: {f"recall@{k}": round(totals[mode][k] / judged, 4) if judged else None for k in ks}
+        for mode in modes
+    }
+    logger.info(f"Retrieval recall over {judged}/{len(per_question)} judged questions: {summary}")
+    return {"questions": len(per_question), "judged": judged, "modes": summary, "details": per_question}
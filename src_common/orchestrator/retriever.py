@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import heapq
 import json
 import os
 import re
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
+from ..spans import record_span
 from ..ttrpg_logging import get_logger
 from ..vector_store.factory import make_vector_store
 
@@ -39,13 +44,11 @@ def _apply_lane_filter(chunks: List[DocChunk], lane: Optional[str]) -> List[DocC
     if not lane or lane.upper() == "ALL":
         return chunks
     lane_upper = lane.upper()
-    filtered: List[DocChunk] = []
-    for chunk in chunks:
-        metadata = chunk.metadata or {}
-        chunk_lane = str(metadata.get("lane", "A")).upper()
-        if chunk_lane == lane_upper:
-            filtered.append(chunk)
-    return filtered
+    return [chunk for chunk in chunks if _chunk_lane(chunk) == lane_upper]
+
+
+def _chunk_lane(chunk: DocChunk) -> str:
+    return str((chunk.metadata or {}).get("lane", "A")).upper()
 
 
 def _keyword_boost_score(query: str, text: str, metadata: Dict[str, Any]) -> float:
@@ -104,23 +107,51 @@ def _iter_candidate_chunks(env: str) -> List[DocChunk]:
 
 
 
-def _retrieve_from_store(query: str, env: str, top_k: int = 5) -> List[DocChunk]:
+RETRIEVAL_MODES = {"lexical", "vector", "hybrid"}
+_store_executor: Optional[ThreadPoolExecutor] = None
+_store_executor_lock = threading.Lock()
+
+
+def _get_store_executor() -> ThreadPoolExecutor:
+    global _store_executor
+    with _store_executor_lock:
+        if _store_executor is None:
+            _store_executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("RETRIEVAL_STORE_WORKERS", "8")),
+                thread_name_prefix="retrieval",
+            )
+        return _store_executor
+
+
+def _resolve_retrieval_mode(mode: Optional[str]) -> str:
+    value = (mode or os.getenv("RETRIEVAL_MODE", "lexical")).strip().lower()
+    return value if value in RETRIEVAL_MODES else "lexical"
+
+
+def _embed_query(query: str, deadline: Optional[float]) -> Optional[List[float]]:
+    """Embed the query on a worker thread, waiting no later than ``deadline``.
+
+    The provider call is a blocking HTTP request, so it never runs on the
+    caller's (possibly event loop) thread. A call that outlives the deadline
+    keeps running and fills the cache for the next identical query.
+    """
+    from .query_embeddings import get_query_embedder
+
+    embedder = get_query_embedder()
+    if not embedder.available:
+        return None
+    future = _get_store_executor().submit(embedder.embed, query)
+    timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
     try:
-        store = make_vector_store(env)
-    except Exception as exc:
-        logger.warning("Vector store unavailable; falling back to local artifacts: %s", exc)
-        return []
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        logger.info("Query embedding exceeded the candidate budget; using lexical results only")
+        return None
 
-    filters: Dict[str, Any] = {
-        "query_text": query,
-        "scan_limit": 2000,
-    }
-    raw_results = store.query(vector=None, top_k=max(top_k * 2, 10), filters=filters)
-    if not raw_results:
-        return []
 
+def _store_chunks(store: Any, raw_results: List[Dict[str, Any]]) -> List[DocChunk]:
     chunks: List[DocChunk] = []
-    for doc in raw_results:
+    for doc in raw_results or []:
         text = doc.get("content") or ""
         metadata = doc.get("metadata") or {}
         score = doc.get("score", 0.0)
@@ -134,9 +165,288 @@ def _retrieve_from_store(query: str, env: str, top_k: int = 5) -> List[DocChunk]
             )
         )
     chunks.sort(key=lambda c: c.score, reverse=True)
+    return chunks
+
+
+def _fuse_results(lexical: List[DocChunk], vector: List[DocChunk]) -> List[DocChunk]:
+    from .fusion import reciprocal_rank_fusion, weighted_score_fusion
+
+    ranked = {"lexical": lexical, "vector": vector}
+    vector_weight = float(os.getenv("RETRIEVAL_VECTOR_WEIGHT", "0.5"))
+    weights = {"lexical": 1.0 - vector_weight, "vector": vector_weight}
+    if os.getenv("RETRIEVAL_FUSION", "rrf").strip().lower() == "weighted":
+        return weighted_score_fusion(ranked, weights=weights)
+    # RRF weights are relative; scale so an even split matches unweighted RRF
+    return reciprocal_rank_fusion(
+        ranked,
+        k=int(os.getenv("RETRIEVAL_RRF_K", "60")),
+        weights={source: 2.0 * weight for source, weight in weights.items()},
+    )
+
+
+def _retrieve_from_store(query: str, env: str, top_k: int = 5, mode: Optional[str] = None,
+                         deadline: Optional[float] = None,
+                         store_filters: Optional[Dict[str, Any]] = None) -> List[DocChunk]:
+    """
+    Query the vector store lexically, by embedding, or both (hybrid).
+
+    The mode comes from ``RETRIEVAL_MODE`` (default "lexical"). Hybrid mode
+    embeds the query once (cached) off the calling thread, runs lexical and
+    vector search concurrently and fuses them (RRF by default, or weighted
+    min-max score fusion). An embedding that misses ``deadline`` (a
+    ``time.perf_counter()`` value) or has no provider degrades hybrid to
+    lexical search; vector mode then returns nothing and logs a warning.
+    ``store_filters`` (lane, source_hash, element_type, page_range) are
+    pushed down into the backend query, so only matching rows are scored.
+    """
+    try:
+        store = make_vector_store(env)
+    except Exception as exc:
+        logger.warning("Vector store unavailable; falling back to local artifacts: %s", exc)
+        return []
+
+    mode = _resolve_retrieval_mode(mode)
+    candidate_k = max(top_k * 2, 10)
+    filters: Dict[str, Any] = {
+        **(store_filters or {}),
+        "query_text": query,
+        "scan_limit": 2000,
+    }
+
+    lexical_future = None
+    if mode != "vector":
+        lexical_future = _get_store_executor().submit(store.query, vector=None, top_k=candidate_k, filters=filters)
+
+    vector_results: List[DocChunk] = []
+    if mode != "lexical":
+        query_vector = _embed_query(query, deadline)
+        if query_vector is None and mode == "vector":
+            logger.warning("Vector retrieval requested but no query embedding is available "
+                           "(provider not configured, failed or over budget); returning no results")
+        if query_vector is not None:
+            try:
+                raw_vector = store.query(vector=query_vector, top_k=candidate_k,
+                                         filters={**(store_filters or {}), "scan_limit": 2000})
+                vector_results = [c for c in _store_chunks(store, raw_vector) if c.score > 0]
+            except Exception as exc:
+                logger.warning("Vector search failed; using lexical results only: %s", exc)
+
+    lexical_results = _store_chunks(store, lexical_future.result()) if lexical_future else []
+
+    if lexical_results and vector_results:
+        chunks = _fuse_results(lexical_results, vector_results)
+    else:
+        chunks = lexical_results or vector_results
     return chunks[: max(1, top_k)]
 
 
+DEFAULT_STAGE_BUDGETS_MS = {"candidates": 250.0, "graph": 50.0, "rerank": 100.0}
+DEFAULT_CANDIDATE_POOL = 50
+DEFAULT_RERANK_TOP_N = 20
+
+_stage_degradations: Dict[str, int] = {}
+_stage_stats_lock = threading.Lock()
+
+
+@dataclass
+class RetrievalStages:
+    """
+    Per-request staged retrieval settings and outcome.
+
+    Stage 1 ("candidates") does wide, cheap lexical recall; stage 2 ("graph")
+    applies graph-expansion boosts to the candidate pool; stage 3 ("rerank")
+    runs the HybridReranker on the top ``rerank_top_n`` only. Stages 2 and 3
+    have latency budgets; one that runs out keeps the previous ranking. Stage 1
+    has no earlier ranking to fall back to, so it always scans every local
+    chunk (keeping only the best ``candidate_pool`` in a heap), which keeps
+    its recall independent of machine load; its budget is reported only.
+    """
+    budgets_ms: Dict[str, float]
+    candidate_pool: int
+    rerank_top_n: int
+    candidates_scanned: int = 0
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    degraded: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_plan(cls, plan: Any, top_k: int, limit: int) -> "RetrievalStages":
+        hints = getattr(plan, "performance_hints", None) or {}
+        reranking_config = getattr(plan, "reranking_config", None) or {}
+
+        budgets = {
+            "candidates": float(os.getenv("RETRIEVAL_CANDIDATE_BUDGET_MS", DEFAULT_STAGE_BUDGETS_MS["candidates"])),
+            "graph": float(os.getenv("RETRIEVAL_GRAPH_BUDGET_MS", DEFAULT_STAGE_BUDGETS_MS["graph"])),
+            "rerank": float(reranking_config.get("timeout_ms")
+                            or os.getenv("RETRIEVAL_RERANK_BUDGET_MS", DEFAULT_STAGE_BUDGETS_MS["rerank"])),
+        }
+        for stage, value in (hints.get("retrieval_budgets_ms") or {}).items():
+            if stage in budgets and value is not None:
+                budgets[stage] = float(value)
+
+        candidate_pool = int(hints.get("candidate_pool") or max(top_k * 2, DEFAULT_CANDIDATE_POOL))
+        rerank_top_n = int(reranking_config.get("max_results") or DEFAULT_RERANK_TOP_N)
+        return cls(
+            budgets_ms=budgets,
+            candidate_pool=max(candidate_pool, limit, 1),
+            rerank_top_n=max(rerank_top_n, limit, 1),
+        )
+
+    def deadline(self, stage: str, started: float) -> float:
+        return started + self.budgets_ms.get(stage, 0.0) / 1000.0
+
+    def finish(self, stage: str, started: float, degraded: bool = False) -> None:
+        self.timings_ms[stage] = round((time.perf_counter() - started) * 1000, 2)
+        record_span(f"retrieve.{stage}", self.timings_ms[stage])
+        if degraded:
+            self.degraded.append(stage)
+            with _stage_stats_lock:
+                _stage_degradations[stage] = _stage_degradations.get(stage, 0) + 1
+
+
+def get_stage_degradation_counts() -> Dict[str, int]:
+    """Number of requests in which each retrieval stage ran out of budget."""
+    with _stage_stats_lock:
+        return dict(_stage_degradations)
+
+
+def _dedupe(chunks: List[DocChunk], limit: int) -> List[DocChunk]:
+    """Drop near-identical content (same leading normalised text)."""
+    seen = set()
+    results: List[DocChunk] = []
+    for ch in chunks:
+        sig = " ".join(_tokenize(ch.text))[:200]
+        if sig in seen:
+            continue
+        seen.add(sig)
+        results.append(ch)
+        if len(results) >= limit:
+            break
+    return results
+
+
+def _best_candidates(query: str, chunks: Iterable[DocChunk], lane_filter: Optional[str],
+                     limit: int) -> Tuple[List[DocChunk], int]:
+    """Score every chunk and keep the best ``limit`` distinct ones.
+
+    Same result as filtering by lane, sorting by score and ``_dedupe``, but
+    only a heap of ``limit`` candidates is kept, and the dedupe signature is
+    computed only for chunks that make it into the heap. Returns the pool
+    (best first) and the number of chunks scanned.
+    """
+    lane = lane_filter.upper() if lane_filter and lane_filter.upper() != "ALL" else None
+    # Entries are [score, -position, signature, chunk]; the heap root is the
+    # weakest kept candidate (lowest score, latest on ties). A chunk replaced
+    # by a better duplicate is marked dead (chunk None) and skipped on pop.
+    heap: List[list] = []
+    members: Dict[str, list] = {}
+    scanned = 0
+    for position, ch in enumerate(chunks):
+        scanned += 1
+        if lane and _chunk_lane(ch) != lane:
+            continue
+        score = _simple_score(query, ch.text)
+        if len(members) >= limit and (score, -position) < (heap[0][0], heap[0][1]):
+            continue
+        sig = " ".join(_tokenize(ch.text))[:200]
+        existing = members.get(sig)
+        if existing is not None:
+            if score <= existing[0]:
+                continue
+            existing[3] = None
+        entry = [score, -position, sig,
+                 DocChunk(id=ch.id, text=ch.text, source=ch.source, score=score, metadata=ch.metadata)]
+        members[sig] = entry
+        heapq.heappush(heap, entry)
+        while len(members) > limit or (heap and heap[0][3] is None):
+            weakest = heapq.heappop(heap)
+            if weakest[3] is not None:
+                del members[weakest[2]]
+
+    ranked = sorted(members.values(), key=lambda entry: (-entry[0], -entry[1]))
+    return [entry[3] for entry in ranked], scanned
+
+
+def _stage_candidates(query: str, env: str, stages: RetrievalStages,
+                      lane_filter: Optional[str]) -> List[DocChunk]:
+    """Stage 1: wide, cheap recall from the vector store, else local artifacts.
+
+    Both sources only return chunks in ``lane_filter``; local artifacts are
+    scanned only when the store has no matching chunks.
+
+    Any query embedding (vector/hybrid modes) waits at most until the stage deadline.
+    """
+    started = time.perf_counter()
+    deadline = stages.deadline("candidates", started)
+
+    # The lane is pushed down to the store, so its results need no post-filter
+    store_filters = {"lane": lane_filter} if lane_filter else None
+    store_results = _retrieve_from_store(query, env, stages.candidate_pool, deadline=deadline,
+                                         store_filters=store_filters)
+    if store_results:
+        pool = _dedupe(store_results, stages.candidate_pool)
+        stages.finish("candidates", started, degraded=time.perf_counter() > deadline)
+        return pool
+
+    pool, stages.candidates_scanned = _best_candidates(
+        query, _iter_candidate_chunks(env), lane_filter, stages.candidate_pool
+    )
+    stages.finish("candidates", started, degraded=time.perf_counter() > deadline)
+    return pool
+
+
+def _stage_graph(pool: List[DocChunk], graph_expansion: Optional[Dict[str, Any]],
+                 stages: RetrievalStages) -> List[DocChunk]:
+    """Stage 2: graph-boosted scoring of the candidate pool."""
+    if not pool or not graph_expansion or not graph_expansion.get("enabled"):
+        return pool
+
+    started = time.perf_counter()
+    deadline = stages.deadline("graph", started)
+    boosted: List[DocChunk] = []
+    for ch in pool:
+        if time.perf_counter() > deadline:
+            # Partial boosts would mix scales; keep the stage 1 ranking
+            stages.finish("graph", started, degraded=True)
+            return pool
+        boosted.append(DocChunk(
+            id=ch.id,
+            text=ch.text,
+            source=ch.source,
+            score=_apply_graph_boost(ch.score, ch, graph_expansion),
+            metadata=ch.metadata,
+        ))
+    boosted.sort(key=lambda c: c.score, reverse=True)
+    stages.finish("graph", started)
+    return boosted
+
+
+def _stage_rerank(pool: List[DocChunk], plan: Any, query: str, env: str,
+                  stages: RetrievalStages) -> List[DocChunk]:
+    """Stage 3: hybrid rerank of the top N within the stage budget.
+
+    The deadline is handed to the reranker, which stops computing signals once
+    it passes, so an overrunning rerank does not keep running after the request
+    moves on. A rerank that still ranked the whole head (on the signals that
+    finished in time) is kept; anything less keeps the previous ranking.
+    """
+    if not pool:
+        return pool
+
+    head, tail = pool[:stages.rerank_top_n], pool[stages.rerank_top_n:]
+    if not getattr(plan, "reranking_config", None):
+        # Nothing to rerank (legacy plans)
+        return _apply_reranking(head, plan, query, env) + tail
+
+    started = time.perf_counter()
+    deadline = stages.deadline("rerank", started)
+    reranked = _apply_reranking(head, plan, query, env, deadline=deadline)
+    if time.perf_counter() >= deadline:
+        stages.finish("rerank", started, degraded=True)
+        return reranked + tail if len(reranked) == len(head) else pool
+    stages.finish("rerank", started)
+    return reranked + tail
+
+
 def retrieve(
     plan: Union[Dict[str, Any], 'QueryPlan'],
     query: str,
@@ -149,6 +459,9 @@ def retrieve(
     with graph expansion capabilities. Performs lightweight lexical scoring over local artifacts
     to satisfy Phase 2 contract without external services. If AstraDB is configured and reachable,
     prefers AstraDB as the source of truth.
+
+    Retrieval is staged (candidates -> graph boost -> rerank top N), each stage
+    bounded by the latency budget in the plan's performance hints.
     """
     # Handle both legacy dict plans and new QueryPlan objects
     if hasattr(plan, 'retrieval_strategy'):
@@ -169,70 +482,27 @@ def retrieve(
             lane_filter = lane_value
 
     top_k = int(plan_dict.get("vector_top_k", 5))
+    limit = max(limit, 1)
+    stages = RetrievalStages.from_plan(plan, top_k, limit)
 
-    # Prefer AstraDB when available (use expanded query for better results)
-    astra_results = _retrieve_from_store(expanded_query, env, top_k)
-    if astra_results:
-        # Deduplicate similar content
-        seen = set()
-        results: List[DocChunk] = []
-        for ch in astra_results:
-            sig = " ".join(_tokenize(ch.text))[:200]
-            if sig in seen:
-                continue
-            seen.add(sig)
-            results.append(ch)
-            if len(results) >= max(1, limit):
-                break
-        if results:
-            # Apply reranking if enabled
-            results = _apply_reranking(results, plan, query, env)
-            # Apply provenance tracking if enabled
-            results = _apply_provenance_tracking(results, plan, query, env)
-            filtered = _apply_lane_filter(results, lane_filter)
-            if lane_filter:
-                if filtered:
-                    return filtered
-            else:
-                return filtered
-
-    candidates = list(_iter_candidate_chunks(env))
-    for i, ch in enumerate(candidates):
-        # Use expanded query for better scoring when available
-        base_score = _simple_score(expanded_query, ch.text)
-
-        # Apply graph-aware boosting if we have expansion metadata
-        if graph_expansion and graph_expansion.get("enabled"):
-            base_score = _apply_graph_boost(base_score, ch, graph_expansion)
-
-        candidates[i] = DocChunk(
-            id=ch.id,
-            text=ch.text,
-            source=ch.source,
-            score=base_score,
-            metadata=ch.metadata,
-        )
-    # sort and dedup by content similarity (very naive)
-    candidates.sort(key=lambda c: c.score, reverse=True)
-    seen = []
-    results: List[DocChunk] = []
-    for ch in candidates:
-        if len(results) >= max(limit, 1):
-            break
-        sig = " ".join(_tokenize(ch.text))[:200]
-        if sig in seen:
-            continue
-        seen.append(sig)
-        results.append(ch)
-
-    # Apply reranking if enabled
-    results = _apply_reranking(results, plan, query, env)
+    # Use expanded query for better recall when available
+    pool = _stage_candidates(expanded_query, env, stages, lane_filter)
+    pool = _stage_graph(pool, graph_expansion, stages)
+    results = _stage_rerank(pool, plan, query, env, stages)[:limit]
 
     # Apply provenance tracking if enabled
     results = _apply_provenance_tracking(results, plan, query, env)
 
-    filtered = _apply_lane_filter(results, lane_filter)
-    return filtered
+    if stages.degraded:
+        logger.info(
+            f"Retrieval stages over budget {stages.degraded}; timings {stages.timings_ms}ms, "
+            f"budgets {stages.budgets_ms}ms, {stages.candidates_scanned} local chunks scanned"
+        )
+    else:
+        logger.debug(f"Retrieval stage timings {stages.timings_ms}ms, "
+                     f"{stages.candidates_scanned} local chunks scanned")
+
+    return results
 
 
 def _get_expanded_query(original_query: str, graph_expansion: Optional[Dict[str, Any]]) -> str:
@@ -307,7 +577,8 @@ def _apply_reranking(
     results: List[DocChunk],
     plan: Union[Dict[str, Any], 'QueryPlan'],
     query: str,
-    env: str
+    env: str,
+    deadline: Optional[float] = None
 ) -> List[DocChunk]:
     """
     Apply hybrid reranking to results if enabled in the plan.
@@ -317,6 +588,8 @@ def _apply_reranking(
         plan: Query plan (dict or QueryPlan object)
         query: Original user query
         env: Environment
+        deadline: Optional ``time.perf_counter()`` value at which the
+            reranker stops scoring
 
     Returns:
         Reranked results as DocChunk list
@@ -345,10 +618,10 @@ def _apply_reranking(
 
     try:
         # Import reranker components
-        from .hybrid_reranker import HybridReranker, RerankingConfig, RerankingStrategy
+        from .hybrid_reranker import RerankingConfig, RerankingStrategy, get_reranker
 
-        # Create reranker
-        reranker = HybridReranker(environment=env)
+        # Shared per-environment reranker (signal extractors are built once)
+        reranker = get_reranker(env)
 
         # Convert reranking config to RerankingConfig object
         strategy = RerankingStrategy(reranking_config.get("strategy", "hybrid_full"))
@@ -387,24 +660,33 @@ def _apply_reranking(
             results=results_dicts,
             config=config,
             query_plan=query_plan_dict,
-            classification=classification
+            classification=classification,
+            deadline=deadline
         )
 
         # Convert back to DocChunk format
+        signals_total = len(reranker.active_signal_groups(config))
         final_results = []
         for reranked in reranked_results:
             original = reranked.original_result
+            metadata = original['metadata']
+            metadata['reranking'] = {
+                'signals_completed': len(reranked.signals_completed),
+                'signals_total': signals_total,
+            }
 
             doc_chunk = DocChunk(
                 id=original['id'],
                 text=original['content'],
                 source=original['source'],
                 score=reranked.final_score,
-                metadata=original['metadata']
+                metadata=metadata
             )
             final_results.append(doc_chunk)
 
-        logger.info(f"Applied reranking: {len(results)} -> {len(final_results)} results")
+        completed = len(reranked_results[0].signals_completed) if reranked_results else 0
+        logger.info(f"Applied reranking: {len(results)} -> {len(final_results)} results "
+                    f"({completed}/{signals_total} signal groups)")
 
         return final_results
 
@@ -3,18 +3,24 @@ from __future__ import annotations
 import os
 import time
 import uuid
-from types import SimpleNamespace
+from pathlib import Path
+from threading import Lock
+from types import MappingProxyType, SimpleNamespace
 from typing import Any, Dict, Optional
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from ..ttrpg_logging import get_logger
+from ..ttrpg_logging import get_logger, trace_scope
 from ..metadata_utils import safe_metadata_get
+from ..spans import current_request_spans, get_slow_request_profiler, render_prometheus, request_spans, span
 from .classifier import classify_query
-from .policies import load_policies, choose_plan
+from .policies import load_policies, choose_plan, policy_candidates
 from .router import pick_model
 from .query_planner import get_planner
+from .hybrid_reranker import get_reranker
+from .signal_extractors import domain_pattern_candidates
+from .service_container import ServiceContainer, request_scope
 from .llm_runtime import generate_rag_answers
 from .prompts import load_prompt, render_prompt, PromptError
 from .retriever import retrieve
@@ -30,6 +36,60 @@ rag_router = APIRouter()
 
 LANE_CHOICES = {"A", "B", "C", "ALL"}
 
+_service_containers: Dict[str, ServiceContainer] = {}
+_service_containers_lock = Lock()
+
+
+def _register_rag_services(container: ServiceContainer) -> None:
+    """Register the per-environment components used by the RAG endpoints.
+
+    ``key`` returns the module-level factory so that a replaced implementation
+    (reload or test patch) is picked up on the next request. The planner and
+    reranker factories build fresh instances (and install them as the module
+    singletons), so a rebuild after a pattern file change reloads them.
+    """
+    env = container.environment
+    domain_patterns = domain_pattern_candidates(env)
+
+    def build_planner():
+        container.get("reranker")  # the planner binds the current shared reranker
+        return get_planner(env, refresh=True)
+
+    container.register("persona_manager", lambda: PersonaManager(),
+                       watch=[Path("Personas")], key=lambda: PersonaManager)
+    container.register("persona_validator", lambda: PersonaResponseValidator(),
+                       key=lambda: PersonaResponseValidator)
+    container.register("persona_metrics", lambda: PersonaMetricsTracker(environment=env),
+                       key=lambda: PersonaMetricsTracker)
+    container.register("aehrl_evaluator", lambda: AEHRLEvaluator(environment=env),
+                       key=lambda: AEHRLEvaluator)
+    container.register("aehrl_metrics", lambda: MetricsTracker(environment=env),
+                       key=lambda: MetricsTracker)
+    container.register("reranker", lambda: get_reranker(env, refresh=True),
+                       watch=domain_patterns, key=lambda: get_reranker)
+    container.register("query_planner", build_planner, watch=domain_patterns, key=lambda: get_planner)
+    container.register("policies", lambda: MappingProxyType(load_policies(env)),
+                       watch=policy_candidates(env), key=lambda: load_policies)
+
+
+def get_service_container(env: Optional[str] = None) -> ServiceContainer:
+    """Return the application-lifetime service container for an environment."""
+    env = env or os.getenv("APP_ENV", "dev")
+    container = _service_containers.get(env)
+    if container is None:
+        with _service_containers_lock:
+            container = _service_containers.get(env)
+            if container is None:
+                container = ServiceContainer(env)
+                _register_rag_services(container)
+                _service_containers[env] = container
+    return container
+
+
+def warm_rag_services(env: Optional[str] = None) -> Dict[str, float]:
+    """Build all RAG components ahead of the first request; returns build times in ms."""
+    return get_service_container(env).warm()
+
 
 def _normalize_lane(value: Optional[str]) -> str:
     lane = (value or "A").strip().upper()
@@ -41,9 +101,9 @@ def _normalize_lane(value: Optional[str]) -> str:
 def _resolve_query_plan(env: str, query: str, classification: Optional[Dict[str, Any]] = None):
     """Return classification, query plan, retrieval plan, and model config."""
     classification = classification or classify_query(query)
-    planner = get_planner(env)
+    services = get_service_container(env)
     try:
-        query_plan = planner.get_plan(query)
+        query_plan = services.get("query_planner").get_plan(query)
     except Exception:
         query_plan = None
 
@@ -51,7 +111,7 @@ def _resolve_query_plan(env: str, query: str, classification: Optional[Dict[str,
     model_cfg = getattr(query_plan, "model_config", None) if query_plan else None
 
     if not plan or not model_cfg:
-        policies = load_policies()
+        policies = services.get("policies")
         plan = choose_plan(policies, classification)
         model_cfg = pick_model(classification, plan)
         query_plan = SimpleNamespace(
@@ -70,6 +130,19 @@ def _resolve_query_plan(env: str, query: str, classification: Optional[Dict[str,
 async def rag_ping():
     return {"status": "ok", "component": "rag", "environment": os.getenv("APP_ENV", "dev")}
 
+
+@rag_router.get("/services")
+async def rag_services():
+    """Startup timings, rebuild counts and per-request construction counters."""
+    return get_service_container().get_stats()
+
+
+@rag_router.get("/metrics")
+async def rag_metrics():
+    """Per-stage latency histograms in the Prometheus text format."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 @rag_router.post("/classify")
 async def rag_classify(payload: Dict[str, Any]):
     env = os.getenv("APP_ENV", "dev")
@@ -152,7 +225,21 @@ async def rag_ask(payload: Dict[str, Any]):
     if not q:
         return JSONResponse(status_code=400, content={"error": "query is required"})
 
+    services = get_service_container(env)
     trace_id = str(uuid.uuid4())
+    profiler = get_slow_request_profiler()
+    with trace_scope(trace_id), request_scope() as constructions, request_spans(), \
+            profiler.profile(trace_id), span("rag.ask"):
+        response = await _rag_ask(payload, q, env, t0, services, trace_id)
+    services.record_request(constructions)
+    if constructions:
+        logger.info(f"RAG ask constructed services during request: {constructions}")
+    return response
+
+
+async def _rag_ask(
+    payload: Dict[str, Any], q: str, env: str, t0: float, services: ServiceContainer, trace_id: str
+):
 
     # 0) Persona context extraction (if enabled)
     persona_enabled = os.getenv("PERSONA_TESTING_ENABLED", "true").lower() == "true"
@@ -161,7 +248,7 @@ async def rag_ask(payload: Dict[str, Any]):
 
     if persona_enabled:
         try:
-            persona_manager = PersonaManager()
+            persona_manager = services.get("persona_manager")
             persona_context = persona_manager.extract_persona_context_from_request(payload)
             if persona_context:
                 logger.info(f"Extracted persona context: {persona_context.persona_profile.id}")
@@ -172,7 +259,10 @@ async def rag_ask(payload: Dict[str, Any]):
     lane = _normalize_lane((payload or {}).get("lane"))
     lane_filter = None if lane == "ALL" else lane
 
-    classification, query_plan, plan, model_cfg = _resolve_query_plan(env, q)
+    with span("rag.classify"):
+        classification = classify_query(q)
+    with span("rag.plan"):
+        classification, query_plan, plan, model_cfg = _resolve_query_plan(env, q, classification)
 
     # 4) Prompt template
     tmpl = load_prompt(classification["intent"], classification["domain"])  # best-effort
@@ -189,7 +279,8 @@ async def rag_ask(payload: Dict[str, Any]):
         rendered_prompt = f"You are the TTRPG Center Assistant. TASK: {q}"
 
     # 5) Retrieve top chunks
-    top_chunks = retrieve(plan, q, env, limit=payload.get("top_k", 3), lane=lane_filter)
+    with span("rag.retrieve"):
+        top_chunks = retrieve(plan, q, env, limit=payload.get("top_k", 3), lane=lane_filter)
 
 
     # 6) Compose stub answers and attempt live generation when permitted
@@ -222,11 +313,12 @@ async def rag_ask(payload: Dict[str, Any]):
 
     stub_answers = {"openai": _synth("OpenAI_stub"), "claude": _synth("Claude_stub")}
     provider_prompt = _build_provider_prompt(rendered_prompt)
-    llm_result = generate_rag_answers(
-        prompt=provider_prompt,
-        model_cfg=model_cfg if isinstance(model_cfg, dict) else model_cfg,
-        stub_answers=stub_answers,
-    )
+    with span("rag.generate"):
+        llm_result = generate_rag_answers(
+            prompt=provider_prompt,
+            model_cfg=model_cfg if isinstance(model_cfg, dict) else model_cfg,
+            stub_answers=stub_answers,
+        )
     selected_answer = llm_result.answers.get(llm_result.selected, next(iter(stub_answers.values()), ""))
 
     answers_payload = dict(llm_result.answers)
@@ -245,7 +337,7 @@ async def rag_ask(payload: Dict[str, Any]):
     if aehrl_enabled:
         try:
             query_id = str(uuid.uuid4())
-            evaluator = AEHRLEvaluator(environment=env)
+            evaluator = services.get("aehrl_evaluator")
 
             # Prepare retrieved chunks for AEHRL
             chunk_data = [
@@ -260,12 +352,13 @@ async def rag_ask(payload: Dict[str, Any]):
             ]
 
             # Evaluate the selected answer with persona context
-            aehrl_report = evaluator.evaluate_query_response(
-                query_id=query_id,
-                model_response=selected_answer,
-                retrieved_chunks=chunk_data,
-                persona_context=persona_context
-            )
+            with span("rag.aehrl"):
+                aehrl_report = evaluator.evaluate_query_response(
+                    query_id=query_id,
+                    model_response=selected_answer,
+                    retrieved_chunks=chunk_data,
+                    persona_context=persona_context
+                )
 
             # Generate user warnings for high-priority flags
             for flag in aehrl_report.get_high_priority_flags():
@@ -278,7 +371,7 @@ async def rag_ask(payload: Dict[str, Any]):
 
             # Record metrics
             if aehrl_report.metrics:
-                metrics_tracker = MetricsTracker(environment=env)
+                metrics_tracker = services.get("aehrl_metrics")
                 metrics_tracker.record_metrics(aehrl_report)
 
             logger.info(f"AEHRL evaluation completed for query {query_id}")
@@ -290,19 +383,20 @@ async def rag_ask(payload: Dict[str, Any]):
     # 9) Persona Response Validation (if persona context available)
     if persona_enabled and persona_context:
         try:
-            validator = PersonaResponseValidator()
-            persona_metrics = validator.validate_response_appropriateness(
-                response=selected_answer,
-                persona_context=persona_context,
-                query=q
-            )
+            validator = services.get("persona_validator")
+            with span("rag.persona"):
+                persona_metrics = validator.validate_response_appropriateness(
+                    response=selected_answer,
+                    persona_context=persona_context,
+                    query=q
+                )
 
             # Update with actual response time
             current_elapsed_ms = int((time.time() - t0) * 1000)
             persona_metrics.response_time_ms = current_elapsed_ms
 
             # Record persona metrics
-            persona_tracker = PersonaMetricsTracker(environment=env)
+            persona_tracker = services.get("persona_metrics")
             persona_tracker.record_metrics(persona_metrics)
 
             logger.info(f"Persona validation completed for {persona_context.persona_profile.id}")
@@ -346,6 +440,7 @@ async def rag_ask(payload: Dict[str, Any]):
             "token_count": approx_tokens,
             "model_badge": model_meta.get("model"),
             "mode": "live" if not used_stub_llm else "stub",
+            "stages_ms": current_request_spans(),
         },
         "retrieved": [
             {
@@ -0,0 +1,225 @@
+"""
+Application-lifetime service container for the RAG endpoints.
+
+Components that are expensive to build (persona manager, AEHRL evaluator,
+query planner, hybrid reranker and its signal extractors, retrieval policies)
+are constructed once, warmed at startup and shared by every request. A
+component is rebuilt only when one of its watched source files changes or its
+factory is replaced (hot reload, test patching). Rebuilds swap the whole
+instance, so a request that already holds a component keeps a consistent
+object; shared instances must be treated as read-only by request code.
+
+Every construction is counted, both process-wide and for the current request
+(via ``request_scope``), so regressions back to per-request construction are
+visible in logs and in ``get_stats()``.
+"""
+from __future__ import annotations
+
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..ttrpg_logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHECK_INTERVAL_SECONDS = 2.0
+
+_request_constructions: contextvars.ContextVar[Optional[Dict[str, int]]] = contextvars.ContextVar(
+    "service_request_constructions", default=None
+)
+
+
+@contextmanager
+def request_scope() -> Iterator[Dict[str, int]]:
+    """Count object constructions made while handling one request"""
+    counts: Dict[str, int] = {}
+    token = _request_constructions.set(counts)
+    try:
+        yield counts
+    finally:
+        _request_constructions.reset(token)
+
+
+def record_construction(name: str) -> None:
+    """Attribute a component construction to the current request (if any)"""
+    counts = _request_constructions.get()
+    if counts is not None:
+        counts[name] = counts.get(name, 0) + 1
+
+
+@dataclass
+class _Component:
+    """Registered component and its current instance"""
+    name: str
+    factory: Callable[[], Any]
+    watch: Tuple[Path, ...] = ()
+    key: Optional[Callable[[], Any]] = None
+    instance: Any = None
+    built: bool = False
+    fingerprint: Any = None
+    factory_key: Any = None
+    next_check: float = 0.0
+    builds: int = 0
+    errors: int = 0
+    last_build_ms: float = 0.0
+    total_build_ms: float = 0.0
+    last_built_at: Optional[float] = None
+    lock: Lock = field(default_factory=Lock, repr=False)
+
+
+def _path_fingerprint(path: Path) -> Any:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    if not path.is_dir():
+        return stat.st_mtime_ns, stat.st_size
+    entries = []
+    try:
+        for child in sorted(path.iterdir()):
+            try:
+                entries.append((child.name, child.stat().st_mtime_ns))
+            except OSError:
+                continue
+    except OSError:
+        pass
+    return stat.st_mtime_ns, tuple(entries)
+
+
+class ServiceContainer:
+    """
+    Lazily built, file-watched singletons for one environment.
+
+    Thread-safe: the hot path is a lock-free read of the current instance; a
+    per-component lock serialises (re)builds so concurrent requests never
+    construct the same component twice.
+    """
+
+    def __init__(self, environment: str, check_interval: Optional[float] = None):
+        self.environment = environment
+        if check_interval is None:
+            check_interval = float(os.getenv("SERVICE_RELOAD_CHECK_SECONDS", DEFAULT_CHECK_INTERVAL_SECONDS))
+        self.check_interval = check_interval
+        self._components: Dict[str, _Component] = {}
+        self._stats_lock = Lock()
+        self._requests = 0
+        self._request_constructions = 0
+        self._last_request_constructions: Dict[str, int] = {}
+        self.startup_timings_ms: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Callable[[], Any], watch: Iterable[Path] = (),
+                 key: Optional[Callable[[], Any]] = None) -> None:
+        """
+        Register a component.
+
+        Args:
+            name: Component name used with ``get``
+            factory: Zero-argument callable building the component
+            watch: Files or directories whose changes trigger a rebuild
+            key: Optional callable whose result identifies the factory
+                implementation; a different value forces a rebuild
+        """
+        self._components[name] = _Component(
+            name=name, factory=factory, watch=tuple(Path(p) for p in watch), key=key
+        )
+
+    def get(self, name: str) -> Any:
+        """Return the current instance of a component, building it if needed"""
+        component = self._components[name]
+        factory_key = component.key() if component.key else None
+
+        if component.built and factory_key is component.factory_key:
+            if not component.watch or time.monotonic() < component.next_check:
+                return component.instance
+
+        with component.lock:
+            now = time.monotonic()
+            fingerprint = component.fingerprint
+            if component.watch and (not component.built or now >= component.next_check):
+                fingerprint = tuple(_path_fingerprint(path) for path in component.watch)
+                component.next_check = now + self.check_interval
+
+            if (component.built and factory_key is component.factory_key
+                    and fingerprint == component.fingerprint):
+                return component.instance
+
+            reason = "initial build" if not component.built else "source changed"
+            self._build(component, fingerprint, factory_key, reason)
+            return component.instance
+
+    def _build(self, component: _Component, fingerprint: Any, factory_key: Any, reason: str) -> None:
+        started = time.perf_counter()
+        try:
+            instance = component.factory()
+        except Exception:
+            component.errors += 1
+            raise
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        component.instance = instance
+        component.fingerprint = fingerprint
+        component.factory_key = factory_key
+        component.built = True
+        component.builds += 1
+        component.last_build_ms = elapsed_ms
+        component.total_build_ms += elapsed_ms
+        component.last_built_at = time.time()
+        record_construction(component.name)
+
+        logger.info(f"Service '{component.name}' built for {self.environment} in {elapsed_ms:.1f}ms ({reason})")
+
+    def warm(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Build components ahead of the first request.
+
+        Returns:
+            Build time in milliseconds per component (failed builds are skipped)
+        """
+        timings: Dict[str, float] = {}
+        for name in list(names or self._components):
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.warning(f"Failed to warm service '{name}': {e}")
+                continue
+            timings[name] = round(self._components[name].last_build_ms, 2)
+        self.startup_timings_ms.update(timings)
+        logger.info(f"Warmed {len(timings)} RAG services for {self.environment} "
+                    f"in {sum(timings.values()):.1f}ms: {timings}")
+        return timings
+
+    def record_request(self, constructions: Dict[str, int]) -> None:
+        """Fold one request's construction counts into the container statistics"""
+        with self._stats_lock:
+            self._requests += 1
+            self._request_constructions += sum(constructions.values())
+            self._last_request_constructions = dict(constructions)
+
+    def get_stats(self) -> Dict[str, Any]:
+        components: List[Dict[str, Any]] = []
+        for component in self._components.values():
+            components.append({
+                "name": component.name,
+                "built": component.built,
+                "builds": component.builds,
+                "errors": component.errors,
+                "last_build_ms": round(component.last_build_ms, 2),
+                "total_build_ms": round(component.total_build_ms, 2),
+                "last_built_at": component.last_built_at,
+                "watch": [str(path) for path in component.watch],
+            })
+        with self._stats_lock:
+            return {
+                "environment": self.environment,
+                "startup_timings_ms": dict(self.startup_timings_ms),
+                "requests": self._requests,
+                "request_constructions": self._request_constructions,
+                "last_request_constructions": dict(self._last_request_constructions),
+                "components": components,
+            }
@@ -11,16 +11,29 @@ Each extractor focuses on a specific signal type and returns normalized scores.
 """
 from __future__ import annotations
 
+import os
 import re
 import math
+from pathlib import Path
 from typing import Dict, List, Any, Optional
 from abc import ABC, abstractmethod
 
+import yaml
+
 from ..ttrpg_logging import get_logger
 
 logger = get_logger(__name__)
 
 
+def domain_pattern_candidates(environment: Optional[str] = None) -> List[Path]:
+    """Domain pattern override files read by ``DomainSignalExtractor``, in priority order."""
+    env = environment or os.getenv("APP_ENV", "dev")
+    return [
+        Path(f"env/{env}/config/domain_patterns.yaml"),
+        Path("config/domain_patterns.yaml"),
+    ]
+
+
 class BaseSignalExtractor(ABC):
     """Base class for all signal extractors."""
 
@@ -39,7 +52,25 @@ class BaseSignalExtractor(ABC):
 
 
 class VectorSignalExtractor(BaseSignalExtractor):
-    """Extract vector similarity based signals."""
+    """Extract vector similarity based signals.
+
+    When retrieval already embedded the query, the semantic signal also uses
+    that embedding: the vector score hybrid retrieval recorded for the result,
+    or the cosine against a result embedding with the cached query vector.
+    No embedding requests are made while reranking.
+    """
+
+    def __init__(self, environment: str = "dev", query_embedder: Optional[Any] = None):
+        super().__init__(environment)
+        self._query_embedder = query_embedder
+
+    @property
+    def query_embedder(self) -> Any:
+        if self._query_embedder is None:
+            from .query_embeddings import get_query_embedder
+
+            self._query_embedder = get_query_embedder()
+        return self._query_embedder
 
     def extract_signals(
         self,
@@ -67,6 +98,9 @@ class VectorSignalExtractor(BaseSignalExtractor):
         # Semantic similarity (enhanced)
         content = result.get('content', '')
         semantic_score = self._compute_semantic_similarity(query, content)
+        embedding_score = self._embedding_similarity(query, result)
+        if embedding_score is not None:
+            semantic_score = max(semantic_score, embedding_score)
         signals['semantic'] = semantic_score
 
         # Query-specific vector adjustments
@@ -81,6 +115,26 @@ class VectorSignalExtractor(BaseSignalExtractor):
 
         return self._normalize_signals(signals)
 
+    def _embedding_similarity(self, query: str, result: Dict[str, Any]) -> Optional[float]:
+        """Query/result embedding similarity, when it is available without a provider call."""
+        metadata = result.get('metadata') or {}
+        vector_source = (metadata.get('retrieval_sources') or {}).get('vector')
+        if vector_source and vector_source.get('score') is not None:
+            return float(vector_source['score'])
+
+        embedding = result.get('embedding') or metadata.get('embedding')
+        if not embedding:
+            return None
+        try:
+            query_vector = self.query_embedder.cached(query)
+        except Exception:
+            return None
+        if not query_vector or len(query_vector) != len(embedding):
+            return None
+        dot = sum(a * b for a, b in zip(query_vector, embedding))
+        norm = math.sqrt(sum(a * a for a in query_vector)) * math.sqrt(sum(b * b for b in embedding))
+        return dot / norm if norm else None
+
     def _compute_semantic_similarity(self, query: str, content: str) -> float:
         """Compute enhanced semantic similarity."""
         if not query or not content:
@@ -123,10 +177,11 @@ class GraphSignalExtractor(BaseSignalExtractor):
 
         # Try to import graph components
         try:
-            from .graph_loader import GraphLoader
+            from .graph_loader import get_graph_loader
             from .graph_ranker import GraphAwareRanker
 
-            self.graph_loader = GraphLoader(environment)
+            # Shared loader: its parsed snapshots outlive this extractor
+            self.graph_loader = get_graph_loader(environment)
             self.graph_ranker = GraphAwareRanker(environment)
             self.graph_available = True
 
@@ -453,7 +508,12 @@ class DomainSignalExtractor(BaseSignalExtractor):
         self._load_domain_patterns()
 
     def _load_domain_patterns(self):
-        """Load TTRPG-specific patterns and entities."""
+        """Load TTRPG-specific patterns and entities.
+
+        Built-in defaults can be extended or overridden per category by the
+        first existing file from ``domain_pattern_candidates`` (YAML with
+        ``entity_patterns`` and/or ``authoritative_sources`` mappings).
+        """
         # TTRPG entity patterns
         self.entity_patterns = {
             'classes': r'\b(?:fighter|wizard|rogue|cleric|barbarian|bard|druid|monk|paladin|ranger|sorcerer|warlock)\b',
@@ -462,6 +522,8 @@ class DomainSignalExtractor(BaseSignalExtractor):
             'abilities': r'\b(?:strength|dexterity|constitution|intelligence|wisdom|charisma|str|dex|con|int|wis|cha)\b',
             'mechanics': r'\b(?:advantage|disadvantage|proficiency|saving throw|armor class|hit points|ac|hp)\b'
         }
+        overrides = self._load_pattern_overrides()
+        self.entity_patterns.update(overrides.get("entity_patterns") or {})
 
         # Compile patterns
         self.compiled_patterns = {
@@ -480,6 +542,21 @@ class DomainSignalExtractor(BaseSignalExtractor):
             'homebrew': 0.3,
             'unofficial': 0.2
         }
+        self.authoritative_sources.update(overrides.get("authoritative_sources") or {})
+
+    def _load_pattern_overrides(self) -> Dict[str, Any]:
+        """Read the first existing domain pattern file, if any."""
+        for path in domain_pattern_candidates(self.environment):
+            if not path.exists():
+                continue
+            try:
+                data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable domain pattern file {path}: {e}")
+                continue
+            if isinstance(data, dict):
+                return data
+        return {}
 
     def extract_signals(
         self,
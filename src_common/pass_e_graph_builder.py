@@ -15,7 +15,8 @@ Responsibilities:
 - Mark chunks as stage:"graph_enriched"
 
 Artifacts:
-- graph_snapshot.json: Complete graph structure
+- graph_snapshot.json: Complete graph structure (JSON export for debugging)
+- graph_snapshot.bin / graph_content.bin: Columnar graph with lazily read node content
 - alias_map.json: Term aliases and relationships
 - relationship_edges.jsonl: Graph edges and connections
 - manifest.json: Updated with graph results
@@ -40,6 +41,7 @@ except ImportError:
 
 from .ttrpg_logging import get_logger
 from .artifact_validator import write_json_atomically, load_json_with_retry
+from .graph_artifact import write_graph_artifact
 from .astra_loader import AstraLoader
 from .dictionary_loader import DictionaryLoader, DictEntry
 
@@ -164,6 +166,9 @@ class PassEGraphBuilder:
             graph_snapshot_path = self._write_graph_snapshot(output_dir)
             alias_map_path = self._write_alias_map(output_dir)
             edges_path = self._write_relationship_edges(output_dir)
+            # Columnar artifact last, so it is never older than the JSON export
+            graph_artifact_paths = self._write_graph_artifact(output_dir)
+            self._notify_graph_loaders(output_dir)
             
             # Update chunks in AstraDB
             chunks_updated = self._batch_update_chunks(updated_chunks)
@@ -177,7 +182,7 @@ class PassEGraphBuilder:
                 len(self.edges),
                 len(self.cross_references),
                 dict_updates,
-                [graph_snapshot_path, alias_map_path, edges_path]
+                [graph_snapshot_path, alias_map_path, edges_path, *graph_artifact_paths]
             )
             
             end_time = time.time()
@@ -203,7 +208,8 @@ class PassEGraphBuilder:
                 cross_references=len(self.cross_references),
                 dictionary_updates=dict_updates,
                 processing_time_ms=processing_time_ms,
-                artifacts=[str(graph_snapshot_path), str(alias_map_path), str(edges_path)],
+                artifacts=[str(graph_snapshot_path), str(alias_map_path), str(edges_path),
+                           *(str(path) for path in graph_artifact_paths)],
                 manifest_path=str(manifest_path),
                 success=True
             )
@@ -597,18 +603,44 @@ class PassEGraphBuilder:
         logger.info(f"Wrote graph snapshot to {snapshot_path}")
         return snapshot_path
     
-    def _write_alias_map(self, output_dir: Path) -> Path:
-        """Write alias map from cross-references"""
+    def _build_alias_map(self) -> Dict[str, Set[str]]:
+        """Build bidirectional aliases from high-confidence cross-references"""
         
         aliases = defaultdict(set)
         
-        # Build aliases from cross-references
         for ref in self.cross_references:
-            # Bidirectional aliases for high-confidence references
             if ref.confidence >= 0.7:
                 aliases[ref.source_element].add(ref.target_element)
                 aliases[ref.target_element].add(ref.source_element)
         
+        return aliases
+    
+    def _write_graph_artifact(self, output_dir: Path) -> List[Path]:
+        """Write the compact columnar graph artifact read by GraphLoader"""
+        
+        return write_graph_artifact(
+            output_dir,
+            job_id=self.job_id,
+            created_at=time.time(),
+            nodes=self.nodes.values(),
+            edges=self.edges,
+            cross_references=self.cross_references,
+            aliases=self._build_alias_map()
+        )
+    
+    def _notify_graph_loaders(self, output_dir: Path) -> None:
+        """Let graph loaders in this process pick up the new snapshot right away"""
+        try:
+            from .orchestrator.graph_loader import notify_snapshot_written
+            notify_snapshot_written(self.env, output_dir)
+        except Exception as e:
+            logger.debug(f"Graph loader notification skipped: {e}")
+
+    def _write_alias_map(self, output_dir: Path) -> Path:
+        """Write alias map from cross-references"""
+        
+        aliases = self._build_alias_map()
+        
         # Convert to serializable format
         alias_map = {
             "job_id": self.job_id,
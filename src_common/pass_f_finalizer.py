@@ -114,6 +114,9 @@ class PassFFinalizer:
             
             logger.info(f"Pass F completed for job {self.job_id} in {processing_time_ms}ms")
             
+            # Make this job's graph visible in the environment-wide merged graph
+            self._update_merged_graph_index(output_dir)
+            
             return PassFResult(
                 source_file=source_file,
                 job_id=self.job_id,
@@ -146,6 +149,16 @@ class PassFFinalizer:
                 error_message=str(e)
             )
     
+    def _update_merged_graph_index(self, output_dir: Path) -> None:
+        """Add the finalized Pass E snapshot to the merged graph index (best effort)"""
+        if not (output_dir / "graph_snapshot.json").exists():
+            return
+        try:
+            from .orchestrator.graph_index import update_merged_graph_index
+            update_merged_graph_index(self.env, output_dir)
+        except Exception as e:
+            logger.warning(f"Could not update merged graph index for job {self.job_id}: {e}")
+    
     def _validate_all_artifacts(self, output_dir: Path, manifest_data: Dict[str, Any]) -> Dict[str, int]:
         """Validate all artifacts mentioned in manifest"""
         
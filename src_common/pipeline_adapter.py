@@ -14,20 +14,24 @@ from typing import Any, Dict, Optional
 from .ttrpg_logging import get_logger
 from .progress_callback import (
     ProgressCallback, LoggingProgressCallback, JobProgress, PassProgress,
-    PassType, PassStatus, CompositeProgressCallback
+    PassType, PassStatus, CompositeProgressCallback, BufferedProgressChannel
 )
 from .job_status_store import get_job_store
 from .job_status_api import JobStatusProgressCallback
+from .progress_bus import ProgressBusCallback
 
 
 class ProgressAwarePipelineWrapper:
     """P1.1: Wrapper that adds progress tracking to the existing 6-pass pipeline"""
     
-    def __init__(self, pipeline, job_progress: JobProgress, progress_callback: ProgressCallback, loop, artifacts_root: Path):
+    def __init__(self, pipeline, job_progress: JobProgress, progress_callback: ProgressCallback, loop, artifacts_root: Path,
+                 progress_channel: Optional[BufferedProgressChannel] = None):
         self.pipeline = pipeline
         self.job_progress = job_progress
         self.progress_callback = progress_callback
         self.loop = loop
+        # Progress events are buffered and delivered on the loop, never awaited here
+        self.progress_channel = progress_channel or BufferedProgressChannel(progress_callback, loop)
         self.artifacts_root = Path(artifacts_root)
         # Ensure wrapper has a logger for internal diagnostics (fixes Pass C crash)
         self.logger = get_logger(__name__)
@@ -61,7 +65,7 @@ class ProgressAwarePipelineWrapper:
                 self.job_progress.current_pass = pass_type
                 
                 # Notify pass start (sync call in thread)
-                self._sync_callback(self.progress_callback.on_pass_start(self.job_progress, pass_progress))
+                self._emit("on_pass_start", pass_progress)
                 
                 pass_progress.status = PassStatus.IN_PROGRESS
                 
@@ -73,19 +77,19 @@ class ProgressAwarePipelineWrapper:
                     if hasattr(result, 'success') and not result.success:
                         error_msg = getattr(result, 'error_message', f'Pass {pass_name} failed')
                         pass_progress.fail(error_msg)
-                        self._sync_callback(self.progress_callback.on_pass_failed(self.job_progress, pass_progress))
+                        self._emit("on_pass_failed", pass_progress)
                         break
                     else:
                         pass_progress.complete()
-                        self._sync_callback(self.progress_callback.on_pass_complete(self.job_progress, pass_progress))
+                        self._emit("on_pass_complete", pass_progress)
                         
                 except Exception as e:
                     pass_progress.fail(str(e), type(e).__name__)
-                    self._sync_callback(self.progress_callback.on_pass_failed(self.job_progress, pass_progress))
+                    self._emit("on_pass_failed", pass_progress)
                     break
             
             # Notify job completion
-            self._sync_callback(self.progress_callback.on_job_complete(self.job_progress))
+            self._emit("on_job_complete")
             
             return result or self._create_failed_result("Pipeline execution failed")
             
@@ -93,14 +97,13 @@ class ProgressAwarePipelineWrapper:
             # Handle overall pipeline failure
             return self._create_failed_result(f"Pipeline error: {str(e)}")
     
-    def _sync_callback(self, coro):
-        """Execute async callback from sync context using asyncio.run_coroutine_threadsafe"""
+    def _emit(self, event, pass_progress=None, **metrics):
+        """Publish a progress event without blocking the pipeline thread"""
         try:
-            future = asyncio.run_coroutine_threadsafe(coro, self.loop)
-            future.result(timeout=5.0)  # Wait up to 5 seconds for callback
+            self.progress_channel.publish(event, self.job_progress, pass_progress, **metrics)
         except Exception as e:
             # Don't let callback errors break the pipeline
-            print(f"Progress callback error: {e}")
+            self.logger.warning(f"Progress callback error: {e}")
     
     def _execute_pass_a(self, pdf_path, environment, pass_progress):
         """Execute Pass A with progress tracking"""
@@ -114,9 +117,9 @@ class ProgressAwarePipelineWrapper:
             # Update progress with ToC metrics
             if hasattr(result, 'toc_entries'):
                 pass_progress.toc_entries = len(result.toc_entries) if result.toc_entries else 0
-                self._sync_callback(self.progress_callback.on_pass_progress(
-                    self.job_progress, pass_progress, toc_entries=pass_progress.toc_entries
-                ))
+                self._emit(
+                    "on_pass_progress", pass_progress, toc_entries=pass_progress.toc_entries
+                )
             
             return result
         except Exception as e:
@@ -133,9 +136,9 @@ class ProgressAwarePipelineWrapper:
             # Update progress with chunk metrics
             if hasattr(result, 'chunks_created'):
                 pass_progress.chunks_processed = result.chunks_created
-                self._sync_callback(self.progress_callback.on_pass_progress(
-                    self.job_progress, pass_progress, chunks_processed=pass_progress.chunks_processed
-                ))
+                self._emit(
+                    "on_pass_progress", pass_progress, chunks_processed=pass_progress.chunks_processed
+                )
             
             return result
         except Exception as e:
@@ -173,9 +176,9 @@ class ProgressAwarePipelineWrapper:
             # Update progress with vector metrics
             if hasattr(result, 'vectors_created'):
                 pass_progress.vectors_created = result.vectors_created
-                self._sync_callback(self.progress_callback.on_pass_progress(
-                    self.job_progress, pass_progress, vectors_created=pass_progress.vectors_created
-                ))
+                self._emit(
+                    "on_pass_progress", pass_progress, vectors_created=pass_progress.vectors_created
+                )
             
             return result
         except Exception as e:
@@ -193,11 +196,11 @@ class ProgressAwarePipelineWrapper:
             if hasattr(result, 'nodes_created') and hasattr(result, 'edges_created'):
                 pass_progress.graph_nodes = result.nodes_created
                 pass_progress.graph_edges = result.edges_created
-                self._sync_callback(self.progress_callback.on_pass_progress(
-                    self.job_progress, pass_progress, 
+                self._emit(
+                    "on_pass_progress", pass_progress,
                     graph_nodes=pass_progress.graph_nodes,
                     graph_edges=pass_progress.graph_edges
-                ))
+                )
             
             return result
         except Exception as e:
@@ -394,12 +397,16 @@ class Pass6PipelineAdapter:
         job_status_callback = JobStatusProgressCallback(self._job_store)
         composite_callback = CompositeProgressCallback([
             self.progress_callback,
-            job_status_callback
+            job_status_callback,
+            ProgressBusCallback(),
         ])
         
         # P1.1: Notify job start
         await composite_callback.on_job_start(job_progress)
         
+        # Worker-thread progress events are coalesced and delivered by the loop
+        progress_channel = BufferedProgressChannel(composite_callback, loop)
+        
         # P0.2: Pre-thread execution logging
         self.logger.info(
             f"Job entering thread pool execution for {pdf_name} "
@@ -419,7 +426,8 @@ class Pass6PipelineAdapter:
                 
                 # P1.1: Create progress-aware pipeline wrapper
                 progress_wrapper = ProgressAwarePipelineWrapper(
-                    self._pipeline, job_progress, composite_callback, loop, artifacts_root
+                    self._pipeline, job_progress, composite_callback, loop, artifacts_root,
+                    progress_channel=progress_channel
                 )
                 
                 # Execute the pipeline with progress tracking
@@ -520,3 +528,7 @@ class Pass6PipelineAdapter:
                 "thread_name": "pool_error",
                 "exception_type": type(e).__name__,
             }
+        finally:
+            # Deliver any buffered progress (including job completion) before returning
+            await progress_channel.flush()
+            self.logger.debug(f"Progress channel stats for {pdf_name}: {progress_channel.get_stats()}")
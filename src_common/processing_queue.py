@@ -1,17 +1,54 @@
 """
 FR-002: Processing Queue
 
-Lightweight, persistent document processing queue with duplicate detection
-and priority ordering.
+Durable document processing queue with duplicate detection and priority
+ordering.
+
+Items live in a SQLite database next to the configured state file, indexed on
+(state, priority, created_at) so enqueue and dequeue are O(log n). Several
+ingestion workers (threads or processes) can pull from the same queue safely:
+``claim_next`` atomically leases an item for a visibility timeout, ``ack``
+removes it once processed and ``nack`` releases it for retry. Items that keep
+failing are moved to a dead-letter state after ``max_attempts`` claims.
 """
 
 from __future__ import annotations
 
 import json
+import sqlite3
 import time
-from dataclasses import dataclass, asdict
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+
+STATE_READY = "ready"
+STATE_CLAIMED = "claimed"
+STATE_DEAD = "dead"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue_items (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL UNIQUE,
+    priority INTEGER NOT NULL DEFAULT 1,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL,
+    state TEXT NOT NULL DEFAULT 'ready',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    receipt TEXT,
+    claimed_by TEXT,
+    visible_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_queue_ready ON queue_items (state, priority, created_at, seq);
+CREATE INDEX IF NOT EXISTS idx_queue_visibility ON queue_items (state, visible_at);
+CREATE TABLE IF NOT EXISTS queue_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
 
 
 @dataclass
@@ -24,106 +61,267 @@ class QueueItem:
 
 
 class ProcessingQueue:
-    def __init__(self, state_file: Path, max_size: int = 1000) -> None:
+    def __init__(
+        self,
+        state_file: Path,
+        max_size: int = 1000,
+        visibility_timeout_s: float = 1800.0,
+        max_attempts: int = 3,
+    ) -> None:
         self.state_file = Path(state_file)
+        self.db_path = self.state_file.with_suffix(".sqlite3")
         self.max_size = max_size
-        self._items: List[QueueItem] = []
-        self._by_path: Dict[str, QueueItem] = {}
-        self._counter = 0
-        self._load()
+        self.visibility_timeout_s = float(visibility_timeout_s)
+        self.max_attempts = max(1, int(max_attempts))
+        self._init_db()
+        self._migrate_legacy_state()
 
     def add_document(self, path: str, priority: int = 1, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        # Duplicate detection by path
-        if path in self._by_path:
-            return {"status": "duplicate", "existing_job_id": self._by_path[path].job_id}
-
-        if len(self._items) >= self.max_size:
-            return {"status": "rejected", "reason": "capacity"}
-
-        self._counter += 1
-        job_id = f"queue_{self._counter:06d}"
-        qi = QueueItem(
-            job_id=job_id,
-            path=path,
-            priority=int(priority),
-            metadata=metadata or {},
-            created_at=time.time(),
-        )
-        self._items.append(qi)
-        self._by_path[path] = qi
-        self._sort()
-        self._save()
+        with self._transaction() as conn:
+            existing = conn.execute(
+                "SELECT job_id, state FROM queue_items WHERE path = ?", (path,)
+            ).fetchone()
+            if existing is not None and existing["state"] != STATE_DEAD:
+                # Duplicate detection by path
+                return {"status": "duplicate", "existing_job_id": existing["job_id"]}
+
+            if self._pending_count(conn) >= self.max_size:
+                return {"status": "rejected", "reason": "capacity"}
+
+            if existing is not None:
+                # Re-adding a dead-lettered document gives it a fresh start
+                conn.execute("DELETE FROM queue_items WHERE path = ?", (path,))
+
+            job_id = self._next_job_id(conn)
+            conn.execute(
+                "INSERT INTO queue_items (job_id, path, priority, metadata, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, path, int(priority), json.dumps(metadata or {}), time.time()),
+            )
         return {"status": "added", "job_id": job_id}
 
     def peek_queue(self) -> List[Dict[str, Any]]:
         """View all items in queue without removing them"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM queue_items WHERE state IN (?, ?) ORDER BY priority, created_at, seq",
+                (STATE_READY, STATE_CLAIMED),
+            ).fetchall()
         return [
             {
-                "job_id": item.job_id,
-                "path": item.path,
-                "priority": item.priority,
-                "created_at": item.created_at,
-                "metadata": item.metadata
+                "job_id": row["job_id"],
+                "path": row["path"],
+                "priority": row["priority"],
+                "created_at": row["created_at"],
+                "metadata": json.loads(row["metadata"]),
+                "state": row["state"],
+                "attempts": row["attempts"],
             }
-            for item in self._items
+            for row in rows
         ]
 
     def get_next_document(self) -> Optional[Dict[str, Any]]:
-        if not self._items:
+        """Remove and return the highest-priority document (at-most-once delivery)."""
+        claimed = self.claim_next(worker_id="get_next_document")
+        if claimed is None:
             return None
-        qi = self._items.pop(0)
-        self._by_path.pop(qi.path, None)
-        self._save()
-        return {"path": qi.path, "priority": qi.priority, "metadata": qi.metadata}
+        self.ack(claimed["job_id"], claimed["receipt"])
+        return {"path": claimed["path"], "priority": claimed["priority"], "metadata": claimed["metadata"]}
+
+    def claim_next(self, worker_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Atomically lease the highest-priority ready document.
+
+        The item stays invisible to other workers until ``visibility_timeout_s``
+        elapses; if it is neither acked nor nacked by then it becomes claimable
+        again (or is dead-lettered once ``max_attempts`` is reached).
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            self._release_expired(conn, now)
+            row = conn.execute(
+                "SELECT * FROM queue_items WHERE state = ? AND visible_at <= ? "
+                "ORDER BY priority, created_at, seq LIMIT 1",
+                (STATE_READY, now),
+            ).fetchone()
+            if row is None:
+                return None
+            receipt = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE queue_items SET state = ?, attempts = attempts + 1, receipt = ?, claimed_by = ?, visible_at = ? "
+                "WHERE seq = ?",
+                (STATE_CLAIMED, receipt, worker_id, now + self.visibility_timeout_s, row["seq"]),
+            )
+        return {
+            "job_id": row["job_id"],
+            "path": row["path"],
+            "priority": row["priority"],
+            "metadata": json.loads(row["metadata"]),
+            "attempts": row["attempts"] + 1,
+            "receipt": receipt,
+        }
+
+    def ack(self, job_id: str, receipt: str) -> bool:
+        """Mark a claimed document as processed and remove it from the queue."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM queue_items WHERE job_id = ? AND state = ? AND receipt = ?",
+                (job_id, STATE_CLAIMED, receipt),
+            )
+        return cursor.rowcount > 0
+
+    def nack(self, job_id: str, receipt: str, error: Optional[str] = None) -> Dict[str, Any]:
+        """Release a claimed document after a failure.
+
+        The document returns to the ready state, or moves to the dead-letter
+        state once it has been claimed ``max_attempts`` times.
+        """
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts FROM queue_items WHERE job_id = ? AND state = ? AND receipt = ?",
+                (job_id, STATE_CLAIMED, receipt),
+            ).fetchone()
+            if row is None:
+                return {"status": "not_claimed", "job_id": job_id}
+            state = STATE_DEAD if row["attempts"] >= self.max_attempts else STATE_READY
+            conn.execute(
+                "UPDATE queue_items SET state = ?, receipt = NULL, claimed_by = NULL, visible_at = 0, last_error = ? "
+                "WHERE job_id = ?",
+                (state, error, job_id),
+            )
+        return {"status": "dead_lettered" if state == STATE_DEAD else "requeued", "job_id": job_id}
+
+    def list_dead_letters(self) -> List[Dict[str, Any]]:
+        """Return documents that exhausted their attempts."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM queue_items WHERE state = ? ORDER BY created_at, seq", (STATE_DEAD,)
+            ).fetchall()
+        return [
+            {
+                "job_id": row["job_id"],
+                "path": row["path"],
+                "priority": row["priority"],
+                "attempts": row["attempts"],
+                "last_error": row["last_error"],
+                "metadata": json.loads(row["metadata"]),
+            }
+            for row in rows
+        ]
+
+    def requeue_dead_letters(self, job_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Move dead-lettered documents back to the ready state with a fresh attempt budget."""
+        with self._transaction() as conn:
+            if job_ids is None:
+                cursor = conn.execute(
+                    "UPDATE queue_items SET state = ?, attempts = 0, last_error = NULL WHERE state = ?",
+                    (STATE_READY, STATE_DEAD),
+                )
+            else:
+                cursor = conn.executemany(
+                    "UPDATE queue_items SET state = ?, attempts = 0, last_error = NULL WHERE state = ? AND job_id = ?",
+                    [(STATE_READY, STATE_DEAD, job_id) for job_id in job_ids],
+                )
+        return {"status": "requeued", "requeued_count": cursor.rowcount}
 
     def get_status(self) -> Dict[str, Any]:
-        return {"total_documents": len(self._items), "capacity": self.max_size}
+        with self._connect() as conn:
+            counts = dict(
+                conn.execute("SELECT state, COUNT(*) FROM queue_items GROUP BY state").fetchall()
+            )
+        return {
+            "total_documents": counts.get(STATE_READY, 0) + counts.get(STATE_CLAIMED, 0),
+            "capacity": self.max_size,
+            "ready": counts.get(STATE_READY, 0),
+            "claimed": counts.get(STATE_CLAIMED, 0),
+            "dead_letters": counts.get(STATE_DEAD, 0),
+        }
 
     def clear_queue(self) -> Dict[str, Any]:
         """Clear all items from the queue and reset state"""
-        cleared_count = len(self._items)
-        self._items = []
-        self._by_path = {}
-        self._save()
-        return {"status": "cleared", "cleared_count": cleared_count}
+        with self._transaction() as conn:
+            cursor = conn.execute("DELETE FROM queue_items")
+        return {"status": "cleared", "cleared_count": cursor.rowcount}
 
     def remove_failed_documents(self, failed_paths: List[str]) -> Dict[str, Any]:
         """Remove specific failed documents from queue"""
-        removed_count = 0
-        original_items = self._items.copy()
-        
-        self._items = [item for item in self._items if item.path not in failed_paths]
-        removed_count = len(original_items) - len(self._items)
-        
-        # Rebuild by_path index
-        self._by_path = {item.path: item for item in self._items}
-        self._save()
-        
-        return {"status": "removed", "removed_count": removed_count, "remaining_count": len(self._items)}
-
-    def _sort(self) -> None:
-        self._items.sort(key=lambda x: (x.priority, x.created_at))
-
-    def _save(self) -> None:
-        self.state_file.parent.mkdir(parents=True, exist_ok=True)
-        data = {
-            "counter": self._counter,
-            "items": [asdict(i) for i in self._items],
-        }
-        self.state_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        with self._transaction() as conn:
+            cursor = conn.executemany(
+                "DELETE FROM queue_items WHERE path = ?", [(path,) for path in failed_paths]
+            )
+            remaining = self._pending_count(conn)
+        return {"status": "removed", "removed_count": cursor.rowcount, "remaining_count": remaining}
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
 
-    def _load(self) -> None:
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE takes the write lock up front so concurrent claimers
+        # serialize on SQLite's lock instead of racing on the same row.
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _pending_count(self, conn: sqlite3.Connection) -> int:
+        return conn.execute(
+            "SELECT COUNT(*) FROM queue_items WHERE state IN (?, ?)", (STATE_READY, STATE_CLAIMED)
+        ).fetchone()[0]
+
+    def _next_job_id(self, conn: sqlite3.Connection) -> str:
+        conn.execute("INSERT OR IGNORE INTO queue_meta (key, value) VALUES ('counter', 0)")
+        conn.execute("UPDATE queue_meta SET value = value + 1 WHERE key = 'counter'")
+        counter = conn.execute("SELECT value FROM queue_meta WHERE key = 'counter'").fetchone()[0]
+        return f"queue_{counter:06d}"
+
+    def _release_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        """Return expired leases to the ready state, dead-lettering exhausted items."""
+        conn.execute(
+            "UPDATE queue_items SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "receipt = NULL, claimed_by = NULL, visible_at = 0, "
+            "last_error = COALESCE(last_error, 'visibility timeout expired') "
+            "WHERE state = ? AND visible_at <= ?",
+            (self.max_attempts, STATE_DEAD, STATE_READY, STATE_CLAIMED, now),
+        )
+
+    def _migrate_legacy_state(self) -> None:
+        """Import items from the pre-SQLite JSON state file once, then retire it."""
         if not self.state_file.exists():
             return
         try:
             data = json.loads(self.state_file.read_text(encoding="utf-8"))
-            self._counter = int(data.get("counter", 0))
-            self._items = [QueueItem(**i) for i in data.get("items", [])]
-            self._by_path = {i.path: i for i in self._items}
-            self._sort()
+            items = [QueueItem(**i) for i in data.get("items", [])]
+            counter = int(data.get("counter", 0))
         except Exception:
-            # Start empty if corrupted
-            self._items = []
-            self._by_path = {}
-            self._counter = 0
-
+            # Corrupted legacy state: start empty
+            items, counter = [], 0
+        with self._transaction() as conn:
+            conn.execute("INSERT OR IGNORE INTO queue_meta (key, value) VALUES ('counter', 0)")
+            conn.execute("UPDATE queue_meta SET value = MAX(value, ?) WHERE key = 'counter'", (counter,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO queue_items (job_id, path, priority, metadata, created_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (item.job_id, item.path, int(item.priority), json.dumps(item.metadata or {}), item.created_at)
+                    for item in items
+                ],
+            )
+        self.state_file.replace(self.state_file.with_suffix(self.state_file.suffix + ".migrated"))
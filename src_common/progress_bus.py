@@ -0,0 +1,311 @@
+# src_common/progress_bus.py
+"""
+Job progress event bus for the ingestion console.
+
+Producers (metrics emission, job log appends, manifest writes and pipeline
+progress callbacks) ``publish`` events keyed by job id; stream endpoints
+``subscribe`` and are woken as events arrive instead of polling manifests
+and log files. Each job keeps its last N events so a new subscriber first
+receives a replay of recent progress.
+
+Subscriber queues are bounded: a slow consumer loses its oldest queued
+events, never the producer's time and never a terminal ``final_status``.
+With ``PROGRESS_BUS_REDIS_ENABLED=true`` events are also relayed over Redis
+pub/sub so streams served by one worker see jobs running in another.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .ttrpg_logging import get_logger
+from .progress_callback import JobProgress, PassProgress, ProgressCallback
+
+
+logger = get_logger(__name__)
+
+FINAL_EVENT = "final_status"
+TERMINAL_STATUSES = ("completed", "failed")
+REDIS_CHANNEL_PREFIX = "ttrpg:job_progress:"
+
+
+class ProgressSubscription:
+    """One subscriber's bounded event queue, consumed on its own event loop."""
+
+    def __init__(self, bus: "JobProgressBus", job_id: str, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.bus = bus
+        self.job_id = job_id
+        self.loop = loop
+        self.maxsize = max(1, int(maxsize))
+        self.dropped = 0
+        self.closed = False
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._ready = asyncio.Event()
+
+    def _offer(self, event: Dict[str, Any]) -> None:
+        """Queue an event (runs on the subscriber's loop)"""
+        if self.closed:
+            return
+        if len(self._queue) >= self.maxsize:
+            # Keep terminal events; shed the oldest progress instead
+            for index, queued in enumerate(self._queue):
+                if queued.get("type") != FINAL_EVENT:
+                    del self._queue[index]
+                    break
+            else:
+                self._queue.popleft()
+            self.dropped += 1
+        self._queue.append(event)
+        self._ready.set()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None if ``timeout`` elapses or the subscription is closed"""
+        while not self._queue:
+            if self.closed:
+                return None
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._queue.popleft()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.bus.unsubscribe(self)
+            self.closed = True
+            self._ready.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+class JobProgressBus:
+    """
+    In-process pub/sub for job progress events
+
+    ``publish`` may be called from any thread; delivery to each subscriber is
+    scheduled on that subscriber's event loop.
+    """
+
+    def __init__(self, replay_size: int = 50, queue_size: int = 256, max_jobs: int = 512,
+                 remote: Optional[Any] = None):
+        self.replay_size = max(0, int(replay_size))
+        self.queue_size = max(1, int(queue_size))
+        self.max_jobs = max(1, int(max_jobs))
+        self.remote = remote
+        self.origin = uuid.uuid4().hex
+
+        self._lock = threading.Lock()
+        self._history: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self._subscribers: Dict[str, List[ProgressSubscription]] = {}
+        self._listener: Optional[threading.Thread] = None
+
+        self.published = 0
+        self.delivered = 0
+        self.remote_received = 0
+
+        if self.remote is not None:
+            self._start_listener()
+
+    def publish(self, job_id: str, event: Dict[str, Any]) -> None:
+        """Record an event for ``job_id`` and wake its subscribers"""
+        event = dict(event)
+        event.setdefault("job_id", job_id)
+        event.setdefault("timestamp", time.time())
+        self._dispatch(job_id, event)
+        if self.remote is not None:
+            self._publish_remote(job_id, event)
+
+    def subscribe(self, job_id: str, replay: bool = True) -> ProgressSubscription:
+        """Subscribe on the running loop; recent events are queued first when ``replay``"""
+        subscription = ProgressSubscription(self, job_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            if replay:
+                for event in self._history.get(job_id, ()):
+                    subscription._offer(event)
+            self._subscribers.setdefault(job_id, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ProgressSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.job_id)
+            if subscribers and subscription in subscribers:
+                subscribers.remove(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.job_id]
+
+    def recent(self, job_id: str) -> List[Dict[str, Any]]:
+        """Replay buffer for a job, oldest first"""
+        with self._lock:
+            return list(self._history.get(job_id, ()))
+
+    def subscriber_count(self, job_id: Optional[str] = None) -> int:
+        with self._lock:
+            if job_id is not None:
+                return len(self._subscribers.get(job_id, ()))
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "published": self.published,
+                "delivered": self.delivered,
+                "remote_received": self.remote_received,
+                "jobs": len(self._history),
+                "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+                "dropped": sum(sub.dropped for subscribers in self._subscribers.values() for sub in subscribers),
+            }
+
+    def _dispatch(self, job_id: str, event: Dict[str, Any]) -> None:
+        with self._lock:
+            self.published += 1
+            if self.replay_size:
+                history = self._history.get(job_id)
+                if history is None:
+                    history = self._history[job_id] = deque(maxlen=self.replay_size)
+                    while len(self._history) > self.max_jobs:
+                        self._history.popitem(last=False)
+                else:
+                    self._history.move_to_end(job_id)
+                history.append(event)
+            subscribers = list(self._subscribers.get(job_id, ()))
+            self.delivered += len(subscribers)
+
+        for subscription in subscribers:
+            try:
+                if _running_loop() is subscription.loop:
+                    subscription._offer(event)
+                else:
+                    subscription.loop.call_soon_threadsafe(subscription._offer, event)
+            except RuntimeError:
+                # Subscriber's loop is gone
+                self.unsubscribe(subscription)
+
+    def _publish_remote(self, job_id: str, event: Dict[str, Any]) -> None:
+        try:
+            payload = json.dumps({"origin": self.origin, "job_id": job_id, "event": event}, default=str)
+            self.remote.client.publish(REDIS_CHANNEL_PREFIX + job_id, payload)
+        except Exception as e:
+            logger.warning(f"Failed to relay progress event for {job_id}: {e}")
+
+    def _start_listener(self) -> None:
+        def _listen() -> None:
+            try:
+                pubsub = self.remote.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(REDIS_CHANNEL_PREFIX + "*")
+                for message in pubsub.listen():
+                    self._receive_remote(message.get("data"))
+            except Exception as e:
+                logger.error(f"Progress bus Redis listener stopped: {e}")
+
+        self._listener = threading.Thread(target=_listen, name="progress-bus-redis", daemon=True)
+        self._listener.start()
+
+    def _receive_remote(self, data: Any) -> None:
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self.origin:
+            return
+        with self._lock:
+            self.remote_received += 1
+        self._dispatch(message["job_id"], message["event"])
+
+
+class ProgressBusCallback(ProgressCallback):
+    """Pipeline progress callback that publishes pass events to the bus"""
+
+    def __init__(self, bus: Optional[JobProgressBus] = None):
+        self.bus = bus or get_progress_bus()
+
+    def _publish(self, job_progress: JobProgress, event_type: str,
+                 pass_progress: Optional[PassProgress] = None, **fields) -> None:
+        event: Dict[str, Any] = {
+            "type": event_type,
+            "environment": job_progress.environment,
+            "status": job_progress.overall_status,
+            "progress_percent": job_progress.get_progress_percentage(),
+        }
+        if pass_progress is not None:
+            event["pass"] = pass_progress.pass_type.value
+            event["pass_status"] = pass_progress.status.value
+            if pass_progress.error_message:
+                event["error"] = pass_progress.error_message
+        event.update(fields)
+        self.bus.publish(job_progress.job_id, event)
+
+    async def on_job_start(self, job_progress: JobProgress) -> None:
+        self._publish(job_progress, "job_start")
+
+    async def on_pass_start(self, job_progress: JobProgress, pass_progress: PassProgress) -> None:
+        self._publish(job_progress, "pass", pass_progress)
+
+    async def on_pass_progress(self, job_progress: JobProgress, pass_progress: PassProgress, **metrics) -> None:
+        self._publish(job_progress, "pass", pass_progress, metrics=metrics)
+
+    async def on_pass_complete(self, job_progress: JobProgress, pass_progress: PassProgress) -> None:
+        self._publish(job_progress, "pass", pass_progress)
+
+    async def on_pass_failed(self, job_progress: JobProgress, pass_progress: PassProgress) -> None:
+        self._publish(job_progress, "pass", pass_progress)
+
+    async def on_job_complete(self, job_progress: JobProgress) -> None:
+        status = "completed" if job_progress.overall_status == "completed" else "failed"
+        self._publish(job_progress, FINAL_EVENT, status=status)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _default_remote() -> Optional[Any]:
+    """Redis relay, used only when enabled and the Redis service is connected."""
+    if os.getenv("PROGRESS_BUS_REDIS_ENABLED", "false").lower() != "true":
+        return None
+    try:
+        from .redis_service import get_redis_service
+
+        service = get_redis_service()
+    except Exception as e:
+        logger.warning(f"Redis unavailable for the progress bus: {e}")
+        return None
+    if service.client is None:
+        return None
+    if not service.features_enabled:
+        logger.info("Redis features are disabled; progress bus Redis relay inactive")
+        return None
+    return service
+
+
+_progress_bus: Optional[JobProgressBus] = None
+_progress_bus_lock = threading.Lock()
+
+
+def get_progress_bus() -> JobProgressBus:
+    """Process-wide progress bus"""
+    global _progress_bus
+    if _progress_bus is None:
+        with _progress_bus_lock:
+            if _progress_bus is None:
+                _progress_bus = JobProgressBus(
+                    replay_size=int(os.getenv("PROGRESS_BUS_REPLAY", "50")),
+                    queue_size=int(os.getenv("PROGRESS_BUS_QUEUE_SIZE", "256")),
+                    remote=_default_remote(),
+                )
+    return _progress_bus
@@ -7,8 +7,11 @@ from the 6-pass pipeline execution with pass-level granularity.
 
 from __future__ import annotations
 
+import asyncio
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Union
 from enum import Enum
@@ -289,4 +292,153 @@ class CompositeProgressCallback(ProgressCallback):
     
     async def on_job_complete(self, job_progress: JobProgress) -> None:
         for callback in self.callbacks:
-            await callback.on_job_complete(job_progress)
\ No newline at end of file
+            await callback.on_job_complete(job_progress)
+
+
+_CHANNEL_EVENTS = frozenset({
+    "on_job_start", "on_pass_start", "on_pass_progress",
+    "on_pass_complete", "on_pass_failed", "on_job_complete",
+})
+
+
+class BufferedProgressChannel:
+    """Non-blocking bridge from pipeline worker threads to an async progress callback.
+
+    Worker threads ``publish`` events into a bounded buffer and return
+    immediately. A single consumer task on the event loop drains the buffer in
+    batches and fans each event out to the wrapped callback (typically a
+    ``CompositeProgressCallback``).
+
+    ``on_pass_progress`` updates for the same job and pass are coalesced while
+    pending (last write wins per metric). When the buffer is full the oldest
+    pending progress update is dropped; lifecycle events (start, complete,
+    failed) are never dropped. Callbacks observe the live ``JobProgress`` and
+    ``PassProgress`` objects at delivery time.
+    """
+
+    def __init__(self, callback: ProgressCallback, loop: asyncio.AbstractEventLoop, capacity: int = 256):
+        self.callback = callback
+        self.loop = loop
+        self.capacity = max(1, int(capacity))
+        self.logger = get_logger(__name__)
+
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._seq = 0
+        self._drain_scheduled = False
+        self._drain_task: Optional[asyncio.Task] = None
+
+        # Channel statistics
+        self.published = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.errors = 0
+
+    def publish(self, event: str, job_progress: JobProgress,
+                pass_progress: Optional[PassProgress] = None, **metrics) -> None:
+        """Queue a progress event from any thread without waiting for delivery"""
+        if event not in _CHANNEL_EVENTS:
+            raise ValueError(f"Unknown progress event: {event}")
+
+        with self._lock:
+            self.published += 1
+
+            if event == "on_pass_progress":
+                key = ("progress", job_progress.job_id, pass_progress.pass_type if pass_progress else None)
+                pending = self._pending.get(key)
+                if pending is not None:
+                    pending[3].update(metrics)
+                    self.coalesced += 1
+                    return
+                if len(self._pending) >= self.capacity and not self._evict_oldest_progress():
+                    self.dropped += 1
+                    return
+            else:
+                self._seq += 1
+                key = ("event", self._seq)
+                if len(self._pending) >= self.capacity:
+                    self._evict_oldest_progress()
+
+            self._pending[key] = (event, job_progress, pass_progress, dict(metrics))
+
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+
+        try:
+            self.loop.call_soon_threadsafe(self._ensure_drain)
+        except RuntimeError as e:
+            # Event loop already closed: nothing left to deliver to
+            self.logger.warning(f"Progress channel loop unavailable, discarding events: {e}")
+            with self._lock:
+                self.dropped += len(self._pending)
+                self._pending.clear()
+                self._drain_scheduled = False
+
+    def _evict_oldest_progress(self) -> bool:
+        """Drop the oldest pending progress update (caller holds the lock)"""
+        for key, pending in self._pending.items():
+            if pending[0] == "on_pass_progress":
+                del self._pending[key]
+                self.dropped += 1
+                return True
+        return False
+
+    def _ensure_drain(self) -> None:
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = self.loop.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._drain_scheduled = False
+                    return
+                batch = list(self._pending.values())
+                self._pending.clear()
+
+            for event, job_progress, pass_progress, metrics in batch:
+                await self._deliver(event, job_progress, pass_progress, metrics)
+
+    async def _deliver(self, event: str, job_progress: JobProgress,
+                       pass_progress: Optional[PassProgress], metrics: Dict[str, Any]) -> None:
+        handler = getattr(self.callback, event)
+        try:
+            if event in ("on_job_start", "on_job_complete"):
+                await handler(job_progress)
+            elif event == "on_pass_progress":
+                await handler(job_progress, pass_progress, **metrics)
+            else:
+                await handler(job_progress, pass_progress)
+            self.delivered += 1
+        except Exception as e:
+            # Don't let callback errors stop the consumer
+            self.errors += 1
+            self.logger.error(f"Progress callback {event} failed for job {job_progress.job_id}: {e}")
+
+    async def flush(self) -> None:
+        """Wait until every published event has been delivered (call on the loop)"""
+        while True:
+            task = self._drain_task
+            if task is not None and not task.done():
+                await task
+                continue
+            with self._lock:
+                idle = not self._pending and not self._drain_scheduled
+            if idle:
+                return
+            # A drain has been requested but not started yet
+            await asyncio.sleep(0)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Channel counters for diagnostics"""
+        with self._lock:
+            return {
+                "published": self.published,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "delivered": self.delivered,
+                "errors": self.errors,
+                "pending": len(self._pending),
+            }
@@ -4,11 +4,13 @@ Phase 7: Requirements Management Service
 Immutable versioned requirements storage with schema validation
 """
 
+import os
 import json
 import time
 import hashlib
 import pathlib
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass, asdict
 
@@ -52,6 +54,19 @@ class AuditLogEntry:
     admin: str
     reason: Optional[str] = None
     checksum: str = ""
+    prev_hash: str = ""
+
+
+# prev_hash of the first entry in a hash-chained audit log
+AUDIT_GENESIS_HASH = ""
+# Bytes read from the end of the audit log to find its last entry
+_TAIL_READ_SIZE = 64 * 1024
+
+
+def _audit_entry_hash(data: Dict[str, Any]) -> str:
+    """SHA-256 over an entry without its checksum; covers prev_hash, chaining the entries"""
+    content = json.dumps({key: value for key, value in data.items() if key != "checksum"}, sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()
 
 
 class RequirementsManager:
@@ -181,16 +196,39 @@ class RequirementsManager:
 
 
 class FeatureRequestManager:
-    """Manages feature request workflow with approval/rejection system"""
+    """
+    Manages feature request workflow with approval/rejection system
     
-    def __init__(self, base_path: pathlib.Path = None):
+    The audit log (``audit/features.log``) is hash-chained: each entry's
+    checksum covers the previous entry's checksum (``prev_hash``). A verified
+    prefix is recorded as an (offset, chain hash) checkpoint, so routine
+    integrity checks only hash entries appended since the last one; a full
+    re-verification can run periodically in the background.
+    """
+    
+    def __init__(self, base_path: pathlib.Path = None, full_verify_interval_s: Optional[float] = None):
         self.base_path = base_path or pathlib.Path(".")
         self.features_dir = self.base_path / "features"
         self.audit_dir = self.base_path / "audit"
+        self.audit_file = self.audit_dir / "features.log"
+        self.checkpoint_file = self.audit_dir / "features.checkpoint.json"
         
         # Ensure directories exist
         for dir_path in [self.features_dir, self.audit_dir]:
             dir_path.mkdir(parents=True, exist_ok=True)
+        
+        self._audit_lock = threading.RLock()
+        self._tail: Optional[Tuple[int, str]] = None  # (log size, checksum of the last entry)
+        self._index: Dict[str, List[int]] = {}  # request_id -> entry offsets
+        self._indexed_offset = 0
+        self.last_full_verification: Optional[Dict[str, Any]] = None
+        self._verifier: Optional[threading.Thread] = None
+        self._stop_verifier = threading.Event()
+        
+        if full_verify_interval_s is None:
+            full_verify_interval_s = float(os.getenv("AUDIT_FULL_VERIFY_INTERVAL_S", "0"))
+        if full_verify_interval_s > 0:
+            self.start_background_verification(full_verify_interval_s)
     
     def _generate_request_id(self) -> str:
         """Generate unique request ID"""
@@ -337,71 +375,218 @@ class FeatureRequestManager:
             reason=reason
         )
         
-        # Generate checksum for tamper detection
-        entry_data = asdict(audit_entry)
-        entry_data.pop("checksum")  # Remove checksum field
-        entry_content = json.dumps(entry_data, sort_keys=True)
-        audit_entry.checksum = hashlib.sha256(entry_content.encode()).hexdigest()
-        
-        # Append to audit log
-        audit_file = self.audit_dir / "features.log"
-        log_line = json.dumps(asdict(audit_entry)) + "\n"
-        
-        with open(audit_file, "a", encoding='utf-8') as f:
-            f.write(log_line)
+        with self._audit_lock:
+            # Generate chained checksum for tamper detection
+            audit_entry.prev_hash = self._tail_hash()
+            audit_entry.checksum = _audit_entry_hash(asdict(audit_entry))
+            
+            # Append to audit log
+            log_line = (json.dumps(asdict(audit_entry)) + "\n").encode("utf-8")
+            with open(self.audit_file, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(log_line)
+            
+            self._tail = (offset + len(log_line), audit_entry.checksum)
+            if self._indexed_offset == offset:
+                self._index.setdefault(request_id, []).append(offset)
+                self._indexed_offset = offset + len(log_line)
+    
+    def _iter_audit_lines(self, start: int = 0) -> Iterator[Tuple[int, bytes]]:
+        """(offset, line) for each complete line from ``start``"""
+        with open(self.audit_file, "rb") as f:
+            f.seek(start)
+            offset = start
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    return  # Entry still being written
+                yield offset, raw
+                offset += len(raw)
+    
+    def _read_audit_line(self, offset: int) -> bytes:
+        with open(self.audit_file, "rb") as f:
+            f.seek(offset)
+            return f.readline()
+    
+    def _tail_hash(self) -> str:
+        """Checksum of the last audit entry (the chain head)"""
+        size = self.audit_file.stat().st_size if self.audit_file.exists() else 0
+        if self._tail is not None and self._tail[0] == size:
+            return self._tail[1]
+        
+        chain_hash = AUDIT_GENESIS_HASH
+        if size:
+            with open(self.audit_file, "rb") as f:
+                f.seek(max(0, size - _TAIL_READ_SIZE))
+                lines = [line for line in f.read().splitlines() if line.strip()]
+            if lines:
+                try:
+                    chain_hash = json.loads(lines[-1]).get("checksum", AUDIT_GENESIS_HASH)
+                except json.JSONDecodeError:
+                    logger.warning("Last audit entry is not valid JSON; chaining from an empty hash")
+        self._tail = (size, chain_hash)
+        return chain_hash
+    
+    def _refresh_audit_index(self) -> None:
+        """Index entries appended since the last refresh (caller holds the lock)"""
+        size = self.audit_file.stat().st_size if self.audit_file.exists() else 0
+        if size < self._indexed_offset:
+            # Log was replaced: start over
+            self._index = {}
+            self._indexed_offset = 0
+        if size == self._indexed_offset:
+            return
+        
+        for offset, raw in self._iter_audit_lines(self._indexed_offset):
+            self._indexed_offset = offset + len(raw)
+            try:
+                entry_request_id = json.loads(raw).get("request_id")
+            except json.JSONDecodeError:
+                continue
+            if entry_request_id:
+                self._index.setdefault(entry_request_id, []).append(offset)
     
     def get_audit_trail(self, request_id: Optional[str] = None) -> List[AuditLogEntry]:
-        """Get audit trail, optionally filtered by request_id"""
-        audit_file = self.audit_dir / "features.log"
-        
-        if not audit_file.exists():
+        """Get audit trail, optionally filtered by request_id (served from the request index)"""
+        if not self.audit_file.exists():
             return []
         
         entries = []
         try:
-            with open(audit_file, "r", encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        data = json.loads(line)
-                        entry = AuditLogEntry(**data)
-                        
-                        # Filter by request_id if specified
-                        if request_id is None or entry.request_id == request_id:
-                            entries.append(entry)
+            if request_id is None:
+                lines = (raw for _, raw in self._iter_audit_lines())
+            else:
+                with self._audit_lock:
+                    self._refresh_audit_index()
+                    offsets = list(self._index.get(request_id, ()))
+                lines = (self._read_audit_line(offset) for offset in offsets)
+            
+            for raw in lines:
+                line = raw.strip()
+                if line:
+                    data = json.loads(line)
+                    entry = AuditLogEntry(**data)
+                    
+                    # Filter by request_id if specified
+                    if request_id is None or entry.request_id == request_id:
+                        entries.append(entry)
         except Exception as e:
             logger.error(f"Error reading audit trail: {e}")
         
         return sorted(entries, key=lambda x: x.timestamp, reverse=True)
     
-    def validate_audit_integrity(self) -> List[str]:
-        """Validate audit log integrity and return any tampered entries"""
-        compromised_entries = []
-        audit_file = self.audit_dir / "features.log"
+    def validate_audit_integrity(self, full: bool = False) -> List[str]:
+        """
+        Validate audit log integrity and return any tampered entries
         
-        if not audit_file.exists():
-            return compromised_entries
+        Only entries after the last verified checkpoint are checked, unless
+        ``full`` is set or the checkpointed prefix no longer matches the log
+        (rewritten or truncated), in which case the whole log is verified.
+        """
+        compromised_entries = []
         
-        try:
-            with open(audit_file, "r", encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if line:
-                        try:
-                            data = json.loads(line)
-                            stored_checksum = data.pop("checksum", "")
-                            
-                            # Recalculate checksum
-                            content = json.dumps(data, sort_keys=True)
-                            calculated_checksum = hashlib.sha256(content.encode()).hexdigest()
-                            
-                            if stored_checksum != calculated_checksum:
-                                compromised_entries.append(f"Line {line_num}: checksum mismatch")
+        with self._audit_lock:
+            if not self.audit_file.exists():
+                return compromised_entries
+            
+            try:
+                checkpoint = self._load_audit_checkpoint()
+                if not full and checkpoint is not None and self._checkpoint_holds(checkpoint):
+                    start, line_num, chain_hash = checkpoint["offset"], checkpoint["lines"], checkpoint["chain_hash"]
+                else:
+                    start, line_num, chain_hash = 0, 0, AUDIT_GENESIS_HASH
+                    full = True
+                
+                tail_offset = checkpoint["tail_offset"] if start and checkpoint else 0
+                end = start
+                for offset, raw in self._iter_audit_lines(start):
+                    line_num += 1
+                    end = offset + len(raw)
+                    line = raw.strip()
+                    if not line:
+                        continue
+                    tail_offset = offset
+                    try:
+                        data = json.loads(line)
+                    except json.JSONDecodeError:
+                        compromised_entries.append(f"Line {line_num}: invalid JSON")
+                        chain_hash = None
+                        continue
+                    
+                    stored_checksum = data.get("checksum", "")
+                    if stored_checksum != _audit_entry_hash(data):
+                        compromised_entries.append(f"Line {line_num}: checksum mismatch")
+                    elif "prev_hash" in data and chain_hash is not None and data["prev_hash"] != chain_hash:
+                        compromised_entries.append(f"Line {line_num}: chain mismatch (entry removed, inserted or reordered)")
+                    chain_hash = stored_checksum
+                
+                if checkpoint is not None and end < checkpoint["offset"]:
+                    compromised_entries.append(
+                        f"Log truncated: {checkpoint['offset']} bytes were verified, {end} remain")
+                
+                if not compromised_entries:
+                    self._save_audit_checkpoint({
+                        "offset": end,
+                        "lines": line_num,
+                        "chain_hash": chain_hash,
+                        "tail_offset": tail_offset,
+                        "verified_at": time.time()
+                    })
+                
+                if full:
+                    self.last_full_verification = {
+                        "verified_at": time.time(),
+                        "entries": line_num,
+                        "compromised_entries": list(compromised_entries)
+                    }
                                 
-                        except json.JSONDecodeError:
-                            compromised_entries.append(f"Line {line_num}: invalid JSON")
-                            
-        except Exception as e:
-            logger.error(f"Error validating audit integrity: {e}")
+            except Exception as e:
+                logger.error(f"Error validating audit integrity: {e}")
         
-        return compromised_entries
\ No newline at end of file
+        return compromised_entries
+    
+    def _checkpoint_holds(self, checkpoint: Dict[str, Any]) -> bool:
+        """The checkpointed entry still ends at the checkpoint offset with the same chain hash"""
+        offset = checkpoint["offset"]
+        if offset == 0:
+            return True
+        if self.audit_file.stat().st_size < offset:
+            return False
+        raw = self._read_audit_line(checkpoint["tail_offset"])
+        if checkpoint["tail_offset"] + len(raw) != offset:
+            return False
+        try:
+            return json.loads(raw).get("checksum") == checkpoint["chain_hash"]
+        except json.JSONDecodeError:
+            return False
+    
+    def _load_audit_checkpoint(self) -> Optional[Dict[str, Any]]:
+        if not self.checkpoint_file.exists():
+            return None
+        try:
+            return json.loads(self.checkpoint_file.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable audit checkpoint: {e}")
+            return None
+    
+    def _save_audit_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        temp_file = self.checkpoint_file.with_suffix(".tmp")
+        temp_file.write_text(json.dumps(checkpoint), encoding='utf-8')
+        os.replace(temp_file, self.checkpoint_file)
+    
+    def start_background_verification(self, interval_s: float) -> None:
+        """Re-verify the whole audit log every ``interval_s`` seconds on a daemon thread"""
+        if self._verifier is not None and self._verifier.is_alive():
+            return
+        self._stop_verifier.clear()
+        
+        def _run() -> None:
+            while not self._stop_verifier.wait(interval_s):
+                compromised = self.validate_audit_integrity(full=True)
+                if compromised:
+                    logger.error(f"Audit log full verification found {len(compromised)} problems: {compromised[:5]}")
+        
+        self._verifier = threading.Thread(target=_run, name="audit-full-verify", daemon=True)
+        self._verifier.start()
+    
+    def stop_background_verification(self) -> None:
+        self._stop_verifier.set()
@@ -5,8 +5,10 @@ US-305: DAG Executor with Retries implementation
 """
 
 import asyncio
+import heapq
 import time
 import uuid
+from collections import defaultdict
 from typing import Dict, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -52,20 +54,55 @@ class RetryPolicy:
         delay = self.base_delay_s * (self.exponential_base ** (attempt - 1))
         return min(delay, self.max_delay_s)
 
+class _ReadyQueue:
+    """Ready tasks grouped by type, released in plan order
+    
+    Tasks of a type that is at its concurrency limit stay queued without
+    blocking ready tasks of other types.
+    """
+    
+    def __init__(self):
+        self._by_type: Dict[str, List[Tuple[int, Dict[str, Any]]]] = defaultdict(list)
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def push(self, order: int, task: Dict[str, Any]) -> None:
+        heapq.heappush(self._by_type[task.get("type", "reasoning")], (order, task))
+        self._size += 1
+    
+    def pop(self, has_capacity: Callable[[str], bool]) -> Optional[Dict[str, Any]]:
+        best_type = None
+        best_order = None
+        for task_type, heap in self._by_type.items():
+            if heap and has_capacity(task_type) and (best_order is None or heap[0][0] < best_order):
+                best_type, best_order = task_type, heap[0][0]
+        if best_type is None:
+            return None
+        self._size -= 1
+        return heapq.heappop(self._by_type[best_type])[1]
+
 class WorkflowExecutor:
     """
     Executes workflow plans with DAG dependencies, retries, and state tracking
     
     Supports:
     - Parallel execution of independent tasks
+    - Per-task-type concurrency limits alongside max_parallel
     - Retry with exponential backoff
     - State persistence and recovery
     - Idempotent task execution
     """
     
-    def __init__(self, state_store: WorkflowStateStore, max_parallel: int = 3):
+    def __init__(self, state_store: WorkflowStateStore, max_parallel: int = 3,
+                 type_limits: Optional[Dict[str, int]] = None):
         self.state_store = state_store
         self.max_parallel = max_parallel
+        self.type_limits = dict(type_limits or {})
+        invalid = {task_type: limit for task_type, limit in self.type_limits.items() if limit < 1}
+        if invalid:
+            raise ValueError(f"type_limits must be at least 1 per task type: {invalid}")
         self.default_retry_policy = RetryPolicy()
         
         # Task executors for different types
@@ -164,70 +201,99 @@ class WorkflowExecutor:
     
     async def _execute_dag(self, workflow_id: str, tasks: List[Dict], task_states: Dict[str, StateTaskState], 
                           task_fn: Optional[Callable] = None) -> Dict[str, ExecutionResult]:
-        """Execute DAG with dependency management"""
+        """Execute DAG with completion-driven scheduling
+        
+        Each pending task tracks how many of its dependencies have not yet
+        succeeded. Tasks whose counter reaches zero enter a ready queue, and
+        every finished task wakes the scheduler through a completion queue, so
+        dependents start immediately instead of on the next polling tick.
+        """
         
         execution_results = {}
         running_tasks = set()
+        completions: asyncio.Queue = asyncio.Queue()
         
-        # Main execution loop
-        while True:
-            # Find ready tasks (dependencies satisfied)
-            ready_tasks = self._find_ready_tasks(tasks, task_states, running_tasks)
+        tasks_by_id = {task["id"]: task for task in tasks}
+        remaining_deps: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        ready = _ReadyQueue()
+        running_by_type: Dict[str, int] = defaultdict(int)
+        in_flight = 0  # counted here: _execute_single_task clears running_tasks before its completion is handled
+        
+        for order, task in enumerate(tasks):
+            task_id = task["id"]
+            if task_states[task_id].status != TaskStatus.PENDING:
+                continue
             
-            if not ready_tasks and not running_tasks:
-                break  # All done
+            unmet = 0
+            for dep_id in task.get("dependencies", []):
+                dep_state = task_states.get(dep_id)
+                if dep_state is not None and dep_state.status == TaskStatus.SUCCEEDED:
+                    continue
+                unmet += 1
+                dependents[dep_id].append(task_id)
             
-            # Start new tasks (respecting parallelism limit)
-            while ready_tasks and len(running_tasks) < self.max_parallel:
-                task = ready_tasks.pop(0)
+            remaining_deps[task_id] = unmet
+            if unmet == 0:
+                ready.push(order, task)
+        
+        order_by_id = {task["id"]: order for order, task in enumerate(tasks)}
+        
+        while True:
+            # Start ready tasks while global and per-type capacity allows
+            while in_flight < self.max_parallel:
+                task = ready.pop(self._type_capacity(running_by_type))
+                if task is None:
+                    break
                 task_id = task["id"]
+                task_type = task.get("type", "reasoning")
                 
-                # Skip if already completed
-                if task_states[task_id].status in [TaskStatus.SUCCEEDED, TaskStatus.SKIPPED]:
-                    continue
-                
-                # Start task execution
                 running_tasks.add(task_id)
+                running_by_type[task_type] += 1
+                in_flight += 1
                 task_states[task_id].status = TaskStatus.RUNNING
                 task_states[task_id].started_at = time.time()
                 
-                # Execute task asynchronously
-                asyncio.create_task(self._execute_single_task(
+                runner = asyncio.create_task(self._execute_single_task(
                     workflow_id, task, task_states[task_id], task_fn, execution_results, running_tasks
                 ))
+                runner.add_done_callback(
+                    lambda _runner, tid=task_id: completions.put_nowait(tid)
+                )
+            
+            if not in_flight:
+                if len(ready):
+                    # Nothing running can free capacity for the ready tasks
+                    logger.error(f"Workflow {workflow_id}: {len(ready)} ready tasks cannot be scheduled")
+                break  # All done (or remaining tasks can never become ready)
             
-            # Brief wait before checking for more ready tasks
-            await asyncio.sleep(0.1)
+            # Wait for the next task to finish, then release its dependents
+            finished_id = await completions.get()
+            finished_task = tasks_by_id[finished_id]
+            in_flight -= 1
+            running_tasks.discard(finished_id)
+            running_by_type[finished_task.get("type", "reasoning")] -= 1
+            
+            if task_states[finished_id].status != TaskStatus.SUCCEEDED:
+                continue
+            
+            for dependent_id in dependents.get(finished_id, []):
+                if task_states[dependent_id].status != TaskStatus.PENDING:
+                    continue
+                remaining_deps[dependent_id] -= 1
+                if remaining_deps[dependent_id] == 0:
+                    ready.push(order_by_id[dependent_id], tasks_by_id[dependent_id])
         
         return execution_results
     
-    def _find_ready_tasks(self, tasks: List[Dict], task_states: Dict[str, StateTaskState], 
-                         running_tasks: set) -> List[Dict]:
-        """Find tasks ready for execution (dependencies satisfied)"""
+    def _type_capacity(self, running_by_type: Dict[str, int]) -> Callable[[str], bool]:
+        """Return a predicate telling whether another task of a type may start"""
         
-        ready = []
-        
-        for task in tasks:
-            task_id = task["id"]
-            task_state = task_states[task_id]
-            
-            # Skip if already running or completed
-            if (task_state.status != TaskStatus.PENDING or 
-                task_id in running_tasks):
-                continue
-            
-            # Check dependencies
-            dependencies_satisfied = True
-            for dep_id in task.get("dependencies", []):
-                if (dep_id not in task_states or 
-                    task_states[dep_id].status != TaskStatus.SUCCEEDED):
-                    dependencies_satisfied = False
-                    break
-            
-            if dependencies_satisfied:
-                ready.append(task)
+        def has_capacity(task_type: str) -> bool:
+            limit = self.type_limits.get(task_type)
+            return limit is None or running_by_type[task_type] < limit
         
-        return ready
+        return has_capacity
     
     async def _execute_single_task(self, workflow_id: str, task: Dict, task_state: StateTaskState,
                                   custom_task_fn: Optional[Callable], results: Dict[str, ExecutionResult],
@@ -515,7 +581,8 @@ class WorkflowExecutor:
 
 # Convenience function for simple workflow execution
 async def run_plan(plan: Dict[str, Any], task_fn: Optional[Callable] = None, 
-                  state_store: Optional[WorkflowStateStore] = None, max_parallel: int = 3) -> Dict[str, Any]:
+                  state_store: Optional[WorkflowStateStore] = None, max_parallel: int = 3,
+                  type_limits: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
     """
     Execute a workflow plan (convenience function)
     
@@ -524,6 +591,7 @@ async def run_plan(plan: Dict[str, Any], task_fn: Optional[Callable] = None,
         task_fn: Optional custom task execution function
         state_store: Optional state store (creates temporary if None)
         max_parallel: Maximum parallel tasks
+        type_limits: Optional per-task-type concurrency limits
         
     Returns:
         Execution results
@@ -533,5 +601,5 @@ async def run_plan(plan: Dict[str, Any], task_fn: Optional[Callable] = None,
         from .state import WorkflowStateStore
         state_store = WorkflowStateStore()
     
-    executor = WorkflowExecutor(state_store, max_parallel)
+    executor = WorkflowExecutor(state_store, max_parallel, type_limits)
     return await executor.run_plan(plan, task_fn)
\ No newline at end of file
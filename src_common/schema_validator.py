@@ -2,14 +2,26 @@
 """
 Phase 7: JSON Schema Validation Service
 Validates requirements and feature requests against defined schemas (US-705, US-706)
+
+Validators are compiled once per schema (keyed by the schema's content hash)
+and share one format checker. File results are cached by (schema hash, file
+content hash), optionally persisted to disk, so unchanged files are not
+re-validated; directory validation spreads cache misses over a process pool.
 """
 
+import os
 import json
+import time
+import hashlib
 import pathlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, Any, List, Optional, Tuple
 import jsonschema
 from jsonschema import Draft7Validator
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, replace
 
 from src_common.ttrpg_logging import get_logger
 
@@ -34,19 +46,137 @@ class ValidationResult:
     validation_time_ms: float
 
 
+# Results kept in memory, least recently used evicted first
+RESULT_CACHE_SIZE = 20000
+# Directory validations with fewer cache misses than this run inline
+PARALLEL_MIN_FILES = 64
+# Files sent to a pool worker per task
+PARALLEL_BATCH_SIZE = 128
+
+_FORMAT_CHECKER = jsonschema.FormatChecker()
+_compiled_validators: Dict[str, Draft7Validator] = {}
+_compiled_lock = threading.Lock()
+# Validators compiled in a pool worker by _init_worker, by schema name
+_worker_validators: Dict[str, Draft7Validator] = {}
+
+
+def schema_digest(schema: Dict[str, Any]) -> str:
+    """Content hash identifying a schema"""
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()
+
+
+def compile_validator(schema: Dict[str, Any]) -> Tuple[str, Draft7Validator]:
+    """(digest, validator) for ``schema``, compiled once per process"""
+    digest = schema_digest(schema)
+    with _compiled_lock:
+        validator = _compiled_validators.get(digest)
+        if validator is None:
+            validator = Draft7Validator(schema, format_checker=_FORMAT_CHECKER)
+            _compiled_validators[digest] = validator
+    return digest, validator
+
+
+def _error_result(field_path: str, message: str, invalid_value: Any,
+                  schema_name: str, start_time: float) -> ValidationResult:
+    error = ValidationError(
+        field_path=field_path,
+        message=message,
+        invalid_value=invalid_value,
+        schema_path=""
+    )
+    return ValidationResult(
+        is_valid=False,
+        errors=[error],
+        schema_name=schema_name,
+        validation_time_ms=(time.perf_counter() - start_time) * 1000
+    )
+
+
+def _run_validator(validator: Draft7Validator, data: Any, schema_name: str,
+                   start_time: float) -> ValidationResult:
+    """Validate already-parsed data with a compiled validator"""
+    errors = []
+    
+    try:
+        # Perform validation
+        for error in validator.iter_errors(data):
+            validation_error = ValidationError(
+                field_path=".".join(str(x) for x in error.absolute_path),
+                message=error.message,
+                invalid_value=error.instance if hasattr(error, 'instance') else None,
+                schema_path=".".join(str(x) for x in error.schema_path)
+            )
+            errors.append(validation_error)
+        
+        validation_time = (time.perf_counter() - start_time) * 1000
+        
+        result = ValidationResult(
+            is_valid=len(errors) == 0,
+            errors=errors,
+            schema_name=schema_name,
+            validation_time_ms=validation_time
+        )
+        
+        if result.is_valid:
+            logger.debug(f"Schema validation passed for {schema_name}")
+        else:
+            logger.warning(f"Schema validation failed for {schema_name}: {len(errors)} errors")
+        
+        return result
+        
+    except Exception as e:
+        logger.error(f"Schema validation error for {schema_name}: {e}")
+        return _error_result("validation", f"Validation error: {str(e)}", None, schema_name, start_time)
+
+
+def _validate_content(validator: Draft7Validator, content: bytes, schema_name: str,
+                      source: str, start_time: float) -> ValidationResult:
+    """Parse and validate a JSON file's bytes"""
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError as e:
+        return _error_result("json", f"Invalid JSON: {str(e)}", source, schema_name, start_time)
+    except UnicodeDecodeError as e:
+        return _error_result("file", f"Error reading file: {str(e)}", source, schema_name, start_time)
+    return _run_validator(validator, data, schema_name, start_time)
+
+
+def _init_worker(schemas: Dict[str, Dict[str, Any]]) -> None:
+    for schema_name, schema in schemas.items():
+        _worker_validators[schema_name] = compile_validator(schema)[1]
+
+
+def _validate_batch(schema_name: str, batch: List[Tuple[str, bytes]]) -> List[ValidationResult]:
+    """Pool task: validate (source, content) pairs against a worker-compiled schema"""
+    validator = _worker_validators[schema_name]
+    return [
+        _validate_content(validator, content, schema_name, source, time.perf_counter())
+        for source, content in batch
+    ]
+
+
 class SchemaValidator:
     """JSON Schema validation service for requirements and feature requests"""
     
-    def __init__(self, schemas_dir: pathlib.Path = None):
+    def __init__(self, schemas_dir: pathlib.Path = None,
+                 result_cache_file: Optional[pathlib.Path] = None):
         self.schemas_dir = schemas_dir or pathlib.Path("schemas")
+        self.result_cache_file = result_cache_file
         self._schema_cache: Dict[str, Dict[str, Any]] = {}
         self._validator_cache: Dict[str, Draft7Validator] = {}
+        self._schema_digests: Dict[str, str] = {}
+        self._result_cache: "OrderedDict[Tuple[str, str], ValidationResult]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
         
         # Ensure schemas directory exists
         self.schemas_dir.mkdir(parents=True, exist_ok=True)
         
         # Load schemas on initialization
         self._load_schemas()
+        if self.result_cache_file is not None:
+            self._load_result_cache()
     
     def _load_schemas(self):
         """Load all JSON schemas from schemas directory"""
@@ -65,12 +195,10 @@ class SchemaValidator:
                     schema_name = schema_file.replace('.schema.json', '')
                     self._schema_cache[schema_name] = schema
                     
-                    # Create validator with format checking
-                    validator = Draft7Validator(
-                        schema,
-                        format_checker=jsonschema.FormatChecker()
-                    )
+                    # Compiled validator with format checking, shared by identical schemas
+                    digest, validator = compile_validator(schema)
                     self._validator_cache[schema_name] = validator
+                    self._schema_digests[schema_name] = digest
                     
                     logger.info(f"Loaded schema: {schema_name}")
                     
@@ -87,7 +215,6 @@ class SchemaValidator:
         Returns:
             ValidationResult with validation status and errors
         """
-        import time
         start_time = time.perf_counter()
         
         return self._validate_data(requirements_data, "requirements", start_time)
@@ -102,7 +229,6 @@ class SchemaValidator:
         Returns:
             ValidationResult with validation status and errors
         """
-        import time
         start_time = time.perf_counter()
         
         return self._validate_data(feature_data, "feature_request", start_time)
@@ -110,71 +236,11 @@ class SchemaValidator:
     def _validate_data(self, data: Dict[str, Any], schema_name: str, 
                       start_time: float) -> ValidationResult:
         """Internal method to validate data against specific schema"""
-        import time
-        
-        errors = []
-        
         if schema_name not in self._validator_cache:
-            error = ValidationError(
-                field_path="schema",
-                message=f"Schema '{schema_name}' not found",
-                invalid_value=schema_name,
-                schema_path=""
-            )
-            validation_time = (time.perf_counter() - start_time) * 1000
-            return ValidationResult(
-                is_valid=False,
-                errors=[error],
-                schema_name=schema_name,
-                validation_time_ms=validation_time
-            )
+            return _error_result("schema", f"Schema '{schema_name}' not found", schema_name,
+                                 schema_name, start_time)
         
-        validator = self._validator_cache[schema_name]
-        
-        try:
-            # Perform validation
-            validation_errors = list(validator.iter_errors(data))
-            
-            for error in validation_errors:
-                validation_error = ValidationError(
-                    field_path=".".join(str(x) for x in error.absolute_path),
-                    message=error.message,
-                    invalid_value=error.instance if hasattr(error, 'instance') else None,
-                    schema_path=".".join(str(x) for x in error.schema_path)
-                )
-                errors.append(validation_error)
-            
-            validation_time = (time.perf_counter() - start_time) * 1000
-            
-            result = ValidationResult(
-                is_valid=len(errors) == 0,
-                errors=errors,
-                schema_name=schema_name,
-                validation_time_ms=validation_time
-            )
-            
-            if result.is_valid:
-                logger.debug(f"Schema validation passed for {schema_name}")
-            else:
-                logger.warning(f"Schema validation failed for {schema_name}: {len(errors)} errors")
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Schema validation error for {schema_name}: {e}")
-            error = ValidationError(
-                field_path="validation",
-                message=f"Validation error: {str(e)}",
-                invalid_value=None,
-                schema_path=""
-            )
-            validation_time = (time.perf_counter() - start_time) * 1000
-            return ValidationResult(
-                is_valid=False,
-                errors=[error],
-                schema_name=schema_name,
-                validation_time_ms=validation_time
-            )
+        return _run_validator(self._validator_cache[schema_name], data, schema_name, start_time)
     
     def get_schema(self, schema_name: str) -> Optional[Dict[str, Any]]:
         """Get loaded schema by name"""
@@ -196,92 +262,167 @@ class SchemaValidator:
         Returns:
             ValidationResult with validation status and errors
         """
-        import time
         start_time = time.perf_counter()
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            return self._validate_data(data, schema_name, start_time)
-            
-        except json.JSONDecodeError as e:
-            validation_time = (time.perf_counter() - start_time) * 1000
-            error = ValidationError(
-                field_path="json",
-                message=f"Invalid JSON: {str(e)}",
-                invalid_value=str(file_path),
-                schema_path=""
-            )
-            return ValidationResult(
-                is_valid=False,
-                errors=[error],
-                schema_name=schema_name,
-                validation_time_ms=validation_time
-            )
+            content = pathlib.Path(file_path).read_bytes()
         except Exception as e:
-            validation_time = (time.perf_counter() - start_time) * 1000
-            error = ValidationError(
-                field_path="file",
-                message=f"Error reading file: {str(e)}",
-                invalid_value=str(file_path),
-                schema_path=""
-            )
-            return ValidationResult(
-                is_valid=False,
-                errors=[error],
-                schema_name=schema_name,
-                validation_time_ms=validation_time
-            )
+            return _error_result("file", f"Error reading file: {str(e)}", str(file_path),
+                                 schema_name, start_time)
+        
+        key = self._cache_key(schema_name, content)
+        cached = self._cached_result(key, start_time)
+        if cached is not None:
+            return cached
+        
+        result = self._validate_file_content(content, schema_name, str(file_path), start_time)
+        self._store_result(key, result)
+        return result
     
-    def validate_requirements_directory(self, requirements_dir: pathlib.Path) -> List[Tuple[str, ValidationResult]]:
+    def _validate_file_content(self, content: bytes, schema_name: str, source: str,
+                               start_time: float) -> ValidationResult:
+        if schema_name not in self._validator_cache:
+            return self._validate_data(None, schema_name, start_time)
+        return _validate_content(self._validator_cache[schema_name], content, schema_name, source, start_time)
+    
+    def validate_requirements_directory(self, requirements_dir: pathlib.Path,
+                                        max_workers: Optional[int] = None) -> List[Tuple[str, ValidationResult]]:
         """
         Validate all requirements files in directory
         
         Args:
             requirements_dir: Directory containing requirements JSON files
+            max_workers: Process pool size for uncached files (1 validates inline)
             
         Returns:
             List of (filename, ValidationResult) tuples
         """
-        results = []
-        
-        if not requirements_dir.exists():
-            return results
-        
-        for req_file in requirements_dir.glob("*.json"):
-            try:
-                result = self.validate_json_file(req_file, "requirements")
-                results.append((req_file.name, result))
-            except Exception as e:
-                logger.error(f"Error validating requirements file {req_file}: {e}")
-        
-        return results
+        return self._validate_directory(requirements_dir, "*.json", "requirements", max_workers)
     
-    def validate_features_directory(self, features_dir: pathlib.Path) -> List[Tuple[str, ValidationResult]]:
+    def validate_features_directory(self, features_dir: pathlib.Path,
+                                    max_workers: Optional[int] = None) -> List[Tuple[str, ValidationResult]]:
         """
         Validate all feature request files in directory
         
         Args:
             features_dir: Directory containing feature request JSON files
+            max_workers: Process pool size for uncached files (1 validates inline)
             
         Returns:
             List of (filename, ValidationResult) tuples
         """
-        results = []
-        
-        if not features_dir.exists():
-            return results
+        return self._validate_directory(features_dir, "FR-*.json", "feature_request", max_workers)
+    
+    def _validate_directory(self, directory: pathlib.Path, pattern: str, schema_name: str,
+                            max_workers: Optional[int]) -> List[Tuple[str, ValidationResult]]:
+        """Serve unchanged files from the result cache and validate the rest, in parallel when worthwhile"""
+        if not directory.exists():
+            return []
         
-        for feature_file in features_dir.glob("FR-*.json"):
+        results: List[Optional[Tuple[str, ValidationResult]]] = []
+        pending: List[Tuple[int, pathlib.Path, Optional[Tuple[str, str]], bytes]] = []
+        for file_path in directory.glob(pattern):
+            start_time = time.perf_counter()
             try:
-                result = self.validate_json_file(feature_file, "feature_request")
-                results.append((feature_file.name, result))
+                content = file_path.read_bytes()
             except Exception as e:
-                logger.error(f"Error validating feature request file {feature_file}: {e}")
+                logger.error(f"Error validating {schema_name} file {file_path}: {e}")
+                continue
+            
+            key = self._cache_key(schema_name, content)
+            cached = self._cached_result(key, start_time)
+            if cached is not None:
+                results.append((file_path.name, cached))
+            else:
+                pending.append((len(results), file_path, key, content))
+                results.append(None)
+        
+        if pending:
+            for (index, file_path, key, _), result in zip(pending, self._validate_pending(schema_name, pending, max_workers)):
+                self._store_result(key, result)
+                results[index] = (file_path.name, result)
+            if self.result_cache_file is not None:
+                self.save_result_cache()
         
         return results
     
+    def _validate_pending(self, schema_name: str, pending: List[Tuple[int, pathlib.Path, Any, bytes]],
+                          max_workers: Optional[int]) -> List[ValidationResult]:
+        batches = [
+            [(str(file_path), content) for _, file_path, _, content in pending[i:i + PARALLEL_BATCH_SIZE]]
+            for i in range(0, len(pending), PARALLEL_BATCH_SIZE)
+        ]
+        workers = max_workers or min(os.cpu_count() or 1, len(batches))
+        if schema_name in self._schema_cache and workers > 1 and len(pending) >= PARALLEL_MIN_FILES:
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=({schema_name: self._schema_cache[schema_name]},)) as pool:
+                    futures = [pool.submit(_validate_batch, schema_name, batch) for batch in batches]
+                    return [result for future in futures for result in future.result()]
+            except (OSError, BrokenProcessPool) as e:
+                logger.warning(f"Process pool unavailable for {schema_name} validation, validating inline: {e}")
+        
+        return [
+            self._validate_file_content(content, schema_name, str(file_path), time.perf_counter())
+            for _, file_path, _, content in pending
+        ]
+    
+    def _cache_key(self, schema_name: str, content: bytes) -> Optional[Tuple[str, str]]:
+        digest = self._schema_digests.get(schema_name)
+        if digest is None:
+            return None
+        return digest, hashlib.sha256(content).hexdigest()
+    
+    def _cached_result(self, key: Optional[Tuple[str, str]], start_time: float) -> Optional[ValidationResult]:
+        if key is None:
+            return None
+        with self._result_cache_lock:
+            result = self._result_cache.get(key)
+            if result is None:
+                self.cache_misses += 1
+                return None
+            self._result_cache.move_to_end(key)
+            self.cache_hits += 1
+        return replace(result, errors=list(result.errors),
+                       validation_time_ms=(time.perf_counter() - start_time) * 1000)
+    
+    def _store_result(self, key: Optional[Tuple[str, str]], result: ValidationResult) -> None:
+        if key is None:
+            return
+        with self._result_cache_lock:
+            self._result_cache[key] = result
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+    
+    def clear_result_cache(self) -> None:
+        with self._result_cache_lock:
+            self._result_cache.clear()
+    
+    def _load_result_cache(self) -> None:
+        if not self.result_cache_file.exists():
+            return
+        try:
+            entries = json.loads(self.result_cache_file.read_text(encoding='utf-8'))
+            for entry in entries:
+                errors = [ValidationError(**error) for error in entry["errors"]]
+                result = ValidationResult(entry["is_valid"], errors, entry["schema_name"], entry["validation_time_ms"])
+                self._store_result((entry["schema_digest"], entry["content_hash"]), result)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable schema validation cache {self.result_cache_file}: {e}")
+    
+    def save_result_cache(self) -> None:
+        """Persist cached results to ``result_cache_file`` so later runs skip unchanged files"""
+        with self._result_cache_lock:
+            entries = [
+                dict(asdict(result), schema_digest=key[0], content_hash=key[1])
+                for key, result in self._result_cache.items()
+            ]
+        self.result_cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.result_cache_file.with_suffix(".tmp")
+        temp_file.write_text(json.dumps(entries, default=str), encoding='utf-8')
+        os.replace(temp_file, self.result_cache_file)
+    
     def generate_validation_report(self, results: List[Tuple[str, ValidationResult]]) -> Dict[str, Any]:
         """
         Generate summary validation report
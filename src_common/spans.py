@@ -0,0 +1,316 @@
+"""
+Stage Spans
+
+Low-overhead timing of the hot stages of a RAG request (classification,
+planning, retrieval, reranking, generation, AEHRL).
+
+``span(name)`` is a context manager and a decorator. Every finished span is
+added to a per-stage latency histogram, and to the breakdown of the current
+request when one is open (``request_spans()``). ``render_prometheus()``
+returns the histograms in the Prometheus text exposition format, served at
+``/rag/metrics``.
+
+``SlowRequestProfiler`` is an opt-in sampling profiler: when
+``RAG_PROFILE_SLOW_MS`` is set, the request thread's stack is sampled while
+the request runs, and requests slower than the threshold leave a
+collapsed-stack flamegraph (``artifacts/profiles/<trace_id>.folded``, the
+format read by flamegraph.pl and speedscope).
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .ttrpg_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Histogram bucket upper bounds in milliseconds (+Inf is implicit)
+DEFAULT_BUCKETS_MS: Tuple[float, ...] = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+SPANS_ENABLED = os.getenv("RAG_SPANS_ENABLED", "true").lower() == "true"
+
+_request_spans: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_spans", default=None)
+
+
+class StageHistogram:
+    """Cumulative latency histogram for one stage"""
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = DEFAULT_BUCKETS_MS) -> None:
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, duration_ms: float) -> None:
+        index = bisect_left(self.buckets_ms, duration_ms)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum_ms += duration_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self.counts)
+            count, sum_ms = self.count, self.sum_ms
+        cumulative, running = [], 0
+        for bound, bucket_count in zip(self.buckets_ms + (float("inf"),), counts):
+            running += bucket_count
+            cumulative.append((bound, running))
+        return {"count": count, "sum_ms": sum_ms, "buckets": cumulative}
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile"""
+        snapshot = self.snapshot()
+        if not snapshot["count"]:
+            return None
+        target = q * snapshot["count"]
+        for bound, running in snapshot["buckets"]:
+            if running >= target:
+                return bound
+        return None
+
+
+class SpanRegistry:
+    """Per-stage histograms shared by the whole process"""
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = DEFAULT_BUCKETS_MS) -> None:
+        self.buckets_ms = buckets_ms
+        self._histograms: Dict[str, StageHistogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, duration_ms: float) -> None:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, StageHistogram(self.buckets_ms))
+        histogram.observe(duration_ms)
+
+    def histogram(self, stage: str) -> Optional[StageHistogram]:
+        return self._histograms.get(stage)
+
+    def stages(self) -> List[str]:
+        with self._lock:
+            return sorted(self._histograms)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Count, mean and approximate p50/p95 per stage"""
+        summary = {}
+        for stage in self.stages():
+            histogram = self._histograms[stage]
+            snapshot = histogram.snapshot()
+            summary[stage] = {
+                "count": snapshot["count"],
+                "avg_ms": round(snapshot["sum_ms"] / snapshot["count"], 2) if snapshot["count"] else 0.0,
+                "p50_ms": histogram.quantile(0.5),
+                "p95_ms": histogram.quantile(0.95),
+            }
+        return summary
+
+    def render_prometheus(self, metric: str = "ttrpg_stage_duration_seconds") -> str:
+        """Histograms in the Prometheus text exposition format (seconds)"""
+        lines = [
+            f"# HELP {metric} Duration of RAG request stages.",
+            f"# TYPE {metric} histogram",
+        ]
+        for stage in self.stages():
+            snapshot = self._histograms[stage].snapshot()
+            label = stage.replace("\\", "\\\\").replace('"', '\\"')
+            for bound, running in snapshot["buckets"]:
+                le = "+Inf" if bound == float("inf") else repr(bound / 1000.0)
+                lines.append(f'{metric}_bucket{{stage="{label}",le="{le}"}} {running}')
+            lines.append(f'{metric}_sum{{stage="{label}"}} {snapshot["sum_ms"] / 1000.0!r}')
+            lines.append(f'{metric}_count{{stage="{label}"}} {snapshot["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+_span_registry = SpanRegistry()
+
+
+def get_span_registry() -> SpanRegistry:
+    return _span_registry
+
+
+def render_prometheus() -> str:
+    return _span_registry.render_prometheus()
+
+
+def record_span(stage: str, duration_ms: float) -> None:
+    """Record an externally timed stage"""
+    if not SPANS_ENABLED:
+        return
+    _span_registry.observe(stage, duration_ms)
+    timings = _request_spans.get()
+    if timings is not None:
+        timings[stage] = round(timings.get(stage, 0.0) + duration_ms, 2)
+
+
+@contextmanager
+def request_spans() -> Iterator[Dict[str, float]]:
+    """Collect the stage timings (ms) of the enclosed request"""
+    timings: Dict[str, float] = {}
+    token = _request_spans.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_spans.reset(token)
+
+
+def current_request_spans() -> Dict[str, float]:
+    return dict(_request_spans.get() or {})
+
+
+class span:
+    """
+    Time a stage, as a context manager or a decorator
+
+        with span("rag.retrieve"):
+            ...
+
+        @span("aehrl.evaluate")
+        def evaluate(...):
+            ...
+
+    A span costs two ``perf_counter`` calls and one histogram update; with
+    ``RAG_SPANS_ENABLED=false`` it costs nothing beyond the call.
+    """
+
+    __slots__ = ("name", "_started")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._started = 0.0
+
+    def __enter__(self) -> "span":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        record_span(self.name, (time.perf_counter() - self._started) * 1000)
+
+    def __call__(self, func: Callable) -> Callable:
+        name = self.name
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's stack into collapsed-stack counts"""
+
+    def __init__(self, thread_id: int, interval_s: float) -> None:
+        super().__init__(name="rag-profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class SlowRequestProfiler:
+    """Opt-in sampling profiler that keeps flamegraphs of slow requests"""
+
+    def __init__(
+        self,
+        threshold_ms: Optional[float] = None,
+        interval_s: float = 0.005,
+        output_dir: Optional[Path] = None,
+    ) -> None:
+        if threshold_ms is None and os.getenv("RAG_PROFILE_SLOW_MS"):
+            threshold_ms = float(os.environ["RAG_PROFILE_SLOW_MS"])
+        self.threshold_ms = threshold_ms
+        self.interval_s = float(os.getenv("RAG_PROFILE_INTERVAL_S", interval_s))
+        self.output_dir = Path(output_dir) if output_dir else Path("artifacts/profiles")
+        self.profiles_written = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms is not None
+
+    @contextmanager
+    def profile(self, trace_id: str) -> Iterator[None]:
+        """Sample the calling thread; write a flamegraph if it ran past the threshold"""
+        if not self.enabled:
+            yield
+            return
+
+        sampler = _StackSampler(threading.get_ident(), self.interval_s)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if elapsed_ms >= self.threshold_ms and sampler.stacks:
+                self._write(trace_id, sampler.stacks, elapsed_ms)
+
+    def _write(self, trace_id: str, stacks: Counter, elapsed_ms: float) -> None:
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path = self.output_dir / f"{trace_id}.folded"
+            path.write_text(
+                "".join(f"{stack} {count}\n" for stack, count in stacks.most_common()),
+                encoding="utf-8",
+            )
+            self.profiles_written += 1
+            logger.info(
+                f"Slow request {trace_id} took {elapsed_ms:.0f}ms "
+                f"(threshold {self.threshold_ms:.0f}ms); profile written to {path}"
+            )
+        except OSError as e:
+            logger.warning(f"Failed to write request profile for {trace_id}: {e}")
+
+
+_slow_request_profiler: Optional[SlowRequestProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_slow_request_profiler() -> SlowRequestProfiler:
+    global _slow_request_profiler
+    if _slow_request_profiler is None:
+        with _profiler_lock:
+            if _slow_request_profiler is None:
+                _slow_request_profiler = SlowRequestProfiler()
+    return _slow_request_profiler
@@ -7,11 +7,15 @@ Provides consistent, environment-aware logging across all components.
 import json
 import logging as _logging
 import logging.config as _logging_config
+import logging.handlers as _logging_handlers
 import os
 import sys
+import threading
 import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 try:
     from pythonjsonlogger import jsonlogger  # type: ignore
@@ -58,8 +62,9 @@ if _HAVE_JSONLOGGER:
             log_record['component'] = getattr(record, 'component', 'unknown')
 
             # Add trace information if available
-            if hasattr(record, 'trace_id'):
-                log_record['trace_id'] = record.trace_id
+            trace_id = getattr(record, 'trace_id', None) or current_trace_id.get()
+            if trace_id:
+                log_record['trace_id'] = trace_id
             if hasattr(record, 'user_id'):
                 log_record['user_id'] = record.user_id
             if hasattr(record, 'session_id'):
@@ -84,6 +89,205 @@ else:
             return f"{ts} {record.name} {record.levelname} [{env}] {msg}"
 
 
+# Trace id of the request being handled; records logged inside trace_scope()
+# carry it even when the call site does not pass extra={'trace_id': ...}
+current_trace_id: ContextVar[Optional[str]] = ContextVar("ttrpg_trace_id", default=None)
+
+TRACE_INDEX_SUFFIX = ".tidx"
+
+
+@contextmanager
+def trace_scope(trace_id: str) -> Iterator[None]:
+    """Attribute every record logged in this context (task or thread) to ``trace_id``"""
+    token = current_trace_id.set(trace_id)
+    try:
+        yield
+    finally:
+        current_trace_id.reset(token)
+
+
+def trace_index_path(log_file: Path) -> Path:
+    """Sidecar index written next to ``log_file`` by TraceIndexedFileHandler"""
+    log_file = Path(log_file)
+    return log_file.with_name(log_file.name + TRACE_INDEX_SUFFIX)
+
+
+class TraceIndexedFileHandler(_logging_handlers.RotatingFileHandler):
+    """
+    File handler that records where each traced record lands in the log.
+
+    For every record with a trace id it appends ``trace_id<TAB>offset<TAB>length``
+    to a sidecar index (``app.log.tidx``), so the lines of one trace can be read
+    back with a few seeks instead of scanning the log. The sidecar rotates with
+    its log file. ``maxBytes=0`` (the default) never rotates, like FileHandler.
+    """
+
+    def __init__(self, filename, mode: str = 'a', maxBytes: int = 0, backupCount: int = 0,
+                 encoding: Optional[str] = 'utf-8', delay: bool = False) -> None:
+        super().__init__(filename, mode=mode, maxBytes=maxBytes, backupCount=backupCount,
+                         encoding=encoding, delay=delay)
+        self.index_filename = str(trace_index_path(Path(self.baseFilename)))
+        self._index_stream = None
+
+    def emit(self, record: _logging.LogRecord) -> None:
+        try:
+            trace_id = getattr(record, 'trace_id', None) or current_trace_id.get()
+            if trace_id and not hasattr(record, 'trace_id'):
+                record.trace_id = trace_id
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            start = self.stream.tell()
+            _logging.FileHandler.emit(self, record)
+            if trace_id:
+                if self._index_stream is None:
+                    self._index_stream = open(self.index_filename, 'a', encoding='utf-8')
+                self._index_stream.write(f"{trace_id}\t{start}\t{self.stream.tell() - start}\n")
+                self._index_stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        if self._index_stream is not None:
+            self._index_stream.close()
+            self._index_stream = None
+        if self.backupCount > 0:
+            for i in range(self.backupCount - 1, 0, -1):
+                source = trace_index_path(Path(self.rotation_filename(f"{self.baseFilename}.{i}")))
+                if source.exists():
+                    os.replace(source, trace_index_path(Path(self.rotation_filename(f"{self.baseFilename}.{i + 1}"))))
+            if os.path.exists(self.index_filename):
+                os.replace(self.index_filename,
+                           trace_index_path(Path(self.rotation_filename(f"{self.baseFilename}.1"))))
+        elif os.path.exists(self.index_filename):
+            os.remove(self.index_filename)
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            if self._index_stream is not None:
+                self._index_stream.close()
+                self._index_stream = None
+        finally:
+            self.release()
+        super().close()
+
+
+class TraceLogIndex:
+    """
+    Reader for one log file's trace index.
+
+    The sidecar is append-only, so each lookup only parses the entries written
+    since the previous one; a rotated or truncated sidecar is reread from the
+    start.
+    """
+
+    def __init__(self, log_file: Path) -> None:
+        self.log_file = Path(log_file)
+        self.index_file = trace_index_path(self.log_file)
+        self._offsets: Dict[str, List[Tuple[int, int]]] = {}
+        self._position = 0
+        self._inode: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def lines(self, trace_id: str, limit: int = 200) -> List[str]:
+        """Log lines written for ``trace_id``, oldest first (at most ``limit``)"""
+        with self._lock:
+            self._refresh()
+            offsets = list(self._offsets.get(trace_id, ())[-limit:])
+        if not offsets:
+            return []
+        lines = []
+        try:
+            with open(self.log_file, 'rb') as f:
+                for offset, length in offsets:
+                    f.seek(offset)
+                    lines.append(f.read(length).decode('utf-8', errors='replace').rstrip('\r\n'))
+        except OSError:
+            return []
+        return lines
+
+    def _refresh(self) -> None:
+        try:
+            stat = self.index_file.stat()
+        except OSError:
+            self._reset(None)
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._position:
+            self._reset(stat.st_ino)
+        if stat.st_size == self._position:
+            return
+        with open(self.index_file, 'rb') as f:
+            f.seek(self._position)
+            data = f.read()
+        # Leave a partially written last entry for the next refresh
+        complete = data.rfind(b'\n') + 1
+        self._position += complete
+        for entry in data[:complete].decode('utf-8', errors='replace').splitlines():
+            trace_id, _, rest = entry.partition('\t')
+            offset, _, length = rest.partition('\t')
+            if offset.isdigit() and length.isdigit():
+                self._offsets.setdefault(trace_id, []).append((int(offset), int(length)))
+
+    def _reset(self, inode: Optional[int]) -> None:
+        self._offsets = {}
+        self._position = 0
+        self._inode = inode
+
+
+_trace_indexes: Dict[str, TraceLogIndex] = {}
+_trace_indexes_lock = threading.Lock()
+
+
+def get_trace_index(log_file: Path) -> TraceLogIndex:
+    """Trace index reader for ``log_file``, one per resolved path"""
+    key = str(Path(log_file).resolve())
+    with _trace_indexes_lock:
+        index = _trace_indexes.get(key)
+        if index is None:
+            index = _trace_indexes[key] = TraceLogIndex(Path(key))
+        return index
+
+
+def indexed_log_files() -> List[Path]:
+    """Log files currently written through a TraceIndexedFileHandler"""
+    loggers = [_logging.getLogger()] + [
+        logger for logger in _logging.Logger.manager.loggerDict.values()
+        if isinstance(logger, _logging.Logger)
+    ]
+    files: List[Path] = []
+    for logger in loggers:
+        for handler in logger.handlers:
+            if isinstance(handler, TraceIndexedFileHandler):
+                path = Path(handler.baseFilename)
+                if path not in files:
+                    files.append(path)
+    return files
+
+
+def trace_log_lines(trace_id: str, log_files: List[Path], limit: int = 200) -> List[str]:
+    """
+    Lines logged for ``trace_id`` across ``log_files`` and their rotated backups
+
+    Backups (``app.log.1``, ``app.log.2``...) are read oldest first so the
+    result stays in write order.
+    """
+    lines: List[str] = []
+    for log_file in log_files:
+        log_file = Path(log_file)
+        backups = sorted(
+            (path for path in log_file.parent.glob(f"{log_file.name}.*")
+             if path.suffix != TRACE_INDEX_SUFFIX and path.name[len(log_file.name) + 1:].isdigit()),
+            key=lambda path: int(path.name[len(log_file.name) + 1:]),
+            reverse=True,
+        )
+        for path in backups + [log_file]:
+            lines.extend(get_trace_index(path).lines(trace_id, limit))
+    return lines[-limit:]
+
+
 def setup_logging(config_path: Optional[Path] = None, log_file: Optional[Path] = None) -> _logging.Logger:
     """
     Set up logging configuration for the TTRPG Center application.
@@ -117,7 +321,7 @@ def setup_logging(config_path: Optional[Path] = None, log_file: Optional[Path] =
         log_file.parent.mkdir(parents=True, exist_ok=True)
         
         handlers_config['file'] = {
-            'class': 'logging.FileHandler',
+            '()': TraceIndexedFileHandler,
             'filename': str(log_file),
             'formatter': 'json' if env != 'dev' else 'console',
             'level': level_name,
@@ -175,7 +379,7 @@ def setup_logging(config_path: Optional[Path] = None, log_file: Optional[Path] =
             log_dir = Path(f"env/{env}/logs")
             if log_dir.exists():
                 file_config['handlers']['file'] = {
-                    'class': 'logging.handlers.RotatingFileHandler',
+                    '()': TraceIndexedFileHandler,
                     'filename': str(log_dir / 'app.log'),
                     'formatter': 'json',
                     'level': 'INFO',
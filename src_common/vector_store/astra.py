@@ -11,6 +11,7 @@ from ..ttrpg_logging import get_logger
 from ..ttrpg_secrets import get_all_config, validate_database_config
 from ..ssl_bypass import configure_ssl_bypass_for_development, get_httpx_verify_setting
 from .base import VectorStore
+from .filters import MetadataFilter
 
 logger = get_logger(__name__)
 
@@ -197,19 +198,19 @@ class AstraVectorStore(VectorStore):
     ) -> List[Dict[str, Any]]:
         filters = filters or {}
         query_text = filters.get("query_text")
-        metadata_filters = filters.get("metadata")
+        metadata_filter = MetadataFilter.from_filters(filters)
         scan_limit = int(filters.get("scan_limit", 2000))
 
         if self.client is None:
             return []
         collection = self.client.get_collection(self.collection_name)
         projection = {"content": 1, "metadata": 1, "chunk_id": 1, "embedding": 1}
-        cursor = collection.find({}, projection=projection, limit=scan_limit)
+        # Predicates run server-side, so the scan limit only covers matching rows
+        server_filter = metadata_filter.to_astra() if metadata_filter else {}
+        cursor = collection.find(server_filter, projection=projection, limit=scan_limit)
         candidates: List[Dict[str, Any]] = []
         for doc in cursor:
             metadata = doc.get("metadata") or {}
-            if metadata_filters and not self._metadata_matches(metadata, metadata_filters):
-                continue
             if vector is None and query_text:
                 score = self._lexical_score(query_text, doc.get("content") or "", metadata)
             else:
@@ -292,20 +293,6 @@ class AstraVectorStore(VectorStore):
             return raw_result
         return self._aggregate_via_find(collection)
 
-    @staticmethod
-    def _metadata_matches(metadata: Mapping[str, Any], required: Optional[Mapping[str, Any]]) -> bool:
-        if not required:
-            return True
-        for key, expected in required.items():
-            current = metadata.get(key)
-            if isinstance(expected, list):
-                if current not in expected:
-                    return False
-            else:
-                if current != expected:
-                    return False
-        return True
-
     @staticmethod
     def _lexical_score(query: str, text: str, metadata: Mapping[str, Any]) -> float:
         if not query or not text:
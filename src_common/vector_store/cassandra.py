@@ -11,19 +11,32 @@ from typing import Any, Dict, Mapping, Optional, Sequence, List
 try:
     from cassandra.auth import PlainTextAuthProvider  # type: ignore
     from cassandra.cluster import Cluster  # type: ignore
+    from cassandra.concurrent import execute_concurrent  # type: ignore
     from cassandra.io.asyncioreactor import AsyncioConnection  # type: ignore
-    from cassandra.query import SimpleStatement  # type: ignore
+    from cassandra.policies import DCAwareRoundRobinPolicy, TokenAwarePolicy  # type: ignore
+    from cassandra.query import BatchStatement, BatchType, SimpleStatement  # type: ignore
 except Exception as cassandra_import_error:  # pragma: no cover - environment specific
     PlainTextAuthProvider = None  # type: ignore[assignment]
     Cluster = None  # type: ignore[assignment]
+    execute_concurrent = None  # type: ignore[assignment]
     AsyncioConnection = None  # type: ignore[assignment]
+    DCAwareRoundRobinPolicy = None  # type: ignore[assignment]
+    TokenAwarePolicy = None  # type: ignore[assignment]
+    BatchStatement = None  # type: ignore[assignment]
+    BatchType = None  # type: ignore[assignment]
     SimpleStatement = None  # type: ignore[assignment]
     _CASSANDRA_IMPORT_ERROR = cassandra_import_error
 else:
     _CASSANDRA_IMPORT_ERROR = None
 
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
 from ..ttrpg_logging import get_logger
 from .base import VectorStore
+from .filters import DEFAULT_LANE, MetadataFilter, document_field
 
 logger = get_logger(__name__)
 
@@ -32,7 +45,7 @@ os.environ.setdefault('CASS_DRIVER_NO_EXTENSIONS', '1')
 
 
 def _ensure_dependencies() -> None:
-    if Cluster is None or AsyncioConnection is None or SimpleStatement is None or PlainTextAuthProvider is None:
+    if Cluster is None or AsyncioConnection is None or SimpleStatement is None or PlainTextAuthProvider is None or execute_concurrent is None:
         if '_CASSANDRA_IMPORT_ERROR' in globals() and _CASSANDRA_IMPORT_ERROR is not None:
             raise RuntimeError("Cassandra backend unavailable: cassandra-driver failed to import.") from _CASSANDRA_IMPORT_ERROR
         raise RuntimeError("Cassandra backend unavailable: cassandra-driver is not installed.")
@@ -40,6 +53,9 @@ def _ensure_dependencies() -> None:
 class CassandraVectorStore(VectorStore):
     """Vector store backed by Apache Cassandra."""
 
+    # Indexed columns that query filters are pushed down to (source_hash is in the base schema)
+    FILTER_COLUMNS = {"lane": "text", "element_type": "text", "page": "int"}
+
     def __init__(self, env: str) -> None:
         super().__init__(env)
         _ensure_dependencies()
@@ -51,12 +67,26 @@ class CassandraVectorStore(VectorStore):
         self.password = os.getenv("CASSANDRA_PASSWORD", "").strip() or None
         self.consistency = os.getenv("CASSANDRA_CONSISTENCY", "LOCAL_ONE").upper()
         self.vector_scan_limit = int(os.getenv("CASSANDRA_VECTOR_SCAN_LIMIT", "2000"))
+        self.local_dc = os.getenv("CASSANDRA_LOCAL_DC", "").strip() or None
+        self.write_concurrency = max(1, int(os.getenv("CASSANDRA_WRITE_CONCURRENCY", "64")))
+        self.use_unlogged_batches = os.getenv("CASSANDRA_UNLOGGED_BATCHES", "false").strip().lower() in {"1", "true", "yes"}
+        self.batch_size = max(1, int(os.getenv("CASSANDRA_BATCH_SIZE", "20")))
+        self.last_write_stats: Dict[str, Any] = {}
 
         auth_provider = None
         if self.username and self.password:
             auth_provider = PlainTextAuthProvider(username=self.username, password=self.password)
 
-        self.cluster = Cluster(self.contact_points, port=self.port, auth_provider=auth_provider, connection_class=AsyncioConnection)
+        # Token-aware routing sends each prepared write straight to a replica
+        # that owns the partition instead of an arbitrary coordinator.
+        load_balancing_policy = TokenAwarePolicy(DCAwareRoundRobinPolicy(local_dc=self.local_dc))
+        self.cluster = Cluster(
+            self.contact_points,
+            port=self.port,
+            auth_provider=auth_provider,
+            connection_class=AsyncioConnection,
+            load_balancing_policy=load_balancing_policy,
+        )
         self.session = self.cluster.connect()
         self._ensure_keyspace()
         self.session.set_keyspace(self.keyspace)
@@ -77,6 +107,9 @@ class CassandraVectorStore(VectorStore):
                 payload text,
                 source_hash text,
                 source_file text,
+                lane text,
+                element_type text,
+                page int,
                 embedding blob,
                 embedding_model text,
                 vector_id text,
@@ -85,9 +118,14 @@ class CassandraVectorStore(VectorStore):
             )
         """
         self.session.execute(create_table)
-        self.session.execute(f"CREATE INDEX IF NOT EXISTS ON {self.table} (source_hash)")
-        self.session.execute(f"CREATE INDEX IF NOT EXISTS ON {self.table} (environment)")
-        self.session.execute(f"CREATE INDEX IF NOT EXISTS ON {self.table} (stage)")
+        # Filter columns added after the first schema; existing tables gain them here
+        for column, cql_type in self.FILTER_COLUMNS.items():
+            try:
+                self.session.execute(f"ALTER TABLE {self.table} ADD {column} {cql_type}")
+            except Exception:
+                pass  # column already exists
+        for column in ("source_hash", "environment", "stage", *self.FILTER_COLUMNS):
+            self.session.execute(f"CREATE INDEX IF NOT EXISTS ON {self.table} ({column})")
 
     # ------------------------------------------------------------------
     # Public API implementations
@@ -96,6 +134,7 @@ class CassandraVectorStore(VectorStore):
         return self._write_documents(documents)
 
     def upsert_documents(self, documents: Sequence[Mapping[str, Any]]) -> int:
+        """Upsert rows concurrently; throughput and error counts land in ``last_write_stats``."""
         return self._write_documents(documents)
 
     def delete_all(self) -> int:
@@ -158,20 +197,27 @@ class CassandraVectorStore(VectorStore):
     ) -> List[Dict[str, Any]]:
         filters = filters or {}
         stage = filters.get("stage", "vectorized")
-        metadata_filters = filters.get("metadata")
         query_text = filters.get("query_text")
+        clauses = ["environment = %s", "stage = %s"]
+        params: List[Any] = [self.env, stage]
+        residual: Optional[MetadataFilter] = None
+        metadata_filter = MetadataFilter.from_filters(filters)
+        if metadata_filter is not None:
+            pushed, pushed_params, residual = metadata_filter.to_cql(("source_hash", *self.FILTER_COLUMNS))
+            clauses.extend(pushed)
+            params.extend(pushed_params)
         statement = SimpleStatement(
             f"SELECT chunk_id, content, payload, embedding, embedding_model FROM {self.table} "
-            "WHERE environment = %s AND stage = %s ALLOW FILTERING"
+            f"WHERE {' AND '.join(clauses)} ALLOW FILTERING"
         )
-        rows = self.session.execute(statement, (self.env, stage))
+        rows = self.session.execute(statement, tuple(params))
         results: List[Dict[str, Any]] = []
         for idx, row in enumerate(rows):
             if idx >= self.vector_scan_limit:
                 break
             payload = self._deserialize_payload(row.payload)
             metadata = payload.get("metadata") if isinstance(payload, dict) else {}
-            if not self._metadata_matches(metadata, metadata_filters):
+            if residual is not None and not residual.matches(payload):
                 continue
             if vector is None and query_text:
                 score = self._lexical_score(query_text, row.content or payload.get("content") or "", metadata)
@@ -209,8 +255,9 @@ class CassandraVectorStore(VectorStore):
             f"""
             INSERT INTO {self.table} (
                 chunk_id, environment, stage, content, payload, source_hash, source_file,
+                lane, element_type, page,
                 embedding, embedding_model, vector_id, updated_at, loaded_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """
         )
         self.delete_stmt = self.session.prepare(
@@ -218,14 +265,99 @@ class CassandraVectorStore(VectorStore):
         )
 
     def _write_documents(self, documents: Sequence[Mapping[str, Any]]) -> int:
+        """Write rows through the driver's concurrent executor.
+
+        Returns the number of rows acknowledged by the cluster; failed rows are
+        counted in ``last_write_stats`` rather than aborting the whole call, so
+        callers can derive partial-failure counts the same way they do for Astra.
+        """
+        started = time.perf_counter()
+        if not documents:
+            self.last_write_stats = self._build_write_stats(0, 0, 0, 0, started)
+            return 0
+
+        blobs = self._encode_embeddings([doc.get("embedding") for doc in documents])
+        params_list = [
+            self._normalise_document(doc, embedding_blob=blob)
+            for doc, blob in zip(documents, blobs)
+        ]
+
+        if self.use_unlogged_batches:
+            statements = self._build_unlogged_batches(params_list)
+        else:
+            statements = [(self.insert_stmt, params, 1) for params in params_list]
+
+        results = execute_concurrent(
+            self.session,
+            [(statement, params) for statement, params, _ in statements],
+            concurrency=self.write_concurrency,
+            raise_on_first_error=False,
+        )
+
         written = 0
-        for doc in documents:
-            params = self._normalise_document(doc)
-            self.session.execute(self.insert_stmt, params)
-            written += 1
+        errors = 0
+        for (success, outcome), (_, _, row_count) in zip(results, statements):
+            if success:
+                written += row_count
+            else:
+                errors += row_count
+                logger.warning("Cassandra write failed for %s row(s): %s", row_count, outcome)
+
+        self.last_write_stats = self._build_write_stats(len(params_list), written, errors, len(statements), started)
+        logger.info(
+            "Cassandra wrote %s/%s rows in %.1f ms (%.0f rows/s, %s errors, concurrency=%s)",
+            written,
+            len(params_list),
+            self.last_write_stats["elapsed_ms"],
+            self.last_write_stats["rows_per_second"],
+            errors,
+            self.write_concurrency,
+        )
         return written
 
-    def _normalise_document(self, doc: Mapping[str, Any]) -> tuple[Any, ...]:
+    def _build_unlogged_batches(self, params_list: Sequence[tuple[Any, ...]]) -> List[tuple[Any, Any, int]]:
+        """Group rows into UNLOGGED batches that share the same replica set.
+
+        ``chunk_id`` is the partition key, so rows are grouped by the replicas
+        owning their token; a batch then lands on a single coordinator without
+        fanning out across the ring.
+        """
+        groups: Dict[Any, List[tuple[Any, ...]]] = {}
+        for params in params_list:
+            groups.setdefault(self._replica_key(params), []).append(params)
+
+        statements: List[tuple[Any, Any, int]] = []
+        for rows in groups.values():
+            for start in range(0, len(rows), self.batch_size):
+                chunk = rows[start:start + self.batch_size]
+                batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+                for params in chunk:
+                    batch.add(self.insert_stmt, params)
+                statements.append((batch, None, len(chunk)))
+        return statements
+
+    def _replica_key(self, params: tuple[Any, ...]) -> Any:
+        try:
+            bound = self.insert_stmt.bind(params)
+            replicas = self.cluster.metadata.get_replicas(self.keyspace, bound.routing_key)
+            return tuple(sorted(str(host.endpoint) for host in replicas)) or params[0]
+        except Exception:
+            return params[0]
+
+    def _build_write_stats(self, rows: int, written: int, errors: int, statements: int, started: float) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - started
+        return {
+            "rows": rows,
+            "written": written,
+            "errors": errors,
+            "statements": statements,
+            "unlogged_batches": self.use_unlogged_batches,
+            "concurrency": self.write_concurrency,
+            "elapsed_ms": round(elapsed * 1000.0, 3),
+            "rows_per_second": (written / elapsed) if elapsed > 0 else 0.0,
+        }
+
+    def _normalise_document(self, doc: Mapping[str, Any], *, embedding_blob: Optional[bytes] = None) -> tuple[Any, ...]:
         chunk_id = str(doc.get("chunk_id") or doc.get("id") or doc.get("_id") or self._fallback_chunk_id())
         content = doc.get("content") or doc.get("text") or ""
         stage = doc.get("stage") or "raw"
@@ -238,8 +370,9 @@ class CassandraVectorStore(VectorStore):
         )
         source_file = doc.get("source_file") or doc.get("metadata", {}).get("source_file")
         payload = json.dumps(dict(doc), ensure_ascii=False, default=self._json_default)
-        embedding_list = self._ensure_vector(doc.get("embedding"))
-        embedding_blob = self._vector_to_blob(embedding_list) if embedding_list else None
+        if embedding_blob is None:
+            embedding_list = self._ensure_vector(doc.get("embedding"))
+            embedding_blob = self._vector_to_blob(embedding_list) if embedding_list else None
         embedding_model = doc.get("embedding_model")
         vector_id = doc.get("vector_id")
         updated_at = self._coerce_datetime(doc.get("updated_at"))
@@ -252,6 +385,9 @@ class CassandraVectorStore(VectorStore):
             payload,
             source_hash,
             source_file,
+            document_field(doc, "lane") or DEFAULT_LANE,
+            document_field(doc, "element_type"),
+            document_field(doc, "page"),
             embedding_blob,
             embedding_model,
             vector_id,
@@ -271,6 +407,31 @@ class CassandraVectorStore(VectorStore):
         arr = array("f", [float(v) for v in values])
         return arr.tobytes()
 
+    @classmethod
+    def _encode_embeddings(cls, embeddings: Sequence[Any]) -> List[Optional[bytes]]:
+        """Encode a batch of embeddings to float32 blobs in one pass.
+
+        Embeddings sharing a dimension are packed into a single float32 matrix,
+        so conversion happens once per batch instead of once per value.
+        """
+        blobs: List[Optional[bytes]] = [None] * len(embeddings)
+        if np is None:
+            for idx, value in enumerate(embeddings):
+                vector = cls._ensure_vector(value)
+                blobs[idx] = cls._vector_to_blob(vector) if vector else None
+            return blobs
+
+        by_dim: Dict[int, List[int]] = {}
+        for idx, value in enumerate(embeddings):
+            if value is None or not isinstance(value, (list, tuple, np.ndarray)) or len(value) == 0:
+                continue
+            by_dim.setdefault(len(value), []).append(idx)
+        for indices in by_dim.values():
+            matrix = np.asarray([embeddings[idx] for idx in indices], dtype=np.float32)
+            for row, idx in zip(matrix, indices):
+                blobs[idx] = row.tobytes()
+        return blobs
+
     @staticmethod
     def _blob_to_vector(blob: Optional[bytes]) -> List[float]:
         if blob is None:
@@ -317,42 +478,27 @@ class CassandraVectorStore(VectorStore):
             return {}
 
     @staticmethod
-    def _metadata_matches(metadata: Mapping[str, Any], required: Optional[Mapping[str, Any]]) -> bool:
-        if not required:
-            return True
-        for key, value in required.items():
-            meta_value = metadata.get(key)
-            if isinstance(value, list):
-                if meta_value not in value:
-                    return False
-            else:
-                if meta_value != value:
-                    return False
-        return True
-
-
-@staticmethod
-def _lexical_score(query: str, text: str, metadata: Mapping[str, Any]) -> float:
-    if not query or not text:
-        return 0.0
-    tokens_q = set(re.findall(r"\w+", query.lower()))
-    tokens_t = set(re.findall(r"\w+", text.lower()))
-    if not tokens_q or not tokens_t:
-        return 0.0
-    overlap = len(tokens_q & tokens_t) / max(1, len(tokens_q))
-    boost = 0.0
-    q_lower = query.lower()
-    t_lower = text.lower()
-    if "spells per day" in q_lower and "spells per day" in t_lower:
-        boost += 2.0
-    if "dodge" in q_lower and "dodge" in t_lower:
-        boost += 1.5
-    if "paladin" in q_lower and "paladin" in t_lower:
-        boost += 1.0
-    chunk_type = metadata.get("chunk_type") or metadata.get("type")
-    if chunk_type and str(chunk_type).lower() in {"table", "list", "table_row"}:
-        boost += 0.5
-    return overlap + boost
+    def _lexical_score(query: str, text: str, metadata: Mapping[str, Any]) -> float:
+        if not query or not text:
+            return 0.0
+        tokens_q = set(re.findall(r"\w+", query.lower()))
+        tokens_t = set(re.findall(r"\w+", text.lower()))
+        if not tokens_q or not tokens_t:
+            return 0.0
+        overlap = len(tokens_q & tokens_t) / max(1, len(tokens_q))
+        boost = 0.0
+        q_lower = query.lower()
+        t_lower = text.lower()
+        if "spells per day" in q_lower and "spells per day" in t_lower:
+            boost += 2.0
+        if "dodge" in q_lower and "dodge" in t_lower:
+            boost += 1.5
+        if "paladin" in q_lower and "paladin" in t_lower:
+            boost += 1.0
+        chunk_type = metadata.get("chunk_type") or metadata.get("type")
+        if chunk_type and str(chunk_type).lower() in {"table", "list", "table_row"}:
+            boost += 0.5
+        return overlap + boost
 
     @staticmethod
     def _coerce_datetime(value: Any) -> Optional[datetime]:
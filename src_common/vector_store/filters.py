@@ -0,0 +1,172 @@
+"""
+Metadata filter pushdown for vector store queries.
+
+``query(filters=...)`` accepts these predicates next to ``query_text`` and
+``scan_limit``:
+
+- ``lane``: content lane ("A", "B", "C"); chunks without a lane are lane A
+- ``source_hash`` / ``element_type``: a value or list of accepted values
+- ``page_range``: ``(first, last)`` inclusive, either end may be None
+- ``metadata``: legacy ``{key: value | [values]}`` equality filters
+
+``MetadataFilter`` compiles them once into each backend's native form (an
+Astra filter document, CQL clauses over indexed columns, or a predicate the
+memory backend checks before scoring), so filtered queries only read rows
+that can match.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_LANE = "A"
+KNOWN_LANES = ("A", "B", "C")
+
+# Predicates with a dedicated top-level field in Pass D documents and a
+# dedicated, indexed column in Cassandra
+PUSHDOWN_FIELDS = ("lane", "source_hash", "element_type")
+PAGE_FIELDS = ("page_number", "page")
+
+
+def _values(value: Any) -> Tuple[Any, ...]:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(value)
+    return (value,)
+
+
+def _page(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def document_field(document: Mapping[str, Any], name: str) -> Any:
+    """Value of a filterable field: metadata first, then the document's top level."""
+    metadata = document.get("metadata") or {}
+    if name == "page":
+        for key in PAGE_FIELDS:
+            page = _page(metadata.get(key, document.get(key)))
+            if page is not None:
+                return page
+        return None
+    value = metadata.get(name, document.get(name))
+    if name == "lane":
+        return str(value or DEFAULT_LANE).upper()
+    return value
+
+
+@dataclass(frozen=True)
+class MetadataFilter:
+    """Compiled equality and page-range predicates."""
+
+    equals: Dict[str, Tuple[Any, ...]] = field(default_factory=dict)
+    page_min: Optional[int] = None
+    page_max: Optional[int] = None
+
+    @classmethod
+    def from_filters(cls, filters: Optional[Mapping[str, Any]]) -> Optional["MetadataFilter"]:
+        """Compile ``query`` filters; returns None when nothing constrains the rows."""
+        filters = filters or {}
+        equals: Dict[str, Tuple[Any, ...]] = {}
+        for key, value in (filters.get("metadata") or {}).items():
+            equals[key] = _values(value)
+        for key in PUSHDOWN_FIELDS:
+            value = filters.get(key)
+            if value is None or value == "":
+                continue
+            equals[key] = _values(value)
+
+        lanes = equals.get("lane")
+        if lanes is not None:
+            lanes = tuple(sorted({str(lane).strip().upper() for lane in lanes}))
+            if "ALL" in lanes:
+                equals.pop("lane")
+            else:
+                equals["lane"] = lanes
+
+        page_min = page_max = None
+        page_range = filters.get("page_range")
+        if page_range:
+            first, last = page_range
+            page_min, page_max = _page(first), _page(last)
+
+        if not equals and page_min is None and page_max is None:
+            return None
+        return cls(equals=equals, page_min=page_min, page_max=page_max)
+
+    @property
+    def has_page_range(self) -> bool:
+        return self.page_min is not None or self.page_max is not None
+
+    def matches(self, document: Mapping[str, Any]) -> bool:
+        """Evaluate against a stored document (``metadata`` plus top-level fields)."""
+        for name, accepted in self.equals.items():
+            if document_field(document, name) not in accepted:
+                return False
+        if self.has_page_range:
+            page = document_field(document, "page")
+            if page is None:
+                return False
+            if self.page_min is not None and page < self.page_min:
+                return False
+            if self.page_max is not None and page > self.page_max:
+                return False
+        return True
+
+    def to_astra(self) -> Dict[str, Any]:
+        """Data API filter document matching ``metadata.<field>`` or the top-level field."""
+        clauses: List[Dict[str, Any]] = []
+        for name, accepted in self.equals.items():
+            values = list(accepted)
+            if name == "lane" and DEFAULT_LANE in values:
+                # Lane-less chunks are lane A: exclude the other lanes instead
+                others = [lane for lane in KNOWN_LANES if lane not in values]
+                clauses.append({"metadata.lane": {"$nin": others}} if others else {})
+                continue
+            clauses.append({"$or": [{f"metadata.{name}": {"$in": values}}, {name: {"$in": values}}]})
+        if self.has_page_range:
+            bounds: Dict[str, int] = {}
+            if self.page_min is not None:
+                bounds["$gte"] = self.page_min
+            if self.page_max is not None:
+                bounds["$lte"] = self.page_max
+            clauses.append({"$or": [{key: bounds} for key in ("page_number", "metadata.page", "metadata.page_number")]})
+        clauses = [clause for clause in clauses if clause]
+        if not clauses:
+            return {}
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    def to_cql(self, columns: Sequence[str]) -> Tuple[List[str], List[Any], Optional["MetadataFilter"]]:
+        """
+        CQL ``WHERE`` clauses over indexed ``columns`` (``page`` for the page range).
+
+        Secondary indexes only support single-value equality, so multi-value
+        predicates and fields without a column come back as a residual filter
+        to evaluate on the (already narrowed) rows.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        residual: Dict[str, Tuple[Any, ...]] = {}
+        for name, accepted in self.equals.items():
+            if name in columns and len(accepted) == 1:
+                clauses.append(f"{name} = %s")
+                params.append(accepted[0])
+            else:
+                residual[name] = accepted
+        if "page" in columns:
+            if self.page_min is not None:
+                clauses.append("page >= %s")
+                params.append(self.page_min)
+            if self.page_max is not None:
+                clauses.append("page <= %s")
+                params.append(self.page_max)
+            leftover = MetadataFilter(equals=residual) if residual else None
+        else:
+            leftover = MetadataFilter(equals=residual, page_min=self.page_min, page_max=self.page_max)
+            if not residual and not leftover.has_page_range:
+                leftover = None
+        return clauses, params, leftover
+
+
+__all__ = ["DEFAULT_LANE", "KNOWN_LANES", "MetadataFilter", "document_field"]
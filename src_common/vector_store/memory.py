@@ -1,20 +1,267 @@
 ﻿from __future__ import annotations
 
 import threading
+from bisect import bisect_right
 from collections import defaultdict
 from copy import deepcopy
-from typing import Any, Dict, List, Mapping, Optional, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
 
 from .base import VectorStore
+from .filters import PAGE_FIELDS, PUSHDOWN_FIELDS, MetadataFilter, document_field
 
-_lock = threading.RLock()
-_store: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+# Fields with integer-id bitmap postings; a doc's id is its global slot number
+INDEXED_FIELDS = ("source_hash", "source_file", "stage", "lane", "element_type")
+_COMPACT_MIN_SLOTS = 1024
+_MAX_SEGMENTS = 32
+
+
+def _popcount(bitmap: int) -> int:
+    return bin(bitmap).count("1")
+
+
+def _bitmap(slots: Sequence[int]) -> int:
+    """Bitmap with the given bits set, built in one pass over a byte buffer."""
+    if not slots:
+        return 0
+    buffer = bytearray(max(slots) // 8 + 1)
+    for slot in slots:
+        buffer[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _iter_bits(bitmap: int) -> Iterator[int]:
+    """Yield set bit positions in ascending order (one pass over the bitmap's bytes)."""
+    if not bitmap:
+        return
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for index, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            yield (index << 3) + low.bit_length() - 1
+            byte ^= low
+
+
+class _Snapshot:
+    """
+    Immutable, published view of one environment's documents.
+
+    Documents live in append-only segments (tuples); slot ``bases[i] + j``
+    is ``segments[i][j]``. Each indexed field maps value -> bitmap (a Python
+    int) of live slots; documents without a (hashable) value are posted under
+    None. Readers use a snapshot without locking because nothing in it is
+    ever mutated: writers build and publish a replacement.
+    """
+
+    __slots__ = ("segments", "bases", "live", "postings", "size")
+
+    def __init__(self, segments: Tuple[Tuple[Dict[str, Any], ...], ...] = (), bases: Tuple[int, ...] = (),
+                 live: int = 0, postings: Optional[Dict[str, Dict[Any, int]]] = None, size: int = 0) -> None:
+        self.segments = segments
+        self.bases = bases
+        self.live = live
+        self.postings = postings if postings is not None else {name: {} for name in INDEXED_FIELDS}
+        self.size = size
+
+    @property
+    def slots(self) -> int:
+        return self.bases[-1] + len(self.segments[-1]) if self.segments else 0
+
+    def document(self, slot: int) -> Dict[str, Any]:
+        index = bisect_right(self.bases, slot) - 1
+        return self.segments[index][slot - self.bases[index]]
+
+    def matching(self, name: str, values: Iterable[Any]) -> int:
+        postings = self.postings[name]
+        bitmap = 0
+        for value in values:
+            bitmap |= postings.get(value, 0)
+        return bitmap
+
+    def candidates(self, metadata_filter: Optional[MetadataFilter]) -> Tuple[int, Optional[MetadataFilter]]:
+        """Bitmap of documents passing the indexed predicates, plus any predicates left to check."""
+        bitmap = self.live
+        if metadata_filter is None:
+            return bitmap, None
+        residual: Dict[str, Tuple[Any, ...]] = {}
+        for name, accepted in metadata_filter.equals.items():
+            if name in self.postings:
+                bitmap &= self.matching(name, accepted)
+            else:
+                residual[name] = accepted
+        if residual or metadata_filter.has_page_range:
+            return bitmap, MetadataFilter(residual, metadata_filter.page_min, metadata_filter.page_max)
+        return bitmap, None
+
+    def documents(self, bitmap: int) -> Iterator[Dict[str, Any]]:
+        for base, segment in zip(self.bases, self.segments):
+            part = (bitmap >> base) & ((1 << len(segment)) - 1)
+            for offset in _iter_bits(part):
+                yield segment[offset]
+
+
+class _Partition:
+    """
+    One environment's store: a published snapshot plus writer-only state.
+
+    Writers serialise on ``write_lock``, append a new segment (replaced
+    documents are dropped from ``live``, never modified in place) and publish
+    a new snapshot with a single reference assignment. Dead slots are
+    compacted away once they make up half of the slots, and small segments
+    are merged once there are more than ``_MAX_SEGMENTS``.
+    """
+
+    def __init__(self) -> None:
+        self.write_lock = threading.Lock()
+        self.snapshot = _Snapshot()
+        self._ids: Dict[str, int] = {}
+        # Next id for documents inserted without one; only ever increases
+        self._next_auto_id = 0
+
+    def __len__(self) -> int:
+        return self.snapshot.size
+
+    def add(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or replace documents by chunk_id; postings change once per (field, value).
+
+        Documents whose chunk_id is None get an id unique within the partition.
+        """
+        documents = list(documents)
+        if not documents:
+            return 0
+        with self.write_lock:
+            explicit = {doc["chunk_id"] for doc in documents if doc["chunk_id"] is not None}
+            batch: Dict[str, Dict[str, Any]] = {}
+            for doc in documents:
+                if doc["chunk_id"] is None:
+                    doc["chunk_id"] = self._auto_id(explicit)
+                batch[doc["chunk_id"]] = doc
+            current = self.snapshot
+            base = current.slots
+            stale: Dict[Tuple[str, Any], List[int]] = defaultdict(list)
+            fresh: Dict[Tuple[str, Any], List[int]] = defaultdict(list)
+            replaced: List[int] = []
+            for offset, (chunk_id, doc) in enumerate(batch.items()):
+                old_slot = self._ids.get(chunk_id)
+                if old_slot is not None:
+                    replaced.append(old_slot)
+                    old = current.document(old_slot)
+                    for name in INDEXED_FIELDS:
+                        stale[(name, _indexed_value(old, name))].append(old_slot)
+                self._ids[chunk_id] = base + offset
+                for name in INDEXED_FIELDS:
+                    fresh[(name, _indexed_value(doc, name))].append(base + offset)
+
+            postings = _apply_postings(current.postings, stale, fresh)
+            live = (current.live & ~_bitmap(replaced)) | _bitmap(range(base, base + len(batch)))
+            self._publish(_Snapshot(current.segments + (tuple(batch.values()),), current.bases + (base,),
+                                    live, postings, current.size + len(batch) - len(replaced)))
+        return len(batch)
+
+    def _auto_id(self, reserved: Set[str]) -> str:
+        while True:
+            chunk_id = str(self._next_auto_id)
+            self._next_auto_id += 1
+            if chunk_id not in self._ids and chunk_id not in reserved:
+                return chunk_id
+
+    def remove_matching(self, name: str, values: Iterable[Any]) -> int:
+        """Remove documents whose ``name`` field has one of ``values``."""
+        with self.write_lock:
+            current = self.snapshot
+            slots = list(_iter_bits(current.matching(name, values) & current.live))
+            if not slots:
+                return 0
+            stale: Dict[Tuple[str, Any], List[int]] = defaultdict(list)
+            for slot in slots:
+                doc = current.document(slot)
+                for field_name in INDEXED_FIELDS:
+                    stale[(field_name, _indexed_value(doc, field_name))].append(slot)
+                del self._ids[doc["chunk_id"]]
+            postings = _apply_postings(current.postings, stale, {})
+            self._publish(_Snapshot(current.segments, current.bases, current.live & ~_bitmap(slots),
+                                    postings, current.size - len(slots)))
+            return len(slots)
+
+    def clear(self) -> int:
+        with self.write_lock:
+            count = self.snapshot.size
+            self._ids = {}
+            self.snapshot = _Snapshot()
+            return count
+
+    def _publish(self, snapshot: _Snapshot) -> None:
+        slots = snapshot.slots
+        if (slots >= _COMPACT_MIN_SLOTS and snapshot.size * 2 < slots) or len(snapshot.segments) > _MAX_SEGMENTS:
+            snapshot = self._compacted(snapshot)
+        self.snapshot = snapshot
+
+    def _compacted(self, snapshot: _Snapshot) -> _Snapshot:
+        """Rewrite the live documents into one segment with dense slots."""
+        documents = tuple(snapshot.documents(snapshot.live))
+        self._ids = {doc["chunk_id"]: slot for slot, doc in enumerate(documents)}
+        fresh: Dict[Tuple[str, Any], List[int]] = defaultdict(list)
+        for slot, doc in enumerate(documents):
+            for name in INDEXED_FIELDS:
+                fresh[(name, _indexed_value(doc, name))].append(slot)
+        postings = _apply_postings({name: {} for name in INDEXED_FIELDS}, {}, fresh)
+        segments = (documents,) if documents else ()
+        return _Snapshot(segments, (0,) if documents else (), _bitmap(range(len(documents))),
+                         postings, len(documents))
+
+
+def _apply_postings(postings: Mapping[str, Dict[Any, int]],
+                    stale: Mapping[Tuple[str, Any], List[int]],
+                    fresh: Mapping[Tuple[str, Any], List[int]]) -> Dict[str, Dict[Any, int]]:
+    """Copy-on-write update of the postings (only the per-field dicts are copied)."""
+    updated = {name: dict(values) for name, values in postings.items()}
+    for (name, value), slots in stale.items():
+        remaining = updated[name].get(value, 0) & ~_bitmap(slots)
+        if remaining:
+            updated[name][value] = remaining
+        else:
+            updated[name].pop(value, None)
+    for (name, value), slots in fresh.items():
+        updated[name][value] = updated[name].get(value, 0) | _bitmap(slots)
+    return updated
+
+
+def _indexed_value(doc: Mapping[str, Any], name: str) -> Any:
+    value = document_field(doc, name)
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return value
+
+
+_partitions: Dict[str, _Partition] = {}
+_partitions_lock = threading.Lock()
+
+
+def _get_partition(env: str) -> _Partition:
+    partition = _partitions.get(env)
+    if partition is None:
+        with _partitions_lock:
+            partition = _partitions.setdefault(env, _Partition())
+    return partition
 
 
 def _tokenize(text: str) -> List[str]:
     return [token.lower() for token in (text or "").split() if token]
 
 
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    if not a or not b or len(a) != len(b):
+        return 0.0
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = sum(x * x for x in a) ** 0.5
+    norm_b = sum(x * x for x in b) ** 0.5
+    if not norm_a or not norm_b:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
 def _lexical_score(query: str, content: str) -> float:
     if not query or not content:
         return 0.0
@@ -26,84 +273,61 @@ def _lexical_score(query: str, content: str) -> float:
 
 
 class MemoryVectorStore(VectorStore):
-    """In-process vector store used for local development and tests."""
+    """In-process vector store used for local development and tests.
+
+    Each environment is a separate partition. Queries and counts read the
+    partition's current immutable snapshot without taking a lock, so they
+    never wait on each other or on writers; writers of one environment
+    serialise only with each other. Counts, source deletes and filtered
+    queries read bitmap postings and cost O(matching documents).
+    """
 
     backend_name = "memory"
 
-    def _bucket(self) -> List[Dict[str, Any]]:
-        with _lock:
-            return _store[self.env]
+    def _partition(self) -> _Partition:
+        return _get_partition(self.env)
 
     def ensure_schema(self) -> None:  # pragma: no cover - schema-less backend
         return None
 
     def insert_documents(self, documents: Sequence[Mapping[str, Any]]) -> int:
-        inserted = 0
-        with _lock:
-            bucket = self._bucket()
-            for doc in documents:
-                fallback_id = len(bucket) + inserted
-                bucket.append(self._normalize(doc, fallback_id=fallback_id))
-                inserted += 1
-        return inserted
+        return self.upsert_documents(documents)
 
     def upsert_documents(self, documents: Sequence[Mapping[str, Any]]) -> int:
-        updated = 0
-        with _lock:
-            bucket = self._bucket()
-            by_id = {doc["chunk_id"]: idx for idx, doc in enumerate(bucket) if "chunk_id" in doc}
-            for doc in documents:
-                fallback_id = len(bucket)
-                normalized = self._normalize(doc, fallback_id=fallback_id)
-                chunk_id = normalized["chunk_id"]
-                if chunk_id in by_id:
-                    bucket[by_id[chunk_id]] = normalized
-                else:
-                    bucket.append(normalized)
-                updated += 1
-        return updated
+        normalized = [self._normalize(doc) for doc in documents]
+        self._partition().add(normalized)
+        return len(documents)
 
     def delete_all(self) -> int:
-        with _lock:
-            bucket = self._bucket()
-            count = len(bucket)
-            bucket.clear()
-            return count
+        return self._partition().clear()
 
     def delete_by_source_hash(self, source_hash: str) -> int:
         if not source_hash:
             return 0
-        removed = 0
-        with _lock:
-            bucket = self._bucket()
-            keep = []
-            for doc in bucket:
-                metadata = doc.get("metadata") or {}
-                if metadata.get("source_hash") == source_hash:
-                    removed += 1
-                else:
-                    keep.append(doc)
-            bucket[:] = keep
-        return removed
+        return self._partition().remove_matching("source_hash", (source_hash,))
 
     def count_documents(self) -> int:
-        with _lock:
-            return len(self._bucket())
+        return self._partition().snapshot.size
 
     def count_documents_for_source(self, source_hash: str) -> int:
         if not source_hash:
             return 0
-        with _lock:
-            return sum(1 for doc in self._bucket() if (doc.get("metadata") or {}).get("source_hash") == source_hash)
+        return _popcount(self._partition().snapshot.matching("source_hash", (source_hash,)))
 
     def get_sources_with_chunk_counts(self) -> Dict[str, Any]:
-        with _lock:
-            counts: Dict[str, int] = defaultdict(int)
-            for doc in self._bucket():
-                metadata = doc.get("metadata") or {}
-                source = metadata.get("source_file") or metadata.get("source_hash") or "unknown"
-                counts[source] += 1
-            return dict(counts)
+        snapshot = self._partition().snapshot
+        counts: Dict[str, int] = {}
+        named = [value for value in snapshot.postings["source_file"] if value]
+        for source_file in named:
+            counts[source_file] = counts.get(source_file, 0) + _popcount(snapshot.postings["source_file"][source_file])
+        # Documents without a source file are grouped by source hash
+        unnamed = snapshot.live & ~snapshot.matching("source_file", named)
+        for source_hash, bitmap in snapshot.postings["source_hash"].items():
+            count = _popcount(unnamed & bitmap)
+            if count:
+                key = source_hash or "unknown"
+                counts[key] = counts.get(key, 0) + count
+        return counts
 
     def query(
         self,
@@ -114,39 +338,56 @@ class MemoryVectorStore(VectorStore):
         filters = filters or {}
         query_text = str(filters.get("query_text", ""))
         results: List[Dict[str, Any]] = []
-        with _lock:
-            for doc in self._bucket():
-                content = doc.get("content") or ""
-                metadata = doc.get("metadata") or {}
+        query_vector = [float(v) for v in vector] if vector is not None else None
+        snapshot = self._partition().snapshot
+        bitmap, residual = snapshot.candidates(MetadataFilter.from_filters(filters))
+        for doc in snapshot.documents(bitmap):
+            if residual is not None and not residual.matches(doc):
+                continue
+            content = doc.get("content") or ""
+            metadata = doc.get("metadata") or {}
+            if query_vector is not None:
+                score = _cosine(query_vector, doc.get("embedding") or ())
+            else:
                 score = _lexical_score(query_text, content)
-                if score <= 0:
-                    continue
-                results.append(
-                    {
-                        "chunk_id": doc.get("chunk_id"),
-                        "content": content,
-                        "metadata": deepcopy(metadata),
-                        "score": score,
-                        "source_file": metadata.get("source_file"),
-                    }
-                )
+            if score <= 0:
+                continue
+            results.append(
+                {
+                    "chunk_id": doc.get("chunk_id"),
+                    "content": content,
+                    "metadata": deepcopy(metadata),
+                    "score": score,
+                    "source_file": metadata.get("source_file"),
+                }
+            )
         results.sort(key=lambda item: item.get("score", 0.0), reverse=True)
         return results[: max(1, top_k)]
 
     def close(self) -> None:  # pragma: no cover - no resources to release
         return None
 
-    def _normalize(self, doc: Mapping[str, Any], *, fallback_id: int) -> Dict[str, Any]:
-        chunk_id = str(doc.get("chunk_id") or doc.get("id") or doc.get("uuid") or fallback_id)
+    def _normalize(self, doc: Mapping[str, Any]) -> Dict[str, Any]:
+        # Id-less documents get a partition-unique id when they are added
+        chunk_id = doc.get("chunk_id") or doc.get("id") or doc.get("uuid")
+        chunk_id = str(chunk_id) if chunk_id else None
         content = doc.get("content") or doc.get("text") or ""
         metadata = doc.get("metadata") or {}
         if not isinstance(metadata, dict):
             metadata = dict(metadata)
-        return {
+        normalized = {
             "chunk_id": chunk_id,
             "content": str(content),
             "metadata": deepcopy(metadata),
         }
+        # Top-level filterable fields (as Pass D writes them) stay queryable
+        for key in PUSHDOWN_FIELDS + PAGE_FIELDS + ("source_file", "stage"):
+            if doc.get(key) is not None:
+                normalized[key] = doc[key]
+        embedding = doc.get("embedding")
+        if embedding is not None:
+            normalized["embedding"] = [float(v) for v in embedding]
+        return normalized
 
 
 __all__ = ["MemoryVectorStore"]
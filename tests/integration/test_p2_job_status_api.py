@@ -174,7 +174,7 @@ class TestJobStatusAPI:
         assert response.status_code == 200
         
         # Verify limit was passed to store
-        mock_job_store.get_job_history.assert_called_once_with(limit=10, environment=None)
+        mock_job_store.get_job_history.assert_called_once_with(limit=10, environment=None, offset=0)
     
     def test_get_job_history_with_environment(self, client, mock_job_store):
         """Test job history with environment filter"""
@@ -183,7 +183,7 @@ class TestJobStatusAPI:
         assert response.status_code == 200
         
         # Verify parameters were passed correctly
-        mock_job_store.get_job_history.assert_called_once_with(limit=20, environment="prod")
+        mock_job_store.get_job_history.assert_called_once_with(limit=20, environment="prod", offset=0)
     
     def test_get_job_statistics(self, client):
         """Test retrieving job statistics"""
@@ -0,0 +1,189 @@
+# tests/performance/test_cassandra_write_throughput.py
+"""
+Write-throughput benchmark for CassandraVectorStore upserts.
+
+Runs against a fake session that simulates per-request round-trip latency by
+default. Set RUN_CASSANDRA_TESTS=1 to run the same workload against a local
+Cassandra container (CASSANDRA_CONTACT_POINTS / CASSANDRA_PORT).
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("cassandra")
+
+from cassandra.query import SimpleStatement
+
+from src_common.vector_store.cassandra import CassandraVectorStore
+
+ROUND_TRIP_SECONDS = 0.002
+DOCUMENT_COUNT = 400
+EMBEDDING_DIM = 384
+
+
+class FakeResponseFuture:
+    """Minimal ResponseFuture stand-in understood by cassandra.concurrent."""
+
+    has_more_pages = False
+    _col_names = None
+    _col_types = None
+
+    def __init__(self, pool: ThreadPoolExecutor, outcome):
+        self._pool = pool
+        self._outcome = outcome
+
+    def add_callbacks(self, callback, errback, callback_args=(), callback_kwargs=None,
+                      errback_args=(), errback_kwargs=None):
+        def _complete():
+            time.sleep(ROUND_TRIP_SECONDS)
+            if isinstance(self._outcome, Exception):
+                errback(self._outcome, *errback_args, **(errback_kwargs or {}))
+            else:
+                callback(self._outcome, *callback_args, **(callback_kwargs or {}))
+
+        self._pool.submit(_complete)
+
+    def clear_callbacks(self):
+        return None
+
+
+class FakeSession:
+    """Session that acknowledges writes after a simulated round trip."""
+
+    def __init__(self, fail_chunk_ids=()):
+        self.pool = ThreadPoolExecutor(max_workers=128)
+        self.fail_chunk_ids = set(fail_chunk_ids)
+        self.statements = 0
+        self._lock = threading.Lock()
+
+    def execute_async(self, statement, parameters=None, **_kwargs):
+        with self._lock:
+            self.statements += 1
+        chunk_id = parameters[0] if parameters else None
+        outcome = RuntimeError(f"write timeout for {chunk_id}") if chunk_id in self.fail_chunk_ids else []
+        return FakeResponseFuture(self.pool, outcome)
+
+
+class FakeInsertStatement(SimpleStatement):
+    """Insert statement whose bound form exposes a routing key like a prepared one."""
+
+    def bind(self, params):
+        return SimpleNamespace(routing_key=str(params[0]).encode("utf-8"))
+
+
+def _make_store(session, *, concurrency=64, unlogged_batches=False, replicas=None):
+    store = CassandraVectorStore.__new__(CassandraVectorStore)
+    store.env = "test"
+    store.keyspace = "ttrpg"
+    store.table = "chunks"
+    store.session = session
+    store.write_concurrency = concurrency
+    store.use_unlogged_batches = unlogged_batches
+    store.batch_size = 20
+    store.last_write_stats = {}
+    store.insert_stmt = FakeInsertStatement(
+        "INSERT INTO chunks (chunk_id, environment, stage, content, payload, source_hash, source_file, "
+        "lane, element_type, page, embedding, embedding_model, vector_id, updated_at, loaded_at) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+    )
+    hosts = [SimpleNamespace(endpoint=name) for name in (replicas or ["10.0.0.1"])]
+    store.cluster = SimpleNamespace(
+        metadata=SimpleNamespace(get_replicas=lambda keyspace, key: [hosts[hash(key) % len(hosts)]])
+    )
+    return store
+
+
+def _documents(count=DOCUMENT_COUNT):
+    return [
+        {
+            "chunk_id": f"chunk-{i:05d}",
+            "content": f"Spell description {i}",
+            "stage": "vectorized",
+            "metadata": {"source_hash": "bench", "source_file": "bench.pdf"},
+            "embedding": [float((i + j) % 7) / 7.0 for j in range(EMBEDDING_DIM)],
+        }
+        for i in range(count)
+    ]
+
+
+def test_concurrent_writes_outperform_sequential_round_trips():
+    documents = _documents()
+
+    sequential = _make_store(FakeSession(), concurrency=1)
+    started = time.perf_counter()
+    assert sequential.upsert_documents(documents) == len(documents)
+    sequential_seconds = time.perf_counter() - started
+
+    concurrent = _make_store(FakeSession(), concurrency=64)
+    started = time.perf_counter()
+    assert concurrent.upsert_documents(documents) == len(documents)
+    concurrent_seconds = time.perf_counter() - started
+
+    stats = concurrent.last_write_stats
+    print(
+        f"\nsequential: {len(documents) / sequential_seconds:.0f} rows/s, "
+        f"concurrent(64): {stats['rows_per_second']:.0f} rows/s"
+    )
+    assert stats["written"] == len(documents)
+    assert stats["errors"] == 0
+    assert concurrent_seconds * 5 < sequential_seconds
+
+
+def test_write_errors_are_counted_not_raised():
+    documents = _documents(50)
+    store = _make_store(FakeSession(fail_chunk_ids={"chunk-00003", "chunk-00010"}))
+
+    written = store.upsert_documents(documents)
+
+    assert written == 48
+    assert store.last_write_stats["errors"] == 2
+    assert store.last_write_stats["rows"] == 50
+
+
+def test_unlogged_batches_group_rows_by_replica_set():
+    documents = _documents(100)
+    session = FakeSession()
+    store = _make_store(session, unlogged_batches=True, replicas=["10.0.0.1", "10.0.0.2"])
+
+    written = store.upsert_documents(documents)
+
+    assert written == 100
+    # 100 rows across two replica groups at batch_size=20 -> at most 6 statements
+    assert session.statements <= 6
+    assert store.last_write_stats["statements"] == session.statements
+
+
+def test_bulk_embedding_encoding_matches_per_value_encoding():
+    embeddings = [[0.1, 0.2, 0.3], None, (1.0, 2.0, 3.0), [0.5, 0.25]]
+
+    blobs = CassandraVectorStore._encode_embeddings(embeddings)
+
+    assert blobs[1] is None
+    for value, blob in zip(embeddings, blobs):
+        if value is None:
+            continue
+        assert blob == CassandraVectorStore._vector_to_blob(value)
+        assert CassandraVectorStore._blob_to_vector(blob) == pytest.approx(list(value))
+
+
+@pytest.mark.integration
+@pytest.mark.cassandra
+def test_live_cassandra_write_throughput(monkeypatch):
+    if not os.getenv("RUN_CASSANDRA_TESTS"):
+        pytest.skip("RUN_CASSANDRA_TESTS not set")
+    monkeypatch.setenv("CASSANDRA_TABLE", "chunks_write_benchmark")
+    store = CassandraVectorStore("test")
+    try:
+        documents = _documents(2000)
+        written = store.upsert_documents(documents)
+        stats = store.last_write_stats
+        print(f"\nlive cassandra: {stats['rows_per_second']:.0f} rows/s, {stats['errors']} errors")
+        assert written == len(documents)
+    finally:
+        store.delete_all()
+        store.close()
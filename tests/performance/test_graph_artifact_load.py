@@ -0,0 +1,94 @@
+# tests/performance/test_graph_artifact_load.py
+"""
+Load-time and memory comparison: graph_snapshot.json vs the columnar artifact.
+
+Builds one large Pass E-shaped book, writes both formats, then measures what
+GraphLoader pays to open each (content is left on disk for the columnar path).
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import asdict
+
+from src_common.graph_artifact import GRAPH_ARTIFACT_FILENAME, write_graph_artifact
+from src_common.orchestrator.graph_loader import CrossReference, GraphEdge, GraphLoader, GraphNode
+
+SECTIONS = 400
+CHUNKS_PER_SECTION = 20
+CROSS_REFS = 2000
+
+
+def _write_book(job_dir):
+    nodes, edges = [], []
+    for s in range(SECTIONS):
+        section_id = f"section_{s}"
+        chunk_ids = [f"chunk_{s}_{c}" for c in range(CHUNKS_PER_SECTION)]
+        nodes.append(GraphNode(section_id, "section", f"Chapter {s}", children=chunk_ids))
+        for chunk_id in chunk_ids:
+            nodes.append(GraphNode(chunk_id, "chunk", f"Rules text {chunk_id}",
+                                   content="The caster gains advantage on saving throws. " * 12,
+                                   parent_id=section_id, metadata={"page": s, "section": section_id}))
+            edges.append(GraphEdge(f"contains_{chunk_id}", section_id, chunk_id, "contains", 1.0))
+    refs = [CrossReference(f"ref_{r}", f"spell {r}", f"class {r % 12}", "spell_to_class", 0.8,
+                           "appears on the class spell list") for r in range(CROSS_REFS)]
+    aliases = {ref.source_element: {ref.target_element} for ref in refs[:200]}
+
+    (job_dir / "graph_snapshot.json").write_text(json.dumps({
+        "job_id": "job_bench", "created_at": 1000.0,
+        "nodes": {node.node_id: asdict(node) for node in nodes},
+        "edges": [asdict(edge) for edge in edges],
+        "cross_references": [asdict(ref) for ref in refs],
+    }, indent=2))
+    (job_dir / "alias_map.json").write_text(json.dumps(
+        {"aliases": {term: sorted(values) for term, values in aliases.items()}}, indent=2))
+    write_graph_artifact(job_dir, "job_bench", 1000.0, nodes, edges, refs, aliases)
+
+
+def _measure(load):
+    gc.collect()
+    started = time.perf_counter()
+    snapshot = load()
+    seconds = time.perf_counter() - started
+    del snapshot
+
+    # Memory is measured on a second, traced load (tracing inflates timings)
+    gc.collect()
+    tracemalloc.start()
+    snapshot = load()
+    current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return snapshot, seconds, current_bytes, peak_bytes
+
+
+def test_columnar_artifact_loads_faster_and_smaller_than_json(tmp_path):
+    json_dir = tmp_path / "json_only"
+    bin_dir = tmp_path / "columnar"
+    for job_dir in (json_dir, bin_dir):
+        job_dir.mkdir()
+        _write_book(job_dir)
+    (json_dir / GRAPH_ARTIFACT_FILENAME).unlink()
+
+    loader = GraphLoader("bench", merge_sources=False)
+    json_snapshot, json_seconds, json_current, json_peak = _measure(
+        lambda: loader._load_snapshot_from_directory(json_dir))
+    bin_snapshot, bin_seconds, bin_current, bin_peak = _measure(
+        lambda: loader._load_snapshot_from_directory(bin_dir))
+
+    json_bytes = (json_dir / "graph_snapshot.json").stat().st_size
+    bin_bytes = sum((bin_dir / name).stat().st_size for name in (GRAPH_ARTIFACT_FILENAME, "graph_content.bin"))
+
+    print(
+        f"\ngraph load @ {len(json_snapshot.nodes)} nodes, {len(json_snapshot.edges)} edges\n"
+        f"  json:     {json_seconds * 1000:.0f}ms, resident {json_current / 1e6:.1f}MB, "
+        f"peak {json_peak / 1e6:.1f}MB, {json_bytes / 1e6:.1f}MB on disk\n"
+        f"  columnar: {bin_seconds * 1000:.0f}ms, resident {bin_current / 1e6:.1f}MB, "
+        f"peak {bin_peak / 1e6:.1f}MB, {bin_bytes / 1e6:.1f}MB on disk"
+    )
+
+    assert len(bin_snapshot.nodes) == len(json_snapshot.nodes)
+    assert len(bin_snapshot.edges) == len(json_snapshot.edges)
+    assert bin_snapshot.get_node("chunk_3_4").content == json_snapshot.get_node("chunk_3_4").content
+    assert bin_current < json_current
+    assert bin_bytes < json_bytes
@@ -0,0 +1,137 @@
+# tests/performance/test_graph_snapshot_index.py
+"""
+Lookup benchmark for the indexed GraphSnapshot.
+
+Compares adjacency/alias/cross-reference lookups against the previous
+full-scan implementations. Real Pass E snapshots under
+artifacts/ingest/<GRAPH_BENCH_ENV> (default: dev) are used when present;
+otherwise a synthetic snapshot with Pass E's shape is generated.
+"""
+
+import os
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from src_common.orchestrator.graph_loader import (
+    CrossReference, GraphEdge, GraphLoader, GraphNode, GraphSnapshot
+)
+
+SYNTHETIC_SECTIONS = 400
+CHUNKS_PER_SECTION = 10
+SYNTHETIC_CROSS_REFS = 6000
+
+
+def _scan_related_nodes(graph, node_id, max_depth=2):
+    """Pre-index BFS: list queue and a full edge scan per dequeued node."""
+    visited, queue, related = set(), [(node_id, 0)], []
+    while queue and len(related) < 50:
+        current_id, depth = queue.pop(0)
+        if current_id in visited or depth > max_depth:
+            continue
+        visited.add(current_id)
+        node = graph.nodes.get(current_id)
+        if node and depth > 0:
+            related.append(node)
+        for edge in graph.edges:
+            if edge.source_id == current_id and edge.target_id not in visited:
+                queue.append((edge.target_id, depth + 1))
+            elif edge.target_id == current_id and edge.source_id not in visited:
+                queue.append((edge.source_id, depth + 1))
+    return related
+
+
+def _scan_cross_references(graph, element):
+    return [ref for ref in graph.cross_references
+            if element.lower() in ref.source_element.lower() or
+            element.lower() in ref.target_element.lower()]
+
+
+def _scan_aliases(graph, term):
+    term_lower = term.lower()
+    aliases = {term}
+    if term_lower in graph.aliases:
+        aliases.update(graph.aliases[term_lower])
+    for key, alias_set in graph.aliases.items():
+        if term_lower in {alias.lower() for alias in alias_set}:
+            aliases.add(key)
+            aliases.update(alias_set)
+    return aliases
+
+
+def _synthetic_snapshot(seed=7):
+    rng = random.Random(seed)
+    nodes, edges = {}, []
+    for s in range(SYNTHETIC_SECTIONS):
+        section_id = f"section_{s}"
+        children = [f"chunk_{s}_{c}" for c in range(CHUNKS_PER_SECTION)]
+        nodes[section_id] = GraphNode(section_id, "section", f"Chapter {s} Rules", children=children)
+        for c, chunk_id in enumerate(children):
+            nodes[chunk_id] = GraphNode(chunk_id, "chunk", f"Chunk {c} of section {s}", parent_id=section_id)
+            edges.append(GraphEdge(f"e_{chunk_id}", section_id, chunk_id, "contains"))
+        if s:
+            edges.append(GraphEdge(f"seq_{s}", f"section_{s - 1}", section_id, "follows"))
+
+    vocabulary = [f"{prefix} {suffix}" for prefix in ("arcane", "divine", "martial", "shadow", "storm")
+                  for suffix in ("bolt", "ward", "strike", "step", "blessing", "curse", "sight", "form")]
+    elements = [f"{rng.choice(vocabulary)} {i}" for i in range(SYNTHETIC_CROSS_REFS // 3)]
+    cross_refs = [
+        CrossReference(f"ref_{i}", rng.choice(elements), rng.choice(elements), "relates_to", 0.8, "")
+        for i in range(SYNTHETIC_CROSS_REFS)
+    ]
+    aliases = {}
+    for ref in cross_refs[: SYNTHETIC_CROSS_REFS // 2]:
+        aliases.setdefault(ref.source_element, set()).add(ref.target_element)
+        aliases.setdefault(ref.target_element, set()).add(ref.source_element)
+    return GraphSnapshot("synthetic", 0.0, nodes, edges, cross_refs, aliases)
+
+
+def _benchmark_snapshots():
+    base = Path("artifacts/ingest") / os.getenv("GRAPH_BENCH_ENV", "dev")
+    loader = GraphLoader(base.name)
+    snapshots = []
+    if base.exists():
+        for job_dir in sorted(base.iterdir()):
+            if (job_dir / "graph_snapshot.json").exists():
+                snapshot = loader._load_snapshot_from_directory(job_dir)
+                if snapshot and snapshot.nodes:
+                    snapshots.append(snapshot)
+    return snapshots or [_synthetic_snapshot()]
+
+
+def _timed(fn, args):
+    started = time.perf_counter()
+    results = [fn(*a) for a in args]
+    return results, time.perf_counter() - started
+
+
+@pytest.mark.parametrize("graph", _benchmark_snapshots(), ids=lambda g: g.job_id)
+def test_indexed_lookups_match_and_beat_full_scans(graph):
+    rng = random.Random(11)
+    node_ids = rng.sample(sorted(graph.nodes), min(40, len(graph.nodes)))
+    elements = sorted({ref.source_element for ref in graph.cross_references}) or ["wizard"]
+    terms = rng.sample(elements, min(40, len(elements))) + ["arc", "zz", "no such element"]
+    alias_terms = [alias for key in sorted(graph.aliases)[:40] for alias in sorted(graph.aliases[key])[:1]]
+
+    cases = [
+        ("related", _scan_related_nodes, graph.get_related_nodes, [(n,) for n in node_ids],
+         lambda nodes: [node.node_id for node in nodes]),
+        ("cross_refs", _scan_cross_references, graph.find_cross_references, [(t,) for t in terms],
+         lambda refs: [ref.ref_id for ref in refs]),
+        ("aliases", _scan_aliases, graph.expand_aliases, [(t,) for t in alias_terms], lambda s: s),
+    ]
+
+    print(f"\n{graph.job_id}: {len(graph.nodes)} nodes, {len(graph.edges)} edges, "
+          f"{len(graph.cross_references)} cross-refs, {len(graph.aliases)} alias keys")
+    for name, scan, indexed, args, key in cases:
+        if not args:
+            continue
+        expected, scan_seconds = _timed(lambda *a: scan(graph, *a), args)
+        actual, indexed_seconds = _timed(indexed, args)
+        assert [key(r) for r in actual] == [key(r) for r in expected], name
+        print(f"  {name}: scan {scan_seconds * 1000:.1f}ms, indexed {indexed_seconds * 1000:.1f}ms "
+              f"over {len(args)} lookups")
+        if graph.job_id == "synthetic":
+            assert indexed_seconds * 5 < scan_seconds, name
@@ -0,0 +1,119 @@
+# tests/performance/test_memory_store_concurrency.py
+"""
+Query throughput of the memory vector store under concurrent upserts.
+
+Reader threads run filtered lexical queries while a writer keeps upserting
+batches into the same environment. The snapshot store is compared with the
+previous model, reproduced here by wrapping every call in one process-wide
+lock. CPython threads share the GIL, so the gain shows up as readers no
+longer stalling behind a writer's batch, not as CPU parallelism.
+
+Throughput depends on the machine, so it is only logged; the assertions
+cover what readers observe while the writer runs.
+"""
+
+import logging
+import threading
+import time
+
+from src_common.vector_store import memory
+from src_common.vector_store.memory import MemoryVectorStore
+
+logger = logging.getLogger(__name__)
+
+CORPUS = 6000
+WRITE_BATCH = 3000
+RUN_SECONDS = 0.5
+READER_COUNTS = (1, 4)
+SOURCES = 20
+
+
+class GlobalLockStore:
+    """The pre-partition behaviour: every operation behind one lock."""
+
+    def __init__(self, store):
+        self._store = store
+        self._lock = threading.RLock()
+
+    def query(self, *args, **kwargs):
+        with self._lock:
+            return self._store.query(*args, **kwargs)
+
+    def upsert_documents(self, documents):
+        with self._lock:
+            return self._store.upsert_documents(documents)
+
+
+def _documents(prefix, count):
+    return [
+        {"chunk_id": f"{prefix}-{i}", "content": f"fireball spell damage rule {i % 97}",
+         "metadata": {"source_hash": f"book-{i % SOURCES}", "lane": "AB"[i % 2]}}
+        for i in range(count)
+    ]
+
+
+def _check_snapshot(store):
+    """A published snapshot is internally consistent and holds whole batches only."""
+    snapshot = store._partition().snapshot
+    assert memory._popcount(snapshot.live) == snapshot.size
+    assert snapshot.size in (CORPUS, CORPUS + WRITE_BATCH, CORPUS + 2 * WRITE_BATCH)
+    per_source = [memory._popcount(snapshot.matching("source_hash", (f"book-{i}",)) & snapshot.live)
+                  for i in range(SOURCES)]
+    assert sum(per_source) == snapshot.size
+
+
+def _run(store, wrapped, readers):
+    stop = threading.Event()
+    counts = [0] * readers
+    worst = [0.0] * readers
+    writes = [0]
+    errors = []
+
+    def read(index):
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                results = wrapped.query(None, top_k=10,
+                                        filters={"query_text": "fireball damage", "source_hash": "book-3"})
+                worst[index] = max(worst[index], time.perf_counter() - started)
+                assert len(results) == 10
+                assert all(r["metadata"]["source_hash"] == "book-3" for r in results)
+                _check_snapshot(store)
+                counts[index] += 1
+        except AssertionError as e:
+            errors.append(e)
+
+    def write():
+        round_no = 0
+        while not stop.is_set():
+            wrapped.upsert_documents(_documents(f"w{round_no % 2}", WRITE_BATCH))
+            writes[0] += 1
+            round_no += 1
+
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=write))
+    for thread in threads:
+        thread.start()
+    time.sleep(RUN_SECONDS)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(counts), max(worst), writes[0], errors
+
+
+def test_queries_see_consistent_snapshots_during_concurrent_upserts():
+    for name, wrap in (("global_lock", GlobalLockStore), ("snapshot", lambda store: store)):
+        for readers in READER_COUNTS:
+            store = MemoryVectorStore(f"bench_concurrency_{name}_{readers}")
+            store.delete_all()
+            store.upsert_documents(_documents("base", CORPUS))
+            queries, worst, writes, errors = _run(store, wrap(store), readers)
+
+            assert errors == []
+            assert queries > 0 and writes > 0
+            # Both writer prefixes were upserted at least once, and replaced in place after that
+            assert store.count_documents() == CORPUS + WRITE_BATCH * min(writes, 2)
+            store.delete_all()
+
+            logger.info(f"{name} readers={readers}: {queries / RUN_SECONDS:.0f} queries/s, "
+                        f"worst query {worst * 1000:.1f} ms, {writes} write batches")
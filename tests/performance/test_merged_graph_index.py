@@ -0,0 +1,97 @@
+# tests/performance/test_merged_graph_index.py
+"""
+Load-time and memory report for the merged graph index at 50 ingested books.
+
+Generates Pass E-shaped job directories, builds the merged index once, then
+measures what a query worker pays to open it: reading the persisted index and
+materialising the merged GraphSnapshot.
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+
+from src_common.orchestrator.graph_index import MergedGraphIndex, merged_index_path
+
+BOOKS = 50
+SECTIONS_PER_BOOK = 40
+CHUNKS_PER_SECTION = 8
+CROSS_REFS_PER_BOOK = 150
+
+
+def _write_book(base, book):
+    job_dir = base / f"job_{book:03d}"
+    job_dir.mkdir(parents=True)
+    nodes, edges = {}, []
+    for s in range(SECTIONS_PER_BOOK):
+        section_id = f"book{book}_section_{s}"
+        chunk_ids = [f"book{book}_chunk_{s}_{c}" for c in range(CHUNKS_PER_SECTION)]
+        nodes[section_id] = {"node_type": "section", "title": f"Chapter {s}", "children": chunk_ids}
+        for chunk_id in chunk_ids:
+            nodes[chunk_id] = {"node_type": "chunk", "title": f"Rules text {chunk_id}",
+                               "content": "The caster gains advantage on saving throws. " * 8,
+                               "parent_id": section_id, "metadata": {"page": s}}
+            edges.append({"edge_id": f"contains_{chunk_id}", "source_id": section_id,
+                          "target_id": chunk_id, "edge_type": "contains", "weight": 1.0})
+    refs = [{"ref_id": f"book{book}_ref_{r}", "source_element": f"spell {book}-{r}",
+             "target_element": f"class {r % 12}", "ref_type": "spell_to_class",
+             "confidence": 0.8, "context": "appears on the class spell list"}
+            for r in range(CROSS_REFS_PER_BOOK)]
+    (job_dir / "graph_snapshot.json").write_text(json.dumps(
+        {"job_id": job_dir.name, "created_at": 1000.0 + book, "nodes": nodes, "edges": edges,
+         "cross_references": refs}, indent=2))
+    (job_dir / "alias_map.json").write_text(json.dumps(
+        {"aliases": {ref["source_element"]: [ref["target_element"]] for ref in refs[:20]}}, indent=2))
+    (job_dir / "manifest.json").write_text(json.dumps({"completed_passes": ["A", "B", "C", "D", "E", "F"]}))
+
+
+def test_merged_index_load_time_and_memory_at_50_books(tmp_path):
+    base = tmp_path / "artifacts" / "ingest" / "bench"
+    for book in range(BOOKS):
+        _write_book(base, book)
+
+    started = time.perf_counter()
+    builder = MergedGraphIndex("bench", base, read_only=False)
+    builder.refresh()
+    build_seconds = time.perf_counter() - started
+
+    # Incremental refresh with nothing changed only stats the job directories
+    started = time.perf_counter()
+    assert builder.refresh() is False
+    noop_refresh_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    worker = MergedGraphIndex("bench", base, read_only=True)
+    worker.refresh()
+    snapshot = worker.get_snapshot()
+    load_seconds = time.perf_counter() - started
+
+    # Memory is measured on a second, traced load (tracing inflates timings)
+    gc.collect()
+    tracemalloc.start()
+    traced = MergedGraphIndex("bench", base, read_only=True)
+    traced.refresh()
+    traced.get_snapshot()
+    current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    index_bytes = merged_index_path(base).stat().st_size
+    source_bytes = sum(path.stat().st_size for path in base.glob("job_*/*.json"))
+    expected_nodes = BOOKS * SECTIONS_PER_BOOK * (CHUNKS_PER_SECTION + 1)
+
+    print(
+        f"\nmerged graph @ {BOOKS} books: {len(snapshot.nodes)} nodes, {len(snapshot.edges)} edges, "
+        f"{len(snapshot.cross_references)} cross-refs\n"
+        f"  build from job dirs: {build_seconds * 1000:.0f}ms, no-op refresh: {noop_refresh_ms:.1f}ms\n"
+        f"  worker load (read index + merge): {load_seconds * 1000:.0f}ms "
+        f"(index read {worker.stats['last_load_ms']:.0f}ms)\n"
+        f"  index size: {index_bytes / 1e6:.1f}MB vs {source_bytes / 1e6:.1f}MB of source JSON\n"
+        f"  resident after load: {current_bytes / 1e6:.1f}MB, peak during load: {peak_bytes / 1e6:.1f}MB"
+    )
+
+    assert len(snapshot.nodes) == expected_nodes
+    assert len(snapshot.cross_references) == BOOKS * CROSS_REFS_PER_BOOK
+    assert len(worker.get_sources()) == BOOKS
+    assert index_bytes < source_bytes
+    assert noop_refresh_ms < 500
@@ -0,0 +1,66 @@
+# tests/performance/test_schema_validation_throughput.py
+"""
+Directory validation throughput over 5,000 feature request files.
+
+Compares a cold inline run, a cold run over the process pool and a warm run
+where every file is unchanged and served from the content-hash result cache.
+The pool only pays off with more than one CPU, so its speedup is reported
+rather than asserted.
+"""
+
+import json
+import os
+import pathlib
+import shutil
+import time
+
+from src_common.schema_validator import SchemaValidator
+
+FILES = 5000
+REPO_SCHEMAS = pathlib.Path(__file__).resolve().parents[2] / "schemas"
+
+
+def _write_features(directory):
+    directory.mkdir()
+    for i in range(FILES):
+        (directory / f"FR-{100000 + i}.json").write_text(json.dumps({
+            "request_id": f"FR-{100000 + i}",
+            "title": f"Feature request {i}",
+            "description": "Let game masters pin rules excerpts to the session sidebar. " * 4,
+            "priority": ("low", "medium", "high", "critical")[i % 4],
+            "requester": f"user_{i % 50}",
+            "status": "pending" if i % 7 else "bogus",
+            "created_at": "2024-01-01T00:00:00Z",
+            "category": "ui",
+        }), encoding="utf-8")
+
+
+def _timed(validator, directory, max_workers):
+    started = time.perf_counter()
+    results = validator.validate_features_directory(directory, max_workers=max_workers)
+    return time.perf_counter() - started, results
+
+
+def test_feature_directory_validation_throughput(tmp_path):
+    schemas_dir = tmp_path / "schemas"
+    shutil.copytree(REPO_SCHEMAS, schemas_dir)
+    features = tmp_path / "features"
+    _write_features(features)
+
+    inline_s, inline = _timed(SchemaValidator(schemas_dir), features, max_workers=1)
+    pooled_validator = SchemaValidator(schemas_dir)
+    pooled_s, pooled = _timed(pooled_validator, features, max_workers=None)
+    warm_s, warm = _timed(pooled_validator, features, max_workers=None)
+
+    print()
+    print(f"{FILES} files on {os.cpu_count()} CPUs: inline {inline_s:.2f}s, "
+          f"process pool {pooled_s:.2f}s ({inline_s / pooled_s:.1f}x), "
+          f"cached {warm_s:.2f}s ({inline_s / warm_s:.1f}x)")
+
+    invalid = sum(1 for _, result in inline if not result.is_valid)
+    assert invalid == len(range(0, FILES, 7))
+    assert sum(1 for _, result in pooled if not result.is_valid) == invalid
+    assert sum(1 for _, result in warm if not result.is_valid) == invalid
+    assert pooled_validator.cache_hits == FILES
+    # Unchanged files only cost a read and a hash
+    assert warm_s < inline_s / 2
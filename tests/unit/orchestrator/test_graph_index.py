@@ -0,0 +1,268 @@
+"""
+Unit tests for the merged multi-source graph index.
+"""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from src_common.graph_artifact import write_graph_artifact
+from src_common.orchestrator.graph_index import (
+    INDEX_DIRNAME, MergedGraphIndex, merged_index_path, remove_from_merged_graph_index,
+    update_merged_graph_index
+)
+from src_common.orchestrator import graph_loader as graph_loader_module
+from src_common.orchestrator.graph_loader import (
+    CrossReference, GraphEdge, GraphLoader, GraphNode, GraphSnapshotRegistry
+)
+
+
+def write_job(base: Path, name: str, element: str, finalized: bool = True,
+              node_ids=("section_1", "chunk_1")) -> Path:
+    """Write a minimal Pass E job directory."""
+    job_dir = base / name
+    job_dir.mkdir(parents=True, exist_ok=True)
+    section_id, chunk_id = node_ids
+    graph = {
+        "job_id": name,
+        "created_at": 1000.0,
+        "nodes": {
+            section_id: {"node_type": "section", "title": f"{element} chapter", "children": [chunk_id]},
+            chunk_id: {"node_type": "chunk", "title": f"{element} rules", "content": f"All about {element}",
+                       "parent_id": section_id},
+        },
+        "edges": [{"edge_id": f"e_{name}", "source_id": section_id, "target_id": chunk_id,
+                   "edge_type": "contains"}],
+        "cross_references": [{"ref_id": f"r_{name}", "source_element": element,
+                              "target_element": f"{element} feat", "ref_type": "related",
+                              "confidence": 0.9, "context": ""}],
+    }
+    (job_dir / "graph_snapshot.json").write_text(json.dumps(graph))
+    (job_dir / "alias_map.json").write_text(json.dumps({"aliases": {element: [f"{element}s"]}}))
+    completed = ["A", "B", "C", "D", "E"] + (["F"] if finalized else [])
+    (job_dir / "manifest.json").write_text(json.dumps({"job_id": name, "completed_passes": completed}))
+    return job_dir
+
+
+def bump_mtime(path: Path, seconds: float = 5.0) -> None:
+    stat = path.stat()
+    os.utime(path, (stat.st_atime + seconds, stat.st_mtime + seconds))
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    base = tmp_path / "artifacts" / "ingest" / "test"
+    base.mkdir(parents=True)
+    return base
+
+
+class TestMergedGraphIndex:
+    """Test merging, incremental updates and persistence."""
+
+    def test_merges_all_finalized_jobs(self, artifacts):
+        write_job(artifacts, "job_wizard", "wizard", node_ids=("s_w", "c_w"))
+        write_job(artifacts, "job_cleric", "cleric", node_ids=("s_c", "c_c"))
+        write_job(artifacts, "job_running", "rogue", finalized=False, node_ids=("s_r", "c_r"))
+
+        index = MergedGraphIndex("test", artifacts)
+        assert index.refresh() is True
+        snapshot = index.get_snapshot()
+
+        assert snapshot.job_id == "merged:test"
+        assert set(snapshot.nodes) == {"job_wizard::s_w", "job_wizard::c_w", "job_cleric::s_c", "job_cleric::c_c"}
+        assert len(snapshot.edges) == 2
+        assert [ref.ref_id for ref in snapshot.find_cross_references("cleric")] == ["r_job_cleric"]
+        assert "wizards" in snapshot.expand_aliases("wizard")
+        assert snapshot.nodes["job_wizard::c_w"].metadata["job_id"] == "job_wizard"
+        assert snapshot.nodes["job_wizard::c_w"].content == "All about wizard"
+        assert merged_index_path(artifacts).exists()
+
+    def test_colliding_node_ids_are_namespaced(self, artifacts):
+        write_job(artifacts, "job_a", "wizard")
+        write_job(artifacts, "job_b", "cleric")
+
+        index = MergedGraphIndex("test", artifacts)
+        index.refresh()
+        snapshot = index.get_snapshot()
+
+        assert len(snapshot.nodes) == 4
+        assert snapshot.nodes["job_b::section_1"].children == ["job_b::chunk_1"]
+        assert snapshot.get_neighbors("job_b::section_1") == ["job_b::chunk_1"]
+        assert snapshot.get_neighbors("job_a::section_1") == ["job_a::chunk_1"]
+
+    def test_node_ids_do_not_depend_on_other_books(self, artifacts):
+        write_job(artifacts, "job_b", "cleric")
+        index = MergedGraphIndex("test", artifacts)
+        index.refresh()
+        before = set(index.get_snapshot().nodes)
+
+        # A book that sorts earlier and reuses the same node IDs
+        write_job(artifacts, "job_a", "wizard")
+        index.refresh()
+
+        assert before <= set(index.get_snapshot().nodes)
+
+    def test_persisted_index_holds_structure_and_content_loads_lazily(self, artifacts):
+        write_job(artifacts, "job_a", "wizard", node_ids=("s_a", "c_a"))
+        MergedGraphIndex("test", artifacts).refresh()
+
+        persisted = merged_index_path(artifacts).read_text()
+        assert "All about wizard" not in persisted
+
+        reader = MergedGraphIndex("test", artifacts, read_only=True)
+        reader.refresh()
+        node = reader.get_snapshot().nodes["job_a::c_a"]
+        source = reader._content_source("job_a")
+        assert not source.loaded
+        assert node.content == "All about wizard"
+        assert source.loaded
+
+    def test_columnar_artifact_segments_load_content_from_content_store(self, artifacts):
+        job_dir = write_job(artifacts, "job_a", "wizard", node_ids=("s_a", "c_a"))
+        write_graph_artifact(
+            job_dir, "job_a", 1000.0,
+            [GraphNode("s_a", "section", "wizard chapter", children=["c_a"]),
+             GraphNode("c_a", "chunk", "wizard rules", content="From the content store",
+                       parent_id="s_a", metadata={"page": 3})],
+            [GraphEdge("e_job_a", "s_a", "c_a", "contains", 0.7)],
+            [CrossReference("r_job_a", "wizard", "wizard feat", "related", 0.9, "")],
+            {"wizard": {"wizards"}},
+        )
+        index = MergedGraphIndex("test", artifacts)
+        index.refresh()
+        snapshot = index.get_snapshot()
+
+        assert index._segments["job_a"]["columnar"] is True
+        assert snapshot.nodes["job_a::s_a"].children == ["job_a::c_a"]
+        assert snapshot.edges[0].weight == 0.7
+        assert "wizards" in snapshot.expand_aliases("wizard")
+
+        node = snapshot.nodes["job_a::c_a"]
+        assert not index._content_source("job_a").loaded
+        assert node.content == "From the content store"
+        assert node.metadata == {"page": 3, "job_id": "job_a"}
+        assert index._content_source("job_a").loaded
+
+    def test_refresh_only_parses_changed_jobs(self, artifacts):
+        write_job(artifacts, "job_a", "wizard", node_ids=("s_a", "c_a"))
+        write_job(artifacts, "job_b", "cleric", node_ids=("s_b", "c_b"))
+        index = MergedGraphIndex("test", artifacts)
+        index.refresh()
+        assert index.stats["segments_parsed"] == 2
+
+        assert index.refresh() is False
+        assert index.stats["segments_parsed"] == 2
+
+        bump_mtime(write_job(artifacts, "job_a", "paladin", node_ids=("s_a", "c_a")) / "graph_snapshot.json")
+        assert index.refresh() is True
+        assert index.stats["segments_parsed"] == 3
+        assert index.get_snapshot().find_cross_references("paladin")
+
+    def test_deleted_job_directory_is_dropped(self, artifacts):
+        write_job(artifacts, "job_a", "wizard", node_ids=("s_a", "c_a"))
+        job_b = write_job(artifacts, "job_b", "cleric", node_ids=("s_b", "c_b"))
+        index = MergedGraphIndex("test", artifacts)
+        index.refresh()
+
+        for child in job_b.iterdir():
+            child.unlink()
+        job_b.rmdir()
+
+        assert index.refresh() is True
+        assert [source["job_dir"] for source in index.get_sources()] == ["job_a"]
+
+    def test_hooks_update_persisted_index_for_other_processes(self, artifacts):
+        write_job(artifacts, "job_a", "wizard", node_ids=("s_a", "c_a"))
+        assert update_merged_graph_index("test", artifacts / "job_a") is True
+
+        # A read-only worker sees what the writer persisted
+        reader = MergedGraphIndex("test", artifacts, read_only=True)
+        reader.refresh()
+        assert [source["job_dir"] for source in reader.get_sources()] == ["job_a"]
+
+        job_b = write_job(artifacts, "job_b", "cleric", node_ids=("s_b", "c_b"))
+        assert update_merged_graph_index("test", job_b) is True
+        bump_mtime(merged_index_path(artifacts))
+        assert reader.refresh() is True
+        assert len(reader.get_sources()) == 2
+
+        assert remove_from_merged_graph_index("test", job_b) is True
+        bump_mtime(merged_index_path(artifacts), seconds=10.0)
+        reader.refresh()
+        assert [source["job_dir"] for source in reader.get_sources()] == ["job_a"]
+        assert not (artifacts / "job_b" / INDEX_DIRNAME).exists()
+
+    def test_read_only_index_never_writes(self, artifacts):
+        write_job(artifacts, "job_a", "wizard")
+        index = MergedGraphIndex("test", artifacts, read_only=True)
+
+        assert index.refresh() is False
+        assert index.get_snapshot() is None
+        assert not merged_index_path(artifacts).exists()
+
+    def test_index_lives_outside_the_job_root(self, artifacts):
+        write_job(artifacts, "job_a", "wizard")
+        (artifacts / INDEX_DIRNAME).mkdir()
+        (artifacts / INDEX_DIRNAME / "merged_graph.json").write_text("{}")  # pre-move location
+
+        MergedGraphIndex("test", artifacts).refresh()
+
+        assert merged_index_path(artifacts).exists()
+        assert sorted(p.name for p in artifacts.iterdir()) == ["job_a"]
+
+    def test_dictionary_artifact_scan_sees_only_jobs(self, artifacts, monkeypatch):
+        pytest.importorskip("psutil")
+        from src_common.admin.dictionary import AdminDictionaryService
+
+        monkeypatch.chdir(artifacts.parents[2])
+        write_job(artifacts, "job_a", "wizard")
+        MergedGraphIndex("test", artifacts).refresh()
+
+        service = AdminDictionaryService(graph_store=object(), use_mongodb=False)
+        assert {record["job_id"] for record in service._iter_artifact_files("test")} == {"job_a"}
+
+class TestGraphLoaderMergedView:
+    """Test GraphLoader serving the merged view."""
+
+    @pytest.fixture(autouse=True)
+    def registry(self, monkeypatch):
+        registry = GraphSnapshotRegistry(refresh_interval_s=0)
+        monkeypatch.setattr(graph_loader_module, "_snapshot_registry", registry)
+        return registry
+
+    def test_latest_load_returns_merged_snapshot(self, artifacts, monkeypatch):
+        monkeypatch.chdir(artifacts.parents[2])
+        write_job(artifacts, "job_a", "wizard", node_ids=("s_a", "c_a"))
+        write_job(artifacts, "job_b", "cleric", node_ids=("s_b", "c_b"))
+
+        loader = GraphLoader("test")
+        snapshot = loader.load_graph_snapshot()
+
+        assert snapshot is not None
+        assert len(snapshot.nodes) == 4
+        assert loader.load_graph_snapshot() is snapshot
+
+    def test_index_rewrite_invalidates_cached_merged_snapshot(self, artifacts, monkeypatch):
+        monkeypatch.chdir(artifacts.parents[2])
+        write_job(artifacts, "job_a", "wizard", node_ids=("s_a", "c_a"))
+        loader = GraphLoader("test")
+        first = loader.load_graph_snapshot()
+
+        job_b = write_job(artifacts, "job_b", "cleric", node_ids=("s_b", "c_b"))
+        update_merged_graph_index("test", Path("artifacts/ingest/test") / job_b.name)
+        bump_mtime(merged_index_path(artifacts))
+
+        second = loader.load_graph_snapshot()
+        assert second is not first
+        assert len(second.nodes) == 4
+
+    def test_merge_sources_disabled_uses_latest_job(self, artifacts, monkeypatch):
+        monkeypatch.chdir(artifacts.parents[2])
+        write_job(artifacts, "job_a", "wizard", node_ids=("s_a", "c_a"))
+        bump_mtime(write_job(artifacts, "job_b", "cleric", node_ids=("s_b", "c_b")) / "graph_snapshot.json")
+
+        snapshot = GraphLoader("test", merge_sources=False).load_graph_snapshot()
+
+        assert snapshot.job_id == "job_b"
+        assert not merged_index_path(artifacts).exists()
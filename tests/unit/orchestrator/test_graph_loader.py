@@ -131,6 +131,44 @@ class TestGraphSnapshot:
         assert "wizard" in mage_aliases
         assert "mage" in mage_aliases
 
+    def test_get_neighbors_is_undirected(self, sample_snapshot):
+        """Adjacency lists include both edge directions."""
+        assert sample_snapshot.get_neighbors("node2") == ["node1", "node3"]
+        assert sample_snapshot.get_neighbors("missing") == []
+
+    def test_related_nodes_respect_max_depth(self, sample_snapshot):
+        """Traversal stops at max_depth hops."""
+        related = sample_snapshot.get_related_nodes("node1", max_depth=1)
+        assert [node.node_id for node in related] == ["node2"]
+
+    def test_find_cross_references_substring_and_short_terms(self, sample_snapshot):
+        """Element lookup keeps case-insensitive substring semantics."""
+        assert [ref.ref_id for ref in sample_snapshot.find_cross_references("IZAR")] == ["ref1"]
+        assert [ref.ref_id for ref in sample_snapshot.find_cross_references("sp")] == ["ref1"]
+        assert sample_snapshot.find_cross_references("paladin") == []
+
+    def test_find_cross_references_any_preserves_order(self):
+        """Matches for several elements come back once, in snapshot order."""
+        refs = [
+            CrossReference("r1", "fireball", "wizard", "spell_to_class", 0.9, ""),
+            CrossReference("r2", "cleric", "cure wounds", "class_to_spell", 0.8, ""),
+            CrossReference("r3", "wizard", "spellbook", "class_to_item", 0.7, ""),
+        ]
+        snapshot = GraphSnapshot("job", 0.0, {}, [], refs, {})
+
+        matches = snapshot.find_cross_references_any(["wizard", "fireball", "cleric"])
+
+        assert [ref.ref_id for ref in matches] == ["r1", "r2", "r3"]
+
+    def test_reindex_after_in_place_mutation(self, sample_snapshot):
+        """reindex() picks up edges and aliases added after construction."""
+        sample_snapshot.edges.append(GraphEdge("edge3", "node3", "node1", "relates_to"))
+        sample_snapshot.aliases["rogue"] = {"thief"}
+        sample_snapshot.reindex()
+
+        assert "node1" in sample_snapshot.get_neighbors("node3")
+        assert "rogue" in sample_snapshot.expand_aliases("thief")
+
 
 class TestGraphLoader:
     """Test GraphLoader functionality."""
@@ -0,0 +1,146 @@
+"""
+Unit tests for the process-wide graph snapshot registry shared by GraphLoader instances.
+"""
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from src_common.orchestrator import graph_loader as graph_loader_module
+from src_common.orchestrator.graph_index import MergedGraphIndex
+from src_common.orchestrator.graph_loader import GraphLoader, GraphSnapshotRegistry, notify_snapshot_written
+
+
+def write_snapshot(job_dir, title, mtime=None):
+    job_dir.mkdir(parents=True, exist_ok=True)
+    graph_file = job_dir / "graph_snapshot.json"
+    graph_file.write_text(json.dumps({
+        "job_id": job_dir.name,
+        "created_at": 1.0,
+        "nodes": {"node1": {"node_type": "section", "title": title, "children": []}},
+        "edges": [],
+        "cross_references": [],
+    }), encoding="utf-8")
+    if mtime is not None:
+        os.utime(graph_file, (mtime, mtime))
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    registry = GraphSnapshotRegistry(refresh_interval_s=0)
+    monkeypatch.setattr(graph_loader_module, "_snapshot_registry", registry)
+    return registry
+
+
+def test_loaders_share_one_parsed_snapshot(registry, tmp_path):
+    write_snapshot(tmp_path / "artifacts/ingest/test/job_1", "Combat")
+
+    first = GraphLoader("test", merge_sources=False).load_graph_snapshot()
+    second = GraphLoader("test", merge_sources=False).load_graph_snapshot("job_1")
+
+    assert first is second
+    metrics = registry.metrics()
+    assert metrics["loads"] == 1 and metrics["hits"] == 1
+    assert metrics["snapshots"][str((tmp_path / "artifacts/ingest/test/job_1").resolve())]["job_id"] == "job_1"
+    assert metrics["max_load_ms"] >= metrics["avg_load_ms"] > 0
+
+
+def test_rewritten_snapshot_is_reloaded_in_the_background(registry, tmp_path):
+    job_dir = tmp_path / "artifacts/ingest/test/job_1"
+    write_snapshot(job_dir, "Combat", mtime=time.time() - 60)
+    loader = GraphLoader("test", merge_sources=False)
+    old = loader.load_graph_snapshot()
+
+    write_snapshot(job_dir, "Combat, revised")
+    assert registry.refresh() == 1
+    assert registry.metrics()["background_reloads"] == 1
+
+    new = loader.load_graph_snapshot()
+    assert new is not old
+    assert new.nodes["node1"].title == "Combat, revised"
+    assert registry.metrics()["loads"] == 2
+
+
+def test_new_job_makes_latest_re_resolve(registry, tmp_path):
+    write_snapshot(tmp_path / "artifacts/ingest/test/job_1", "Old", mtime=time.time() - 60)
+    loader = GraphLoader("test", merge_sources=False)
+    assert loader.load_graph_snapshot().job_id == "job_1"
+
+    write_snapshot(tmp_path / "artifacts/ingest/test/job_2", "New")
+    assert loader.load_graph_snapshot().job_id == "job_1"  # still inside the loader's cache window
+    registry.refresh()
+    assert loader.load_graph_snapshot().job_id == "job_2"
+
+
+def test_concurrent_requests_parse_once(registry, tmp_path):
+    job_dir = tmp_path / "artifacts/ingest/test/job_1"
+    write_snapshot(job_dir, "Combat")
+    loader = GraphLoader("test", merge_sources=False)
+    calls = []
+
+    def slow_load(artifact_dir):
+        calls.append(artifact_dir)
+        time.sleep(0.05)
+        return loader._load_snapshot_from_directory(artifact_dir)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("test", job_dir, slow_load)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_merged_view_is_shared_and_measured(registry, tmp_path):
+    write_snapshot(tmp_path / "artifacts/ingest/test/job_1", "Combat")
+    write_snapshot(tmp_path / "artifacts/ingest/test/job_2", "Magic")
+
+    first = GraphLoader("test").load_graph_snapshot()
+    second = GraphLoader("test").load_graph_snapshot()
+
+    assert first is second
+    assert len(first.nodes) == 2
+    metrics = registry.metrics()
+    assert metrics["loads"] == 1 and metrics["hits"] == 1
+    assert metrics["snapshots"][str((tmp_path / "artifacts/ingest/test").resolve())]["job_id"] == "merged:test"
+
+
+def test_merged_view_is_synced_off_the_request_path(registry, tmp_path, monkeypatch):
+    write_snapshot(tmp_path / "artifacts/ingest/test/job_1", "Combat")
+    loader = GraphLoader("test")
+    old = loader.load_graph_snapshot()
+    write_snapshot(tmp_path / "artifacts/ingest/test/job_2", "Magic")
+
+    syncs = []
+    original_refresh = MergedGraphIndex.refresh
+    monkeypatch.setattr(MergedGraphIndex, "refresh",
+                        lambda self: syncs.append(threading.current_thread()) or original_refresh(self))
+    assert loader.load_graph_snapshot() is old
+    assert GraphLoader("test").load_graph_snapshot() is old
+    assert syncs == []
+
+    assert registry.refresh() == 1
+    assert registry.metrics()["background_reloads"] == 1
+    new = loader.load_graph_snapshot()
+    assert len(new.nodes) == 2
+    assert registry.metrics()["loads"] == 2
+
+
+def test_written_snapshot_updates_the_merged_view(registry, tmp_path):
+    write_snapshot(tmp_path / "artifacts/ingest/test/job_1", "Combat")
+    loader = GraphLoader("test")
+    assert len(loader.load_graph_snapshot().nodes) == 1
+
+    job_dir = tmp_path / "artifacts/ingest/test/job_2"
+    write_snapshot(job_dir, "Magic")
+    notify_snapshot_written("test", job_dir)
+
+    assert len(loader.load_graph_snapshot().nodes) == 2
+    assert registry.metrics()["background_reloads"] == 1
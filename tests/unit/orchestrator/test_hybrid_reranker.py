@@ -196,6 +196,21 @@ class TestHybridReranker:
         for extractor in mock_signal_extractors.values():
             assert extractor.extract_signals.call_count >= len(sample_results)
 
+    def test_rerank_stops_scoring_at_deadline(self, sample_results):
+        """Test the reranker stops itself once its deadline has passed."""
+        reranker = HybridReranker(environment="test")
+        reranker.vector_extractor = Mock()
+
+        reranked = reranker.rerank_results(
+            query="fireball spell",
+            results=sample_results,
+            config=RerankingConfig(enable_signal_caching=False),
+            deadline=time.perf_counter() - 1.0
+        )
+
+        assert reranked == []
+        reranker.vector_extractor.extract_signals.assert_not_called()
+
     def test_rerank_with_classification(self, mock_signal_extractors, sample_results):
         """Test reranking with query classification."""
         reranker = HybridReranker(environment="test")
@@ -525,4 +540,71 @@ class TestRerankerIntegration:
             )
 
             assert len(reranked) == 1
-            assert reranked[0].final_score > 0.0
\ No newline at end of file
+            assert reranked[0].final_score > 0.0
+
+class TestAnytimeReranking:
+    """Test cost-ordered, deadline-bounded signal computation."""
+
+    @pytest.fixture
+    def results(self):
+        return [
+            {'id': f'result_{i}', 'content': f'Spell text {i}', 'score': 0.5,
+             'metadata': {}, 'source': 'phb.pdf'}
+            for i in range(4)
+        ]
+
+    @staticmethod
+    def recording_reranker(calls, delays=None):
+        reranker = HybridReranker(environment="test")
+        values = {
+            'vector': {'similarity': 0.9, 'semantic': 0.8},
+            'content': {'quality': 0.7, 'readability': 0.6, 'length_penalty': 0.1, 'structure': 0.5},
+            'graph': {'relevance': 0.6, 'relationships': 0.5, 'cross_refs': 0.4},
+            'domain': {'entity_match': 0.9, 'mechanics': 0.8, 'authority': 0.7},
+        }
+        for group, signals in values.items():
+            def extract(*args, group=group, signals=signals):
+                import threading
+                calls.append((group, threading.current_thread().name))
+                time.sleep((delays or {}).get(group, 0.0))
+                return signals
+            setattr(reranker, f"{group}_extractor", Mock(extract_signals=Mock(side_effect=extract)))
+        return reranker
+
+    def test_signal_groups_run_cheapest_first_on_the_pool(self, results):
+        calls = []
+        reranker = self.recording_reranker(calls)
+
+        reranked = reranker.rerank_results("fireball", results, config=RerankingConfig(enable_signal_caching=False))
+
+        order = [group for group, _ in calls]
+        assert order == sorted(order, key=["vector", "content", "graph", "domain"].index)
+        assert all(thread.startswith("rerank") for _, thread in calls)
+        assert all(r.signals_completed == ["vector", "content", "graph", "domain"] for r in reranked)
+        assert reranked[0].final_score == reranker._compute_final_score(reranked[0].signals, RerankingConfig())
+
+    def test_deadline_keeps_every_result_with_the_completed_signals(self, results):
+        calls = []
+        reranker = self.recording_reranker(calls, delays={'graph': 0.2})
+        config = RerankingConfig(enable_signal_caching=False)
+
+        started = time.perf_counter()
+        reranked = reranker.rerank_results("fireball", results, config=config, deadline=started + 0.05)
+
+        assert time.perf_counter() - started < 0.15
+        assert len(reranked) == len(results)
+        assert all(r.signals_completed == ["vector", "content"] for r in reranked)
+        assert "domain" not in [group for group, _ in calls]
+        assert reranked[0].signals.graph_relevance == 0.0
+
+        # Remaining weights are scaled up, so partial scores stay on the full scale
+        signals = reranked[0].signals
+        kept = (0.9 * 0.7 + 0.8 * 0.3) * config.vector_weight + \
+            (0.7 * 0.4 + 0.6 * 0.2 + 0.5 * 0.2 + 0.9 * 0.2) * config.content_weight + \
+            0.5 * config.metadata_weight
+        total = config.vector_weight + config.graph_weight + config.content_weight + \
+            config.domain_weight + config.metadata_weight
+        kept_weight = config.vector_weight + config.content_weight + config.metadata_weight
+        assert reranked[0].final_score == pytest.approx(kept * total / kept_weight)
+        assert reranker._compute_final_score(signals, config, ["graph", "domain"]) == reranked[0].final_score
+        assert not reranker.signal_cache
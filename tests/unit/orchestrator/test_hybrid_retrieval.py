@@ -0,0 +1,196 @@
+"""
+Unit tests for hybrid lexical + vector retrieval, fusion and the recall harness.
+"""
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src_common.orchestrator import query_embeddings, retriever
+from src_common.orchestrator.fusion import reciprocal_rank_fusion, weighted_score_fusion
+from src_common.orchestrator.query_embeddings import QueryEmbedder
+from src_common.orchestrator.retrieval_eval import (
+    EvalQuestion, evaluate_recall, load_persona_questions
+)
+from src_common.orchestrator.retriever import DocChunk, _retrieve_from_store
+from src_common.vector_store.factory import make_vector_store
+
+ENV = "hybrid_unit"
+
+# Toy 3-d "embeddings": axis 0 = fire, axis 1 = stealth, axis 2 = healing
+DOCS = [
+    {"chunk_id": "fireball", "content": "Fireball deals 8d6 fire damage in a sphere", "embedding": [1.0, 0.0, 0.0]},
+    {"chunk_id": "burning", "content": "Burning hands: a cone of flame scorches creatures", "embedding": [0.9, 0.1, 0.0]},
+    {"chunk_id": "stealth", "content": "Stealth checks use Dexterity and damage nothing", "embedding": [0.0, 1.0, 0.0]},
+    {"chunk_id": "cure", "content": "Cure wounds restores hit points", "embedding": [0.0, 0.0, 1.0]},
+]
+
+
+def chunk(chunk_id, score):
+    return DocChunk(id=chunk_id, text=chunk_id, source="test", score=score, metadata={})
+
+
+def fake_provider(texts, model):
+    vectors = []
+    for text in texts:
+        vectors.append([1.0 if "fire" in text else 0.0, 1.0 if "sneak" in text else 0.0, 0.0])
+    return vectors
+
+
+@pytest.fixture
+def store():
+    vector_store = make_vector_store(ENV, backend="memory")
+    vector_store.upsert_documents(DOCS)
+    yield vector_store
+    vector_store.delete_all()
+
+
+@pytest.fixture
+def embedder():
+    instance = QueryEmbedder(provider=fake_provider, model="toy")
+    with patch.object(query_embeddings, "get_query_embedder", return_value=instance):
+        yield instance
+
+
+class TestFusion:
+    """Test RRF and weighted score fusion."""
+
+    def test_rrf_rewards_agreement_and_records_sources(self):
+        fused = reciprocal_rank_fusion({
+            "lexical": [chunk("a", 9.0), chunk("b", 5.0)],
+            "vector": [chunk("b", 0.9), chunk("c", 0.8)],
+        })
+
+        assert [c.id for c in fused] == ["b", "a", "c"]
+        assert fused[0].metadata["retrieval_sources"] == {
+            "lexical": {"rank": 2, "score": 5.0}, "vector": {"rank": 1, "score": 0.9}
+        }
+        assert fused[0].score == pytest.approx(1 / 62 + 1 / 61)
+
+    def test_weighted_fusion_normalises_each_source(self):
+        fused = weighted_score_fusion({
+            "lexical": [chunk("a", 100.0), chunk("b", 50.0)],
+            "vector": [chunk("b", 0.9), chunk("a", 0.1)],
+        }, weights={"lexical": 0.3, "vector": 0.7})
+
+        assert [c.id for c in fused] == ["b", "a"]
+        assert fused[0].metadata["fused_score"] == pytest.approx(0.7)
+
+
+class TestHybridStoreRetrieval:
+    """Test _retrieve_from_store retrieval modes."""
+
+    def test_hybrid_combines_lexical_and_vector_hits(self, store, embedder):
+        results = _retrieve_from_store("fire damage", ENV, top_k=3, mode="hybrid")
+
+        ids = [c.id for c in results]
+        assert ids[0] == "fireball"
+        # Found only through the embedding (no query word in its text)
+        assert "burning" in ids
+        sources = {c.id: set(c.metadata["retrieval_sources"]) for c in results}
+        assert sources["fireball"] == {"lexical", "vector"}
+        assert sources["burning"] == {"vector"}
+
+    def test_query_is_embedded_once_per_normalised_text(self, store, embedder):
+        _retrieve_from_store("Fire damage", ENV, top_k=3, mode="hybrid")
+        _retrieve_from_store("  fire   DAMAGE ", ENV, top_k=3, mode="vector")
+
+        stats = embedder.get_stats()
+        assert stats["provider_calls"] == 1
+        assert stats["hits"] == 1
+
+    def test_default_mode_is_lexical_and_never_embeds(self, store, embedder, monkeypatch):
+        monkeypatch.delenv("RETRIEVAL_MODE", raising=False)
+
+        results = _retrieve_from_store("fire damage", ENV, top_k=3)
+
+        assert results[0].id == "fireball"
+        assert embedder.get_stats()["provider_calls"] == 0
+
+    def test_embedding_runs_off_the_calling_thread(self, store):
+        threads = []
+
+        def provider(texts, model):
+            threads.append(threading.current_thread())
+            return fake_provider(texts, model)
+
+        with patch.object(query_embeddings, "get_query_embedder", return_value=QueryEmbedder(provider=provider)):
+            _retrieve_from_store("fire damage", ENV, top_k=3, mode="hybrid")
+
+        assert threads and threads[0] is not threading.current_thread()
+
+    def test_slow_embedding_past_deadline_degrades_to_lexical(self, store):
+        release = threading.Event()
+
+        def slow_provider(texts, model):
+            release.wait(2.0)
+            return fake_provider(texts, model)
+
+        with patch.object(query_embeddings, "get_query_embedder",
+                          return_value=QueryEmbedder(provider=slow_provider)):
+            started = time.perf_counter()
+            results = _retrieve_from_store("fire damage", ENV, top_k=3, mode="hybrid",
+                                           deadline=started + 0.05)
+            elapsed = time.perf_counter() - started
+        release.set()
+
+        assert elapsed < 1.0
+        assert "burning" not in [c.id for c in results]
+        assert all("retrieval_sources" not in c.metadata for c in results)
+
+    def test_vector_mode_without_provider_warns(self, store):
+        with patch.object(query_embeddings, "get_query_embedder", return_value=QueryEmbedder(provider=None)), \
+                patch.object(retriever.logger, "warning") as warning:
+            results = _retrieve_from_store("fire damage", ENV, top_k=3, mode="vector")
+
+        assert results == []
+        assert "no query embedding" in warning.call_args[0][0]
+
+    def test_without_embeddings_hybrid_is_lexical(self, store):
+        with patch.object(query_embeddings, "get_query_embedder", return_value=QueryEmbedder(provider=None)):
+            results = _retrieve_from_store("fire damage", ENV, top_k=3, mode="hybrid")
+
+        assert [c.id for c in results][:2] == ["fireball", "stealth"]
+        assert all("retrieval_sources" not in c.metadata for c in results)
+
+
+class TestRecallHarness:
+    """Test the offline recall@k harness."""
+
+    def test_pooled_relevance_and_recall(self):
+        rankings = {
+            "lexical": [chunk("wrong", 1.0), chunk("right", 0.5)],
+            "vector": [chunk("right", 0.9), chunk("wrong", 0.1)],
+        }
+        texts = {"right": "fireball deals fire damage", "wrong": "stealth rules"}
+
+        def retrieve_fn(query, mode, top_k):
+            return [DocChunk(c.id, texts[c.id], "test", c.score, {}) for c in rankings[mode]]
+
+        report = evaluate_recall(
+            [EvalQuestion("fireball damage?", expected="Fireball deals fire damage")],
+            retrieve_fn, modes=("lexical", "vector"), ks=(1, 2),
+        )
+
+        assert report["judged"] == 1
+        assert report["modes"]["lexical"] == {"recall@1": 0.0, "recall@2": 1.0}
+        assert report["modes"]["vector"] == {"recall@1": 1.0, "recall@2": 1.0}
+
+    def test_load_persona_questions(self, tmp_path):
+        (tmp_path / "Ana.md").write_text(
+            "## Q&A (English)\n\n### Question 1 (English)\n- Question: How does flanking work?\n"
+            "- Expected Answer (English): Flanking grants a +2 bonus.\n"
+        )
+        (tmp_path / "Persona_Bo.md").write_text("- **English Q:** What is a saving throw?\n- **English A:** A d20 roll.\n")
+        (tmp_path / "Ana_response.md").write_text("- **English Q:** ignored\n- **English A:** x\n")
+
+        questions = load_persona_questions(tmp_path)
+
+        assert [(q.question, q.expected, q.persona) for q in questions] == [
+            ("How does flanking work?", "Flanking grants a +2 bonus.", "Ana"),
+            ("What is a saving throw?", "A d20 roll.", "Bo"),
+        ]
+
+    def test_missing_personas_dir_yields_no_questions(self, tmp_path):
+        assert load_persona_questions(tmp_path / "Personas") == []
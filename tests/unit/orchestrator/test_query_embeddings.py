@@ -0,0 +1,136 @@
+"""
+Unit tests for query embedding caching, coalescing, batching and the shared tier.
+"""
+import threading
+
+import pytest
+
+from src_common.orchestrator.query_embeddings import QueryEmbedder
+from src_common.orchestrator.signal_extractors import VectorSignalExtractor
+
+
+class RecordingProvider:
+    """Provider that records each call; the vector is [len(text), 1]."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, model):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class FakeRemote:
+    """Stands in for RedisService's get_value/set_value."""
+
+    def __init__(self, values=None):
+        self.values = dict(values or {})
+        self.writes = []
+
+    def get_value(self, key):
+        return self.values.get(key)
+
+    def set_value(self, key, value, ttl=None):
+        self.writes.append((key, ttl))
+        self.values[key] = value
+        return True
+
+
+def run_concurrently(embedder, texts):
+    results = [None] * len(texts)
+    barrier = threading.Barrier(len(texts))
+
+    def worker(i, text):
+        barrier.wait()
+        results[i] = embedder.embed(text)
+
+    threads = [threading.Thread(target=worker, args=(i, text)) for i, text in enumerate(texts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5.0)
+    return results
+
+
+class TestQueryEmbedder:
+    """Test single-flight, batching and tiered caching."""
+
+    def test_concurrent_identical_queries_share_one_call(self):
+        provider = RecordingProvider()
+        embedder = QueryEmbedder(provider=provider, model="toy", batch_window_ms=50)
+
+        results = run_concurrently(embedder, ["Fire damage", "fire  DAMAGE", "fire damage", "Fire Damage"])
+
+        assert provider.calls == [["fire damage"]]
+        assert all(result == [11.0, 1.0] for result in results)
+        assert embedder.get_stats()["coalesced"] == 3
+
+    def test_distinct_concurrent_queries_are_batched(self):
+        provider = RecordingProvider()
+        embedder = QueryEmbedder(provider=provider, model="toy", batch_window_ms=50)
+
+        results = run_concurrently(embedder, ["a", "bb", "ccc"])
+
+        assert len(provider.calls) == 1
+        assert sorted(provider.calls[0]) == ["a", "bb", "ccc"]
+        assert [result[0] for result in results] == [1.0, 2.0, 3.0]
+        assert embedder.get_stats()["batched_inputs"] == 3
+
+    def test_batches_respect_max_batch_size(self):
+        provider = RecordingProvider()
+        embedder = QueryEmbedder(provider=provider, model="toy", batch_window_ms=50, max_batch_size=2)
+
+        run_concurrently(embedder, ["a", "bb", "ccc", "dddd", "eeeee"])
+
+        assert sorted(len(call) for call in provider.calls) == [1, 2, 2]
+
+    def test_shared_tier_is_read_before_and_written_after_the_provider(self):
+        provider = RecordingProvider()
+        writer = QueryEmbedder(provider=provider, model="toy", remote=FakeRemote(), batch_window_ms=0)
+        writer.embed("fireball")
+        assert writer.remote.writes and writer.remote.writes[0][1] == writer.remote_ttl
+
+        reader = QueryEmbedder(provider=provider, model="toy", remote=writer.remote, batch_window_ms=0)
+        assert reader.embed("Fireball") == [8.0, 1.0]
+
+        assert len(provider.calls) == 1
+        assert reader.get_stats()["remote_hits"] == 1
+        assert reader.cached("fireball") == [8.0, 1.0]
+
+    def test_provider_failure_releases_every_waiter(self):
+        def failing(texts, model):
+            raise RuntimeError("boom")
+
+        embedder = QueryEmbedder(provider=failing, model="toy", batch_window_ms=50)
+
+        assert run_concurrently(embedder, ["x", "x", "y"]) == [None, None, None]
+        stats = embedder.get_stats()
+        assert stats["errors"] == 1
+        assert stats["size"] == 0
+        # Nothing is left in flight, so the next call retries
+        embedder.provider = RecordingProvider()
+        assert embedder.embed("x") == [1.0, 1.0]
+
+
+class TestVectorSignalHook:
+    """Test the vector signal extractor's use of query embeddings."""
+
+    def test_semantic_signal_uses_hybrid_vector_score(self):
+        extractor = VectorSignalExtractor("test", query_embedder=QueryEmbedder(provider=None))
+        result = {"content": "unrelated words", "score": 0.4,
+                  "metadata": {"retrieval_sources": {"vector": {"rank": 1, "score": 0.8}}}}
+
+        assert extractor.extract_signals("fire damage", result)["semantic"] == 0.8
+
+    def test_result_embedding_scored_against_cached_query_vector_only(self):
+        provider = RecordingProvider()
+        embedder = QueryEmbedder(provider=provider, model="toy", batch_window_ms=0)
+        extractor = VectorSignalExtractor("test", query_embedder=embedder)
+        result = {"content": "unrelated words", "score": 0.1, "embedding": [11.0, 1.0]}
+
+        # Not cached yet: no provider call during reranking
+        assert extractor.extract_signals("fire damage", result)["semantic"] == 0.0
+        assert provider.calls == []
+
+        embedder.embed("fire damage")
+        assert extractor.extract_signals("fire damage", result)["semantic"] == pytest.approx(1.0)
@@ -0,0 +1,156 @@
+"""
+Unit tests for staged retrieval with per-stage latency budgets.
+"""
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src_common.orchestrator import retriever
+from src_common.orchestrator.retriever import DocChunk, RetrievalStages, retrieve
+
+
+def make_chunks(count):
+    return [
+        DocChunk(id=f"c{i}", text=f"fireball damage rules entry {i} " + "word " * i,
+                 source="local", score=0.0, metadata={})
+        for i in range(count)
+    ]
+
+
+def make_plan(budgets=None, max_results=5, graph_expansion=None):
+    return SimpleNamespace(
+        retrieval_strategy={"vector_top_k": 5},
+        graph_expansion=graph_expansion,
+        reranking_config={"strategy": "hybrid_full", "max_results": max_results, "timeout_ms": 100},
+        provenance_config=None,
+        performance_hints={"retrieval_budgets_ms": budgets or {}, "candidate_pool": 30},
+    )
+
+
+@pytest.fixture
+def local_chunks():
+    with patch.object(retriever, "_retrieve_from_store", return_value=[]) as store, \
+         patch.object(retriever, "_iter_candidate_chunks", return_value=make_chunks(40)):
+        yield store
+
+
+class TestRetrievalStages:
+    """Test budget resolution and stage degradation."""
+
+    def test_budgets_come_from_performance_hints(self):
+        stages = RetrievalStages.from_plan(make_plan({"graph": 7, "rerank": 30}), top_k=5, limit=3)
+
+        assert stages.budgets_ms["graph"] == 7.0
+        assert stages.budgets_ms["rerank"] == 30.0
+        assert stages.candidate_pool == 30
+        assert stages.rerank_top_n == 5
+
+    def test_legacy_plan_uses_defaults(self):
+        stages = RetrievalStages.from_plan({"vector_top_k": 40}, top_k=40, limit=3)
+
+        assert stages.budgets_ms == retriever.DEFAULT_STAGE_BUDGETS_MS
+        assert stages.candidate_pool == 80
+
+    def test_store_is_asked_for_the_candidate_pool(self, local_chunks):
+        retrieve(make_plan(), "fireball damage", "test", limit=3)
+
+        local_chunks.assert_called_once()
+        args, kwargs = local_chunks.call_args
+        assert args == ("fireball damage", "test", 30)
+        # Query embedding (if any) is bounded by the candidate stage budget
+        assert isinstance(kwargs["deadline"], float)
+
+    def test_only_top_n_is_reranked(self, local_chunks):
+        seen = []
+
+        def rerank(results, plan, query, env, deadline=None):
+            seen.append(len(results))
+            return list(reversed(results))
+
+        with patch.object(retriever, "_apply_reranking", side_effect=rerank):
+            results = retrieve(make_plan(max_results=5), "fireball damage", "test", limit=3)
+
+        assert seen == [5]
+        assert len(results) == 3
+
+    def test_slow_rerank_stops_at_deadline_and_keeps_previous_ranking(self, local_chunks):
+        calls = []
+
+        def slow_rerank(results, plan, query, env, deadline=None):
+            calls.append(threading.get_ident())
+            scored = []
+            for chunk in results:
+                if time.perf_counter() >= deadline:
+                    break
+                time.sleep(0.01)
+                scored.append(chunk)
+            return list(reversed(scored))
+
+        before = retriever.get_stage_degradation_counts().get("rerank", 0)
+        with patch.object(retriever, "_apply_reranking", side_effect=slow_rerank):
+            started = time.perf_counter()
+            results = retrieve(make_plan({"rerank": 20}, max_results=30), "fireball damage", "test", limit=3)
+            elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.25
+        # Runs on the request thread, so nothing is left running after the deadline
+        assert calls == [threading.get_ident()]
+        assert [c.id for c in results] == [c.id for c in sorted(results, key=lambda c: -c.score)]
+        assert retriever.get_stage_degradation_counts()["rerank"] == before + 1
+
+    def test_candidate_scan_covers_every_chunk(self, local_chunks):
+        stages = RetrievalStages.from_plan(make_plan({"candidates": 0}), top_k=5, limit=3)
+
+        pool = retriever._stage_candidates("fireball damage", "test", stages, None)
+
+        assert stages.candidates_scanned == 40
+        assert len(pool) == 30
+
+    def test_heap_selection_matches_sort_and_dedupe(self):
+        chunks = make_chunks(60)
+        for i, chunk in enumerate(chunks):
+            chunk.metadata["lane"] = "AB"[i % 2]
+            if i % 7 == 0:
+                chunk.text = "fireball damage duplicate entry"  # one dedupe signature
+        query = "fireball damage entry word"
+        scored = [DocChunk(id=c.id, text=c.text, source=c.source, score=retriever._simple_score(query, c.text),
+                           metadata=c.metadata) for c in chunks]
+
+        for lane, limit in ((None, 10), ("B", 10), ("A", 100)):
+            expected = sorted(retriever._apply_lane_filter(scored, lane), key=lambda c: c.score, reverse=True)
+            pool, scanned = retriever._best_candidates(query, chunks, lane, limit)
+            assert [c.id for c in pool] == [c.id for c in retriever._dedupe(expected, limit)]
+            assert scanned == 60
+
+    def test_lane_filter_applies_before_the_pool_is_truncated(self, monkeypatch):
+        chunks = make_chunks(40)
+        for chunk in chunks[:35]:
+            chunk.metadata["lane"] = "A"
+        for i, chunk in enumerate(chunks[35:]):
+            chunk.metadata["lane"] = "B"
+            chunk.text = f"unrelated lore {i}"
+        monkeypatch.setattr(retriever, "_retrieve_from_store", lambda *args, **kwargs: [])
+        monkeypatch.setattr(retriever, "_iter_candidate_chunks", lambda env: chunks)
+        stages = RetrievalStages.from_plan(make_plan(), top_k=5, limit=3)
+
+        pool = retriever._stage_candidates("fireball damage", "test", stages, "B")
+
+        # Every lane B chunk scores below the 30-chunk pool of lane A chunks
+        assert sorted(c.id for c in pool) == [f"c{i}" for i in range(35, 40)]
+
+    def test_graph_stage_out_of_budget_keeps_candidate_ranking(self, local_chunks):
+        expansion = {"enabled": True, "expanded_query": "fireball damage",
+                     "expansion_terms": [{"term": "entry 3 word", "source": "cross_ref", "confidence": 1.0}]}
+        stages = RetrievalStages.from_plan(make_plan({"graph": 0}), top_k=5, limit=3)
+        pool = retriever._stage_candidates("fireball damage", "test", stages, None)
+
+        assert retriever._stage_graph(pool, expansion, stages) is pool
+        assert stages.degraded == ["graph"]
+
+        stages = RetrievalStages.from_plan(make_plan({"graph": 1000}), top_k=5, limit=3)
+        boosted = retriever._stage_graph(pool, expansion, stages)
+        assert boosted[0].id == "c3"
+        assert stages.degraded == []
@@ -0,0 +1,179 @@
+"""
+Unit tests for the RAG service container.
+"""
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src_common.orchestrator.policies import DEFAULT_POLICIES, choose_plan
+from src_common.orchestrator.service_container import ServiceContainer, request_scope
+
+
+class Widget:
+    """Counts its own constructions."""
+    built = 0
+
+    def __init__(self):
+        Widget.built += 1
+
+
+@pytest.fixture(autouse=True)
+def reset_widget():
+    Widget.built = 0
+
+
+class TestServiceContainer:
+    """Test build-once, rebuild-on-change and construction counting."""
+
+    def test_component_is_built_once_and_shared(self):
+        container = ServiceContainer("test", check_interval=0)
+        container.register("widget", Widget)
+
+        with request_scope() as first:
+            widget = container.get("widget")
+        with request_scope() as second:
+            assert container.get("widget") is widget
+
+        assert Widget.built == 1
+        assert first == {"widget": 1}
+        assert second == {}
+
+    def test_watched_file_change_rebuilds(self, tmp_path):
+        source = tmp_path / "policies.yaml"
+        source.write_text("a: 1")
+        container = ServiceContainer("test", check_interval=0)
+        container.register("widget", Widget, watch=[source])
+
+        first = container.get("widget")
+        assert container.get("widget") is first
+
+        source.write_text("a: 2, b: 3")
+        stat = source.stat()
+        os.utime(source, (stat.st_atime + 5, stat.st_mtime + 5))
+        assert container.get("widget") is not first
+        assert container.get_stats()["components"][0]["builds"] == 2
+
+    def test_file_checks_are_throttled(self, tmp_path):
+        source = tmp_path / "personas"
+        source.mkdir()
+        container = ServiceContainer("test", check_interval=3600)
+        container.register("widget", Widget, watch=[source])
+
+        first = container.get("widget")
+        (source / "new_persona.md").write_text("# Persona")
+        assert container.get("widget") is first
+
+    def test_replaced_factory_rebuilds(self):
+        factories = {"current": Widget}
+        container = ServiceContainer("test")
+        container.register("widget", lambda: factories["current"](), key=lambda: factories["current"])
+
+        first = container.get("widget")
+        replacement = MagicMock()
+        factories["current"] = replacement
+        assert container.get("widget") is replacement.return_value
+
+        factories["current"] = Widget
+        assert isinstance(container.get("widget"), Widget)
+        assert container.get("widget") is not first
+
+    def test_failed_build_is_not_cached(self):
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("not ready")
+            return Widget()
+
+        container = ServiceContainer("test")
+        container.register("widget", flaky)
+
+        with pytest.raises(RuntimeError):
+            container.get("widget")
+        assert isinstance(container.get("widget"), Widget)
+        assert container.get_stats()["components"][0]["errors"] == 1
+
+    def test_warm_records_startup_timings_and_skips_failures(self):
+        container = ServiceContainer("test")
+        container.register("widget", Widget)
+        container.register("broken", MagicMock(side_effect=RuntimeError("boom")))
+
+        timings = container.warm()
+
+        assert set(timings) == {"widget"}
+        assert container.get_stats()["startup_timings_ms"] == timings
+
+    def test_request_statistics(self):
+        container = ServiceContainer("test")
+        container.register("widget", Widget)
+
+        with request_scope() as constructions:
+            container.get("widget")
+        container.record_request(constructions)
+        container.record_request({})
+
+        stats = container.get_stats()
+        assert stats["requests"] == 2
+        assert stats["request_constructions"] == 1
+        assert stats["last_request_constructions"] == {}
+
+
+def test_choose_plan_does_not_mutate_shared_policies():
+    policies = {"unknown": {"multi_hop_reasoning": {"low": {"vector_top_k": 500, "graph_depth": 9}}}}
+    classification = {"domain": "unknown", "intent": "multi_hop_reasoning", "complexity": "low"}
+
+    plan = choose_plan(policies, classification)
+    plan["filters"] = {"system": "PF2E"}
+
+    assert plan["vector_top_k"] == 50
+    assert policies["unknown"]["multi_hop_reasoning"]["low"] == {"vector_top_k": 500, "graph_depth": 9}
+    assert "filters" not in DEFAULT_POLICIES["unknown"]["multi_hop_reasoning"]["low"]
+
+
+def test_warm_container_serves_requests_without_construction():
+    from src_common.orchestrator import service
+
+    with patch.dict(service._service_containers, clear=True), \
+         patch.object(service, "get_planner") as get_planner:
+        get_planner.return_value.get_plan.side_effect = Exception("no plan")
+        service.warm_rag_services("test")
+
+        with request_scope() as constructions:
+            _, _, plan, _ = service._resolve_query_plan("test", "How does grappling work?")
+
+        assert constructions == {}
+        assert plan["vector_top_k"] > 0
+        get_planner.assert_called_once_with("test", refresh=True)
+
+
+def test_domain_pattern_change_rebuilds_planner_and_reranker(tmp_path, monkeypatch):
+    from src_common.orchestrator import hybrid_reranker, query_planner, service
+
+    monkeypatch.chdir(tmp_path)
+    with patch.dict(service._service_containers, clear=True), \
+         patch.dict(hybrid_reranker._reranker_instances, clear=True), \
+         patch.dict(query_planner._planner_instances, clear=True):
+        container = service.get_service_container("test")
+        container.check_interval = 0
+        with request_scope() as constructions:
+            reranker = container.get("reranker")
+            planner = container.get("query_planner")
+        assert constructions == {"reranker": 1, "query_planner": 1}
+        assert "homebrew_lore" not in reranker.domain_extractor.entity_patterns
+
+        patterns = tmp_path / "env" / "test" / "config" / "domain_patterns.yaml"
+        patterns.parent.mkdir(parents=True)
+        patterns.write_text("entity_patterns:\n  homebrew_lore: '\\bvecna\\b'\n")
+
+        with request_scope() as constructions:
+            rebuilt = container.get("reranker")
+        assert constructions == {"reranker": 1}
+        assert rebuilt is not reranker
+        assert "homebrew_lore" in rebuilt.domain_extractor.entity_patterns
+        assert hybrid_reranker.get_reranker("test") is rebuilt
+
+        rebuilt_planner = container.get("query_planner")
+        assert rebuilt_planner is not planner
+        assert rebuilt_planner.reranker is rebuilt
@@ -0,0 +1,115 @@
+# tests/unit/test_admin_test_runner.py
+"""
+Unit tests for AdminTestingService's concurrent, non-blocking test runner.
+"""
+
+import asyncio
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("psutil")
+
+from src_common.admin.testing import AdminTestingService, TestStatus
+from src_common.progress_bus import FINAL_EVENT, JobProgressBus
+
+PYTHON = f'"{sys.executable}"'
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    testing = AdminTestingService()
+    testing.progress_bus = JobProgressBus()
+    return testing
+
+
+async def add_test(service, name, command, avg_duration=None):
+    test = await service.create_test("dev", {
+        "name": name, "description": name, "test_type": "unit",
+        "command": command, "expected_result": "exit 0",
+    })
+    if avg_duration is not None:
+        test.avg_duration_seconds = avg_duration
+        await service._save_test(test)
+    return test
+
+
+def sleeper(seconds, exit_code=0):
+    return f'{PYTHON} -c "import time, sys; print(\'start\', flush=True); time.sleep({seconds}); sys.exit({exit_code})"'
+
+
+async def test_suite_runs_in_parallel_and_records_durations(service):
+    for i in range(4):
+        await add_test(service, f"t{i}", sleeper(0.5))
+
+    started = time.perf_counter()
+    results = await service.run_test_suite("dev", max_concurrency=4)
+    elapsed = time.perf_counter() - started
+
+    assert results["summary"] == {"passed": 4}
+    assert elapsed < 1.5
+    tests = await service.list_tests("dev")
+    assert all(test["avg_duration_seconds"] >= 0.5 for test in tests)
+
+
+async def test_shortest_tests_start_first(service):
+    slow = await add_test(service, "slow", sleeper(0.3), avg_duration=30.0)
+    fast = await add_test(service, "fast", sleeper(0.1), avg_duration=1.0)
+    unknown = await add_test(service, "unknown", sleeper(0.1))
+
+    results = await service.run_test_suite("dev", max_concurrency=1)
+
+    order = [execution["test_id"] for execution in results["executions"]]
+    # The unmeasured test is scheduled at the mean of the known durations
+    assert order == [fast.test_id, unknown.test_id, slow.test_id]
+
+
+async def test_fail_fast_cancels_running_and_skips_queued(service):
+    failing = await add_test(service, "fails", sleeper(0.1, exit_code=1), avg_duration=0.1)
+    long_running = await add_test(service, "long", sleeper(30), avg_duration=0.2)
+    queued = await add_test(service, "queued", sleeper(0.1), avg_duration=5.0)
+
+    started = time.perf_counter()
+    results = await service.run_test_suite("dev", max_concurrency=2, fail_fast=True)
+
+    assert time.perf_counter() - started < 10
+    assert [execution["status"] for execution in results["executions"]] == ["failed"]
+    assert results["cancelled"] == [long_running.test_id]
+    assert results["skipped"] == [queued.test_id]
+    cancelled = await service.get_test("dev", long_running.test_id)
+    assert cancelled["last_result"] == TestStatus.ERROR.value
+
+
+async def test_output_is_streamed_while_the_test_runs(service):
+    test = await add_test(service, "stream", sleeper(0.3))
+    subscription = service.progress_bus.subscribe("test_suite:s1")
+    seen = []
+
+    suite = asyncio.create_task(service.run_test_suite(
+        "dev", suite_id="s1", on_output=lambda execution, stream, line: seen.append(line.strip())))
+    first = await subscription.get(timeout=5)
+    assert not suite.done()
+    assert first["type"] == "output" and first["line"] == "start"
+
+    await suite
+    events = [first]
+    while (event := await subscription.get(timeout=0.1)) is not None:
+        events.append(event)
+    assert seen == ["start"]
+    assert [event["type"] for event in events] == ["output", "test_complete", FINAL_EVENT]
+    assert events[1]["test_id"] == test.test_id
+
+
+async def test_cancel_test_suite_kills_processes(service):
+    test = await add_test(service, "long", sleeper(30))
+
+    suite = asyncio.create_task(service.run_test_suite("dev", suite_id="s2"))
+    await asyncio.sleep(0.3)
+    assert await service.cancel_test_suite("s2")
+
+    results = await asyncio.wait_for(suite, 5)
+    assert results["cancelled"] == [test.test_id]
+    assert service._processes == {}
+    assert not await service.cancel_test_suite("s2")
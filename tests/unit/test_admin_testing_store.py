@@ -0,0 +1,121 @@
+# tests/unit/test_admin_testing_store.py
+"""
+Unit tests for the indexed admin testing store and its use by AdminTestingService.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("psutil")
+
+from src_common.admin.testing import AdminTestingService
+from src_common.admin.testing_store import AdminTestingStore, bug_cursor
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def bug(bug_id, priority="medium", created_at=1.0, **fields):
+    return dict({"bug_id": bug_id, "title": bug_id, "description": "d", "environment": "dev",
+                 "severity": "low", "priority": priority, "status": "open", "component": "other",
+                 "created_at": created_at, "created_by": "admin"}, **fields)
+
+
+def test_cursor_pages_follow_priority_then_newest_order(workdir):
+    store = AdminTestingStore("dev")
+    for i in range(6):
+        store.upsert_bug(bug(f"b{i}", priority="high" if i % 3 == 0 else "low", created_at=float(i)))
+
+    pages, cursor = [], None
+    while True:
+        page = store.query_bugs(limit=2, cursor=cursor)
+        if not page:
+            break
+        pages.append([item["bug_id"] for item in page])
+        cursor = bug_cursor(page[-1])
+
+    assert pages == [["b3", "b0"], ["b5", "b4"], ["b2", "b1"]]
+    assert [item["bug_id"] for item in store.query_bugs(priority="low", created_from=2.0)] == ["b5", "b4", "b2"]
+
+
+def test_counters_follow_updates(workdir):
+    store = AdminTestingStore("dev")
+    store.upsert_bug(bug("b1", severity="high"))
+    store.upsert_bug(bug("b2"))
+    store.upsert_bug(bug("b1", severity="high", status="resolved"))
+
+    counts = store.counts()["bug"]
+    assert counts["status"] == {"open": 1, "resolved": 1}
+    assert counts["severity"] == {"high": 1, "low": 1}
+
+    store.rebuild_counters()
+    assert store.counts()["bug"] == counts
+
+
+def test_per_file_layout_is_imported_and_resynced(workdir):
+    data_dir = Path("env/dev/data")
+    data_dir.mkdir(parents=True)
+    bugs_file = data_dir / "bug_bundles.json"
+    bugs_file.write_text(json.dumps({"bugs": [bug("legacy", last_updated=5.0)]}), encoding="utf-8")
+    (data_dir / "test_executions.json").write_text(json.dumps({"executions": [
+        {"execution_id": "e1", "test_id": "t1", "environment": "dev", "started_at": 3.0, "status": "passed"}
+    ]}), encoding="utf-8")
+
+    store = AdminTestingStore("dev")
+    assert store.sync_legacy()
+    assert store.get_bug("legacy")["title"] == "legacy"
+    assert store.recent_executions()[0]["execution_id"] == "e1"
+    assert not store.sync_legacy()
+
+    # A newer copy in the store survives a stale file; new bugs in the file are picked up
+    store.upsert_bug(bug("legacy", title="edited", last_updated=9.0))
+    bugs_file.write_text(json.dumps({"bugs": [bug("legacy", last_updated=5.0), bug("log_review")]}),
+                         encoding="utf-8")
+    os.utime(bugs_file, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+    assert store.sync_legacy()
+    assert store.get_bug("legacy")["title"] == "edited"
+    assert store.counts()["bug"]["status"] == {"open": 2}
+
+
+async def test_service_reads_and_writes_through_the_store(workdir):
+    service = AdminTestingService()
+    created = await service.create_bug("dev", {"title": "Broken", "description": "d", "severity": "high",
+                                              "priority": "urgent", "component": "api"})
+    await service.create_bug("dev", {"title": "Minor", "description": "d", "severity": "low"})
+    await service.update_bug("dev", created.bug_id, {"status": "resolved"})
+
+    first = await service.list_bugs("dev", limit=1)
+    rest = await service.list_bugs("dev", limit=10, cursor=bug_cursor(first[0]))
+    assert [item["title"] for item in first + rest] == ["Broken", "Minor"]
+    assert (await service.list_bugs("dev", component="api"))[0]["status"] == "resolved"
+    assert (await service.get_bug("dev", created.bug_id))["activity_log"][-1]["activity_type"] == "updated"
+
+    overview = await service.get_testing_overview()
+    assert overview["environments"]["dev"]["bug_stats"] == {
+        "total": 2, "by_severity": {"high": 1, "low": 1}, "by_status": {"open": 1, "resolved": 1}}
+
+
+async def test_store_calls_run_off_the_event_loop(workdir, monkeypatch):
+    loop_thread = threading.get_ident()
+    threads = []
+    original_sync = AdminTestingStore.sync_legacy
+
+    def recording_sync(self):
+        threads.append(threading.get_ident())
+        return original_sync(self)
+
+    monkeypatch.setattr(AdminTestingStore, "sync_legacy", recording_sync)
+    service = AdminTestingService()
+    created = await service.create_bug("dev", {"title": "Broken", "description": "d", "severity": "high"})
+    await service.get_bug("dev", created.bug_id)
+    await service.list_tests("dev")
+
+    assert threads and loop_thread not in threads
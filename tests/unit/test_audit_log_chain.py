@@ -0,0 +1,143 @@
+# tests/unit/test_audit_log_chain.py
+"""
+Unit tests for the hash-chained, checkpointed feature request audit log.
+"""
+
+import hashlib
+import json
+import time
+
+import pytest
+
+from src_common.requirements_manager import AUDIT_GENESIS_HASH, FeatureRequestManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return FeatureRequestManager(tmp_path)
+
+
+def log_changes(manager, count):
+    request_ids = []
+    for i in range(count):
+        request_id = manager.submit_feature_request(f"Feature {i}", "Desc", "medium", "user1")
+        manager.approve_feature_request(request_id, "admin", "ok")
+        request_ids.append(request_id)
+    return request_ids
+
+
+def read_lines(manager):
+    return manager.audit_file.read_text(encoding="utf-8").splitlines(keepends=True)
+
+
+def test_entries_chain_to_the_previous_checksum(manager):
+    log_changes(manager, 3)
+
+    entries = [json.loads(line) for line in read_lines(manager)]
+    assert entries[0]["prev_hash"] == AUDIT_GENESIS_HASH
+    for previous, entry in zip(entries, entries[1:]):
+        assert entry["prev_hash"] == previous["checksum"]
+
+    # A fresh manager continues the chain from the last entry on disk
+    other = FeatureRequestManager(manager.base_path)
+    log_changes(other, 1)
+    last_two = [json.loads(line) for line in read_lines(other)[-2:]]
+    assert last_two[1]["prev_hash"] == last_two[0]["checksum"]
+    assert other.validate_audit_integrity(full=True) == []
+
+
+def test_incremental_check_only_reads_appended_entries(manager):
+    log_changes(manager, 3)
+    assert manager.validate_audit_integrity() == []
+    checkpoint = json.loads(manager.checkpoint_file.read_text())
+    assert checkpoint["lines"] == 3
+    assert checkpoint["offset"] == manager.audit_file.stat().st_size
+
+    log_changes(manager, 2)
+    seen = []
+    original = manager._iter_audit_lines
+
+    def recording(start=0):
+        seen.append(start)
+        return original(start)
+
+    manager._iter_audit_lines = recording
+    assert manager.validate_audit_integrity() == []
+    assert seen == [checkpoint["offset"]]
+    assert json.loads(manager.checkpoint_file.read_text())["lines"] == 5
+
+
+def test_removed_entry_breaks_the_chain(manager):
+    log_changes(manager, 3)
+    lines = read_lines(manager)
+    manager.audit_file.write_text("".join(lines[:1] + lines[2:]), encoding="utf-8")
+
+    assert manager.validate_audit_integrity(full=True) == ["Line 2: chain mismatch (entry removed, inserted or reordered)"]
+
+
+def test_rewritten_prefix_falls_back_to_full_verification(manager):
+    log_changes(manager, 3)
+    assert manager.validate_audit_integrity() == []
+
+    lines = read_lines(manager)
+    tampered = json.loads(lines[0])
+    tampered["admin"] = "mallory"
+    lines[0] = json.dumps(tampered) + "\n"
+    manager.audit_file.write_text("".join(lines), encoding="utf-8")
+
+    assert manager.validate_audit_integrity()[0] == "Line 1: checksum mismatch"
+    assert manager.last_full_verification["compromised_entries"]
+
+
+def test_truncated_log_is_reported(manager):
+    log_changes(manager, 3)
+    assert manager.validate_audit_integrity() == []
+
+    manager.audit_file.write_text("".join(read_lines(manager)[:2]), encoding="utf-8")
+
+    problems = manager.validate_audit_integrity()
+    assert len(problems) == 1
+    assert problems[0].startswith("Log truncated")
+
+
+def test_legacy_entries_without_prev_hash_still_verify(manager):
+    log_changes(manager, 1)
+    legacy = json.loads(read_lines(manager)[0])
+    del legacy["prev_hash"]
+    del legacy["checksum"]
+    legacy["checksum"] = hashlib.sha256(json.dumps(legacy, sort_keys=True).encode()).hexdigest()
+    manager.audit_file.write_text(json.dumps(legacy) + "\n", encoding="utf-8")
+
+    log_changes(manager, 1)
+    assert manager.validate_audit_integrity(full=True) == []
+    assert manager.get_audit_trail(legacy["request_id"])[0].prev_hash == ""
+
+
+def test_request_trail_is_served_from_the_index(manager):
+    first, second = log_changes(manager, 2)
+    manager.reject_feature_request(
+        manager.submit_feature_request("Feature 3", "Desc", "low", "user2"), "admin", "no")
+
+    trail = manager.get_audit_trail(first)
+    assert [entry.request_id for entry in trail] == [first]
+    assert manager._index[second] and len(manager._index) == 3
+
+    # An index built by another process's manager picks up appends and rewrites
+    other = FeatureRequestManager(manager.base_path)
+    assert len(other.get_audit_trail(second)) == 1
+    manager.audit_file.write_text("", encoding="utf-8")
+    assert other.get_audit_trail(second) == []
+
+
+def test_background_full_verification(manager):
+    log_changes(manager, 2)
+    manager.start_background_verification(0.05)
+    try:
+        deadline = time.time() + 5
+        while manager.last_full_verification is None and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        manager.stop_background_verification()
+
+    assert manager.last_full_verification["entries"] == 2
+    assert manager.last_full_verification["compromised_entries"] == []
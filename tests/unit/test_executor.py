@@ -193,6 +193,69 @@ class TestWorkflowExecutor:
         max_start_diff = max(start_times) - min(start_times)
         assert max_start_diff < 0.5  # Should start within 0.5 seconds of each other
     
+    def test_type_limits_below_one_are_rejected(self, temp_state_store):
+        """Test a zero type limit is rejected instead of stalling the scheduler"""
+        
+        with pytest.raises(ValueError):
+            WorkflowExecutor(temp_state_store, type_limits={"retrieval": 0})
+    
+    @pytest.mark.asyncio
+    async def test_per_type_concurrency_limits(self, temp_state_store):
+        """Test per-task-type limits are honoured alongside max_parallel"""
+        
+        executor = WorkflowExecutor(temp_state_store, max_parallel=4, type_limits={"retrieval": 1})
+        running = {"retrieval": 0, "reasoning": 0}
+        peak = {"retrieval": 0, "reasoning": 0}
+        
+        async def tracking_task_fn(task):
+            running[task["type"]] += 1
+            peak[task["type"]] = max(peak[task["type"]], running[task["type"]])
+            await asyncio.sleep(0.02)
+            running[task["type"]] -= 1
+            return {"result": task["id"]}
+        
+        plan = {
+            "id": "plan:type-limits",
+            "goal": "Test per-type limits",
+            "tasks": [
+                {"id": f"task:r{i}", "type": "retrieval", "dependencies": []} for i in range(3)
+            ] + [
+                {"id": f"task:s{i}", "type": "reasoning", "dependencies": []} for i in range(3)
+            ]
+        }
+        
+        result = await executor.run_plan(plan, tracking_task_fn)
+        
+        assert result["status"] == "completed"
+        assert peak["retrieval"] == 1
+        assert peak["reasoning"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_dependents_start_without_polling_delay(self, executor):
+        """Test dependents are released as soon as their dependency completes"""
+        
+        async def instant_task_fn(task):
+            return {"result": task["id"]}
+        
+        chain_plan = {
+            "id": "plan:chain",
+            "goal": "Test completion-driven scheduling",
+            "tasks": [
+                {"id": f"task:{i}", "type": "reasoning", "dependencies": [f"task:{i - 1}"] if i else []}
+                for i in range(20)
+            ]
+        }
+        
+        import time
+        started = time.perf_counter()
+        result = await executor.run_plan(chain_plan, instant_task_fn)
+        elapsed = time.perf_counter() - started
+        
+        assert result["status"] == "completed"
+        assert len(result["tasks"]) == 20
+        # A 20-level chain used to pay up to 100 ms of polling per level
+        assert elapsed < 1.0
+    
     @pytest.mark.asyncio
     async def test_workflow_resume_functionality(self, executor, temp_state_store):
         """Test resuming workflow from failure point"""
@@ -0,0 +1,109 @@
+# tests/unit/test_feedback_queue.py
+"""
+Unit tests for the durable feedback queue, the feedback worker pool and the
+trace-id log offset index used for bug bundles.
+"""
+
+import json
+import logging
+import time
+
+import pytest
+
+from app_feedback import FeedbackProcessor, FeedbackRequest, FeedbackWorkerPool, query_fingerprint
+from src_common.feedback_queue import FeedbackQueue
+from src_common.ttrpg_logging import TraceIndexedFileHandler, trace_log_lines, trace_scope
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def feedback(rating, query="What is a saving throw?", trace_id="trace-1"):
+    return FeedbackRequest(trace_id=trace_id, rating=rating, query=query,
+                           answer="A d20 roll.", metadata={"model": "test-model"})
+
+
+def enqueue(queue, job_id, item):
+    payload = {"feedback": item.dict()}
+    if item.rating == "thumbs_down":
+        payload["bundle_name"] = f"bundle_{job_id}"
+    queue.enqueue(job_id, item.rating, payload)
+
+
+def test_claims_are_leases_and_failures_retry(workdir):
+    queue = FeedbackQueue(workdir / "queue.sqlite3", lease_s=60, max_attempts=2)
+    for i in range(3):
+        enqueue(queue, f"job{i}", feedback("thumbs_up"))
+
+    first = queue.claim(2)
+    assert [job.job_id for job in first] == ["job0", "job1"]
+    assert [job.job_id for job in queue.claim(5)] == ["job2"]
+    assert queue.claim(5) == []
+    assert queue.open_counts() == {"thumbs_up": 3}
+
+    queue.complete("job0", {"test_id": "job0"})
+    assert queue.fail(first[1], "disk full")
+    retried = queue.claim(5)
+    assert [(job.job_id, job.attempts) for job in retried] == [("job1", 2)]
+    assert not queue.fail(retried[0], "disk full")
+    assert queue.get("job1")["status"] == "failed"
+    assert queue.get("job0")["result"] == {"test_id": "job0"}
+
+    # A worker that died holding job2 loses its lease
+    queue.lease_s = 0
+    time.sleep(0.01)
+    assert [job.job_id for job in queue.claim(5)] == ["job2"]
+
+
+def test_workers_write_artifacts_and_deduplicate_regression_tests(workdir):
+    processor = FeedbackProcessor(log_files=[])
+    queue = FeedbackQueue(workdir / "queue.sqlite3")
+    pool = FeedbackWorkerPool(queue, processor, batch_size=2)
+    enqueue(queue, "up1", feedback("thumbs_up", trace_id="t1"))
+    enqueue(queue, "up2", feedback("thumbs_up", query="  what is a SAVING throw? ", trace_id="t2"))
+    enqueue(queue, "down1", feedback("thumbs_down", trace_id="t3"))
+
+    assert pool.drain() == 3
+    assert queue.status_counts() == {"done": 3}
+
+    tests = list(processor.regression_dir.glob("test_*.json"))
+    assert [path.name for path in tests] == ["test_up1.json"]
+    case = json.loads(tests[0].read_text(encoding="utf-8"))
+    assert case["query_fingerprint"] == query_fingerprint("what is a saving throw?")
+    assert [entry["trace_id"] for entry in case["metadata"]["duplicate_traces"]] == ["t2"]
+    assert queue.get("up2")["result"]["test_id"] == "up1"
+    assert len(list((workdir / "tests" / "regression").glob("test_regression_*.py"))) == 1
+
+    bundle = json.loads((processor.bugs_dir / "bundle_down1" / "bundle.json").read_text(encoding="utf-8"))
+    assert bundle["bug_id"] == "down1"
+    assert (processor.bugs_dir / "bundle_down1" / "context.json").exists()
+
+
+async def test_bug_bundle_logs_come_from_the_trace_index(workdir):
+    log_file = workdir / "logs" / "app.log"
+    log_file.parent.mkdir()
+    handler = TraceIndexedFileHandler(log_file, maxBytes=400, backupCount=2)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    logger = logging.getLogger("ttrpg.tests.trace_index")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        for i in range(12):
+            with trace_scope("wanted" if i % 3 == 0 else "other"):
+                logger.info(f"step {i} " + "x" * 40)
+        logger.info("passed via extra", extra={"trace_id": "wanted"})
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    assert (workdir / "logs" / "app.log.1.tidx").exists()
+    lines = trace_log_lines("wanted", [log_file])
+    assert [line.split()[2] for line in lines[:-1]] == ["0", "3", "6", "9"]
+    assert lines[-1] == "INFO passed via extra"
+
+    processor = FeedbackProcessor(log_files=[log_file])
+    assert await processor._collect_relevant_logs("wanted") == lines
+    assert "nobody" in (await processor._collect_relevant_logs("nobody"))[0]
@@ -0,0 +1,127 @@
+# tests/unit/test_graph_artifact.py
+"""
+Unit tests for the columnar Pass E graph artifact and its lazy loader.
+"""
+
+import json
+import os
+from dataclasses import asdict
+
+import pytest
+
+from src_common import graph_artifact
+from src_common.graph_artifact import (
+    GRAPH_ARTIFACT_FILENAME, GRAPH_CONTENT_FILENAME, has_graph_artifact,
+    read_graph_artifact, write_graph_artifact
+)
+from src_common.orchestrator.graph_loader import (
+    ColumnarEdgeList, ColumnarNodeMap, CrossReference, GraphEdge, GraphLoader, GraphNode
+)
+
+
+@pytest.fixture
+def graph_parts():
+    nodes = [
+        GraphNode("section_1", "section", "Spellcasting", children=["chunk_1", "chunk_2"],
+                  metadata={"page": 10}),
+        GraphNode("chunk_1", "chunk", "Spell Slots", content="Wizards prepare spells. ✨",
+                  parent_id="section_1", metadata={"page": 11, "tags": ["magic"]}),
+        GraphNode("chunk_2", "chunk", "Cantrips", content="", parent_id="section_1"),
+    ]
+    edges = [
+        GraphEdge("contains_1", "section_1", "chunk_1", "contains", 1.0),
+        GraphEdge("contains_2", "section_1", "chunk_2", "contains", 0.1, metadata={"order": 2}),
+        GraphEdge("hierarchy_x", "toc_magic", "section_1", "hierarchy", 1.0),
+    ]
+    refs = [CrossReference("ref1", "fireball", "wizard", "spell_to_class", 0.9, "Wizard spell list")]
+    aliases = {"fireball": {"wizard"}, "wizard": {"fireball"}}
+    return nodes, edges, refs, aliases
+
+
+def write_job(tmp_path, graph_parts):
+    nodes, edges, refs, aliases = graph_parts
+    (tmp_path / "graph_snapshot.json").write_text(json.dumps({
+        "job_id": "job_1", "created_at": 5.0,
+        "nodes": {node.node_id: asdict(node) for node in nodes},
+        "edges": [asdict(edge) for edge in edges],
+        "cross_references": [asdict(ref) for ref in refs],
+    }))
+    (tmp_path / "alias_map.json").write_text(json.dumps(
+        {"aliases": {term: sorted(values) for term, values in aliases.items()}}))
+    return write_graph_artifact(tmp_path, "job_1", 5.0, nodes, edges, refs, aliases)
+
+
+def test_round_trip_preserves_graph(tmp_path, graph_parts):
+    paths = write_job(tmp_path, graph_parts)
+    assert [path.name for path in paths] == [GRAPH_ARTIFACT_FILENAME, GRAPH_CONTENT_FILENAME]
+
+    artifact = read_graph_artifact(tmp_path)
+
+    assert artifact.job_id == "job_1"
+    assert artifact.node_count == 3
+    assert artifact.node_content(1) == "Wizards prepare spells. ✨"
+    assert artifact.node_content(2) == ""
+    assert artifact.node_content(0) is None
+    assert artifact.node_metadata(1) == {"page": 11, "tags": ["magic"]}
+    assert artifact.node_metadata(2) == {}
+
+
+def test_content_store_is_read_lazily(tmp_path, graph_parts):
+    write_job(tmp_path, graph_parts)
+    artifact = read_graph_artifact(tmp_path)
+
+    nodes = ColumnarNodeMap(artifact)
+    assert nodes["chunk_1"].title == "Spell Slots"
+    assert not artifact.content.loaded
+
+    assert nodes["chunk_1"].content.startswith("Wizards")
+    assert artifact.content.loaded
+    # Nodes are materialised once, so loaded content is not re-read per lookup
+    assert nodes["chunk_1"] is nodes["chunk_1"]
+
+
+def test_loader_prefers_columnar_artifact(tmp_path, graph_parts):
+    write_job(tmp_path, graph_parts)
+    nodes, edges, _, _ = graph_parts
+
+    snapshot = GraphLoader("test")._load_snapshot_from_directory(tmp_path)
+
+    assert isinstance(snapshot.nodes, ColumnarNodeMap)
+    assert isinstance(snapshot.edges, ColumnarEdgeList)
+    assert set(snapshot.nodes) == {"section_1", "chunk_1", "chunk_2"}
+    assert "toc_magic" not in snapshot.nodes
+    for original in nodes:
+        loaded = snapshot.get_node(original.node_id)
+        assert (loaded.node_type, loaded.title, loaded.content, loaded.parent_id, loaded.children) == \
+            (original.node_type, original.title, original.content, original.parent_id, original.children)
+        assert loaded.metadata == (original.metadata or {})
+    assert list(snapshot.edges) == [
+        GraphEdge(edge.edge_id, edge.source_id, edge.target_id, edge.edge_type, edge.weight, edge.metadata or {})
+        for edge in edges
+    ]
+    assert snapshot.edges[1].weight == 0.1  # float64 column: exact round trip
+    assert snapshot.edges[-1].source_id == "toc_magic"
+    assert snapshot.get_neighbors("section_1") == ["chunk_1", "chunk_2", "toc_magic"]
+    assert [node.node_id for node in snapshot.get_children("section_1")] == ["chunk_1", "chunk_2"]
+    assert [ref.ref_id for ref in snapshot.find_cross_references("fire")] == ["ref1"]
+    assert "fireball" in snapshot.expand_aliases("wizard")
+
+
+def test_stale_artifact_falls_back_to_json(tmp_path, graph_parts):
+    write_job(tmp_path, graph_parts)
+    json_path = tmp_path / "graph_snapshot.json"
+    stat = (tmp_path / GRAPH_ARTIFACT_FILENAME).stat()
+    os.utime(json_path, (stat.st_atime + 10, stat.st_mtime + 10))
+
+    assert not has_graph_artifact(tmp_path)
+    snapshot = GraphLoader("test")._load_snapshot_from_directory(tmp_path)
+    assert isinstance(snapshot.nodes, dict)
+
+
+def test_json_codec_used_without_msgpack(tmp_path, graph_parts, monkeypatch):
+    monkeypatch.setattr(graph_artifact, "msgpack", None)
+    write_job(tmp_path, graph_parts)
+
+    raw = (tmp_path / GRAPH_ARTIFACT_FILENAME).read_bytes()
+    assert raw[12:13] == b"J"
+    assert read_graph_artifact(tmp_path).titles[0] == "Spellcasting"
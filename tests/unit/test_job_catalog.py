@@ -0,0 +1,78 @@
+# tests/unit/test_job_catalog.py
+"""
+Unit tests for the ingestion job catalog.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src_common.job_catalog import JobCatalog, get_job_catalog
+
+
+def write_manifest(job_dir, **manifest):
+    job_dir.mkdir(parents=True, exist_ok=True)
+    (job_dir / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_first_open_rebuilds_from_both_job_roots(workdir):
+    write_manifest(Path("artifacts/test/job_1_test"), job_id="job_1_test", status="completed", created_at=1.0,
+                   phases=["A", "B"], completed_phases=2)
+    write_manifest(Path("artifacts/ingest/test/job_2_abc"), job_id="job_2_abc", created_at=2.0,
+                   completed_passes=["A"])
+
+    catalog = JobCatalog("test")
+
+    assert catalog.count() == 2
+    bulk = catalog.get("job_2_abc")
+    assert bulk["status"] == "unknown"
+    assert bulk["completed_phases"] == 1
+    assert bulk["artifacts_path"] == str(Path("artifacts/ingest/test/job_2_abc"))
+    assert catalog.get("job_1_test")["total_phases"] == 2
+
+
+def test_pages_newest_first_with_status_filter(workdir):
+    catalog = JobCatalog("test")
+    for i in range(5):
+        catalog.upsert({"job_id": f"job_{i}", "environment": "test", "created_at": float(i % 3),
+                        "status": "failed" if i == 3 else "completed"})
+
+    first = catalog.list_jobs(limit=2)
+    last = first[-1]
+    second = catalog.list_jobs(limit=10, before=(last["created_at"], last["job_id"]))
+
+    assert [job["job_id"] for job in first + second] == ["job_2", "job_4", "job_1", "job_3", "job_0"]
+    assert [job["job_id"] for job in catalog.list_jobs(status="failed")] == ["job_3"]
+    assert catalog.status_counts() == {"completed": 4, "failed": 1}
+
+
+def test_find_prefers_exact_id_then_newest_containing_match(workdir):
+    catalog = JobCatalog("test")
+    catalog.upsert({"job_id": "job_10_test", "environment": "test", "created_at": 10.0, "status": "completed"})
+    catalog.upsert({"job_id": "job_100_test", "environment": "test", "created_at": 100.0, "status": "running"})
+
+    assert catalog.find("job_10_test")["job_id"] == "job_10_test"
+    assert catalog.find("job_10")["job_id"] == "job_100_test"
+    assert catalog.find("missing") is None
+
+
+def test_record_job_dir_fills_status_and_rebuild_recovers(workdir):
+    job_dir = Path("artifacts/ingest/test/job_3_bulk")
+    write_manifest(job_dir, job_id="job_3_bulk")
+    catalog = get_job_catalog("test")
+
+    assert catalog.record_job_dir(job_dir, status="completed")
+    assert catalog.get("job_3_bulk")["status"] == "completed"
+    assert catalog.get("job_3_bulk")["created_at"] > 0
+
+    catalog.remove("job_3_bulk")
+    assert catalog.get("job_3_bulk") is None
+    assert catalog.rebuild() == 1
+    assert catalog.get("job_3_bulk")["status"] == "unknown"
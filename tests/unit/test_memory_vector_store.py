@@ -0,0 +1,117 @@
+# tests/unit/test_memory_vector_store.py
+"""
+Unit tests for the memory vector store's bitmap postings.
+"""
+
+import pytest
+
+from src_common.vector_store import memory
+from src_common.vector_store.memory import MemoryVectorStore
+
+ENV = "memory_unit"
+
+
+def doc(chunk_id, source_hash, source_file=None, **metadata):
+    metadata = {"source_hash": source_hash, **metadata}
+    if source_file:
+        metadata["source_file"] = source_file
+    return {"chunk_id": chunk_id, "content": f"fireball {chunk_id}", "metadata": metadata}
+
+
+@pytest.fixture
+def store():
+    vector_store = MemoryVectorStore(ENV)
+    vector_store.delete_all()
+    yield vector_store
+    vector_store.delete_all()
+
+
+def test_counts_come_from_postings(store):
+    store.upsert_documents([doc("a", "h1", "phb.pdf"), doc("b", "h1", "phb.pdf"), doc("c", "h2")])
+
+    assert store.count_documents() == 3
+    assert store.count_documents_for_source("h1") == 2
+    assert store.get_sources_with_chunk_counts() == {"phb.pdf": 2, "h2": 1}
+
+
+def test_upsert_moves_document_between_postings(store):
+    store.upsert_documents([doc("a", "h1"), doc("b", "h1")])
+    store.upsert_documents([doc("a", "h2")])
+
+    snapshot = store._partition().snapshot
+    assert store.count_documents() == 2
+    assert store.count_documents_for_source("h1") == 1
+    assert store.count_documents_for_source("h2") == 1
+    assert memory._popcount(snapshot.live) == 2
+
+
+def test_delete_by_source_hash_only_touches_matches(store):
+    store.upsert_documents([doc("a", "h1"), doc("b", "h2"), doc("c", "h1")])
+
+    assert store.delete_by_source_hash("h1") == 2
+    assert store.delete_by_source_hash("h1") == 0
+
+    assert "h1" not in store._partition().snapshot.postings["source_hash"]
+    assert [r["chunk_id"] for r in store.query(None, top_k=5, filters={"query_text": "fireball"})] == ["b"]
+
+
+def test_filtered_query_intersects_postings_before_scoring(store):
+    store.upsert_documents([doc("a", "h1", lane="B"), doc("b", "h1"), doc("c", "h2", lane="B")])
+
+    results = store.query(None, top_k=5, filters={"query_text": "fireball", "source_hash": "h1", "lane": "B"})
+
+    assert [r["chunk_id"] for r in results] == ["a"]
+
+
+def test_dead_slots_are_compacted(store, monkeypatch):
+    monkeypatch.setattr(memory, "_COMPACT_MIN_SLOTS", 4)
+    store.upsert_documents([doc(str(i), "old" if i < 6 else "new") for i in range(8)])
+
+    store.delete_by_source_hash("old")
+
+    assert store._partition().snapshot.slots == 2
+    assert store.count_documents_for_source("new") == 2
+    assert sorted(r["chunk_id"] for r in store.query(None, top_k=5, filters={"query_text": "fireball"})) == ["6", "7"]
+
+
+def test_segments_are_merged(store, monkeypatch):
+    monkeypatch.setattr(memory, "_MAX_SEGMENTS", 3)
+    for i in range(5):
+        store.upsert_documents([doc(f"c{i}", "h1")])
+
+    snapshot = store._partition().snapshot
+    assert len(snapshot.segments) <= 3
+    assert store.count_documents_for_source("h1") == 5
+
+
+def test_readers_do_not_wait_for_writers(store):
+    store.upsert_documents([doc("a", "h1")])
+    partition = store._partition()
+    before = partition.snapshot
+
+    with partition.write_lock:
+        # A writer holds the partition; reads still complete from the published snapshot
+        assert [r["chunk_id"] for r in store.query(None, top_k=5, filters={"query_text": "fireball"})] == ["a"]
+        assert store.count_documents() == 1
+
+    store.upsert_documents([doc("b", "h1")])
+    # Published snapshots are never modified in place
+    assert before.size == 1 and partition.snapshot is not before
+
+
+def test_environments_are_separate_partitions(store):
+    other = MemoryVectorStore(ENV + "_other")
+    other.delete_all()
+    store.upsert_documents([doc("a", "h1")])
+
+    assert other.count_documents() == 0
+    assert other._partition() is not store._partition()
+
+
+def test_documents_without_ids_never_overwrite_earlier_batches(store):
+    store.insert_documents([{"content": "fireball one"}, {"content": "fireball two"}])
+    store.insert_documents([{"content": "fireball three"}, doc("2", "h1")])
+
+    assert store.count_documents() == 4
+    ids = sorted(r["chunk_id"] for r in store.query(None, top_k=10, filters={"query_text": "fireball"}))
+    assert ids == ["0", "1", "2", "3"]
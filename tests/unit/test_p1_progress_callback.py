@@ -11,7 +11,7 @@ from dataclasses import dataclass
 
 from src_common.progress_callback import (
     ProgressCallback, LoggingProgressCallback, CompositeProgressCallback,
-    JobProgress, PassProgress, PassType, PassStatus
+    BufferedProgressChannel, JobProgress, PassProgress, PassType, PassStatus
 )
 
 
@@ -344,5 +344,126 @@ class TestProgressCallbackIntegration:
         assert len(working_callback.calls['on_job_start']) == 1
 
 
+class SlowProgressCallback(MockProgressCallback):
+    """Mock callback whose deliveries take a noticeable amount of time"""
+    
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+    
+    async def on_pass_progress(self, job_progress, pass_progress, **metrics):
+        await asyncio.sleep(self.delay)
+        await super().on_pass_progress(job_progress, pass_progress, **metrics)
+
+
+class TestBufferedProgressChannel:
+    """Test the non-blocking worker-thread progress bridge"""
+    
+    @pytest.mark.asyncio
+    async def test_publish_from_thread_delivers_in_order(self, sample_job_progress, sample_pass_progress):
+        """Events published from a worker thread reach the callback in order"""
+        mock_callback = MockProgressCallback()
+        channel = BufferedProgressChannel(mock_callback, asyncio.get_running_loop())
+        
+        def worker():
+            channel.publish("on_pass_start", sample_job_progress, sample_pass_progress)
+            channel.publish("on_pass_progress", sample_job_progress, sample_pass_progress, toc_entries=3)
+            channel.publish("on_pass_complete", sample_job_progress, sample_pass_progress)
+            channel.publish("on_job_complete", sample_job_progress)
+        
+        await asyncio.get_running_loop().run_in_executor(None, worker)
+        await channel.flush()
+        
+        assert len(mock_callback.calls['on_pass_start']) == 1
+        assert mock_callback.calls['on_pass_progress'][0][2] == {"toc_entries": 3}
+        assert len(mock_callback.calls['on_pass_complete']) == 1
+        assert len(mock_callback.calls['on_job_complete']) == 1
+        assert channel.get_stats()["delivered"] == 4
+    
+    @pytest.mark.asyncio
+    async def test_publish_does_not_wait_for_slow_callbacks(self, sample_job_progress, sample_pass_progress):
+        """A slow consumer must not slow down the publishing thread"""
+        slow_callback = SlowProgressCallback(delay=0.05)
+        channel = BufferedProgressChannel(slow_callback, asyncio.get_running_loop())
+        
+        def worker():
+            started = time.perf_counter()
+            for i in range(200):
+                channel.publish("on_pass_progress", sample_job_progress, sample_pass_progress, chunks_processed=i)
+            return time.perf_counter() - started
+        
+        publish_seconds = await asyncio.get_running_loop().run_in_executor(None, worker)
+        await channel.flush()
+        
+        # 200 blocking round trips would take ~10s; publishing should be near-instant
+        assert publish_seconds < 0.5
+        deliveries = slow_callback.calls['on_pass_progress']
+        assert len(deliveries) < 200
+        assert deliveries[-1][2]["chunks_processed"] == 199
+        stats = channel.get_stats()
+        assert stats["published"] == 200
+        assert stats["coalesced"] + stats["delivered"] == 200
+    
+    @pytest.mark.asyncio
+    async def test_progress_updates_coalesce_per_pass(self, sample_job_progress):
+        """Pending progress for the same pass merges metrics, last write wins"""
+        mock_callback = MockProgressCallback()
+        channel = BufferedProgressChannel(mock_callback, asyncio.get_running_loop())
+        pass_e = PassProgress(pass_type=PassType.PASS_E, status=PassStatus.IN_PROGRESS, start_time=time.time())
+        
+        # Published from the loop thread, so nothing drains until we yield
+        channel.publish("on_pass_progress", sample_job_progress, pass_e, graph_nodes=10)
+        channel.publish("on_pass_progress", sample_job_progress, pass_e, graph_nodes=20, graph_edges=5)
+        channel.publish("on_pass_progress", sample_job_progress, pass_e, graph_edges=40)
+        await channel.flush()
+        
+        assert len(mock_callback.calls['on_pass_progress']) == 1
+        assert mock_callback.calls['on_pass_progress'][0][2] == {"graph_nodes": 20, "graph_edges": 40}
+        assert channel.get_stats()["coalesced"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_full_buffer_drops_progress_but_keeps_lifecycle_events(self, sample_job_progress):
+        """Under pressure only intermediate progress updates are discarded"""
+        mock_callback = MockProgressCallback()
+        channel = BufferedProgressChannel(mock_callback, asyncio.get_running_loop(), capacity=2)
+        passes = [
+            PassProgress(pass_type=pass_type, status=PassStatus.IN_PROGRESS, start_time=time.time())
+            for pass_type in (PassType.PASS_A, PassType.PASS_B, PassType.PASS_C)
+        ]
+        
+        for pass_progress in passes:
+            channel.publish("on_pass_progress", sample_job_progress, pass_progress, chunks_processed=1)
+        for pass_progress in passes:
+            channel.publish("on_pass_complete", sample_job_progress, pass_progress)
+        await channel.flush()
+        
+        assert len(mock_callback.calls['on_pass_complete']) == 3
+        assert 'on_pass_progress' not in mock_callback.calls
+        assert channel.get_stats()["dropped"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_callback_errors_do_not_stop_delivery(self, sample_job_progress, sample_pass_progress):
+        """A failing callback is counted and later events are still delivered"""
+        
+        class FailingStartCallback(MockProgressCallback):
+            async def on_pass_start(self, job_progress, pass_progress):
+                raise RuntimeError("store unavailable")
+        
+        callback = FailingStartCallback()
+        channel = BufferedProgressChannel(callback, asyncio.get_running_loop())
+        
+        channel.publish("on_pass_start", sample_job_progress, sample_pass_progress)
+        channel.publish("on_job_complete", sample_job_progress)
+        await channel.flush()
+        
+        assert len(callback.calls['on_job_complete']) == 1
+        assert channel.get_stats()["errors"] == 1
+    
+    def test_unknown_event_rejected(self, sample_job_progress):
+        channel = BufferedProgressChannel(MockProgressCallback(), MagicMock())
+        with pytest.raises(ValueError):
+            channel.publish("on_unknown", sample_job_progress)
+
+
 if __name__ == "__main__":
-    pytest.main([__file__])
\ No newline at end of file
+    pytest.main([__file__])
@@ -8,6 +8,7 @@ import pytest
 import tempfile
 import json
 import time
+from dataclasses import asdict
 from pathlib import Path
 from unittest.mock import MagicMock, AsyncMock, patch
 
@@ -121,18 +122,11 @@ class TestJobStatusStore:
         
         assert store.storage_dir == temp_storage_dir
         assert len(store._active_jobs) == 0
-        assert len(store._completed_jobs) == 0
+        assert store.get_job_history() == []
         
-        # Storage directory should be created
+        # Storage directory and database should be created
         assert store.storage_dir.exists()
-        
-        # Files are created on first save, not initialization
-        # Create a job to trigger file creation
-        store.create_job("init_test", "/test/init.pdf", "test")
-        
-        # Now files should exist
-        assert (temp_storage_dir / "active_jobs.json").exists()
-        assert (temp_storage_dir / "completed_jobs.json").exists()
+        assert (temp_storage_dir / JobStatusStore.DB_FILENAME).exists()
     
     def test_create_job(self, job_store):
         """Test job creation"""
@@ -189,9 +183,8 @@ class TestJobStatusStore:
         # Should no longer be in active jobs
         assert job_store.get_job_status("complete_job") is not None
         assert "complete_job" not in job_store._active_jobs
-        assert "complete_job" in job_store._completed_jobs
         
-        completed_record = job_store._completed_jobs["complete_job"]
+        completed_record = job_store.get_job_status("complete_job")
         assert completed_record.status == "completed"
         assert completed_record.processing_time == 45.2
         assert completed_record.wait_time == 2.1
@@ -270,36 +263,101 @@ class TestJobStatusStore:
         assert job is not None
         assert job.job_id == "persist_job"
     
-    def test_completed_job_cleanup(self, job_store):
-        """Test that old completed jobs are cleaned up"""
+    def test_completed_job_cleanup(self, temp_storage_dir):
+        """Test that periodic compaction trims the oldest completed jobs"""
+        job_store = JobStatusStore(storage_dir=temp_storage_dir, max_completed_history=100, compaction_interval=5)
+        
         # Create more than 100 completed jobs
         for i in range(105):
             job_id = f"cleanup_job_{i:03d}"
             job_store.create_job(job_id, f"/test/cleanup{i}.pdf", "test")
-            # Stagger completion times
             result = {"status": "completed", "processing_time": 10.0}
             job_store.complete_job(job_id, result)
-            job_store._completed_jobs[job_id].end_time = time.time() - (105 - i)
         
         # Should only keep the 100 most recent
-        assert len(job_store._completed_jobs) == 100
+        assert len(job_store.get_job_history(limit=200)) == 100
         
         # Should have kept the most recent ones
-        assert "cleanup_job_104" in job_store._completed_jobs
-        assert "cleanup_job_004" not in job_store._completed_jobs
+        assert job_store.get_job_status("cleanup_job_104") is not None
+        assert job_store.get_job_status("cleanup_job_004") is None
+        
+        # Statistics are maintained incrementally and match the retained history
+        stats = job_store.get_job_statistics()
+        assert stats["total_completed"] == 100
+        assert stats["average_processing_time"] == 10.0
+    
+    def test_statistics_count_each_job_once(self, job_store):
+        """Test completing the same job_id again replaces its contribution"""
+        job_store.create_job("repeat_job", "/test/repeat.pdf", "test")
+        job_store.complete_job("repeat_job", {"status": "failed"})
+        job_store.create_job("repeat_job", "/test/repeat.pdf", "test")
+        job_store.complete_job("repeat_job", {"status": "completed", "processing_time": 4.0})
+        
+        stats = job_store.get_job_statistics(environment="test")
+        assert stats["total_completed"] == 1
+        assert stats["successful"] == 1
+        assert stats["failed"] == 0
+        assert stats["average_processing_time"] == 4.0
+    
+    def test_job_history_paging_and_environment_filter(self, job_store):
+        """Test history is paged from disk, newest first, per environment"""
+        for i in range(6):
+            job_id = f"page_job_{i}"
+            job_store.create_job(job_id, f"/test/page{i}.pdf", "test" if i % 2 else "dev")
+            job_store.complete_job(job_id, {"status": "completed"})
+        
+        first_page = job_store.get_job_history(limit=2)
+        second_page = job_store.get_job_history(limit=2, offset=2)
+        assert [job.job_id for job in first_page] == ["page_job_5", "page_job_4"]
+        assert [job.job_id for job in second_page] == ["page_job_3", "page_job_2"]
+        
+        test_history = job_store.get_job_history(environment="test")
+        assert [job.job_id for job in test_history] == ["page_job_5", "page_job_3", "page_job_1"]
+    
+    def test_completed_history_survives_restart(self, temp_storage_dir):
+        """Test completed jobs and statistics are reloaded from disk"""
+        store1 = JobStatusStore(storage_dir=temp_storage_dir)
+        store1.create_job("restart_job", "/test/restart.pdf", "test")
+        store1.complete_job("restart_job", {"status": "completed", "processing_time": 12.0})
+        
+        store2 = JobStatusStore(storage_dir=temp_storage_dir)
+        
+        assert store2.get_job_status("restart_job").processing_time == 12.0
+        stats = store2.get_job_statistics(environment="test")
+        assert stats["total_completed"] == 1
+        assert stats["average_processing_time"] == 12.0
+    
+    def test_legacy_json_files_are_imported(self, temp_storage_dir):
+        """Test job state written by the JSON-file store is migrated once"""
+        legacy_record = asdict(JobStatusRecord(
+            job_id="legacy_job", source_path="/test/legacy.pdf", environment="test",
+            status="completed", queued_time=1.0, end_time=2.0, processing_time=5.0
+        ))
+        (temp_storage_dir / "completed_jobs.json").write_text(json.dumps({"legacy_job": legacy_record}))
+        
+        store = JobStatusStore(storage_dir=temp_storage_dir)
+        
+        assert store.get_job_status("legacy_job").processing_time == 5.0
+        assert store.get_job_statistics()["total_completed"] == 1
+        assert not (temp_storage_dir / "completed_jobs.json").exists()
 
 
 class TestJobStatusStoreAsync:
     """Test async functionality of job status store"""
     
     @pytest.mark.asyncio
-    async def test_get_job_store_singleton(self):
+    async def test_get_job_store_singleton(self, temp_storage_dir, monkeypatch):
         """Test that get_job_store returns singleton"""
+        import src_common.job_status_store as job_status_store
+        monkeypatch.setenv("JOB_STATUS_DIR", str(temp_storage_dir))
+        monkeypatch.setattr(job_status_store, "_job_store", None)
+        
         store1 = await get_job_store()
         store2 = await get_job_store()
         
         assert store1 is store2  # Same instance
         assert isinstance(store1, JobStatusStore)
+        assert store1.storage_dir == temp_storage_dir
     
     @pytest.mark.asyncio 
     async def test_concurrent_job_updates(self, temp_storage_dir):
@@ -399,7 +457,7 @@ class TestJobStatusStoreErrorHandling:
         store = JobStatusStore(storage_dir=temp_storage_dir)
         
         assert len(store._active_jobs) == 0
-        assert len(store._completed_jobs) == 0
+        assert store.get_job_history() == []
     
     def test_unknown_job_completion(self, job_store):
         """Test completing unknown job"""
@@ -0,0 +1,147 @@
+# tests/unit/test_processing_queue.py
+"""
+Unit tests for the durable FR-002 ProcessingQueue.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from src_common.processing_queue import ProcessingQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return ProcessingQueue(state_file=tmp_path / "queue_state" / "processing_queue.json", max_size=100)
+
+
+def test_priority_ordering_and_duplicates(queue):
+    assert queue.add_document("/docs/c.pdf", priority=3)["status"] == "added"
+    assert queue.add_document("/docs/a.pdf", priority=1)["status"] == "added"
+    assert queue.add_document("/docs/b.pdf", priority=2)["status"] == "added"
+    assert queue.add_document("/docs/a.pdf", priority=1)["status"] == "duplicate"
+
+    paths = [queue.get_next_document()["path"] for _ in range(3)]
+
+    assert paths == ["/docs/a.pdf", "/docs/b.pdf", "/docs/c.pdf"]
+    assert queue.get_next_document() is None
+
+
+def test_state_survives_reopen(tmp_path):
+    state_file = tmp_path / "processing_queue.json"
+    first = ProcessingQueue(state_file=state_file)
+    first.add_document("/docs/a.pdf", priority=2, metadata={"size_mb": 5})
+
+    reopened = ProcessingQueue(state_file=state_file)
+
+    items = reopened.peek_queue()
+    assert [item["path"] for item in items] == ["/docs/a.pdf"]
+    assert items[0]["metadata"] == {"size_mb": 5}
+    assert reopened.add_document("/docs/b.pdf")["job_id"] == "queue_000002"
+
+
+def test_legacy_json_state_is_migrated_once(tmp_path):
+    state_file = tmp_path / "processing_queue.json"
+    state_file.write_text(json.dumps({
+        "counter": 7,
+        "items": [{"job_id": "queue_000007", "path": "/docs/legacy.pdf", "priority": 1,
+                   "metadata": {}, "created_at": 1.0}],
+    }))
+
+    queue = ProcessingQueue(state_file=state_file)
+
+    assert [item["job_id"] for item in queue.peek_queue()] == ["queue_000007"]
+    assert not state_file.exists()
+    assert queue.add_document("/docs/new.pdf")["job_id"] == "queue_000008"
+    assert len(ProcessingQueue(state_file=state_file).peek_queue()) == 2
+
+
+def test_claim_hides_item_until_ack(queue):
+    queue.add_document("/docs/a.pdf")
+
+    claimed = queue.claim_next(worker_id="worker-1")
+
+    assert claimed["path"] == "/docs/a.pdf"
+    assert queue.claim_next(worker_id="worker-2") is None
+    assert queue.ack(claimed["job_id"], "wrong-receipt") is False
+    assert queue.ack(claimed["job_id"], claimed["receipt"]) is True
+    assert queue.get_status()["total_documents"] == 0
+
+
+def test_expired_claim_becomes_visible_again(tmp_path):
+    queue = ProcessingQueue(state_file=tmp_path / "q.json", visibility_timeout_s=0.05)
+    queue.add_document("/docs/a.pdf")
+
+    first = queue.claim_next(worker_id="worker-1")
+    time.sleep(0.1)
+    second = queue.claim_next(worker_id="worker-2")
+
+    assert second["job_id"] == first["job_id"]
+    assert second["attempts"] == 2
+    # The stale lease can no longer ack
+    assert queue.ack(first["job_id"], first["receipt"]) is False
+    assert queue.ack(second["job_id"], second["receipt"]) is True
+
+
+def test_repeated_failures_are_dead_lettered(tmp_path):
+    queue = ProcessingQueue(state_file=tmp_path / "q.json", max_attempts=2)
+    queue.add_document("/docs/broken.pdf")
+
+    first = queue.claim_next()
+    assert queue.nack(first["job_id"], first["receipt"], error="parse error")["status"] == "requeued"
+    second = queue.claim_next()
+    assert queue.nack(second["job_id"], second["receipt"], error="parse error")["status"] == "dead_lettered"
+
+    assert queue.claim_next() is None
+    dead = queue.list_dead_letters()
+    assert [item["path"] for item in dead] == ["/docs/broken.pdf"]
+    assert dead[0]["last_error"] == "parse error"
+    assert queue.get_status()["dead_letters"] == 1
+
+    assert queue.requeue_dead_letters()["requeued_count"] == 1
+    assert queue.claim_next()["path"] == "/docs/broken.pdf"
+
+
+def test_concurrent_workers_never_claim_the_same_item(tmp_path):
+    state_file = tmp_path / "q.json"
+    producer = ProcessingQueue(state_file=state_file)
+    for i in range(60):
+        producer.add_document(f"/docs/{i:03d}.pdf", priority=i % 3)
+
+    claimed = []
+    lock = threading.Lock()
+
+    def worker(name):
+        # Each worker opens its own handle, like separate scheduler processes
+        queue = ProcessingQueue(state_file=state_file)
+        while True:
+            item = queue.claim_next(worker_id=name)
+            if item is None:
+                return
+            with lock:
+                claimed.append(item["job_id"])
+            queue.ack(item["job_id"], item["receipt"])
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(claimed) == 60
+    assert len(set(claimed)) == 60
+
+
+def test_capacity_and_remove_failed(tmp_path):
+    queue = ProcessingQueue(state_file=tmp_path / "q.json", max_size=2)
+    queue.add_document("/docs/a.pdf")
+    queue.add_document("/docs/b.pdf")
+
+    assert queue.add_document("/docs/c.pdf") == {"status": "rejected", "reason": "capacity"}
+
+    result = queue.remove_failed_documents(["/docs/a.pdf"])
+    assert result["removed_count"] == 1
+    assert result["remaining_count"] == 1
+    assert queue.clear_queue()["cleared_count"] == 1
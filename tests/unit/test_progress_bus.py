@@ -0,0 +1,142 @@
+# tests/unit/test_progress_bus.py
+"""
+Unit tests for the job progress event bus.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src_common.progress_bus import FINAL_EVENT, JobProgressBus, ProgressBusCallback
+from src_common.progress_callback import JobProgress
+
+
+class FakeRedisClient:
+    """Records publishes; its pub/sub listener never yields a message."""
+
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channel, payload):
+        self.published.append((channel, json.loads(payload)))
+
+    def pubsub(self, **kwargs):
+        class _PubSub:
+            def psubscribe(self, pattern):
+                pass
+
+            def listen(self):
+                return iter(())
+
+        return _PubSub()
+
+
+class FakeRemote:
+    def __init__(self):
+        self.client = FakeRedisClient()
+
+
+async def test_subscriber_gets_replay_then_live_events():
+    bus = JobProgressBus(replay_size=2)
+    for step in range(3):
+        bus.publish("job1", {"type": "logs", "step": step})
+
+    subscription = bus.subscribe("job1")
+    bus.publish("job1", {"type": "logs", "step": 3})
+    bus.publish("job2", {"type": "logs", "step": 99})
+
+    steps = [(await subscription.get(timeout=1))["step"] for _ in range(3)]
+    assert steps == [1, 2, 3]
+    assert await subscription.get(timeout=0.01) is None
+    subscription.close()
+    assert bus.subscriber_count("job1") == 0
+
+
+async def test_slow_subscriber_drops_oldest_but_keeps_final_status():
+    bus = JobProgressBus(replay_size=0, queue_size=2)
+    subscription = bus.subscribe("job1")
+
+    bus.publish("job1", {"type": FINAL_EVENT, "status": "completed"})
+    bus.publish("job1", {"type": "metrics", "n": 1})
+    bus.publish("job1", {"type": "metrics", "n": 2})
+
+    events = [await subscription.get(timeout=1), await subscription.get(timeout=1)]
+    assert [event["type"] for event in events] == [FINAL_EVENT, "metrics"]
+    assert events[1]["n"] == 2
+    assert subscription.dropped == 1
+
+
+async def test_publish_from_worker_thread_wakes_subscriber():
+    bus = JobProgressBus()
+    subscription = bus.subscribe("job1")
+
+    thread = threading.Thread(target=bus.publish, args=("job1", {"type": "metrics", "phase": "C"}))
+    thread.start()
+    event = await subscription.get(timeout=2)
+    thread.join()
+
+    assert event["phase"] == "C"
+    assert event["job_id"] == "job1"
+
+
+async def test_redis_relay_publishes_and_ignores_own_messages():
+    remote = FakeRemote()
+    bus = JobProgressBus(remote=remote)
+    subscription = bus.subscribe("job1", replay=False)
+
+    bus.publish("job1", {"type": "logs"})
+    channel, message = remote.client.published[0]
+    assert channel == "ttrpg:job_progress:job1"
+
+    # Our own message echoed back by Redis is not delivered twice
+    bus._receive_remote(json.dumps(message))
+    other = dict(message, origin="other-worker", event={"type": "metrics", "job_id": "job1"})
+    bus._receive_remote(json.dumps(other))
+
+    assert (await subscription.get(timeout=1))["type"] == "logs"
+    assert (await subscription.get(timeout=1))["type"] == "metrics"
+    assert await subscription.get(timeout=0.01) is None
+    assert bus.get_stats()["remote_received"] == 1
+
+
+async def test_pipeline_callback_publishes_pass_and_final_events():
+    bus = JobProgressBus()
+    callback = ProgressBusCallback(bus)
+    job = JobProgress(job_id="job1", source_path="phb.pdf", environment="test", start_time=time.time())
+
+    await callback.on_job_start(job)
+    job.overall_status = "completed"
+    await callback.on_job_complete(job)
+
+    events = bus.recent("job1")
+    assert [event["type"] for event in events] == ["job_start", FINAL_EVENT]
+    assert events[-1]["status"] == "completed"
+
+
+async def test_stream_job_progress_is_driven_by_published_events(tmp_path, monkeypatch):
+    pytest.importorskip("psutil")
+    from src_common.admin.ingestion import AdminIngestionService
+
+    monkeypatch.chdir(tmp_path)
+    service = AdminIngestionService()
+    service.progress_bus = JobProgressBus()
+    job_dir = Path("artifacts/test/job_1_test")
+    manifest = {"job_id": "job_1_test", "status": "running", "phases": ["A"]}
+    await service._write_manifest(job_dir / "manifest.json", manifest)
+
+    async def produce():
+        await asyncio.sleep(0.05)
+        await service._append_log(Path("env/test/logs/job_1_test.log"), "Pass A done")
+        manifest["status"] = "completed"
+        await service._write_manifest(job_dir / "manifest.json", manifest)
+
+    producer = asyncio.create_task(produce())
+    events = [event async for event in service.stream_job_progress("test", "job_1_test")]
+    await producer
+
+    assert [event["type"] for event in events] == ["status", "logs", FINAL_EVENT]
+    assert events[1]["logs"][0]["message"] == "Pass A done"
@@ -0,0 +1,108 @@
+# tests/unit/test_schema_validation_cache.py
+"""
+Unit tests for SchemaValidator's compiled validators, result cache and
+parallel directory validation.
+"""
+
+import json
+import pathlib
+import shutil
+
+import pytest
+
+from src_common import schema_validator
+from src_common.schema_validator import SchemaValidator
+
+REPO_SCHEMAS = pathlib.Path(__file__).resolve().parents[2] / "schemas"
+
+
+@pytest.fixture
+def schemas_dir(tmp_path):
+    target = tmp_path / "schemas"
+    shutil.copytree(REPO_SCHEMAS, target)
+    return target
+
+
+def feature(i, **overrides):
+    data = {
+        "request_id": f"FR-{1000 + i}",
+        "title": f"Feature number {i}",
+        "description": "A sufficiently long description",
+        "priority": "medium",
+        "requester": "user1",
+        "status": "pending",
+        "created_at": "2024-01-01T00:00:00Z",
+    }
+    data.update(overrides)
+    return data
+
+
+def write_features(directory, count, invalid=()):
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        data = feature(i, priority="urgent") if i in invalid else feature(i)
+        (directory / f"FR-{1000 + i}.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_identical_schemas_share_one_compiled_validator(schemas_dir):
+    first = SchemaValidator(schemas_dir)
+    second = SchemaValidator(schemas_dir)
+
+    assert first._validator_cache["feature_request"] is second._validator_cache["feature_request"]
+
+
+def test_unchanged_files_are_served_from_the_cache(schemas_dir, tmp_path):
+    validator = SchemaValidator(schemas_dir)
+    features = tmp_path / "features"
+    write_features(features, 3, invalid={1})
+
+    first = dict(validator.validate_features_directory(features, max_workers=1))
+    assert validator.cache_hits == 0
+    second = dict(validator.validate_features_directory(features, max_workers=1))
+
+    assert validator.cache_hits == 3
+    assert {name: r.is_valid for name, r in second.items()} == {name: r.is_valid for name, r in first.items()}
+    assert second["FR-1001.json"].errors[0].field_path == "priority"
+
+    # Editing a file invalidates only that file's entry
+    (features / "FR-1001.json").write_text(json.dumps(feature(1)), encoding="utf-8")
+    third = dict(validator.validate_features_directory(features, max_workers=1))
+    assert third["FR-1001.json"].is_valid
+    assert validator.cache_hits == 5
+
+
+def test_result_cache_persists_across_instances(schemas_dir, tmp_path):
+    cache_file = tmp_path / "cache" / "schema_results.json"
+    features = tmp_path / "features"
+    write_features(features, 2, invalid={0})
+
+    SchemaValidator(schemas_dir, result_cache_file=cache_file).validate_features_directory(features)
+    validator = SchemaValidator(schemas_dir, result_cache_file=cache_file)
+    results = dict(validator.validate_features_directory(features))
+
+    assert validator.cache_hits == 2 and validator.cache_misses == 0
+    assert not results["FR-1000.json"].is_valid
+    assert results["FR-1000.json"].errors[0].message
+
+
+def test_single_file_validation_uses_the_cache(schemas_dir, tmp_path):
+    validator = SchemaValidator(schemas_dir)
+    path = tmp_path / "FR-1.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    assert validator.validate_json_file(path, "feature_request").errors[0].field_path == "json"
+    assert validator.validate_json_file(path, "feature_request").errors[0].field_path == "json"
+    assert validator.cache_hits == 1
+
+
+def test_process_pool_matches_inline_validation(schemas_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(schema_validator, "PARALLEL_MIN_FILES", 4)
+    monkeypatch.setattr(schema_validator, "PARALLEL_BATCH_SIZE", 3)
+    features = tmp_path / "features"
+    write_features(features, 10, invalid={2, 7})
+
+    inline = SchemaValidator(schemas_dir).validate_features_directory(features, max_workers=1)
+    pooled = SchemaValidator(schemas_dir).validate_features_directory(features, max_workers=2)
+
+    assert [(name, r.is_valid, len(r.errors)) for name, r in pooled] == \
+        [(name, r.is_valid, len(r.errors)) for name, r in inline]
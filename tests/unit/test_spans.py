@@ -0,0 +1,87 @@
+# tests/unit/test_spans.py
+"""
+Unit tests for stage spans, the Prometheus histogram export and the
+slow-request sampling profiler.
+"""
+
+import time
+
+import pytest
+
+from src_common import spans as spans_module
+from src_common.spans import SlowRequestProfiler, SpanRegistry, request_spans, span
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = SpanRegistry(buckets_ms=(10, 100))
+    monkeypatch.setattr(spans_module, "_span_registry", registry)
+    return registry
+
+
+def test_histogram_renders_cumulative_prometheus_buckets(registry):
+    for duration_ms in (5, 10, 50, 500):
+        registry.observe("rag.retrieve", duration_ms)
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE ttrpg_stage_duration_seconds histogram" in text
+    assert 'ttrpg_stage_duration_seconds_bucket{stage="rag.retrieve",le="0.01"} 2' in text
+    assert 'ttrpg_stage_duration_seconds_bucket{stage="rag.retrieve",le="0.1"} 3' in text
+    assert 'ttrpg_stage_duration_seconds_bucket{stage="rag.retrieve",le="+Inf"} 4' in text
+    assert 'ttrpg_stage_duration_seconds_sum{stage="rag.retrieve"} 0.565' in text
+    assert 'ttrpg_stage_duration_seconds_count{stage="rag.retrieve"} 4' in text
+    assert registry.summary()["rag.retrieve"]["p50_ms"] == 10
+
+
+async def test_spans_feed_histograms_and_the_request_breakdown(registry):
+    @span("stage.sync")
+    def sync_stage():
+        time.sleep(0.01)
+        return "sync"
+
+    @span("stage.async")
+    async def async_stage():
+        return "async"
+
+    with request_spans() as timings:
+        assert sync_stage() == "sync"
+        assert await async_stage() == "async"
+        with span("stage.sync"):
+            pass
+
+    assert sync_stage() == "sync"  # outside the request: histogram only
+    assert set(timings) == {"stage.sync", "stage.async"}
+    assert timings["stage.sync"] >= 10
+    assert registry.histogram("stage.sync").count == 3
+    assert registry.histogram("stage.async").count == 1
+
+
+def test_profiler_writes_a_flamegraph_only_for_slow_requests(tmp_path):
+    def busy(seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    profiler = SlowRequestProfiler(threshold_ms=50, interval_s=0.002, output_dir=tmp_path)
+    with profiler.profile("fast"):
+        busy(0.005)
+    with profiler.profile("slow"):
+        busy(0.1)
+
+    assert not (tmp_path / "fast.folded").exists()
+    lines = (tmp_path / "slow.folded").read_text(encoding="utf-8").splitlines()
+    assert any("busy (test_spans.py" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert profiler.profiles_written == 1
+
+
+def test_profiler_is_off_without_a_threshold(tmp_path, monkeypatch):
+    monkeypatch.delenv("RAG_PROFILE_SLOW_MS", raising=False)
+    profiler = SlowRequestProfiler(output_dir=tmp_path)
+
+    with profiler.profile("trace"):
+        time.sleep(0.01)
+
+    assert not profiler.enabled
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,103 @@
+# tests/unit/test_vector_store_filters.py
+"""
+Unit tests for metadata filter pushdown into the vector store backends.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src_common.orchestrator import retriever
+from src_common.vector_store.filters import MetadataFilter
+from src_common.vector_store.memory import MemoryVectorStore
+
+ENV = "filter_unit"
+
+
+@pytest.fixture
+def store():
+    memory = MemoryVectorStore(ENV)
+    memory.delete_all()
+    memory.upsert_documents([
+        {"chunk_id": "a1", "content": "fireball spell", "element_type": "Table", "page_number": 10,
+         "metadata": {"source_hash": "phb"}},
+        {"chunk_id": "a2", "content": "fireball lore", "metadata": {"source_hash": "phb", "lane": "A", "page": 30}},
+        {"chunk_id": "b1", "content": "fireball homebrew", "metadata": {"source_hash": "hb", "lane": "b", "page": 12}},
+    ])
+    yield memory
+    memory.delete_all()
+
+
+def ids(results):
+    return sorted(result["chunk_id"] for result in results)
+
+
+class TestMetadataFilter:
+    """Test filter compilation."""
+
+    def test_no_predicates_compile_to_none(self):
+        assert MetadataFilter.from_filters({"query_text": "x", "scan_limit": 10}) is None
+        assert MetadataFilter.from_filters({"lane": "ALL"}) is None
+
+    def test_astra_filter_treats_missing_lane_as_lane_a(self):
+        compiled = MetadataFilter.from_filters({"lane": "a", "element_type": ["Table", "List"],
+                                                "page_range": (5, None)})
+
+        assert compiled.to_astra() == {"$and": [
+            {"metadata.lane": {"$nin": ["B", "C"]}},
+            {"$or": [{"metadata.element_type": {"$in": ["Table", "List"]}},
+                     {"element_type": {"$in": ["Table", "List"]}}]},
+            {"$or": [{"page_number": {"$gte": 5}}, {"metadata.page": {"$gte": 5}},
+                     {"metadata.page_number": {"$gte": 5}}]},
+        ]}
+
+    def test_cql_pushes_single_values_and_returns_residual(self):
+        compiled = MetadataFilter.from_filters({"lane": "B", "source_hash": ["phb", "hb"],
+                                                "page_range": (1, 20), "metadata": {"section": "Magic"}})
+
+        clauses, params, residual = compiled.to_cql(("source_hash", "lane", "element_type", "page"))
+
+        assert clauses == ["lane = %s", "page >= %s", "page <= %s"]
+        assert params == ["B", 1, 20]
+        assert residual.equals == {"source_hash": ("phb", "hb"), "section": ("Magic",)}
+        assert not residual.has_page_range
+
+
+class TestMemoryPushdown:
+    """Test the memory backend's filtered queries."""
+
+    def test_lane_filter_includes_lane_less_chunks_in_lane_a(self, store):
+        assert ids(store.query(None, top_k=10, filters={"query_text": "fireball", "lane": "A"})) == ["a1", "a2"]
+        assert ids(store.query(None, top_k=10, filters={"query_text": "fireball", "lane": "B"})) == ["b1"]
+
+    def test_top_level_and_metadata_fields_both_filter(self, store):
+        assert ids(store.query(None, top_k=10, filters={"query_text": "fireball", "element_type": "Table"})) == ["a1"]
+        assert ids(store.query(None, top_k=10, filters={"query_text": "fireball", "source_hash": "phb",
+                                                        "page_range": (1, 20)})) == ["a1"]
+
+    def test_top_k_is_filled_from_matching_rows(self, store):
+        results = store.query(None, top_k=1, filters={"query_text": "fireball", "lane": "B"})
+        assert ids(results) == ["b1"]
+
+
+class TestRetrieverLanePushdown:
+    """Test that the retriever hands the lane to the store."""
+
+    def test_lane_is_pushed_into_store_query(self, store):
+        with patch.object(retriever, "make_vector_store", return_value=store), \
+                patch.object(retriever, "_iter_candidate_chunks") as artifact_scan:
+            results = retriever.retrieve({"vector_top_k": 5}, "fireball", ENV, limit=5, lane="B")
+
+        assert [chunk.id for chunk in results] == ["b1"]
+        artifact_scan.assert_not_called()
+
+    def test_store_filters_reach_backend_for_both_searches(self):
+        backend = SimpleNamespace(backend_name="fake", calls=[])
+        backend.query = lambda vector, top_k, filters: backend.calls.append(filters) or []
+
+        with patch.object(retriever, "make_vector_store", return_value=backend), \
+                patch.object(retriever, "_embed_query", return_value=[1.0, 0.0]):
+            retriever._retrieve_from_store("fire", ENV, mode="hybrid", store_filters={"lane": "C"})
+
+        assert [call["lane"] for call in backend.calls] == ["C", "C"]